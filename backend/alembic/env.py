@@ -28,6 +28,19 @@ from app.models import *  # noqa: F403, F401, E402
 
 target_metadata = BaseModel.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave DDL-managed columns, indexes and partitions to their migrations"""
+    if reflected and compare_to is None and name:
+        if name == "search_vector" or name.endswith("_search_vector"):
+            return False
+        if type_ == "table" and name.startswith("status_history_"):
+            return False
+        if type_ == "index" and name.endswith("_timeline"):
+            return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +63,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +82,11 @@ def run_migrations_online() -> None:
     connectable = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,169 @@
+"""Add the partitioned status history log and its rollups
+
+Revision ID: 2a98fe74edd4
+Revises: ccd6f3456846
+Create Date: 2026-10-19 13:59:17.379902
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2a98fe74edd4"
+down_revision: str | Sequence[str] | None = "ccd6f3456846"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("projects", "campaigns", "quotes", "tasks")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "status_current",
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("since", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("entity", "entity_id"),
+    )
+    op.create_index(
+        "ix_status_current_entity_status_since",
+        "status_current",
+        ["entity", "status", "since"],
+        unique=False,
+    )
+    op.create_table(
+        "status_duration_rollups",
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("bucket", sa.SmallInteger(), nullable=False),
+        sa.Column("transitions", sa.Integer(), nullable=False),
+        sa.Column("total_seconds", sa.Double(), nullable=False),
+        sa.PrimaryKeyConstraint("entity", "status", "day", "bucket"),
+    )
+    op.create_table(
+        "status_history",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("from_status", sa.String(length=32), nullable=True),
+        sa.Column("to_status", sa.String(length=32), nullable=False),
+        sa.Column("entered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id", "changed_at"),
+        postgresql_partition_by="RANGE (changed_at)",
+    )
+    op.create_index(
+        "ix_status_history_changed_at",
+        "status_history",
+        ["changed_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_status_history_entity_changed_at",
+        "status_history",
+        ["entity", "entity_id", "changed_at"],
+        unique=False,
+    )
+    op.execute(
+        "CREATE TABLE status_history_default PARTITION OF status_history DEFAULT"
+    )
+    # This month and the next; the daily partitions task keeps it ahead
+    start = datetime.now(UTC).date().replace(day=1)
+    for _ in range(2):
+        end = (start + timedelta(days=32)).replace(day=1)
+        op.execute(
+            f"CREATE TABLE status_history_p{start:%Y_%m} PARTITION OF status_history "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forbid_status_history_change() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'status_history is append-only';
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER status_history_append_only "
+        "BEFORE UPDATE OR DELETE ON status_history "
+        "FOR EACH STATEMENT EXECUTE FUNCTION forbid_status_history_change()"
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_status_change() RETURNS trigger AS $$
+        DECLARE
+            entered timestamptz;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM status_current
+                WHERE entity = TG_TABLE_NAME AND entity_id = OLD.id;
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'UPDATE' AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+                RETURN NULL;
+            END IF;
+            SELECT since INTO entered FROM status_current
+            WHERE entity = TG_TABLE_NAME AND entity_id = NEW.id
+            FOR UPDATE;
+            INSERT INTO status_history
+                (entity, entity_id, from_status, to_status, entered_at, changed_at)
+            VALUES (
+                TG_TABLE_NAME,
+                NEW.id,
+                CASE WHEN TG_OP = 'UPDATE' THEN OLD.status::text END,
+                NEW.status::text,
+                entered,
+                now()
+            );
+            INSERT INTO status_current (entity, entity_id, status, since)
+            VALUES (TG_TABLE_NAME, NEW.id, NEW.status::text, now())
+            ON CONFLICT (entity, entity_id)
+            DO UPDATE SET status = EXCLUDED.status, since = EXCLUDED.since;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        # Best guess for rows that predate the log: their last write
+        op.execute(
+            f"INSERT INTO status_current (entity, entity_id, status, since) "
+            f"SELECT '{table}', id, status::text, coalesce(updated_at, created_at) "
+            f"FROM {table}"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_record_status "
+            f"AFTER INSERT OR UPDATE OF status OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION record_status_change()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.execute(f"DROP TRIGGER {table}_record_status ON {table}")
+    op.execute("DROP FUNCTION record_status_change()")
+    op.drop_index("ix_status_history_entity_changed_at", table_name="status_history")
+    op.drop_index("ix_status_history_changed_at", table_name="status_history")
+    # Takes the partitions and the append-only trigger with it
+    op.drop_table("status_history")
+    op.execute("DROP FUNCTION forbid_status_history_change()")
+    op.drop_table("status_duration_rollups")
+    op.drop_index("ix_status_current_entity_status_since", table_name="status_current")
+    op.drop_table("status_current")
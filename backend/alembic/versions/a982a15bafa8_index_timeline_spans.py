@@ -0,0 +1,51 @@
+"""Add campaign dates and range-index timeline spans
+
+Revision ID: a982a15bafa8
+Revises: ef4217678633
+Create Date: 2026-10-19 14:04:49.119715
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a982a15bafa8"
+down_revision: str | Sequence[str] | None = "ef4217678633"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must match app.models.timeline.date_span() for the planner to use it
+SPAN = (
+    "daterange(start_date, "
+    "CASE WHEN (end_date < start_date) THEN start_date ELSE end_date END, '[]')"
+)
+DATED = "start_date IS NOT NULL OR end_date IS NOT NULL"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("campaigns", sa.Column("start_date", sa.Date(), nullable=True))
+    op.add_column("campaigns", sa.Column("end_date", sa.Date(), nullable=True))
+    for table in ("campaigns", "projects"):
+        op.create_index(
+            f"ix_{table}_timeline",
+            table,
+            [sa.literal_column(SPAN)],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_where=sa.text(DATED),
+        )
+    op.create_index("ix_tasks_due_date", "tasks", ["due_date"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_due_date", table_name="tasks")
+    op.drop_index("ix_projects_timeline", table_name="projects")
+    op.drop_index("ix_campaigns_timeline", table_name="campaigns")
+    op.drop_column("campaigns", "end_date")
+    op.drop_column("campaigns", "start_date")
@@ -0,0 +1,108 @@
+"""Index document metadata
+
+Revision ID: ccd6f3456846
+Revises: 2aac293979d0
+Create Date: 2026-10-19 13:49:37.034477
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ccd6f3456846"
+down_revision: str | Sequence[str] | None = "2aac293979d0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("documents", sa.Column("path", sa.String(length=1024), nullable=True))
+    op.execute("UPDATE documents SET path = filename")
+    op.alter_column("documents", "path", nullable=False)
+    op.add_column(
+        "documents",
+        sa.Column(
+            "tags",
+            sa.JSON().with_variant(
+                postgresql.JSONB(astext_type=sa.Text()), "postgresql"
+            ),
+            server_default="[]",
+            nullable=False,
+        ),
+    )
+    op.add_column("documents", sa.Column("uploaded_by_id", sa.Integer(), nullable=True))
+    op.alter_column(
+        "documents", "sha256", existing_type=sa.VARCHAR(length=64), nullable=True
+    )
+    op.drop_index(op.f("ix_documents_project_id"), table_name="documents")
+    op.create_index(
+        "ix_documents_created_at", "documents", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_documents_project_created_at",
+        "documents",
+        ["project_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_documents_project_path",
+        "documents",
+        ["project_id", "path"],
+        unique=False,
+        postgresql_ops={"path": "text_pattern_ops"},
+    )
+    op.create_index(
+        "ix_documents_project_type_created_at",
+        "documents",
+        ["project_id", "content_type", "created_at", "id"],
+        unique=False,
+    )
+    op.alter_column(
+        "documents",
+        "s3_key",
+        existing_type=sa.VARCHAR(length=512),
+        type_=sa.String(length=512, collation="C"),
+        existing_nullable=False,
+    )
+    op.create_index(
+        "ix_documents_tags", "documents", ["tags"], unique=False, postgresql_using="gin"
+    )
+    op.create_foreign_key(
+        "documents_uploaded_by_id_fkey",
+        "documents",
+        "users",
+        ["uploaded_by_id"],
+        ["id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("documents_uploaded_by_id_fkey", "documents", type_="foreignkey")
+    op.drop_index("ix_documents_tags", table_name="documents")
+    op.alter_column(
+        "documents",
+        "s3_key",
+        existing_type=sa.String(length=512, collation="C"),
+        type_=sa.VARCHAR(length=512),
+        existing_nullable=False,
+    )
+    op.drop_index("ix_documents_project_type_created_at", table_name="documents")
+    op.drop_index("ix_documents_project_path", table_name="documents")
+    op.drop_index("ix_documents_project_created_at", table_name="documents")
+    op.drop_index("ix_documents_created_at", table_name="documents")
+    op.create_index(
+        op.f("ix_documents_project_id"), "documents", ["project_id"], unique=False
+    )
+    op.alter_column(
+        "documents", "sha256", existing_type=sa.VARCHAR(length=64), nullable=False
+    )
+    op.drop_column("documents", "uploaded_by_id")
+    op.drop_column("documents", "tags")
+    op.drop_column("documents", "path")
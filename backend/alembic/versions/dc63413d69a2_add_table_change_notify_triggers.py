@@ -0,0 +1,61 @@
+"""Add change notification triggers to the core tables
+
+Revision ID: dc63413d69a2
+Revises: e863e6c69c25
+Create Date: 2026-10-19 15:20:37.104512
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "dc63413d69a2"
+down_revision: str | Sequence[str] | None = "e863e6c69c25"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = (
+    "projects",
+    "campaigns",
+    "items",
+    "quotes",
+    "tasks",
+    "craftsmen",
+    "clients",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_table_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'table_changes',
+                json_build_object(
+                    'table', TG_TABLE_NAME,
+                    'op', lower(TG_OP),
+                    'id', COALESCE(NEW.id, OLD.id)
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_change "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION notify_table_change()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.execute(f"DROP TRIGGER {table}_notify_change ON {table}")
+    op.execute("DROP FUNCTION notify_table_change()")
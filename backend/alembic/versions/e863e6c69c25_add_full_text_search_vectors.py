@@ -0,0 +1,63 @@
+"""Add full-text search vectors to messages and quotes
+
+Revision ID: e863e6c69c25
+Revises: be37009bc094
+Create Date: 2026-10-19 14:02:11.418305
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e863e6c69c25"
+down_revision: str | Sequence[str] | None = "be37009bc094"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_whatsapp_messages_sent_at",
+        "whatsapp_messages",
+        ["sent_at", "id"],
+        unique=False,
+    )
+    op.execute(
+        "ALTER TABLE whatsapp_messages ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('spanish'::regconfig, coalesce(body, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(body, '')), 'D')"
+        ") STORED"
+    )
+    op.execute(
+        "ALTER TABLE whatsapp_messages ALTER COLUMN search_vector SET STATISTICS 1000"
+    )
+    op.execute(
+        "CREATE INDEX ix_whatsapp_messages_search_vector ON whatsapp_messages "
+        "USING gin (search_vector)"
+    )
+    op.execute(
+        "ALTER TABLE quotes ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('spanish'::regconfig, coalesce(whatsapp_message, '')), 'A') || "
+        "setweight(to_tsvector('spanish'::regconfig, coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, "
+        "coalesce(whatsapp_message, '') || ' ' || coalesce(description, '')), 'D')"
+        ") STORED"
+    )
+    op.execute("ALTER TABLE quotes ALTER COLUMN search_vector SET STATISTICS 1000")
+    op.execute(
+        "CREATE INDEX ix_quotes_search_vector ON quotes USING gin (search_vector)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_quotes_search_vector", table_name="quotes")
+    op.drop_column("quotes", "search_vector")
+    op.drop_index("ix_whatsapp_messages_search_vector", table_name="whatsapp_messages")
+    op.drop_column("whatsapp_messages", "search_vector")
+    op.drop_index("ix_whatsapp_messages_sent_at", table_name="whatsapp_messages")
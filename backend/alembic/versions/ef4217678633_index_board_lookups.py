@@ -0,0 +1,39 @@
+"""Index the foreign keys kanban boards are read by
+
+Revision ID: ef4217678633
+Revises: 2a98fe74edd4
+Create Date: 2026-10-19 14:40:12.218374
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ef4217678633"
+down_revision: str | Sequence[str] | None = "2a98fe74edd4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_campaigns_project_id", "campaigns", ["project_id"], unique=False
+    )
+    op.create_index("ix_items_campaign_id", "items", ["campaign_id"], unique=False)
+    op.create_index(
+        "ix_quotes_item_status", "quotes", ["item_id", "status"], unique=False
+    )
+    op.create_index(
+        "ix_tasks_project_status", "tasks", ["project_id", "status"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_project_status", table_name="tasks")
+    op.drop_index("ix_quotes_item_status", table_name="quotes")
+    op.drop_index("ix_items_campaign_id", table_name="items")
+    op.drop_index("ix_campaigns_project_id", table_name="campaigns")
@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import select
+import threading
+from collections.abc import Iterable
+from typing import Protocol
+
+import psycopg2
+
+from ..models.notify import NOTIFY_CHANNEL
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidator(Protocol):
+    """An in-process cache that can drop one row or everything"""
+
+    def invalidate(self, table: str, id: int) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class InvalidationBus:
+    """Dispatch PostgreSQL change notifications to in-process caches.
+
+    A daemon thread keeps one LISTEN connection per process and hands every
+    notification to the invalidators registered for its table, so they run
+    on that thread and must be thread-safe. Notifications sent while the
+    connection is down are lost, so every (re)connect flushes all caches
+    once LISTEN is in place.
+
+    Notifications are handled a drained batch at a time. When a batch holds
+    more than ``burst_size`` rows of one table, as a bulk import produces,
+    that table's caches are flushed once instead of re-reading every row.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        channel: str = NOTIFY_CHANNEL,
+        health_check_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        burst_size: int = 100,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.health_check_interval = health_check_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.burst_size = burst_size
+        self.connected = threading.Event()
+        self._invalidators: dict[str, list[CacheInvalidator]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wakeup: tuple[int, int] | None = None
+        self._thread: threading.Thread | None = None
+
+    def register(self, invalidator: CacheInvalidator, tables: Iterable[str]) -> None:
+        """Send changes of the given tables to an invalidator"""
+        with self._lock:
+            for table in tables:
+                registered = self._invalidators.setdefault(table, [])
+                if invalidator not in registered:
+                    registered.append(invalidator)
+
+    def unregister(self, invalidator: CacheInvalidator) -> None:
+        """Stop sending changes to an invalidator"""
+        with self._lock:
+            for registered in self._invalidators.values():
+                if invalidator in registered:
+                    registered.remove(invalidator)
+
+    def dispatch(self, payload: str) -> None:
+        """Invalidate the row named by a notification payload"""
+        self.dispatch_many([payload])
+
+    def dispatch_many(self, payloads: Iterable[str]) -> None:
+        """Invalidate the rows named by a batch of notification payloads"""
+        changes: dict[str, dict[int, None]] = {}
+        for payload in payloads:
+            try:
+                change = json.loads(payload)
+                table, id = change["table"], int(change["id"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Ignoring malformed change notification %r", payload)
+                continue
+            changes.setdefault(table, {})[id] = None
+        for table, ids in changes.items():
+            with self._lock:
+                invalidators = list(self._invalidators.get(table, ()))
+            if len(ids) > self.burst_size:
+                logger.info("%d %s changes; flushing their caches", len(ids), table)
+                self._flush(invalidators)
+                continue
+            for invalidator in invalidators:
+                for id in ids:
+                    try:
+                        invalidator.invalidate(table, id)
+                    except Exception:
+                        logger.exception(
+                            "Cache invalidation failed for %s %s", table, id
+                        )
+
+    def flush(self) -> None:
+        """Empty every registered cache"""
+        with self._lock:
+            invalidators = [
+                invalidator
+                for registered in self._invalidators.values()
+                for invalidator in registered
+            ]
+        self._flush(invalidators)
+
+    def _flush(self, invalidators: list[CacheInvalidator]) -> None:
+        """Flush each invalidator once, however many tables it is registered for"""
+        unique = {id(invalidator): invalidator for invalidator in invalidators}
+        for invalidator in unique.values():
+            try:
+                invalidator.flush()
+            except Exception:
+                logger.exception("Cache flush failed for %r", invalidator)
+
+    def start(self) -> "InvalidationBus":
+        """Start listening in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._wakeup = os.pipe()
+        self._thread = threading.Thread(
+            target=self._run, name="invalidation-bus", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the listener thread and close its connection"""
+        if not self._thread:
+            return
+        self._stop.set()
+        os.write(self._wakeup[1], b"\0")
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            for fd in self._wakeup:
+                os.close(fd)
+        self._thread = self._wakeup = None
+
+    def _run(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                conn = psycopg2.connect(
+                    self.dsn, application_name="invalidation-bus", connect_timeout=5
+                )
+            except psycopg2.Error as exc:
+                logger.warning("Invalidation bus cannot connect: %s", exc)
+                self._stop.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+            delay = self.reconnect_delay
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                # Anything may have changed while we were not listening
+                self.flush()
+                self.connected.set()
+                self._listen(conn)
+            except psycopg2.Error as exc:
+                logger.warning("Invalidation bus lost its connection: %s", exc)
+            finally:
+                self.connected.clear()
+                conn.close()
+
+    def _listen(self, conn) -> None:
+        """Dispatch notifications until stopped or the connection drops"""
+        while not self._stop.is_set():
+            ready, _, _ = select.select(
+                [conn, self._wakeup[0]], [], [], self.health_check_interval
+            )
+            if not ready:
+                # Quiet for a while: make sure the server is still there
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            conn.poll()
+            if conn.notifies:
+                payloads = [notify.payload for notify in conn.notifies]
+                conn.notifies.clear()
+                self.dispatch_many(payloads)
+
+
+# Create instance
+invalidation_bus = InvalidationBus(settings.DATABASE_URL)
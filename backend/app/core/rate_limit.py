@@ -0,0 +1,45 @@
+import asyncio
+
+import redis.asyncio as aioredis
+
+# Refill and take one token atomically. Returns 0 when a token was taken,
+# otherwise the milliseconds until one becomes available. Redis' own clock
+# is used so every API process and worker shares the same bucket.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class TokenBucket:
+    """Distributed token bucket stored in Redis"""
+
+    def __init__(
+        self, redis: aioredis.Redis, key: str, *, rate: float, capacity: float
+    ):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        while wait_ms := await self._script(
+            keys=[self.key], args=[self.rate, self.capacity]
+        ):
+            await asyncio.sleep(wait_ms / 1000)
@@ -0,0 +1,22 @@
+import redis
+import redis.asyncio as aioredis
+from fastapi import Request
+
+from .config import settings
+
+# Shared synchronous client for services and workers; connections are pooled
+# and opened lazily on first use.
+redis_client = redis.from_url(settings.REDIS_URL)
+
+
+def create_async_redis() -> aioredis.Redis:
+    """Create the asyncio client owned by the application lifespan"""
+    return aioredis.from_url(settings.REDIS_URL)
+
+
+def get_async_redis(request: Request) -> aioredis.Redis:
+    """
+    Dependency to get the application's asyncio Redis client.
+    The client is bound to the running event loop, so it lives on app.state.
+    """
+    return request.app.state.redis
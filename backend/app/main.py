@@ -1,18 +1,60 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.redis import create_async_redis, redis_client
 from app.routers.v1 import (
+    analytics,
     campaigns,
     clients,
     craftsmen,
+    dashboard,
+    documents,
+    fx_rates,
     health,
+    imports,
     items,
+    pdfs,
     projects,
     quotes,
+    search,
+    stream,
     tasks,
+    timeline,
     users,
+    whatsapp,
 )
+from app.services.fx import fx_service
+from app.services.prediction import price_predictor
+from app.services.signed_urls import SignedURLService, create_signer
+from app.services.similarity import item_similarity_index
+from app.services.storage import create_storage
+from app.services.whatsapp import WhatsAppService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.redis = create_async_redis()
+    app.state.whatsapp = WhatsAppService(app.state.redis)
+    app.state.storage = create_storage()
+    app.state.signed_urls = SignedURLService(
+        create_signer(app.state.storage), redis_client
+    )
+    if settings.CACHE_INVALIDATION_ENABLED:
+        invalidation_bus.register(item_similarity_index, ["items"])
+        invalidation_bus.register(
+            price_predictor.estimates, ["quotes", "items", "fx_rates"]
+        )
+        invalidation_bus.register(fx_service.rates, ["fx_rates"])
+        invalidation_bus.start()
+    yield
+    invalidation_bus.stop()
+    await app.state.whatsapp.aclose()
+    await app.state.redis.aclose()
+
 
 app = FastAPI(
     title="StudioHub API",
@@ -20,6 +62,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -39,6 +82,16 @@ app.include_router(campaigns.router, prefix="/api/v1/campaigns")
 app.include_router(items.router, prefix="/api/v1/items")
 app.include_router(quotes.router, prefix="/api/v1/quotes")
 app.include_router(tasks.router, prefix="/api/v1/tasks")
+app.include_router(pdfs.router, prefix="/api/v1/pdfs")
+app.include_router(search.router, prefix="/api/v1/search")
+app.include_router(whatsapp.router, prefix="/api/v1/whatsapp")
+app.include_router(stream.router, prefix="/api/v1/stream")
+app.include_router(documents.router, prefix="/api/v1/documents")
+app.include_router(analytics.router, prefix="/api/v1/analytics")
+app.include_router(dashboard.router, prefix="/api/v1/dashboard")
+app.include_router(timeline.router, prefix="/api/v1/timeline")
+app.include_router(imports.router, prefix="/api/v1/imports")
+app.include_router(fx_rates.router, prefix="/api/v1/fx-rates")
 
 
 @app.get("/")
@@ -1,20 +1,30 @@
+from .anomaly import QuoteAnomaly, QuotePriceStats
 from .campaign import Campaign
+from .checkpoint import JobCheckpoint
 from .client import Client
 from .craftsman import Craftsman
+from .craftsman_score import CraftsmanScore
+from .document import Document
 from .enums import (
     CampaignStatus,
     Currency,
+    MessageDirection,
+    MessageStatus,
     ProjectStatus,
     QuoteStatus,
     TaskPriority,
     TaskStatus,
     Unit,
 )
+from .fx_rate import FxRate
 from .item import Item
+from .kpi import KpiDaily, KpiMonthly
 from .project import Project
 from .quote import Quote
+from .status_history import StatusCurrent, StatusDurationRollup, StatusHistory
 from .task import Task
 from .user import User
+from .whatsapp_message import WhatsAppMessage
 
 __all__ = [
     "User",
@@ -25,6 +35,18 @@ __all__ = [
     "Item",
     "Quote",
     "Task",
+    "WhatsAppMessage",
+    "Document",
+    "StatusHistory",
+    "StatusCurrent",
+    "StatusDurationRollup",
+    "JobCheckpoint",
+    "CraftsmanScore",
+    "QuotePriceStats",
+    "QuoteAnomaly",
+    "KpiDaily",
+    "KpiMonthly",
+    "FxRate",
     "ProjectStatus",
     "CampaignStatus",
     "QuoteStatus",
@@ -32,4 +54,6 @@ __all__ = [
     "TaskStatus",
     "TaskPriority",
     "Unit",
+    "MessageDirection",
+    "MessageStatus",
 ]
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Double, Enum, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+from .craftsman_score import SPECIALTY_LENGTH
+from .enums import Unit
+
+
+class QuotePriceStats(Base):
+    """Robust price statistics of recent quotes per specialty and unit.
+
+    Prices are log unit prices in the base currency, so the median and the
+    median absolute deviation (MAD) describe relative spread.
+    """
+
+    __tablename__ = "quote_price_stats"
+
+    specialty: Mapped[str] = mapped_column(String(SPECIALTY_LENGTH), primary_key=True)
+    unit: Mapped[Unit] = mapped_column(Enum(Unit), primary_key=True)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False)
+    median: Mapped[float] = mapped_column(Double, nullable=False)
+    mad: Mapped[float] = mapped_column(Double, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<QuotePriceStats(specialty='{self.specialty}', unit='{self.unit}', samples={self.samples})>"
+
+
+class QuoteAnomaly(Base):
+    """A quote priced far from its specialty and unit's usual range"""
+
+    __tablename__ = "quote_anomalies"
+    __table_args__ = (
+        Index("ix_quote_anomalies_detected_at", "detected_at", "quote_id"),
+        Index("ix_quote_anomalies_specialty_unit", "specialty", "unit"),
+    )
+
+    quote_id: Mapped[int] = mapped_column(
+        ForeignKey("quotes.id", ondelete="CASCADE"), primary_key=True
+    )
+    specialty: Mapped[str] = mapped_column(String(SPECIALTY_LENGTH), nullable=False)
+    unit: Mapped[Unit] = mapped_column(Enum(Unit), nullable=False)
+    # Unit prices in the base currency
+    unit_price: Mapped[float] = mapped_column(Double, nullable=False)
+    typical_unit_price: Mapped[float] = mapped_column(Double, nullable=False)
+    # Robust z-score: positive when overpriced, negative when underpriced
+    score: Mapped[float] = mapped_column(Double, nullable=False)
+    detected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    quote = relationship("Quote")
+
+    def __repr__(self) -> str:
+        return f"<QuoteAnomaly(quote_id={self.quote_id}, score={self.score})>"
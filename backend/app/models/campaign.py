@@ -1,18 +1,26 @@
-from sqlalchemy import Enum, ForeignKey, String, Text
+from datetime import date
+
+from sqlalchemy import Date, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
 from .enums import CampaignStatus
+from .notify import add_change_notify
+from .status_history import add_status_history
+from .timeline import add_timeline_index
 
 
 class Campaign(BaseModel):
     __tablename__ = "campaigns"
+    __table_args__ = (Index("ix_campaigns_project_id", "project_id"),)
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[CampaignStatus] = mapped_column(
         Enum(CampaignStatus), nullable=False, default=CampaignStatus.ACTIVE
     )
+    start_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    end_date: Mapped[date | None] = mapped_column(Date, nullable=True)
 
     # Foreign Keys
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -25,3 +33,8 @@ class Campaign(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Campaign(id={self.id}, name='{self.name}', status='{self.status}')>"
+
+
+add_change_notify(Campaign.__table__)
+add_status_history(Campaign.__table__)
+add_timeline_index(Campaign.__table__, Campaign.start_date, Campaign.end_date)
@@ -0,0 +1,25 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class JobCheckpoint(Base):
+    """How far an incremental periodic job has got"""
+
+    __tablename__ = "job_checkpoints"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # Everything before the watermark has been processed
+    watermark: Mapped[date] = mapped_column(Date, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<JobCheckpoint(name='{self.name}', watermark={self.watermark})>"
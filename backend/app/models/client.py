@@ -2,6 +2,7 @@ from sqlalchemy import String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
+from .notify import add_change_notify
 
 
 class Client(BaseModel):
@@ -20,3 +21,6 @@ class Client(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Client(id={self.id}, name='{self.name}', email='{self.email}')>"
+
+
+add_change_notify(Client.__table__)
@@ -2,6 +2,7 @@ from sqlalchemy import Boolean, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
+from .notify import add_change_notify
 
 
 class Craftsman(BaseModel):
@@ -21,3 +22,6 @@ class Craftsman(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Craftsman(id={self.id}, name='{self.name}', specialties='{self.specialties}')>"
+
+
+add_change_notify(Craftsman.__table__)
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    Double,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+# Longest specialty kept; longer first specialties are cut to fit
+SPECIALTY_LENGTH = 100
+
+
+class CraftsmanScore(Base):
+    """Reliability of a craftsman, recomputed in batch from their quotes"""
+
+    __tablename__ = "craftsman_scores"
+    __table_args__ = (
+        # Listing craftsmen by reliability is a read of this index
+        Index("ix_craftsman_scores_reliability", "reliability", "craftsman_id"),
+        Index(
+            "ix_craftsman_scores_specialty_reliability",
+            "specialty",
+            "reliability",
+            "craftsman_id",
+        ),
+    )
+
+    craftsman_id: Mapped[int] = mapped_column(
+        ForeignKey("craftsmen.id", ondelete="CASCADE"), primary_key=True
+    )
+    # First specialty listed, lower-cased; peers are compared within it
+    specialty: Mapped[str] = mapped_column(String(SPECIALTY_LENGTH), nullable=False)
+    quotes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    approved: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rejected: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    expired: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Shares of the decided (approved, rejected or expired) quotes
+    approval_rate: Mapped[float | None] = mapped_column(Double, nullable=True)
+    expiry_rate: Mapped[float | None] = mapped_column(Double, nullable=True)
+    # Median time from a WhatsApp quote request to the quote
+    turnaround_seconds: Mapped[float | None] = mapped_column(Double, nullable=True)
+    # Mean log ratio of their price to the median quote of the same item
+    price_deviation: Mapped[float | None] = mapped_column(Double, nullable=True)
+    # Standard deviations from specialty peers' price deviation
+    price_deviation_z: Mapped[float | None] = mapped_column(Double, nullable=True)
+    reliability: Mapped[float] = mapped_column(Double, nullable=False, default=0)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    craftsman = relationship("Craftsman")
+
+    def __repr__(self) -> str:
+        return f"<CraftsmanScore(craftsman_id={self.craftsman_id}, reliability={self.reliability})>"
@@ -0,0 +1,71 @@
+from sqlalchemy import JSON, BigInteger, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import BaseModel
+
+
+class Document(BaseModel):
+    __tablename__ = "documents"
+    __table_args__ = (
+        # Keyset pagination, newest first, with the usual filters in front
+        Index("ix_documents_created_at", "created_at", "id"),
+        Index("ix_documents_project_created_at", "project_id", "created_at", "id"),
+        Index(
+            "ix_documents_project_type_created_at",
+            "project_id",
+            "content_type",
+            "created_at",
+            "id",
+        ),
+        # Folder browsing with LIKE 'prefix%'
+        Index(
+            "ix_documents_project_path",
+            "project_id",
+            "path",
+            postgresql_ops={"path": "text_pattern_ops"},
+        ),
+        Index("ix_documents_tags", "tags", postgresql_using="gin"),
+        Index("ix_documents_campaign_id", "campaign_id"),
+        Index("ix_documents_item_id", "item_id"),
+    )
+
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Folder path within the project, e.g. "cad/entrega/Planos/planta.dwg"
+    path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(127), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Unknown for objects found by bucket reconciliation
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Byte-wise collation so keys sort the way S3 lists them (reconciliation)
+    s3_key: Mapped[str] = mapped_column(
+        String(512).with_variant(String(512, collation="C"), "postgresql"),
+        unique=True,
+        nullable=False,
+    )
+    etag: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    tags: Mapped[list[str]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=False,
+        default=list,
+        server_default="[]",
+    )
+
+    # Foreign Keys
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    campaign_id: Mapped[int | None] = mapped_column(
+        ForeignKey("campaigns.id"), nullable=True
+    )
+    item_id: Mapped[int | None] = mapped_column(ForeignKey("items.id"), nullable=True)
+    uploaded_by_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id"), nullable=True
+    )
+
+    # Relationships
+    project = relationship("Project")
+    campaign = relationship("Campaign")
+    item = relationship("Item")
+    uploaded_by = relationship("User")
+
+    def __repr__(self) -> str:
+        return f"<Document(id={self.id}, filename='{self.filename}', size={self.size})>"
@@ -50,3 +50,16 @@ class Unit(StrEnum):
     LINEAR_METER = "linear meter"
     KILOGRAM = "kilogram"
     CUBIC_METER = "cubic meter"
+
+
+class MessageDirection(StrEnum):
+    INBOUND = "inbound"
+    OUTBOUND = "outbound"
+
+
+class MessageStatus(StrEnum):
+    RECEIVED = "received"
+    SENT = "sent"
+    DELIVERED = "delivered"
+    READ = "read"
+    FAILED = "failed"
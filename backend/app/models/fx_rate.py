@@ -0,0 +1,36 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Enum, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+from .enums import Currency
+from .notify import add_change_notify
+
+
+class FxRate(BaseModel):
+    """Exchange rate of a currency to the base currency from a given day on.
+
+    A rate stays in force until the next one of the same currency; prices
+    are converted at the rate in force on the day they were quoted.
+    """
+
+    __tablename__ = "fx_rates"
+    # Also serves the "latest rate on or before a day" lookups
+    __table_args__ = (
+        UniqueConstraint(
+            "currency", "valid_from", name="uq_fx_rates_currency_valid_from"
+        ),
+    )
+
+    currency: Mapped[Currency] = mapped_column(Enum(Currency), nullable=False)
+    valid_from: Mapped[date] = mapped_column(Date, nullable=False)
+    # Base currency units per unit of ``currency``
+    rate: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<FxRate({self.currency} {self.rate} from {self.valid_from})>"
+
+
+add_change_notify(FxRate.__table__)
@@ -1,12 +1,14 @@
-from sqlalchemy import Enum, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Enum, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
 from .enums import Unit
+from .notify import add_change_notify
 
 
 class Item(BaseModel):
     __tablename__ = "items"
+    __table_args__ = (Index("ix_items_campaign_id", "campaign_id"),)
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -23,3 +25,6 @@ class Item(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Item(id={self.id}, name='{self.name}', quantity={self.quantity}, unit='{self.unit}')>"
+
+
+add_change_notify(Item.__table__)
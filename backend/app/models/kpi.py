@@ -0,0 +1,54 @@
+"""
+Dashboard KPIs rolled up per day and per month.
+
+Both tables are written only by the rollup job in
+``app.services.dashboard``; dashboard reads never touch ``quotes`` or
+``projects``. Quotes count as revenue on the (UTC) day they were approved,
+priced in the base currency with their studio margin applied.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, Numeric, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class KpiColumns:
+    """Measures shared by the daily and monthly rollups"""
+
+    quotes_received: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    quotes_approved: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Craftsman prices of the approved quotes, and what the client pays
+    cost: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    projects_started: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    projects_completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Active projects when the period was last rolled up
+    projects_active: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class KpiDaily(KpiColumns, Base):
+    __tablename__ = "kpi_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"<KpiDaily(day={self.day}, revenue={self.revenue})>"
+
+
+class KpiMonthly(KpiColumns, Base):
+    __tablename__ = "kpi_monthly"
+
+    # First day of the month
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"<KpiMonthly(month={self.month}, revenue={self.revenue})>"
@@ -0,0 +1,46 @@
+"""
+Change notifications raised by PostgreSQL triggers.
+
+Core tables get a row trigger that sends ``{"table", "op", "id"}`` as JSON
+on the ``table_changes`` channel after every insert, update and delete.
+Notifications are delivered on commit to every listening connection, so
+in-process caches hear about writes made by other workers, migrations and
+admin scripts alike (see ``app.core.invalidation``).
+"""
+
+from sqlalchemy import DDL, Table, event
+
+NOTIFY_CHANNEL = "table_changes"
+
+NOTIFY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_table_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        '{NOTIFY_CHANNEL}',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', lower(TG_OP),
+            'id', COALESCE(NEW.id, OLD.id)
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def notify_trigger_ddl(table_name: str) -> str:
+    """Statement attaching the change trigger to a table"""
+    return (
+        f"CREATE TRIGGER {table_name}_notify_change "
+        f"AFTER INSERT OR UPDATE OR DELETE ON {table_name} "
+        f"FOR EACH ROW EXECUTE FUNCTION notify_table_change()"
+    )
+
+
+def add_change_notify(table: Table) -> None:
+    """Create the change trigger whenever the table is created on PostgreSQL"""
+    for statement in (NOTIFY_FUNCTION, notify_trigger_ddl(table.name)):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
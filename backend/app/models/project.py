@@ -5,6 +5,9 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
 from .enums import ProjectStatus
+from .notify import add_change_notify
+from .status_history import add_status_history
+from .timeline import add_timeline_index
 
 
 class Project(BaseModel):
@@ -33,3 +36,8 @@ class Project(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Project(id={self.id}, name='{self.name}', status='{self.status}')>"
+
+
+add_change_notify(Project.__table__)
+add_status_history(Project.__table__)
+add_timeline_index(Project.__table__, Project.start_date, Project.end_date)
@@ -1,14 +1,30 @@
 from datetime import date
 
-from sqlalchemy import Date, Enum, ForeignKey, Numeric, Text
+from sqlalchemy import Date, Enum, ForeignKey, Index, Numeric, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
 from .enums import Currency, QuoteStatus
+from .notify import add_change_notify
+from .search import add_search_vector
+from .status_history import add_status_history
 
 
 class Quote(BaseModel):
     __tablename__ = "quotes"
+    __table_args__ = (
+        Index("ix_quotes_item_status", "item_id", "status"),
+        Index("ix_quotes_craftsman_status", "craftsman_id", "status"),
+        # Incremental jobs pick up the quotes changed since their last run
+        Index("ix_quotes_created_at", "created_at"),
+        Index("ix_quotes_updated_at", "updated_at"),
+        # The expiry sweep only ever looks at pending quotes
+        Index(
+            "ix_quotes_pending_valid_until",
+            "valid_until",
+            postgresql_where=text("status = 'PENDING' AND valid_until IS NOT NULL"),
+        ),
+    )
 
     price: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     currency: Mapped[Currency] = mapped_column(
@@ -36,3 +52,8 @@ class Quote(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Quote(id={self.id}, price={self.price} {self.currency}, status='{self.status}')>"
+
+
+add_search_vector(Quote.__table__, {"whatsapp_message": "A", "description": "B"})
+add_change_notify(Quote.__table__)
+add_status_history(Quote.__table__)
@@ -0,0 +1,63 @@
+"""
+Full-text search vectors maintained by PostgreSQL.
+
+Each searchable table gets a generated ``search_vector`` tsvector column and
+a GIN index. They are created with DDL instead of being mapped, so the
+model tests that build the schema on SQLite keep working; queries reach the
+column through ``search_vector()``.
+
+Text is indexed twice: with the Spanish stemmer and with the ``simple``
+configuration. The simple half keeps Catalan words, names and references
+searchable exactly as written (PostgreSQL 15 ships no Catalan stemmer).
+"""
+
+from sqlalchemy import DDL, Table, event, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.sql.elements import ColumnElement
+
+SEARCH_CONFIGS = ("spanish", "simple")
+
+
+def search_document(columns: dict[str, str]) -> str:
+    """SQL building the weighted tsvector of ``{column: weight}``"""
+    parts = [
+        f"setweight(to_tsvector('spanish'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in columns.items()
+    ]
+    simple = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+    parts.append(f"setweight(to_tsvector('simple'::regconfig, {simple}), 'D')")
+    return " || ".join(parts)
+
+
+def search_vector_ddl(table_name: str, columns: dict[str, str]) -> list[str]:
+    """Statements adding the generated search column and its GIN index"""
+    return [
+        f"ALTER TABLE {table_name} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({search_document(columns)}) STORED",
+        # A longer lexeme list in the statistics keeps row estimates for
+        # rare words realistic, so the planner uses the GIN index for them
+        f"ALTER TABLE {table_name} ALTER COLUMN search_vector SET STATISTICS 1000",
+        f"CREATE INDEX ix_{table_name}_search_vector ON {table_name} "
+        f"USING gin (search_vector)",
+    ]
+
+
+def add_search_vector(table: Table, columns: dict[str, str]) -> None:
+    """Create the search column whenever the table is created on PostgreSQL"""
+    for statement in search_vector_ddl(table.name, columns):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+
+def search_vector(table: Table) -> ColumnElement:
+    """Reference to a table's generated search column"""
+    return literal_column(f"{table.name}.search_vector", type_=TSVECTOR)
+
+
+def search_query(text: str) -> ColumnElement:
+    """Web-style query matching either the stemmed or the exact words"""
+    spanish, simple = (
+        func.websearch_to_tsquery(config, text) for config in SEARCH_CONFIGS
+    )
+    return spanish.op("||")(simple)
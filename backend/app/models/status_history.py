@@ -0,0 +1,168 @@
+"""
+Status history recorded by PostgreSQL triggers.
+
+Projects, campaigns, quotes and tasks get a row trigger that appends a
+``status_history`` row whenever a row is inserted or its status changes, in
+the same transaction as the write, whichever code path made it. The
+history is append-only and range-partitioned by month on ``changed_at``, so
+recent activity is read from small partitions and old months can be
+detached or dropped whole.
+
+The trigger also keeps ``status_current`` (the status of every row and
+since when), which makes each history row carry how long the previous
+status lasted without looking back through the history. Durations are
+rolled up per day into ``status_duration_rollups`` by a periodic job
+(``app.services.status_history``); analytics read only those two small
+tables.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Date,
+    DateTime,
+    Double,
+    Identity,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Table,
+    event,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+RECORD_FUNCTION = """
+CREATE OR REPLACE FUNCTION record_status_change() RETURNS trigger AS $$
+DECLARE
+    entered timestamptz;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM status_current
+        WHERE entity = TG_TABLE_NAME AND entity_id = OLD.id;
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'UPDATE' AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+        RETURN NULL;
+    END IF;
+    SELECT since INTO entered FROM status_current
+    WHERE entity = TG_TABLE_NAME AND entity_id = NEW.id
+    FOR UPDATE;
+    INSERT INTO status_history
+        (entity, entity_id, from_status, to_status, entered_at, changed_at)
+    VALUES (
+        TG_TABLE_NAME,
+        NEW.id,
+        CASE WHEN TG_OP = 'UPDATE' THEN OLD.status::text END,
+        NEW.status::text,
+        entered,
+        now()
+    );
+    INSERT INTO status_current (entity, entity_id, status, since)
+    VALUES (TG_TABLE_NAME, NEW.id, NEW.status::text, now())
+    ON CONFLICT (entity, entity_id)
+    DO UPDATE SET status = EXCLUDED.status, since = EXCLUDED.since;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+APPEND_ONLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION forbid_status_history_change() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'status_history is append-only';
+END;
+$$ LANGUAGE plpgsql
+"""
+
+HISTORY_DDL = (
+    APPEND_ONLY_FUNCTION,
+    "CREATE TRIGGER status_history_append_only "
+    "BEFORE UPDATE OR DELETE ON status_history "
+    "FOR EACH STATEMENT EXECUTE FUNCTION forbid_status_history_change()",
+    # Catches rows no monthly partition has been created for yet
+    "CREATE TABLE status_history_default PARTITION OF status_history DEFAULT",
+)
+
+
+def status_trigger_ddl(table_name: str) -> str:
+    """Statement attaching the history trigger to a table"""
+    return (
+        f"CREATE TRIGGER {table_name}_record_status "
+        f"AFTER INSERT OR UPDATE OF status OR DELETE ON {table_name} "
+        f"FOR EACH ROW EXECUTE FUNCTION record_status_change()"
+    )
+
+
+def add_status_history(table: Table) -> None:
+    """Create the history trigger whenever the table is created on PostgreSQL"""
+    for statement in (RECORD_FUNCTION, status_trigger_ddl(table.name)):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+
+class StatusHistory(Base):
+    __tablename__ = "status_history"
+    __table_args__ = (
+        Index(
+            "ix_status_history_entity_changed_at", "entity", "entity_id", "changed_at"
+        ),
+        Index("ix_status_history_changed_at", "changed_at"),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
+
+    # The partition key has to be part of the primary key
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+    entity: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    from_status: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    to_status: Mapped[str] = mapped_column(String(32), nullable=False)
+    # When from_status began, so the row knows how long it lasted
+    entered_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<StatusHistory({self.entity} {self.entity_id}: {self.from_status} -> {self.to_status})>"
+
+
+class StatusCurrent(Base):
+    __tablename__ = "status_current"
+    __table_args__ = (
+        Index("ix_status_current_entity_status_since", "entity", "status", "since"),
+    )
+
+    entity: Mapped[str] = mapped_column(String(32), primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    since: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class StatusDurationRollup(Base):
+    __tablename__ = "status_duration_rollups"
+
+    entity: Mapped[str] = mapped_column(String(32), primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # Day the status was left
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Log-scale duration bucket, see app.services.status_history
+    bucket: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    transitions: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_seconds: Mapped[float] = mapped_column(Double, nullable=False)
+
+
+for statement in HISTORY_DDL:
+    event.listen(
+        StatusHistory.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
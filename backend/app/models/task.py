@@ -1,14 +1,38 @@
 from datetime import date
 
-from sqlalchemy import Date, Enum, ForeignKey, String, Text
+from sqlalchemy import Date, Enum, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
 from .enums import TaskPriority, TaskStatus
+from .notify import add_change_notify
+from .status_history import add_status_history
 
 
 class Task(BaseModel):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_status", "project_id", "status"),
+        # Tasks sit on the timeline at their due date
+        Index("ix_tasks_due_date", "due_date"),
+        # Deadline sweeps walk only the open tasks, in due date order
+        Index(
+            "ix_tasks_open_due_date",
+            "due_date",
+            "id",
+            postgresql_where=text(
+                "status IN ('TODO', 'IN_PROGRESS') AND due_date IS NOT NULL"
+            ),
+        ),
+        # ... and the open tasks changed since the previous sweep
+        Index(
+            "ix_tasks_open_changed_at",
+            text("coalesce(updated_at, created_at)"),
+            postgresql_where=text(
+                "status IN ('TODO', 'IN_PROGRESS') AND due_date IS NOT NULL"
+            ),
+        ),
+    )
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -32,3 +56,7 @@ class Task(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}', priority='{self.priority}')>"
+
+
+add_change_notify(Task.__table__)
+add_status_history(Task.__table__)
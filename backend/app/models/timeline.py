@@ -0,0 +1,48 @@
+"""
+Date spans for the timeline view.
+
+Projects and campaigns get a GiST index over ``daterange(start, end, '[]')``
+so "what intersects this window" is answered with the ``&&`` operator from
+the index, whatever the zoom level. Queries must build the range with
+``date_span()`` so the planner recognises the indexed expression. Like the
+search vectors, the indexes are created with DDL because Alembic cannot
+compare expression indexes.
+"""
+
+from sqlalchemy import DDL, Column, Table, case, event, func, literal_column, or_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import DATERANGE
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def date_span(start: Column, end: Column) -> ColumnElement:
+    """Inclusive range of two date columns; a missing bound is open-ended"""
+    # An end before the start would make daterange() fail the whole write
+    end = case((end < start, start), else_=end)
+    return func.daterange(start, end, literal_column("'[]'"), type_=DATERANGE)
+
+
+def is_dated(start: Column, end: Column) -> ColumnElement:
+    """Rows with no dates at all stay off the timeline"""
+    return or_(start.is_not(None), end.is_not(None))
+
+
+def timeline_index_ddl(table: Table, start: Column, end: Column) -> str:
+    """Statement creating the GiST index over the span of dated rows"""
+    dialect = postgresql.dialect()
+    compile_kwargs = {"literal_binds": True, "include_table": False}
+    span = date_span(start, end).compile(dialect=dialect, compile_kwargs=compile_kwargs)
+    dated = is_dated(start, end).compile(dialect=dialect, compile_kwargs=compile_kwargs)
+    return (
+        f"CREATE INDEX ix_{table.name}_timeline ON {table.name} "
+        f"USING gist ({span}) WHERE {dated}"
+    )
+
+
+def add_timeline_index(table: Table, start: Column, end: Column) -> None:
+    """Create the timeline index whenever the table is created on PostgreSQL"""
+    event.listen(
+        table,
+        "after_create",
+        DDL(timeline_index_ddl(table, start, end)).execute_if(dialect="postgresql"),
+    )
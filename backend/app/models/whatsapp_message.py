@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import BaseModel
+from .enums import MessageDirection, MessageStatus
+from .search import add_search_vector
+
+
+class WhatsAppMessage(BaseModel):
+    __tablename__ = "whatsapp_messages"
+    __table_args__ = (
+        Index("ix_whatsapp_messages_sent_at", "sent_at", "id"),
+        Index("ix_whatsapp_messages_phone_sent_at", "phone", "sent_at"),
+        Index("ix_whatsapp_messages_craftsman_sent_at", "craftsman_id", "sent_at"),
+    )
+
+    wa_message_id: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)
+    direction: Mapped[MessageDirection] = mapped_column(
+        Enum(MessageDirection), nullable=False
+    )
+    phone: Mapped[str] = mapped_column(String(20), nullable=False)
+    message_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[MessageStatus] = mapped_column(
+        Enum(MessageStatus), nullable=False, default=MessageStatus.RECEIVED
+    )
+    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    status_updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    raw: Mapped[dict | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=True
+    )
+
+    # Foreign Keys
+    craftsman_id: Mapped[int | None] = mapped_column(
+        ForeignKey("craftsmen.id"), nullable=True
+    )
+    project_id: Mapped[int | None] = mapped_column(
+        ForeignKey("projects.id"), nullable=True
+    )
+
+    # Relationships
+    craftsman = relationship("Craftsman")
+    project = relationship("Project")
+
+    def __repr__(self) -> str:
+        return f"<WhatsAppMessage(id={self.id}, wa_message_id='{self.wa_message_id}', direction='{self.direction}')>"
+
+
+add_search_vector(WhatsAppMessage.__table__, {"body": "A"})
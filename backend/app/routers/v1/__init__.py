@@ -1,15 +1,25 @@
 """API v1 routers"""
 
 from . import (
+    analytics,
     campaigns,
     clients,
     craftsmen,
+    dashboard,
+    documents,
+    fx_rates,
     health,
+    imports,
     items,
+    pdfs,
     projects,
     quotes,
+    search,
+    stream,
     tasks,
+    timeline,
     users,
+    whatsapp,
 )
 
 __all__ = [
@@ -22,4 +32,14 @@ __all__ = [
     "items",
     "quotes",
     "tasks",
+    "pdfs",
+    "whatsapp",
+    "search",
+    "stream",
+    "documents",
+    "analytics",
+    "dashboard",
+    "timeline",
+    "imports",
+    "fx_rates",
 ]
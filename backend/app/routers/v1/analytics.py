@@ -0,0 +1,48 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...schemas.analytics import Bottleneck, StatusChange, StatusTime
+from ...services.status_history import Entity, status_history_service
+
+router = APIRouter(tags=["analytics"])
+
+
+@router.get("/status-times", response_model=list[StatusTime])
+def read_status_times(
+    *,
+    db: Session = Depends(get_db),
+    entity: Entity | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[StatusTime]:
+    """
+    Average and p90 time spent in each status.
+
+    Read from daily rollups refreshed every few minutes, so statuses left
+    in the last minutes may not be counted yet.
+    """
+    return status_history_service.time_in_status(
+        db, entity=entity, date_from=date_from, date_to=date_to
+    )
+
+
+@router.get("/bottlenecks", response_model=list[Bottleneck])
+def read_bottlenecks(
+    *,
+    db: Session = Depends(get_db),
+    entity: Entity | None = None,
+    limit: int = Query(20, ge=1, le=200),
+) -> list[Bottleneck]:
+    """Projects, campaigns, quotes and tasks waiting longest in an open status"""
+    return status_history_service.bottlenecks(db, entity=entity, limit=limit)
+
+
+@router.get("/status-history/{entity}/{entity_id}", response_model=list[StatusChange])
+def read_status_history(
+    *, db: Session = Depends(get_db), entity: Entity, entity_id: int
+) -> list[StatusChange]:
+    """Every status change of a project, campaign, quote or task"""
+    return status_history_service.history(db, entity=entity, entity_id=entity_id)
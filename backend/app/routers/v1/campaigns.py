@@ -2,9 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
-from ...models.enums import CampaignStatus
+from ...models.enums import CampaignStatus, Currency
 from ...schemas.campaign import CampaignCreate, CampaignResponse, CampaignUpdate
+from ...schemas.quote import CampaignQuoteComparison
 from ...services.campaign import campaign_service
+from ...services.quote import quote_service
 
 router = APIRouter(tags=["campaigns"])
 
@@ -29,6 +31,23 @@ def read_campaign(
     return campaign
 
 
+@router.get("/{campaign_id}/quote-comparison", response_model=CampaignQuoteComparison)
+def read_campaign_quote_comparison(
+    *,
+    db: Session = Depends(get_db),
+    campaign_id: int,
+    include_closed: bool = False,
+    currency: Currency | None = None,
+) -> CampaignQuoteComparison:
+    """Compare quotes for every item of a campaign"""
+    campaign = campaign_service.get(db=db, id=campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return quote_service.get_campaign_comparison(
+        db, campaign_id=campaign_id, include_closed=include_closed, currency=currency
+    )
+
+
 @router.put("/{campaign_id}", response_model=CampaignResponse)
 def update_campaign(
     *, db: Session = Depends(get_db), campaign_id: int, campaign_in: CampaignUpdate
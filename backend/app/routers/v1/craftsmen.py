@@ -2,8 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
-from ...schemas.craftsman import CraftsmanCreate, CraftsmanResponse, CraftsmanUpdate
+from ...schemas.craftsman import (
+    CraftsmanCreate,
+    CraftsmanReliability,
+    CraftsmanResponse,
+    CraftsmanUpdate,
+    ReliabilityRefresh,
+)
 from ...services.craftsman import craftsman_service
+from ...services.reliability import reliability_service
 
 router = APIRouter(tags=["craftsmen"])
 
@@ -17,6 +24,36 @@ def create_craftsman(
     return craftsman
 
 
+@router.get("/reliability", response_model=list[CraftsmanReliability])
+def read_craftsmen_by_reliability(
+    db: Session = Depends(get_db),
+    specialty: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> list[CraftsmanReliability]:
+    """Get scored craftsmen, most reliable first"""
+    return reliability_service.ranked(db, specialty=specialty, skip=skip, limit=limit)
+
+
+@router.post("/reliability/refresh", response_model=ReliabilityRefresh)
+def refresh_reliability(
+    db: Session = Depends(get_db), full: bool = False
+) -> ReliabilityRefresh:
+    """Rescore the craftsmen whose quotes changed since the last run"""
+    return ReliabilityRefresh(rescored=reliability_service.refresh(db, full=full))
+
+
+@router.get("/{craftsman_id}/reliability", response_model=CraftsmanReliability)
+def read_craftsman_reliability(
+    *, db: Session = Depends(get_db), craftsman_id: int
+) -> CraftsmanReliability:
+    """Get a craftsman's reliability score"""
+    score = reliability_service.calculate_reliability(db, craftsman_id)
+    if not score:
+        raise HTTPException(status_code=404, detail="Craftsman not found")
+    return score
+
+
 @router.get("/{craftsman_id}", response_model=CraftsmanResponse)
 def read_craftsman(
     *, db: Session = Depends(get_db), craftsman_id: int
@@ -0,0 +1,56 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...models.enums import Currency
+from ...schemas.dashboard import DashboardMetrics, KpiPeriod, PeriodComparison
+from ...services.dashboard import Granularity, Period, dashboard_service
+
+router = APIRouter(tags=["dashboard"])
+
+
+@router.get("/", response_model=DashboardMetrics)
+def read_dashboard(
+    *, db: Session = Depends(get_db), currency: Currency | None = None
+) -> DashboardMetrics:
+    """
+    This month's revenue, profit and margin, projects in progress and the
+    worst bottlenecks.
+
+    Read from rollups refreshed every few minutes, so the latest approvals
+    may not be counted yet.
+    """
+    return dashboard_service.metrics(db, currency=currency)
+
+
+@router.get("/history", response_model=list[KpiPeriod])
+def read_dashboard_history(
+    *,
+    db: Session = Depends(get_db),
+    granularity: Granularity = "month",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    currency: Currency | None = None,
+) -> list[KpiPeriod]:
+    """KPIs of every day or month in a date range"""
+    return dashboard_service.history(
+        db,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+        currency=currency,
+    )
+
+
+@router.get("/compare", response_model=PeriodComparison)
+def read_period_comparison(
+    *,
+    db: Session = Depends(get_db),
+    period: Period = "quarter",
+    on: date | None = None,
+    currency: Currency | None = None,
+) -> PeriodComparison:
+    """KPIs of the month, quarter or year containing a date against the one before"""
+    return dashboard_service.compare(db, period=period, on=on, currency=currency)
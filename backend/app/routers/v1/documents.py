@@ -0,0 +1,294 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ...core.database import get_db
+from ...models.campaign import Campaign
+from ...models.document import Document
+from ...models.item import Item
+from ...models.project import Project
+from ...schemas.document import (
+    BundleExtractionResponse,
+    DocumentBase,
+    DocumentCreate,
+    DocumentResponse,
+    DocumentSearchResults,
+)
+from ...services.bundle import is_bundle
+from ...services.document import document_key, document_path, document_service
+from ...services.signed_urls import (
+    LocalURLSigner,
+    SignedURLService,
+    get_signed_url_service,
+)
+from ...services.storage import (
+    LocalStorageService,
+    StorageService,
+    UploadTooLargeError,
+    get_storage_service,
+)
+from ...workers.bundle import extract_bundle
+from ...workers.celery_app import celery_app
+
+router = APIRouter(tags=["documents"])
+
+
+def check_owner(
+    db: Session, project_id: int, campaign_id: int | None, item_id: int | None
+) -> None:
+    """Make sure the project, campaign and item exist and belong together"""
+    if not db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    if campaign_id is not None:
+        campaign = db.get(Campaign, campaign_id)
+        if not campaign:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        if campaign.project_id != project_id:
+            raise HTTPException(
+                status_code=400, detail="Campaign does not belong to the project"
+            )
+    if item_id is not None:
+        item = db.get(Item, item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        if item.campaign.project_id != project_id or (
+            campaign_id is not None and item.campaign_id != campaign_id
+        ):
+            raise HTTPException(
+                status_code=400, detail="Item does not belong to the campaign"
+            )
+
+
+@router.post("/", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
+async def upload_document(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    project_id: int = Query(...),
+    campaign_id: int | None = None,
+    item_id: int | None = None,
+    folder: str | None = Query(None, max_length=768),
+    tags: list[str] = Query([]),
+    db: Session = Depends(get_db),
+    storage: StorageService | LocalStorageService = Depends(get_storage_service),
+    current_user_id: int = 1,  # TODO: Replace with actual auth
+) -> DocumentResponse:
+    """
+    Upload a file, e.g. a large CAD drawing, as the raw request body.
+
+    The body is streamed into an S3 multipart upload part by part as it
+    arrives, so memory use stays flat and nothing is spooled to disk. Send
+    the file's media type as Content-Type, and optionally the folder it
+    is filed under within the project and tags to search it by.
+    """
+    await run_in_threadpool(check_owner, db, project_id, campaign_id, item_id)
+
+    content_type = request.headers.get("content-type") or "application/octet-stream"
+    # Refuse bad metadata before anything is written to storage
+    try:
+        metadata = DocumentBase(
+            filename=filename,
+            path=document_path(folder, filename),
+            content_type=content_type[:127],
+            tags=tags,
+            project_id=project_id,
+            campaign_id=campaign_id,
+            item_id=item_id,
+        )
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False))
+
+    try:
+        stored = await storage.upload_stream(
+            document_key(project_id, filename),
+            request.stream(),
+            content_type=content_type,
+            max_size=settings.DOCUMENT_MAX_UPLOAD_BYTES,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+
+    try:
+        document_in = DocumentCreate(
+            **metadata.model_dump(),
+            size=stored.size,
+            sha256=stored.sha256,
+            s3_key=stored.key,
+            etag=stored.etag,
+            uploaded_by_id=current_user_id,
+        )
+        return await run_in_threadpool(
+            document_service.create, db=db, obj_in=document_in
+        )
+    except Exception:
+        # Do not leave an object behind that no document points to
+        await run_in_threadpool(storage.delete, stored.key)
+        raise
+
+
+def with_download_urls(
+    documents: list[Document], signed_urls: SignedURLService
+) -> list[DocumentResponse]:
+    """Attach download links to documents, signed in one batch"""
+    urls = signed_urls.urls_for(document.s3_key for document in documents)
+    return [
+        DocumentResponse.model_validate(document).model_copy(
+            update={
+                "download_url": urls[document.s3_key].url,
+                "download_url_expires_at": urls[document.s3_key].expires_at,
+            }
+        )
+        for document in documents
+    ]
+
+
+@router.get("/files/{key:path}", response_class=FileResponse)
+def read_local_file(
+    *,
+    storage: StorageService | LocalStorageService = Depends(get_storage_service),
+    signed_urls: SignedURLService = Depends(get_signed_url_service),
+    key: str,
+    expires: int,
+    signature: str,
+):
+    """Serve a document through a signed link (local storage backend only)"""
+    signer = signed_urls.signer
+    if not isinstance(storage, LocalStorageService) or not isinstance(
+        signer, LocalURLSigner
+    ):
+        raise HTTPException(status_code=404, detail="File not found")
+    if not signer.verify(key, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired link")
+    path = storage.path_for(key)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(path, filename=path.name)
+
+
+@router.get("/search", response_model=DocumentSearchResults)
+def search_documents(
+    *,
+    db: Session = Depends(get_db),
+    signed_urls: SignedURLService = Depends(get_signed_url_service),
+    project_id: int | None = None,
+    content_type: str | None = Query(None, max_length=127),
+    path_prefix: str | None = Query(None, max_length=1024),
+    tag: str | None = Query(None, max_length=50),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+) -> DocumentSearchResults:
+    """
+    Find documents by project, type, folder, tag and upload date.
+
+    Results are newest first; pass next_cursor back as cursor for the
+    following page. Answered from the document index, never by listing S3.
+    """
+    try:
+        page = document_service.search(
+            db,
+            project_id=project_id,
+            content_type=content_type,
+            path_prefix=path_prefix,
+            tag=tag,
+            created_from=created_from,
+            created_to=created_to,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return DocumentSearchResults(
+        items=with_download_urls(page["items"], signed_urls),
+        next_cursor=page["next_cursor"],
+    )
+
+
+@router.get("/{document_id}", response_model=DocumentResponse)
+def read_document(
+    *,
+    db: Session = Depends(get_db),
+    signed_urls: SignedURLService = Depends(get_signed_url_service),
+    document_id: int,
+) -> DocumentResponse:
+    """Get document metadata by ID, with a download link"""
+    document = document_service.get(db=db, id=document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return with_download_urls([document], signed_urls)[0]
+
+
+@router.get("/", response_model=list[DocumentResponse])
+def list_documents(
+    *,
+    db: Session = Depends(get_db),
+    signed_urls: SignedURLService = Depends(get_signed_url_service),
+    project_id: int,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+) -> list[DocumentResponse]:
+    """List the documents of a project with their download links"""
+    documents = document_service.get_by_project(
+        db=db, project_id=project_id, skip=skip, limit=limit
+    )
+    return with_download_urls(documents, signed_urls)
+
+
+@router.post(
+    "/{document_id}/extraction",
+    response_model=BundleExtractionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def start_bundle_extraction(
+    *, db: Session = Depends(get_db), document_id: int
+) -> BundleExtractionResponse:
+    """
+    Extract an uploaded ZIP of drawings under projects/{id}/cad/.
+
+    Extraction runs in the background; poll GET on the same path for
+    progress. Every extracted file becomes a document of the bundle's
+    project, campaign and item.
+    """
+    document = document_service.get(db=db, id=document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if not is_bundle(document):
+        raise HTTPException(status_code=400, detail="Document is not a ZIP archive")
+    job_id = f"bundle-{document_id}"
+    extract_bundle.apply_async(args=[document_id], task_id=job_id)
+    return BundleExtractionResponse(job_id=job_id, status="PENDING")
+
+
+@router.get("/{document_id}/extraction", response_model=BundleExtractionResponse)
+def read_bundle_extraction(document_id: int) -> BundleExtractionResponse:
+    """Get the progress of a bundle extraction"""
+    job_id = f"bundle-{document_id}"
+    result = celery_app.AsyncResult(job_id)
+    job = BundleExtractionResponse(job_id=job_id, status=result.state)
+    if result.state == "FAILURE":
+        job.error = str(result.info)
+    elif isinstance(result.info, dict):
+        job.done = result.info.get("done", 0)
+        job.total = result.info.get("total")
+    return job
+
+
+@router.delete("/{document_id}", response_model=DocumentResponse)
+def delete_document(
+    *,
+    db: Session = Depends(get_db),
+    storage: StorageService | LocalStorageService = Depends(get_storage_service),
+    document_id: int,
+) -> DocumentResponse:
+    """Delete a document and its stored file"""
+    document = document_service.delete(db=db, id=document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    storage.delete(document.s3_key)
+    return document
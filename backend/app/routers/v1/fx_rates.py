@@ -0,0 +1,35 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...models.enums import Currency
+from ...schemas.fx import FxRateCreate, FxRateResponse, FxRatesLoaded
+from ...services.fx import fx_service
+
+router = APIRouter(tags=["fx-rates"])
+
+
+@router.get("/", response_model=list[FxRateResponse])
+def read_fx_rates(
+    db: Session = Depends(get_db),
+    currency: Currency | None = None,
+    on: date | None = None,
+) -> list[FxRateResponse]:
+    """Get exchange rates to the base currency; with ``on``, those in force"""
+    return fx_service.get_multi(db, currency=currency, on=on)
+
+
+@router.put("/", response_model=FxRatesLoaded)
+def set_fx_rates(
+    *, db: Session = Depends(get_db), rates_in: list[FxRateCreate]
+) -> FxRatesLoaded:
+    """
+    Add or replace dated exchange rates.
+
+    A rate applies to prices quoted from its ``valid_from`` day until the
+    next rate of the same currency. Dashboard rollups pick up changed
+    rates at the nightly full rollup.
+    """
+    return FxRatesLoaded(loaded=fx_service.set_rates(db, rates_in))
@@ -0,0 +1,36 @@
+import csv
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...schemas.bulk_import import ImportReport
+from ...services.bulk_import import ImportEntity, bulk_import_service
+
+router = APIRouter(tags=["imports"])
+
+
+@router.post("/{entity}", response_model=ImportReport)
+def import_csv(
+    *,
+    db: Session = Depends(get_db),
+    entity: ImportEntity,
+    file: UploadFile = File(...),
+) -> ImportReport:
+    """
+    Bulk load clients, craftsmen or items from a UTF-8 CSV file.
+
+    The header names the columns of the matching create schema. Rows that
+    match an existing record (clients by email, craftsmen by phone, items
+    by campaign and name) update it and the others are inserted. Invalid
+    rows are skipped and reported by line number.
+    """
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return bulk_import_service.import_csv(db, entity, lines)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Unreadable CSV file: {exc}")
+    finally:
+        lines.detach()
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
+from ...models.enums import Currency
 from ...schemas.item import ItemCreate, ItemResponse, ItemUpdate
+from ...schemas.prediction import PriceEstimate, PriceEstimateRequest, SimilarItem
+from ...schemas.quote import ItemQuoteComparison
+from ...schemas.whatsapp import QuoteRequestCreate, QuoteRequestResponse
+from ...services.craftsman import craftsman_service
+from ...services.export import ExportFormat, export_service
 from ...services.item import item_service
+from ...services.message import message_service
+from ...services.prediction import price_predictor
+from ...services.quote import quote_service
+from ...services.whatsapp import WhatsAppService, get_whatsapp_service
 
 router = APIRouter(tags=["items"])
 
@@ -15,6 +26,42 @@ def create_item(*, db: Session = Depends(get_db), item_in: ItemCreate) -> ItemRe
     return item
 
 
+@router.get("/export")
+def export_items(
+    db: Session = Depends(get_db),
+    file_format: ExportFormat = Query("csv", alias="format"),
+    campaign_id: int = None,
+) -> StreamingResponse:
+    """Download the items matching the list filters as CSV or XLSX"""
+    return export_service.response(
+        db.get_bind(),
+        export_service.items(campaign_id=campaign_id),
+        name="items",
+        file_format=file_format,
+    )
+
+
+@router.get("/similar", response_model=list[SimilarItem])
+def read_similar_items(
+    *,
+    db: Session = Depends(get_db),
+    name: str = Query(..., min_length=1, max_length=255),
+    description: str | None = None,
+    k: int = Query(10, ge=1, le=100),
+    min_score: float = Query(0.2, ge=0, le=1),
+    currency: Currency | None = None,
+) -> list[SimilarItem]:
+    """Historical items resembling a new one, with their approved quotes"""
+    return price_predictor.find_similar_items(
+        db,
+        name=name,
+        description=description,
+        k=k,
+        min_score=min_score,
+        currency=currency,
+    )
+
+
 @router.get("/{item_id}", response_model=ItemResponse)
 def read_item(*, db: Session = Depends(get_db), item_id: int) -> ItemResponse:
     """Get item by ID"""
@@ -24,6 +71,97 @@ def read_item(*, db: Session = Depends(get_db), item_id: int) -> ItemResponse:
     return item
 
 
+@router.get("/{item_id}/quote-comparison", response_model=ItemQuoteComparison)
+def read_item_quote_comparison(
+    *,
+    db: Session = Depends(get_db),
+    item_id: int,
+    include_closed: bool = False,
+    currency: Currency | None = None,
+) -> ItemQuoteComparison:
+    """Compare all quotes of an item, ranked by base-currency price"""
+    comparison = quote_service.get_item_comparison(
+        db, item_id=item_id, include_closed=include_closed, currency=currency
+    )
+    if not comparison:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return comparison
+
+
+@router.get("/{item_id}/similar", response_model=list[SimilarItem])
+def read_items_similar_to(
+    *,
+    db: Session = Depends(get_db),
+    item_id: int,
+    k: int = Query(10, ge=1, le=100),
+    min_score: float = Query(0.2, ge=0, le=1),
+    currency: Currency | None = None,
+) -> list[SimilarItem]:
+    """Other items resembling an item, with their approved quotes"""
+    item = item_service.get(db=db, id=item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return price_predictor.find_similar_items(
+        db,
+        name=item.name,
+        description=item.description,
+        k=k,
+        min_score=min_score,
+        exclude_item_id=item_id,
+        currency=currency,
+    )
+
+
+@router.post("/{item_id}/price-estimate", response_model=PriceEstimate)
+def estimate_item_price(
+    *,
+    db: Session = Depends(get_db),
+    item_id: int,
+    request_in: PriceEstimateRequest | None = None,
+    currency: Currency | None = None,
+) -> PriceEstimate:
+    """
+    Predicted price range of an item with bootstrap confidence intervals.
+
+    Learned from the approved quotes of similar items with the same unit,
+    per unit and in the base currency. Estimates are cached until a quote
+    they were built from changes.
+    """
+    options = request_in or PriceEstimateRequest()
+    estimate = price_predictor.predict_range(
+        db, item_id=item_id, currency=currency, **options.model_dump()
+    )
+    if estimate is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return estimate
+
+
+@router.post("/{item_id}/quote-requests", response_model=QuoteRequestResponse)
+def request_item_quotes(
+    *,
+    db: Session = Depends(get_db),
+    whatsapp: WhatsAppService = Depends(get_whatsapp_service),
+    item_id: int,
+    request_in: QuoteRequestCreate,
+) -> QuoteRequestResponse:
+    """Ask several craftsmen for a quote on an item over WhatsApp"""
+    item = item_service.get(db=db, id=item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    craftsman_ids = list(dict.fromkeys(request_in.craftsman_ids))
+    craftsmen = craftsman_service.get_by_ids(db, ids=craftsman_ids)
+    if len(craftsmen) != len(craftsman_ids):
+        raise HTTPException(status_code=404, detail="Craftsman not found")
+
+    results = message_service.request_quotes(
+        db, whatsapp, item=item, craftsmen=craftsmen
+    )
+    sent = sum(1 for result in results if result.get("wa_message_id"))
+    return QuoteRequestResponse(
+        item_id=item_id, sent=sent, failed=len(results) - sent, results=results
+    )
+
+
 @router.put("/{item_id}", response_model=ItemResponse)
 def update_item(
     *, db: Session = Depends(get_db), item_id: int, item_in: ItemUpdate
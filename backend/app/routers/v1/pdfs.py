@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...core.redis import redis_client
+from ...models.enums import Currency
+from ...schemas.pdf import PDFJobResponse
+from ...services.pdf import RENDER_LOCK_SECONDS, pdf_service
+from ...workers.celery_app import celery_app
+from ...workers.pdf import render_pdf
+
+router = APIRouter(tags=["pdfs"])
+
+CONTENT_HASH_PATTERN = r"^[0-9a-f]{64}$"
+
+
+def _cached_or_enqueue(document: dict, filename: str):
+    """Serve a cached PDF or queue its rendering and return a job handle"""
+    content_hash = pdf_service.content_hash(document)
+    cached = pdf_service.get_cached(content_hash)
+    if cached:
+        return FileResponse(cached, media_type="application/pdf", filename=filename)
+
+    # Same content -> same job id; only the request taking the lock queues
+    # it, so concurrent polls share one render
+    job_id = f"pdf-{content_hash}"
+    if redis_client.set(
+        pdf_service.render_lock_key(content_hash), 1, nx=True, ex=RENDER_LOCK_SECONDS
+    ):
+        render_pdf.apply_async(args=[document], task_id=job_id)
+    job = PDFJobResponse(
+        job_id=job_id,
+        content_hash=content_hash,
+        status="PENDING",
+        download_url=f"/api/v1/pdfs/files/{content_hash}",
+    )
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.model_dump())
+
+
+@router.get(
+    "/quotes/{quote_id}",
+    response_class=FileResponse,
+    responses={202: {"model": PDFJobResponse}},
+)
+def read_quote_pdf(*, db: Session = Depends(get_db), quote_id: int):
+    """Get the quote PDF, rendering it in the background if not cached"""
+    document = pdf_service.build_quote_document(db, quote_id=quote_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Quote not found")
+    return _cached_or_enqueue(document, f"{document['number']}.pdf")
+
+
+@router.get(
+    "/invoices/{campaign_id}",
+    response_class=FileResponse,
+    responses={202: {"model": PDFJobResponse}},
+)
+def read_invoice_pdf(
+    *,
+    db: Session = Depends(get_db),
+    campaign_id: int,
+    currency: Currency | None = None,
+):
+    """Get the campaign invoice PDF, rendering it in the background if not cached"""
+    document = pdf_service.build_invoice_document(
+        db, campaign_id=campaign_id, currency=currency
+    )
+    if document is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return _cached_or_enqueue(document, f"{document['number']}.pdf")
+
+
+@router.get("/jobs/{job_id}", response_model=PDFJobResponse)
+def read_pdf_job(job_id: str = Path(..., pattern=r"^pdf-[0-9a-f]{64}$")):
+    """Get the status of a background PDF render"""
+    content_hash = job_id.removeprefix("pdf-")
+    if pdf_service.get_cached(content_hash):
+        job_status = "SUCCESS"
+    else:
+        job_status = celery_app.AsyncResult(job_id).state
+    return PDFJobResponse(
+        job_id=job_id,
+        content_hash=content_hash,
+        status=job_status,
+        download_url=f"/api/v1/pdfs/files/{content_hash}",
+    )
+
+
+@router.get("/files/{content_hash}", response_class=FileResponse)
+def read_pdf_file(content_hash: str = Path(..., pattern=CONTENT_HASH_PATTERN)):
+    """Download a rendered PDF by content hash"""
+    cached = pdf_service.get_cached(content_hash)
+    if not cached:
+        raise HTTPException(status_code=404, detail="PDF not found")
+    return FileResponse(cached, media_type="application/pdf")
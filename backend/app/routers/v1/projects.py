@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
+from ...core.etag import etag_for, not_modified
 from ...models.enums import ProjectStatus
+from ...schemas.board import Board
 from ...schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
+from ...services.board import BoardEntity, board_service
+from ...services.export import ExportFormat, export_service
 from ...services.project import project_service
 
 router = APIRouter(tags=["projects"])
@@ -21,6 +26,27 @@ def create_project(
     return project
 
 
+@router.get("/export")
+def export_projects(
+    db: Session = Depends(get_db),
+    file_format: ExportFormat = Query("csv", alias="format"),
+    status_filter: ProjectStatus = None,
+    active_only: bool = False,
+    user_id: int = None,
+    client_id: int = None,
+) -> StreamingResponse:
+    """Download the projects matching the list filters as CSV or XLSX"""
+    stmt = export_service.projects(
+        status=status_filter,
+        active_only=active_only,
+        user_id=user_id,
+        client_id=client_id,
+    )
+    return export_service.response(
+        db.get_bind(), stmt, name="projects", file_format=file_format
+    )
+
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 def read_project(*, db: Session = Depends(get_db), project_id: int) -> ProjectResponse:
     """Get project by ID"""
@@ -30,6 +56,41 @@ def read_project(*, db: Session = Depends(get_db), project_id: int) -> ProjectRe
     return project
 
 
+@router.get(
+    "/{project_id}/board",
+    response_model=Board,
+    responses={304: {"description": "The board has not changed"}},
+)
+def read_project_board(
+    *,
+    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    project_id: int,
+    entity: BoardEntity = "tasks",
+    per_column: int = Query(20, ge=1, le=100),
+) -> Board | Response:
+    """
+    Kanban board of a project's tasks, items or quotes.
+
+    Returns every status column with its card count and first cards. Send
+    the ETag back as If-None-Match to get a 304 while the board is unchanged.
+    """
+    if not project_service.get(db=db, id=project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    board = Board.model_validate(
+        board_service.get_board(
+            db, project_id=project_id, entity=entity, per_column=per_column
+        )
+    )
+    etag = etag_for(board.model_dump(mode="json"))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return board
+
+
 @router.put("/{project_id}", response_model=ProjectResponse)
 def update_project(
     *, db: Session = Depends(get_db), project_id: int, project_in: ProjectUpdate
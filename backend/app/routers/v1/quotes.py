@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
-from ...models.enums import QuoteStatus
-from ...schemas.quote import QuoteCreate, QuoteResponse, QuoteUpdate
+from ...models.enums import Currency, QuoteStatus, Unit
+from ...schemas.quote import (
+    QuoteAnomalyResponse,
+    QuoteCreate,
+    QuoteMessageParseRequest,
+    QuoteMessageParseResponse,
+    QuoteResponse,
+    QuoteUpdate,
+)
+from ...services.anomaly import quote_anomaly_service
+from ...services.export import ExportFormat, export_service
+from ...services.message_parser import message_parser
 from ...services.quote import quote_service
 
 router = APIRouter(tags=["quotes"])
@@ -18,6 +29,61 @@ def create_quote(
     return quote
 
 
+@router.post("/parse-message", response_model=QuoteMessageParseResponse)
+def parse_quote_message(
+    *, parse_in: QuoteMessageParseRequest
+) -> QuoteMessageParseResponse:
+    """Extract a quoted price and work status from a WhatsApp message"""
+    return message_parser.parse(parse_in.text)
+
+
+@router.get("/anomalies", response_model=list[QuoteAnomalyResponse])
+def read_quote_anomalies(
+    db: Session = Depends(get_db),
+    specialty: str | None = None,
+    unit: Unit | None = None,
+    craftsman_id: int | None = None,
+    min_score: float | None = Query(None, ge=0),
+    skip: int = 0,
+    limit: int = 100,
+    currency: Currency | None = None,
+) -> list[QuoteAnomalyResponse]:
+    """Get quotes priced unusually for their specialty and unit"""
+    return quote_anomaly_service.get_multi(
+        db,
+        specialty=specialty,
+        unit=unit,
+        craftsman_id=craftsman_id,
+        min_score=min_score,
+        skip=skip,
+        limit=limit,
+        currency=currency,
+    )
+
+
+@router.get("/export")
+def export_quotes(
+    db: Session = Depends(get_db),
+    file_format: ExportFormat = Query("csv", alias="format"),
+    status_filter: QuoteStatus = None,
+    item_id: int = None,
+    craftsman_id: int = None,
+    pending_only: bool = False,
+    approved_only: bool = False,
+) -> StreamingResponse:
+    """Download the quotes matching the list filters as CSV or XLSX"""
+    stmt = export_service.quotes(
+        status=status_filter,
+        item_id=item_id,
+        craftsman_id=craftsman_id,
+        pending_only=pending_only,
+        approved_only=approved_only,
+    )
+    return export_service.response(
+        db.get_bind(), stmt, name="quotes", file_format=file_format
+    )
+
+
 @router.get("/{quote_id}", response_model=QuoteResponse)
 def read_quote(*, db: Session = Depends(get_db), quote_id: int) -> QuoteResponse:
     """Get quote by ID"""
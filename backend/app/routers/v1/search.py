@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...schemas.search import MessageSearchResults
+from ...services.search import SortOrder, search_service
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/messages", response_model=MessageSearchResults)
+def search_messages(
+    *,
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    craftsman_id: int | None = None,
+    project_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    sort: SortOrder = "relevance",
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+) -> MessageSearchResults:
+    """Full-text search across WhatsApp messages and quote texts"""
+    try:
+        return search_service.search_messages(
+            db,
+            q=q,
+            craftsman_id=craftsman_id,
+            project_id=project_id,
+            date_from=date_from,
+            date_to=date_to,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
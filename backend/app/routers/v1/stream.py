@@ -0,0 +1,56 @@
+import time
+from collections.abc import AsyncIterator
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from ...core.config import settings
+from ...core.redis import get_async_redis
+from ...services.changes import changes_channel
+
+router = APIRouter(tags=["stream"])
+
+
+async def change_events(
+    request: Request, redis: aioredis.Redis, channel: str
+) -> AsyncIterator[str]:
+    """Forward pub/sub change events as Server-Sent Events frames"""
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(channel)
+    try:
+        yield "retry: 3000\n\n"
+        last_sent = time.monotonic()
+        while not await request.is_disconnected():
+            message = await pubsub.get_message(timeout=1.0)
+            if message is not None:
+                yield f"event: change\ndata: {message['data'].decode()}\n\n"
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= settings.CHANGE_FEED_HEARTBEAT_SECONDS:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+    finally:
+        await pubsub.aclose()
+
+
+@router.get("")
+async def stream_changes(
+    request: Request,
+    project_id: int | None = None,
+    redis: aioredis.Redis = Depends(get_async_redis),
+) -> StreamingResponse:
+    """
+    Push change events instead of polling the list endpoints.
+
+    Each event is a compact JSON object (entity, id, op, changed fields,
+    project_id) sent whenever a create, update or delete commits. Pass
+    project_id to only receive that project's changes. Events go through
+    Redis pub/sub, so every API worker sees every change; clients that
+    reconnect should refetch, as missed events are not replayed.
+    """
+    return StreamingResponse(
+        change_events(request, redis, changes_channel(project_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
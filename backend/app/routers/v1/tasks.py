@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
 from ...models.enums import TaskPriority, TaskStatus
 from ...schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from ...services.export import ExportFormat, export_service
 from ...services.task import task_service
 
 router = APIRouter(tags=["tasks"])
@@ -16,6 +18,33 @@ def create_task(*, db: Session = Depends(get_db), task_in: TaskCreate) -> TaskRe
     return task
 
 
+@router.get("/export")
+def export_tasks(
+    db: Session = Depends(get_db),
+    file_format: ExportFormat = Query("csv", alias="format"),
+    status_filter: TaskStatus = None,
+    priority_filter: TaskPriority = None,
+    project_id: int = None,
+    user_id: int = None,
+    todo_only: bool = False,
+    in_progress_only: bool = False,
+    unassigned_only: bool = False,
+) -> StreamingResponse:
+    """Download the tasks matching the list filters as CSV or XLSX"""
+    stmt = export_service.tasks(
+        status=status_filter,
+        priority=priority_filter,
+        project_id=project_id,
+        user_id=user_id,
+        todo_only=todo_only,
+        in_progress_only=in_progress_only,
+        unassigned_only=unassigned_only,
+    )
+    return export_service.response(
+        db.get_bind(), stmt, name="tasks", file_format=file_format
+    )
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 def read_task(*, db: Session = Depends(get_db), task_id: int) -> TaskResponse:
     """Get task by ID"""
@@ -0,0 +1,32 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...schemas.timeline import Timeline
+from ...services.timeline import timeline_service
+
+router = APIRouter(tags=["timeline"])
+
+
+@router.get("", response_model=Timeline)
+def read_timeline(
+    *,
+    db: Session = Depends(get_db),
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    project_id: int | None = None,
+    limit: int = Query(1000, ge=1, le=5000),
+) -> Timeline:
+    """
+    Projects, campaigns and tasks intersecting a date window.
+
+    Both dates are inclusive. Projects and campaigns with an open start or
+    end run to the edge of the window; tasks appear at their due date.
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    return timeline_service.get_timeline(
+        db, date_from=date_from, date_to=date_to, project_id=project_id, limit=limit
+    )
@@ -0,0 +1,67 @@
+import hashlib
+import hmac
+from datetime import UTC, datetime
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from redis.exceptions import RedisError
+
+from ...core.config import settings
+from ...core.redis import get_async_redis
+
+router = APIRouter(tags=["whatsapp"])
+
+
+def verify_signature(body: bytes, signature: str | None) -> bool:
+    """Check Meta's X-Hub-Signature-256 header against the app secret"""
+    if not settings.WHATSAPP_APP_SECRET or not signature:
+        return False
+    expected = hmac.new(
+        settings.WHATSAPP_APP_SECRET.encode(), body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+@router.get("/webhook", response_class=PlainTextResponse)
+async def verify_webhook(
+    mode: str = Query(..., alias="hub.mode"),
+    verify_token: str = Query(..., alias="hub.verify_token"),
+    challenge: str = Query(..., alias="hub.challenge"),
+) -> str:
+    """Answer Meta's webhook subscription handshake"""
+    if (
+        mode != "subscribe"
+        or not settings.WHATSAPP_WEBHOOK_VERIFY_TOKEN
+        or not hmac.compare_digest(verify_token, settings.WHATSAPP_WEBHOOK_VERIFY_TOKEN)
+    ):
+        raise HTTPException(status_code=403, detail="Invalid verify token")
+    return challenge
+
+
+@router.post("/webhook")
+async def receive_webhook(
+    request: Request, redis: aioredis.Redis = Depends(get_async_redis)
+):
+    """
+    Receive a WhatsApp webhook event.
+
+    The raw payload is appended to a Redis Stream and acknowledged right
+    away; parsing and storage happen in the stream consumer
+    (app.workers.whatsapp). Returning 503 when Redis is unavailable makes
+    Meta retry the delivery.
+    """
+    body = await request.body()
+    if not verify_signature(body, request.headers.get("X-Hub-Signature-256")):
+        raise HTTPException(status_code=403, detail="Invalid signature")
+
+    try:
+        await redis.xadd(
+            settings.WHATSAPP_WEBHOOK_STREAM,
+            {"payload": body, "received_at": datetime.now(UTC).isoformat()},
+            maxlen=settings.WHATSAPP_WEBHOOK_STREAM_MAXLEN,
+            approximate=True,
+        )
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Event queue unavailable")
+    return {"status": "received"}
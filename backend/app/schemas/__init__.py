@@ -1,6 +1,9 @@
 # Pydantic schemas for request/response validation
 
+from .analytics import Bottleneck, StatusChange, StatusTime
 from .base import BaseResponseSchema, BaseSchema, PaginatedResponse, PaginationParams
+from .board import Board, BoardCard, BoardColumn
+from .bulk_import import ImportReport, ImportRowError
 from .campaign import (
     CampaignBase,
     CampaignCreate,
@@ -13,10 +16,32 @@ from .craftsman import (
     CraftsmanBase,
     CraftsmanCreate,
     CraftsmanList,
+    CraftsmanReliability,
     CraftsmanResponse,
     CraftsmanUpdate,
+    ReliabilityRefresh,
 )
+from .dashboard import DashboardMetrics, KpiPeriod, PeriodComparison
+from .document import (
+    BundleExtractionResponse,
+    DocumentBase,
+    DocumentCreate,
+    DocumentResponse,
+    DocumentSearchResults,
+    DocumentUpdate,
+)
+from .fx import FxRateCreate, FxRateResponse, FxRatesLoaded
 from .item import ItemBase, ItemCreate, ItemList, ItemResponse, ItemUpdate
+from .pdf import PDFJobResponse
+from .prediction import (
+    PriceEstimate,
+    PriceEstimateRequest,
+    PriceInterval,
+    PriceIntervals,
+    PriceRange,
+    SimilarItem,
+    SimilarItemQuote,
+)
 from .project import (
     ProjectBase,
     ProjectCreate,
@@ -24,9 +49,32 @@ from .project import (
     ProjectResponse,
     ProjectUpdate,
 )
-from .quote import QuoteBase, QuoteCreate, QuoteList, QuoteResponse, QuoteUpdate
+from .quote import (
+    CampaignQuoteComparison,
+    ItemQuoteComparison,
+    QuoteAnomalyResponse,
+    QuoteBase,
+    QuoteComparisonEntry,
+    QuoteCreate,
+    QuoteList,
+    QuoteMessageParseRequest,
+    QuoteMessageParseResponse,
+    QuoteResponse,
+    QuoteUpdate,
+)
+from .search import MessageSearchHit, MessageSearchResults
 from .task import TaskBase, TaskCreate, TaskList, TaskResponse, TaskUpdate
+from .timeline import Timeline, TimelineCampaign, TimelineProject, TimelineTask
 from .user import UserBase, UserCreate, UserList, UserResponse, UserUpdate
+from .whatsapp import (
+    QuoteRequestCreate,
+    QuoteRequestResponse,
+    QuoteRequestResult,
+    WhatsAppMessageBase,
+    WhatsAppMessageCreate,
+    WhatsAppMessageResponse,
+    WhatsAppMessageUpdate,
+)
 
 __all__ = [
     # Base schemas
@@ -52,6 +100,8 @@ __all__ = [
     "CraftsmanUpdate",
     "CraftsmanResponse",
     "CraftsmanList",
+    "CraftsmanReliability",
+    "ReliabilityRefresh",
     # Project schemas
     "ProjectBase",
     "ProjectCreate",
@@ -76,10 +126,68 @@ __all__ = [
     "QuoteUpdate",
     "QuoteResponse",
     "QuoteList",
+    "QuoteComparisonEntry",
+    "ItemQuoteComparison",
+    "CampaignQuoteComparison",
+    "QuoteMessageParseRequest",
+    "QuoteMessageParseResponse",
+    "QuoteAnomalyResponse",
     # Task schemas
     "TaskBase",
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
     "TaskList",
+    # Analytics schemas
+    "StatusTime",
+    "Bottleneck",
+    "StatusChange",
+    # Dashboard schemas
+    "KpiPeriod",
+    "DashboardMetrics",
+    "PeriodComparison",
+    # Prediction schemas
+    "SimilarItem",
+    "SimilarItemQuote",
+    "PriceEstimateRequest",
+    "PriceEstimate",
+    "PriceRange",
+    "PriceInterval",
+    "PriceIntervals",
+    # Board schemas
+    "Board",
+    "BoardColumn",
+    "BoardCard",
+    # Timeline schemas
+    "Timeline",
+    "TimelineProject",
+    "TimelineCampaign",
+    "TimelineTask",
+    # PDF schemas
+    "PDFJobResponse",
+    # Search schemas
+    "MessageSearchHit",
+    "MessageSearchResults",
+    # WhatsApp schemas
+    "WhatsAppMessageBase",
+    "WhatsAppMessageCreate",
+    "WhatsAppMessageUpdate",
+    "WhatsAppMessageResponse",
+    "QuoteRequestCreate",
+    "QuoteRequestResult",
+    "QuoteRequestResponse",
+    # Document schemas
+    "DocumentBase",
+    "DocumentCreate",
+    "DocumentUpdate",
+    "DocumentResponse",
+    "DocumentSearchResults",
+    "BundleExtractionResponse",
+    # Exchange rate schemas
+    "FxRateCreate",
+    "FxRateResponse",
+    "FxRatesLoaded",
+    # Import schemas
+    "ImportReport",
+    "ImportRowError",
 ]
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from .base import BaseSchema
+
+
+class StatusTime(BaseSchema):
+    """How long rows of a kind stay in a status"""
+
+    entity: str
+    status: str
+    transitions: int
+    avg_seconds: float
+    # Approximate: upper bound of the rollup bucket holding the percentile
+    p90_seconds: float
+
+
+class Bottleneck(BaseSchema):
+    """A row waiting in an open status"""
+
+    entity: str
+    entity_id: int
+    status: str
+    since: datetime
+    seconds_in_status: float
+
+
+class StatusChange(BaseSchema):
+    """One entry of a row's status history"""
+
+    from_status: str | None = None
+    to_status: str
+    changed_at: datetime
+    seconds_in_previous: float | None = None
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any
+
+from .base import BaseSchema
+
+
+class BoardCard(BaseSchema):
+    """A card of a kanban column"""
+
+    id: int
+    title: str
+    created_at: datetime
+    updated_at: datetime | None = None
+    # Entity specific fields, e.g. priority of a task or price of a quote
+    details: dict[str, Any] = {}
+
+
+class BoardColumn(BaseSchema):
+    """A status column with its total count and first cards"""
+
+    status: str
+    count: int
+    cards: list[BoardCard]
+
+
+class Board(BaseSchema):
+    """Every column of a project's kanban board"""
+
+    project_id: int
+    entity: str
+    columns: list[BoardColumn]
@@ -0,0 +1,23 @@
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class ImportRowError(BaseSchema):
+    """Schema for a CSV row that was not imported"""
+
+    line: int = Field(..., description="Line number in the CSV file")
+    errors: list[str]
+
+
+class ImportReport(BaseSchema):
+    """Schema for the result of a bulk import"""
+
+    entity: str
+    rows: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: list[ImportRowError] = Field(
+        default_factory=list, description="The first failed rows"
+    )
@@ -1,4 +1,6 @@
-from pydantic import Field
+from datetime import date
+
+from pydantic import Field, model_validator
 
 from ..models.enums import CampaignStatus
 from .base import BaseResponseSchema, BaseSchema
@@ -10,6 +12,15 @@ class CampaignBase(BaseSchema):
     name: str = Field(..., min_length=1, max_length=255)
     description: str | None = None
     status: CampaignStatus = CampaignStatus.ACTIVE
+    start_date: date | None = None
+    end_date: date | None = None
+
+    @model_validator(mode="after")
+    def validate_date_range(self):
+        """Validate that end_date is not before start_date"""
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError("End date cannot be before start date")
+        return self
 
 
 class CampaignCreate(CampaignBase):
@@ -24,6 +35,8 @@ class CampaignUpdate(BaseSchema):
     name: str | None = Field(None, min_length=1, max_length=255)
     description: str | None = None
     status: CampaignStatus | None = None
+    start_date: date | None = None
+    end_date: date | None = None
 
 
 class CampaignResponse(CampaignBase, BaseResponseSchema):
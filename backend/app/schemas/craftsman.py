@@ -1,4 +1,5 @@
 import re
+from datetime import datetime
 from decimal import Decimal
 
 from pydantic import EmailStr, Field, field_validator
@@ -113,3 +114,29 @@ class CraftsmanList(BaseSchema):
 
     craftsmen: list[CraftsmanResponse]
     total: int
+
+
+class CraftsmanReliability(BaseSchema):
+    """Schema for a craftsman's reliability score"""
+
+    craftsman_id: int
+    specialty: str
+    quotes: int
+    approved: int
+    rejected: int
+    expired: int
+    approval_rate: float | None = None
+    expiry_rate: float | None = None
+    turnaround_seconds: float | None = None
+    price_deviation: float | None = Field(
+        None, description="Mean log ratio of quoted prices to the item median"
+    )
+    price_deviation_z: float | None = None
+    reliability: float = Field(..., ge=0, le=100)
+    computed_at: datetime
+
+
+class ReliabilityRefresh(BaseSchema):
+    """Schema for the result of a score refresh"""
+
+    rescored: int
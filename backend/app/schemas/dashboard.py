@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+
+from pydantic import Field
+
+from .analytics import Bottleneck
+from .base import BaseSchema
+
+
+class KpiPeriod(BaseSchema):
+    """KPIs of a day, month or longer period"""
+
+    start: date
+    end: date = Field(..., description="First day after the period")
+    currency: str = Field(..., description="Currency of the amounts")
+    quotes_received: int
+    quotes_approved: int
+    cost: Decimal
+    revenue: Decimal
+    profit: Decimal
+    average_margin_percentage: Decimal | None = None
+    projects_started: int
+    projects_completed: int
+    projects_active: int | None = Field(
+        None, description="Active projects when the period was last rolled up"
+    )
+
+
+class DashboardMetrics(BaseSchema):
+    """Headline figures of the dashboard"""
+
+    month: KpiPeriod
+    projects_in_progress: int
+    bottlenecks: list[Bottleneck]
+
+
+class PeriodComparison(BaseSchema):
+    """KPIs of a period against the period before it"""
+
+    period: str
+    current: KpiPeriod
+    previous: KpiPeriod
+    # Percentage change of each measure; None when the previous one was zero
+    changes: dict[str, float | None]
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from pydantic import Field, field_validator
+
+from .base import BaseResponseSchema, BaseSchema
+
+
+class DocumentBase(BaseSchema):
+    """Base document schema with common fields"""
+
+    filename: str = Field(..., min_length=1, max_length=255)
+    path: str = Field(..., min_length=1, max_length=1024)
+    content_type: str = Field(..., max_length=127)
+    tags: list[str] = Field(default_factory=list, max_length=20)
+    project_id: int
+    campaign_id: int | None = None
+    item_id: int | None = None
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, v: list[str]) -> list[str]:
+        """Lowercase tags and drop blanks and duplicates"""
+        tags = (tag.strip().lower()[:50] for tag in v)
+        return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+class DocumentCreate(DocumentBase):
+    """Schema for recording a file stored in S3"""
+
+    size: int = Field(..., ge=0)
+    sha256: str | None = Field(None, min_length=64, max_length=64)
+    s3_key: str = Field(..., max_length=512)
+    etag: str | None = Field(None, max_length=128)
+    uploaded_by_id: int | None = None
+
+
+class DocumentUpdate(BaseSchema):
+    """Schema for renaming, tagging or refiling a document"""
+
+    filename: str | None = Field(None, min_length=1, max_length=255)
+    path: str | None = Field(None, min_length=1, max_length=1024)
+    tags: list[str] | None = Field(None, max_length=20)
+    campaign_id: int | None = None
+    item_id: int | None = None
+
+    normalize_tags = field_validator("tags")(DocumentBase.normalize_tags.__func__)
+
+
+class DocumentResponse(DocumentBase, BaseResponseSchema):
+    """Schema for document responses"""
+
+    size: int
+    sha256: str | None = None
+    s3_key: str
+    uploaded_by_id: int | None = None
+    download_url: str | None = None
+    download_url_expires_at: datetime | None = None
+
+
+class DocumentSearchResults(BaseSchema):
+    """A page of documents and the cursor of the next one"""
+
+    items: list[DocumentResponse]
+    next_cursor: str | None = None
+
+
+class BundleExtractionResponse(BaseSchema):
+    """Progress of a background ZIP bundle extraction"""
+
+    job_id: str
+    status: str
+    done: int = 0
+    total: int | None = None
+    error: str | None = None
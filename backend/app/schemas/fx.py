@@ -0,0 +1,29 @@
+from datetime import date
+from decimal import Decimal
+
+from pydantic import Field
+
+from ..models.enums import Currency
+from .base import BaseResponseSchema, BaseSchema
+
+
+class FxRateCreate(BaseSchema):
+    """Schema for setting the rate of a currency from a day on"""
+
+    currency: Currency
+    valid_from: date
+    rate: Decimal = Field(
+        ..., gt=0, decimal_places=8, description="Base currency per unit"
+    )
+
+
+class FxRateResponse(FxRateCreate, BaseResponseSchema):
+    """Schema for exchange rate responses"""
+
+    pass
+
+
+class FxRatesLoaded(BaseSchema):
+    """Schema for the result of setting rates"""
+
+    loaded: int
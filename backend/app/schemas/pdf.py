@@ -0,0 +1,10 @@
+from .base import BaseSchema
+
+
+class PDFJobResponse(BaseSchema):
+    """Handle for a PDF that is being rendered in the background"""
+
+    job_id: str
+    content_hash: str
+    status: str
+    download_url: str
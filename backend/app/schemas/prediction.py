@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from pydantic import Field
+
+from ..models.enums import Currency, Unit
+from .base import BaseSchema
+
+
+class SimilarItemQuote(BaseSchema):
+    """An approved quote of a similar item"""
+
+    quote_id: int
+    craftsman_id: int
+    price: Decimal
+    currency: Currency
+    price_base: Decimal
+
+
+class SimilarItem(BaseSchema):
+    """A historical item resembling the one being priced"""
+
+    item_id: int
+    name: str
+    description: str | None = None
+    quantity: int
+    unit: Unit
+    # Cosine similarity of the character trigram vectors, 0 to 1
+    score: float
+    approved_quotes: list[SimilarItemQuote]
+
+
+class PriceEstimateRequest(BaseSchema):
+    """Options of a price estimate"""
+
+    k: int = Field(50, ge=1, le=200, description="Similar items to learn from")
+    min_score: float = Field(0.2, ge=0, le=1)
+    coverage: float = Field(0.8, gt=0, lt=1, description="Share of prices in range")
+    confidence: float = Field(0.95, gt=0, lt=1)
+
+
+class PriceRange(BaseSchema):
+    """Low, central and high price"""
+
+    low: Decimal
+    estimate: Decimal
+    high: Decimal
+
+
+class PriceInterval(BaseSchema):
+    """Bootstrap confidence interval of one price"""
+
+    lower: Decimal
+    upper: Decimal
+
+
+class PriceIntervals(BaseSchema):
+    """Confidence intervals of a price range"""
+
+    low: PriceInterval
+    estimate: PriceInterval
+    high: PriceInterval
+
+
+class PriceEstimate(BaseSchema):
+    """Predicted price of an item from similar items' approved quotes"""
+
+    item_id: int
+    currency: str
+    unit: Unit
+    quantity: int
+    # Approved quotes of similar items with the same unit
+    sample_size: int
+    similar_items: int
+    coverage: float
+    confidence: float
+    # None when there is no comparable history
+    unit_price: PriceRange | None = None
+    total: PriceRange | None = None
+    intervals: PriceIntervals | None = None
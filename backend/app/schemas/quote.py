@@ -3,7 +3,7 @@ from decimal import Decimal
 
 from pydantic import Field, field_validator
 
-from ..models.enums import Currency, QuoteStatus
+from ..models.enums import Currency, QuoteStatus, TaskStatus, Unit
 from .base import BaseResponseSchema, BaseSchema
 
 
@@ -82,3 +82,82 @@ class QuoteList(BaseSchema):
 
     quotes: list[QuoteResponse]
     total: int
+
+
+class QuoteComparisonEntry(BaseSchema):
+    """Single quote ranked against the other quotes for the same item"""
+
+    quote_id: int
+    craftsman_id: int
+    status: QuoteStatus
+    price: Decimal
+    currency: Currency
+    normalized_price: Decimal
+    rank: int
+    delta_from_best: Decimal
+    delta_from_best_percentage: Decimal | None = None
+
+
+class ItemQuoteComparison(BaseSchema):
+    """Side-by-side comparison of all quotes for one item"""
+
+    item_id: int
+    item_name: str
+    estimated_cost: Decimal | None = None
+    base_currency: str
+    quote_count: int
+    min_price: Decimal | None = None
+    median_price: Decimal | None = None
+    max_price: Decimal | None = None
+    spread: Decimal | None = None
+    savings_vs_estimate: Decimal | None = None
+    quotes: list[QuoteComparisonEntry]
+
+
+class CampaignQuoteComparison(BaseSchema):
+    """Quote comparison for every item of a campaign"""
+
+    campaign_id: int
+    base_currency: str
+    total_best_price: Decimal
+    total_estimated_cost: Decimal
+    total_savings_vs_estimate: Decimal
+    items: list[ItemQuoteComparison]
+
+
+class QuoteMessageParseRequest(BaseSchema):
+    """Schema for parsing a craftsman's WhatsApp message"""
+
+    text: str = Field(..., min_length=1, max_length=4096)
+
+
+class QuoteMessageParseResponse(BaseSchema):
+    """Price and work status extracted from a message, with confidence"""
+
+    price: Decimal | None = None
+    currency: Currency | None = None
+    price_confidence: float
+    status: TaskStatus | None = None
+    status_confidence: float
+
+
+class QuoteAnomalyResponse(BaseSchema):
+    """Quote priced unusually for its specialty and unit"""
+
+    quote_id: int
+    item_id: int
+    craftsman_id: int
+    price: Decimal
+    currency: Currency
+    specialty: str
+    unit: Unit
+    unit_price: float = Field(
+        ..., description="Price per unit in the base or requested currency"
+    )
+    typical_unit_price: float = Field(
+        ..., description="Median unit price of the specialty, in the same currency"
+    )
+    score: float = Field(
+        ..., description="Robust z-score: positive above, negative below typical"
+    )
+    detected_at: datetime
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Literal
+
+from .base import BaseSchema
+
+
+class MessageSearchHit(BaseSchema):
+    """A WhatsApp message or quote matching a search"""
+
+    source: Literal["message", "quote"]
+    id: int
+    craftsman_id: int | None = None
+    project_id: int | None = None
+    sent_at: datetime
+    rank: float
+    snippet: str
+
+
+class MessageSearchResults(BaseSchema):
+    """One page of search hits"""
+
+    items: list[MessageSearchHit]
+    next_cursor: str | None = None
@@ -0,0 +1,45 @@
+from datetime import date
+
+from ..models.enums import CampaignStatus, ProjectStatus, TaskStatus
+from .base import BaseSchema
+
+
+class TimelineProject(BaseSchema):
+    """A project bar"""
+
+    id: int
+    name: str
+    status: ProjectStatus
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+class TimelineCampaign(BaseSchema):
+    """A campaign bar"""
+
+    id: int
+    project_id: int
+    name: str
+    status: CampaignStatus
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+class TimelineTask(BaseSchema):
+    """A task milestone at its due date"""
+
+    id: int
+    project_id: int
+    title: str
+    status: TaskStatus
+    due_date: date
+
+
+class Timeline(BaseSchema):
+    """Everything intersecting a date window"""
+
+    date_from: date
+    date_to: date
+    projects: list[TimelineProject]
+    campaigns: list[TimelineCampaign]
+    tasks: list[TimelineTask]
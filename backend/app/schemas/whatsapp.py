@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from pydantic import Field
+
+from ..models.enums import MessageDirection, MessageStatus
+from .base import BaseResponseSchema, BaseSchema
+
+
+class WhatsAppMessageBase(BaseSchema):
+    """Base WhatsApp message schema with common fields"""
+
+    wa_message_id: str = Field(..., min_length=1, max_length=128)
+    direction: MessageDirection
+    phone: str = Field(..., min_length=1, max_length=20)
+    message_type: str = Field("text", max_length=32)
+    body: str | None = None
+    status: MessageStatus = MessageStatus.RECEIVED
+    sent_at: datetime
+    craftsman_id: int | None = None
+    project_id: int | None = None
+
+
+class WhatsAppMessageCreate(WhatsAppMessageBase):
+    """Schema for recording a WhatsApp message"""
+
+    pass
+
+
+class WhatsAppMessageUpdate(BaseSchema):
+    """Schema for updating a WhatsApp message"""
+
+    status: MessageStatus | None = None
+    craftsman_id: int | None = None
+    project_id: int | None = None
+
+
+class WhatsAppMessageResponse(WhatsAppMessageBase, BaseResponseSchema):
+    """Schema for WhatsApp message responses"""
+
+    status_updated_at: datetime | None = None
+
+
+class QuoteRequestCreate(BaseSchema):
+    """Schema for asking craftsmen to quote an item over WhatsApp"""
+
+    craftsman_ids: list[int] = Field(..., min_length=1, max_length=100)
+
+
+class QuoteRequestResult(BaseSchema):
+    """Outcome of one quote request message"""
+
+    craftsman_id: int
+    wa_message_id: str | None = None
+    error: str | None = None
+
+
+class QuoteRequestResponse(BaseSchema):
+    """Schema for quote request fan-out responses"""
+
+    item_id: int
+    sent: int
+    failed: int
+    results: list[QuoteRequestResult]
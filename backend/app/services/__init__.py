@@ -1,14 +1,35 @@
 # Business logic services
 
+from .anomaly import QuoteAnomalyService, quote_anomaly_service
 from .base import BaseCRUDService
+from .board import BoardService, board_service
+from .bulk_import import BulkImportService, bulk_import_service
 from .campaign import CampaignService, campaign_service
+from .changes import ChangeFeed, change_feed
 from .client import ClientService, client_service
 from .craftsman import CraftsmanService, craftsman_service
+from .dashboard import DashboardService, dashboard_service
+from .deadlines import DeadlineService, deadline_service
+from .document import DocumentService, document_service
+from .export import ExportService, export_service
+from .fx import FxJoin, FxRateCache, FxService, fx_service
 from .item import ItemService, item_service
+from .message import MessageService, message_service
+from .message_parser import QuoteMessageParser, message_parser
+from .pdf import PDFService, pdf_service
+from .prediction import PricePredictor, price_predictor
 from .project import ProjectService, project_service
 from .quote import QuoteService, quote_service
+from .reliability import ReliabilityService, reliability_service
+from .search import SearchService, search_service
+from .signed_urls import SignedURLService
+from .similarity import ItemSimilarityIndex, item_similarity_index
+from .status_history import StatusHistoryService, status_history_service
+from .storage import LocalStorageService, StorageService, UploadTooLargeError
 from .task import TaskService, task_service
+from .timeline import TimelineService, timeline_service
 from .user import UserService, user_service
+from .whatsapp import WhatsAppError, WhatsAppService
 
 __all__ = [
     # Base service
@@ -22,6 +43,32 @@ __all__ = [
     "ItemService",
     "QuoteService",
     "TaskService",
+    "PDFService",
+    "MessageService",
+    "QuoteMessageParser",
+    "SearchService",
+    "StatusHistoryService",
+    "BoardService",
+    "TimelineService",
+    "DeadlineService",
+    "DashboardService",
+    "PricePredictor",
+    "ItemSimilarityIndex",
+    "ReliabilityService",
+    "QuoteAnomalyService",
+    "ExportService",
+    "BulkImportService",
+    "FxService",
+    "FxRateCache",
+    "FxJoin",
+    "WhatsAppService",
+    "WhatsAppError",
+    "ChangeFeed",
+    "DocumentService",
+    "StorageService",
+    "LocalStorageService",
+    "SignedURLService",
+    "UploadTooLargeError",
     # Service instances
     "user_service",
     "client_service",
@@ -31,4 +78,22 @@ __all__ = [
     "item_service",
     "quote_service",
     "task_service",
+    "pdf_service",
+    "message_service",
+    "message_parser",
+    "search_service",
+    "status_history_service",
+    "board_service",
+    "timeline_service",
+    "deadline_service",
+    "dashboard_service",
+    "price_predictor",
+    "item_similarity_index",
+    "reliability_service",
+    "quote_anomaly_service",
+    "export_service",
+    "bulk_import_service",
+    "fx_service",
+    "change_feed",
+    "document_service",
 ]
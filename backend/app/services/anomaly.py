@@ -0,0 +1,291 @@
+"""
+Quote price anomaly detection.
+
+Quotes are compared with the quotes of the same specialty and unit using
+robust statistics: the median and the median absolute deviation (MAD) of
+log unit prices in the base currency, which a few extreme quotes cannot
+drag along the way they would a mean and standard deviation. The
+statistics live in the small ``quote_price_stats`` table, refreshed over a
+rolling window by a periodic job, so checking a new quote is one indexed
+lookup. Anomalies are kept in ``quote_anomalies``.
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import Float, Row, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..core.config import settings
+from ..models.anomaly import QuoteAnomaly, QuotePriceStats
+from ..models.craftsman import Craftsman
+from ..models.enums import Currency, Unit
+from ..models.item import Item
+from ..models.quote import Quote
+from .fx import FxJoin, fx_service
+from .reliability import normalize_specialty, primary_specialty
+
+# Scales the MAD to the standard deviation of normally distributed prices
+MAD_SCALE = 0.6745
+
+
+def robust_scores(
+    log_prices: np.ndarray, medians: np.ndarray, mads: np.ndarray
+) -> np.ndarray:
+    """Modified z-scores (Iglewicz and Hoaglin); zero where the MAD is zero"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(mads > 0, MAD_SCALE * (log_prices - medians) / mads, 0.0)
+
+
+def unit_price(fx: FxJoin):
+    """SQL expression for a quote's price per item unit, in the base currency"""
+    return cast(fx.price(Quote.price), Float) / Item.quantity
+
+
+class QuoteAnomalyService:
+    """Flags quotes priced far from their specialty and unit's median"""
+
+    def refresh_stats(self, db: Session, *, now: datetime | None = None) -> int:
+        """Recompute the statistics over the rolling window; returns the groups"""
+        since = (now or datetime.now(UTC)) - timedelta(
+            days=settings.QUOTE_ANOMALY_WINDOW_DAYS
+        )
+        fx = FxJoin(Quote.currency, Quote.created_at)
+        prices = (
+            fx.join(
+                select(
+                    primary_specialty(Craftsman.specialties).label("specialty"),
+                    Item.unit,
+                    func.ln(unit_price(fx)).label("price"),
+                )
+                .join(Quote.item)
+                .join(Quote.craftsman)
+            )
+            .where(Quote.created_at >= since, Quote.price > 0, Item.quantity > 0)
+            .cte("prices")
+        )
+        medians = (
+            select(
+                prices.c.specialty,
+                prices.c.unit,
+                func.count().label("samples"),
+                func.percentile_cont(0.5).within_group(prices.c.price).label("median"),
+            )
+            .group_by(prices.c.specialty, prices.c.unit)
+            .cte("medians")
+        )
+        stats = (
+            select(
+                medians.c.specialty,
+                medians.c.unit,
+                medians.c.samples,
+                medians.c.median,
+                func.percentile_cont(0.5).within_group(
+                    func.abs(prices.c.price - medians.c.median)
+                ),
+            )
+            .join(
+                prices,
+                (prices.c.specialty == medians.c.specialty)
+                & (prices.c.unit == medians.c.unit),
+            )
+            .group_by(
+                medians.c.specialty, medians.c.unit, medians.c.samples, medians.c.median
+            )
+        )
+        stmt = insert(QuotePriceStats).from_select(
+            ["specialty", "unit", "samples", "median", "mad"], stats
+        )
+        result = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["specialty", "unit"],
+                set_={
+                    "samples": stmt.excluded.samples,
+                    "median": stmt.excluded.median,
+                    "mad": stmt.excluded.mad,
+                    "computed_at": func.now(),
+                },
+            )
+        )
+        # Groups with no quotes left in the window
+        db.execute(
+            delete(QuotePriceStats).where(QuotePriceStats.computed_at < func.now())
+        )
+        db.commit()
+        return result.rowcount
+
+    def check(self, db: Session, quote_id: int) -> float | None:
+        """
+        Score one new or changed quote; returns its score if anomalous.
+
+        A primary key lookup of the quote, its item, craftsman and group
+        statistics, then an upsert or delete of its anomaly row.
+        """
+        rows = db.execute(self._scored().where(Quote.id == quote_id)).all()
+        anomalies = self._store(db, rows, QuoteAnomaly.quote_id == quote_id)
+        db.commit()
+        return anomalies.get(quote_id)
+
+    def backfill(self, db: Session, *, chunk_size: int = 5000) -> int:
+        """
+        Rescore every quote; returns the number of anomalies found.
+
+        Quotes are read in primary key order, a chunk at a time, and each
+        chunk is scored with NumPy in one go and committed on its own.
+        """
+        self.refresh_stats(db)
+        found, after = 0, 0
+        while True:
+            rows = db.execute(
+                self._scored()
+                .where(Quote.id > after)
+                .order_by(Quote.id)
+                .limit(chunk_size)
+            ).all()
+            last = rows[-1].id if len(rows) == chunk_size else None
+            chunk = QuoteAnomaly.quote_id > after
+            if last is not None:
+                chunk &= QuoteAnomaly.quote_id <= last
+            found += len(self._store(db, rows, chunk))
+            db.commit()
+            if last is None:
+                return found
+            after = last
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        specialty: str | None = None,
+        unit: Unit | None = None,
+        craftsman_id: int | None = None,
+        min_score: float | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        currency: Currency | None = None,
+    ) -> list[dict]:
+        """
+        Anomalies, most recently detected first.
+
+        Unit prices are kept in the base currency and given in ``currency``
+        at its latest rate.
+        """
+        rate = float(fx_service.rate(db, currency))
+        stmt = (
+            select(
+                QuoteAnomaly,
+                Quote.item_id,
+                Quote.craftsman_id,
+                Quote.price,
+                Quote.currency,
+            )
+            .join(QuoteAnomaly.quote)
+            .order_by(QuoteAnomaly.detected_at.desc(), QuoteAnomaly.quote_id.desc())
+        )
+        if specialty:
+            stmt = stmt.where(QuoteAnomaly.specialty == normalize_specialty(specialty))
+        if unit:
+            stmt = stmt.where(QuoteAnomaly.unit == unit)
+        if craftsman_id:
+            stmt = stmt.where(Quote.craftsman_id == craftsman_id)
+        if min_score is not None:
+            stmt = stmt.where(func.abs(QuoteAnomaly.score) >= min_score)
+        return [
+            {
+                "quote_id": anomaly.quote_id,
+                "item_id": item,
+                "craftsman_id": craftsman,
+                "price": price,
+                "currency": currency,
+                "specialty": anomaly.specialty,
+                "unit": anomaly.unit,
+                "unit_price": round(anomaly.unit_price / rate, 2),
+                "typical_unit_price": round(anomaly.typical_unit_price / rate, 2),
+                "score": anomaly.score,
+                "detected_at": anomaly.detected_at,
+            }
+            for anomaly, item, craftsman, price, currency in db.execute(
+                stmt.offset(skip).limit(limit)
+            )
+        ]
+
+    def _scored(self):
+        """Quotes with the statistics of their group, when it has enough"""
+        specialty = primary_specialty(Craftsman.specialties)
+        fx = FxJoin(Quote.currency, Quote.created_at)
+        return fx.join(
+            select(
+                Quote.id,
+                specialty.label("specialty"),
+                Item.unit,
+                unit_price(fx).label("unit_price"),
+                QuotePriceStats.median,
+                QuotePriceStats.mad,
+            )
+            .join(Quote.item)
+            .join(Quote.craftsman)
+            .join(
+                QuotePriceStats,
+                (QuotePriceStats.specialty == specialty)
+                & (QuotePriceStats.unit == Item.unit),
+            )
+        ).where(
+            QuotePriceStats.samples >= settings.QUOTE_ANOMALY_MIN_SAMPLES,
+            Quote.price > 0,
+            Item.quantity > 0,
+        )
+
+    def _store(
+        self, db: Session, rows: Sequence[Row], checked: ColumnElement[bool]
+    ) -> dict[int, float]:
+        """Flag the anomalous rows and clear the other ``checked`` quotes"""
+        anomalies: dict[int, float] = {}
+        if rows:
+            ids, specialties, units, prices, medians, mads = zip(*rows, strict=True)
+            prices = np.array(prices, dtype=float)
+            scores = robust_scores(
+                np.log(prices),
+                np.array(medians, dtype=float),
+                np.array(mads, dtype=float),
+            )
+            flagged = np.flatnonzero(np.abs(scores) >= settings.QUOTE_ANOMALY_THRESHOLD)
+            typical = np.exp(np.array(medians, dtype=float))
+            values = [
+                {
+                    "quote_id": ids[n],
+                    "specialty": specialties[n],
+                    "unit": units[n],
+                    "unit_price": round(float(prices[n]), 2),
+                    "typical_unit_price": round(float(typical[n]), 2),
+                    "score": round(float(scores[n]), 3),
+                }
+                for n in flagged
+            ]
+            anomalies = {value["quote_id"]: value["score"] for value in values}
+            if values:
+                stmt = insert(QuoteAnomaly).values(values)
+                db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["quote_id"],
+                        set_={
+                            "specialty": stmt.excluded.specialty,
+                            "unit": stmt.excluded.unit,
+                            "unit_price": stmt.excluded.unit_price,
+                            "typical_unit_price": stmt.excluded.typical_unit_price,
+                            "score": stmt.excluded.score,
+                        },
+                    )
+                )
+        db.execute(
+            delete(QuoteAnomaly).where(
+                checked, QuoteAnomaly.quote_id.not_in(list(anomalies))
+            )
+        )
+        return anomalies
+
+
+# Create instance
+quote_anomaly_service = QuoteAnomalyService()
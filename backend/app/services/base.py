@@ -1,9 +1,11 @@
+from collections.abc import Iterable
 from typing import Generic, TypeVar
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..models.base import BaseModel
+from .changes import ChangeOp, change_feed
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType")
@@ -37,6 +39,7 @@ class BaseCRUDService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.publish_change(db_obj, "create", fields=obj_data)
         return db_obj
 
     def update(
@@ -44,6 +47,11 @@ class BaseCRUDService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> ModelType:
         """Update an existing record"""
         obj_data = obj_in.model_dump(exclude_unset=True)
+        changed = [
+            field
+            for field, value in obj_data.items()
+            if getattr(db_obj, field) != value
+        ]
 
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
@@ -51,12 +59,37 @@ class BaseCRUDService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        if changed:
+            self.publish_change(db_obj, "update", fields=changed)
         return db_obj
 
     def delete(self, db: Session, *, id: int) -> ModelType | None:
         """Delete a record by ID"""
         obj = db.query(self.model).filter(self.model.id == id).first()
         if obj:
+            project_id = self.project_id_of(obj)
             db.delete(obj)
             db.commit()
+            self.publish_change(obj, "delete", project_id=project_id)
         return obj
+
+    def project_id_of(self, obj: ModelType) -> int | None:
+        """Project a record belongs to, used to route its change events"""
+        return getattr(obj, "project_id", None)
+
+    def publish_change(
+        self,
+        obj: ModelType,
+        op: ChangeOp,
+        *,
+        fields: Iterable[str] = (),
+        project_id: int | None = None,
+    ) -> None:
+        """Broadcast a committed change to /api/v1/stream subscribers"""
+        change_feed.publish(
+            entity=self.model.__tablename__,
+            id=obj.id,
+            op=op,
+            fields=fields,
+            project_id=project_id if op == "delete" else self.project_id_of(obj),
+        )
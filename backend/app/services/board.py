@@ -0,0 +1,145 @@
+from typing import Literal
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from ..models.campaign import Campaign
+from ..models.enums import QuoteStatus, TaskStatus
+from ..models.item import Item
+from ..models.quote import Quote
+from ..models.task import Task
+
+BoardEntity = Literal["tasks", "items", "quotes"]
+
+# Items have no status of their own; their column follows their quotes
+ITEM_COLUMNS = ("awaiting_quotes", "quoted", "approved")
+
+# Shown on every card; the remaining columns go into its details
+CARD_FIELDS = ("id", "title", "created_at", "updated_at")
+
+
+class BoardService:
+    """Kanban boards of a project.
+
+    A board is read with one statement: window functions number the rows
+    of each status column and count them, and only the first cards of each
+    column leave the database.
+    """
+
+    def get_board(
+        self,
+        db: Session,
+        *,
+        project_id: int,
+        entity: BoardEntity = "tasks",
+        per_column: int = 20,
+    ) -> dict:
+        """Every column of a board with its card count and first cards"""
+        rows, columns = getattr(self, f"_{entity}")(project_id)
+        changed = func.coalesce(rows.c.updated_at, rows.c.created_at)
+        ranked = select(
+            rows,
+            func.row_number()
+            .over(
+                partition_by=rows.c.column, order_by=(changed.desc(), rows.c.id.desc())
+            )
+            .label("position"),
+            func.count().over(partition_by=rows.c.column).label("total"),
+        ).subquery("ranked")
+        stmt = (
+            select(ranked)
+            .where(ranked.c.position <= per_column)
+            .order_by(ranked.c.column, ranked.c.position)
+        )
+
+        board = {column: {"count": 0, "cards": []} for column in columns}
+        for row in db.execute(stmt).mappings():
+            card = dict(row)
+            column = board[str(card.pop("column"))]
+            column["count"] = card.pop("total")
+            del card["position"]
+            column["cards"].append(
+                {key: card.pop(key) for key in CARD_FIELDS} | {"details": card}
+            )
+        return {
+            "project_id": project_id,
+            "entity": entity,
+            "columns": [
+                {"status": status, **column} for status, column in board.items()
+            ],
+        }
+
+    @staticmethod
+    def _tasks(project_id: int):
+        rows = select(
+            Task.id,
+            Task.title,
+            Task.status.label("column"),
+            Task.created_at,
+            Task.updated_at,
+            Task.priority,
+            Task.due_date,
+            Task.assigned_user_id,
+        ).where(Task.project_id == project_id)
+        return rows.subquery("cards"), [status.value for status in TaskStatus]
+
+    @staticmethod
+    def _quotes(project_id: int):
+        rows = (
+            select(
+                Quote.id,
+                Item.name.label("title"),
+                Quote.status.label("column"),
+                Quote.created_at,
+                Quote.updated_at,
+                Quote.price,
+                Quote.currency,
+                Quote.item_id,
+                Quote.craftsman_id,
+            )
+            .join(Item, Item.id == Quote.item_id)
+            .join(Campaign, Campaign.id == Item.campaign_id)
+            .where(Campaign.project_id == project_id)
+        )
+        return rows.subquery("cards"), [status.value for status in QuoteStatus]
+
+    @staticmethod
+    def _items(project_id: int):
+        def has_quote(status: QuoteStatus):
+            # Probes ix_quotes_item_status instead of aggregating all quotes
+            return (
+                select(Quote.id)
+                .where(Quote.item_id == Item.id, Quote.status == status)
+                .exists()
+            )
+
+        quote_count = (
+            select(func.count())
+            .where(Quote.item_id == Item.id)
+            .scalar_subquery()
+            .label("quote_count")
+        )
+        rows = (
+            select(
+                Item.id,
+                Item.name.label("title"),
+                case(
+                    (has_quote(QuoteStatus.APPROVED), "approved"),
+                    (has_quote(QuoteStatus.PENDING), "quoted"),
+                    else_="awaiting_quotes",
+                ).label("column"),
+                Item.created_at,
+                Item.updated_at,
+                Item.campaign_id,
+                Item.quantity,
+                Item.unit,
+                quote_count,
+            )
+            .join(Campaign, Campaign.id == Item.campaign_id)
+            .where(Campaign.project_id == project_id)
+        )
+        return rows.subquery("cards"), list(ITEM_COLUMNS)
+
+
+# Create instance
+board_service = BoardService()
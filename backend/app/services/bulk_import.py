@@ -0,0 +1,275 @@
+"""
+Bulk import of clients, craftsmen and items from CSV.
+
+Rows are validated a batch at a time with the same Pydantic schemas as the
+create endpoints. Valid rows are written with ``COPY`` into a temporary
+staging table, which is then merged into the target table by a single
+statement: staged rows matching an existing record on the entity's key
+update it and the rest are inserted. Nothing is written to the target
+table until every row has been read, and the whole import is committed
+(or rolled back) at once.
+
+The tables have no unique constraints to upsert against, so the keys are
+matched case-insensitively in the merge: clients by email, craftsmen by
+phone and items by campaign and name. Rows with no key are always
+inserted, and when a file repeats a key its last row wins. An update only
+writes the fields the row gives; missing or empty ones keep their value.
+"""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from enum import Enum
+from itertools import islice
+from typing import Literal
+
+from pydantic import ValidationError
+from sqlalchemy import (
+    Integer,
+    String,
+    Text,
+    and_,
+    case,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from ..models.base import BaseModel
+from ..models.client import Client
+from ..models.craftsman import Craftsman
+from ..models.item import Item
+from ..schemas.base import BaseSchema
+from ..schemas.client import ClientCreate
+from ..schemas.craftsman import CraftsmanCreate
+from ..schemas.item import ItemCreate
+from .prediction import price_predictor
+from .similarity import item_similarity_index
+
+ImportEntity = Literal["clients", "craftsmen", "items"]
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    model: type[BaseModel]
+    schema: type[BaseSchema]
+    # Columns identifying the existing record a row updates
+    key: tuple[str, ...]
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.schema.model_fields)
+
+
+TARGETS: dict[str, ImportTarget] = {
+    "clients": ImportTarget(Client, ClientCreate, ("email",)),
+    "craftsmen": ImportTarget(Craftsman, CraftsmanCreate, ("phone",)),
+    "items": ImportTarget(Item, ItemCreate, ("campaign_id", "name")),
+}
+
+
+def matched(expression):
+    """Key values compare case-insensitively"""
+    return func.lower(expression) if isinstance(expression.type, String) else expression
+
+
+def copy_value(value):
+    # Enum columns store member names; an empty unquoted field is NULL
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+class BulkImportService:
+    """Loads CSV files of clients, craftsmen or items"""
+
+    def __init__(self, *, batch_size: int = 5000, max_errors: int = 1000):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    def import_csv(
+        self, db: Session, entity: ImportEntity, lines: Iterable[str]
+    ) -> dict:
+        """
+        Import the rows of a CSV file with a header line; returns a report.
+
+        Unknown columns are ignored and empty fields take the schema's
+        default. Rows failing validation, or referencing a record that
+        does not exist, are skipped and listed in the report by line
+        number, up to ``max_errors`` of them.
+        """
+        target = TARGETS[entity]
+        columns = target.columns
+        staging = f"{entity}_import"
+        db.execute(
+            text(
+                f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT 0 AS line, NULL::text[] AS given, {', '.join(columns)} "
+                f"FROM {target.model.__tablename__} WITH NO DATA"
+            )
+        )
+        copy = (
+            f"COPY {staging} (line, given, {', '.join(columns)}) "
+            "FROM STDIN WITH (FORMAT csv)"
+        )
+        cursor = db.connection().connection.cursor()
+
+        report = {"entity": entity, "rows": 0, "failed": 0, "errors": []}
+        reader = csv.DictReader(lines)
+        if reader.fieldnames:
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        for batch in self._batches(reader):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for line, row in batch:
+                report["rows"] += 1
+                given = {
+                    name: value
+                    for name, value in row.items()
+                    if name in columns and value
+                }
+                try:
+                    obj = target.schema.model_validate(given)
+                except ValidationError as exc:
+                    self._fail(report, line, self._messages(exc))
+                    continue
+                writer.writerow(
+                    [
+                        line,
+                        "{" + ",".join(given) + "}",
+                        *(copy_value(getattr(obj, name)) for name in columns),
+                    ]
+                )
+            buffer.seek(0)
+            cursor.copy_expert(copy, buffer)
+
+        staged = table(
+            staging,
+            column("line", Integer),
+            column("given", ARRAY(Text)),
+            *(column(name, target.model.__table__.c[name].type) for name in columns),
+        )
+        for line, message in self._drop_orphans(db, target, staged):
+            self._fail(report, line, [message])
+        report["inserted"], report["updated"] = self._merge(db, target, staged)
+        db.commit()
+
+        if entity == "items":
+            # Reloaded on the next query rather than one item at a time;
+            # other processes flush on the burst of change notifications
+            item_similarity_index.flush()
+            price_predictor.estimates.flush()
+        return report
+
+    def _batches(self, reader: csv.DictReader) -> Iterator[list[tuple[int, dict]]]:
+        rows = ((reader.line_num, row) for row in reader)
+        while batch := list(islice(rows, self.batch_size)):
+            yield batch
+
+    def _fail(self, report: dict, line: int, messages: list[str]) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < self.max_errors:
+            report["errors"].append({"line": line, "errors": messages})
+
+    @staticmethod
+    def _messages(exc: ValidationError) -> list[str]:
+        return [
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        ]
+
+    def _drop_orphans(
+        self, db: Session, target: ImportTarget, staged
+    ) -> list[tuple[int, str]]:
+        """Remove staged rows whose foreign keys point nowhere"""
+        orphans = []
+        for fk in target.model.__table__.foreign_keys:
+            name = fk.parent.name
+            if name not in staged.c:
+                continue
+            referenced = fk.column
+            rows = db.execute(
+                delete(staged)
+                .where(~exists().where(referenced == staged.c[name]))
+                .returning(staged.c.line, staged.c[name])
+            )
+            orphans.extend(
+                (line, f"{name}: {referenced.table.name} {value} not found")
+                for line, value in rows
+            )
+        return sorted(orphans)
+
+    def _merge(self, db: Session, target: ImportTarget, staged) -> tuple[int, int]:
+        """Upsert the staged rows; returns the records inserted and updated"""
+        model_table = target.model.__table__
+        columns = target.columns
+        keys = [staged.c[name] for name in target.key]
+        latest = func.row_number().over(
+            partition_by=[matched(key) for key in keys],
+            order_by=staged.c.line.desc(),
+        )
+        ranked = select(staged, latest.label("rank")).cte("ranked")
+        source = (
+            select(ranked)
+            .where(
+                or_(
+                    ranked.c.rank == 1,
+                    *(ranked.c[name].is_(None) for name in target.key),
+                )
+            )
+            .cte("source")
+        )
+        updated = (
+            update(model_table)
+            .where(
+                and_(
+                    *(
+                        matched(model_table.c[name]) == matched(source.c[name])
+                        for name in target.key
+                    )
+                )
+            )
+            .values(
+                {
+                    # Fields the row leaves out keep their value
+                    name: case(
+                        (source.c.given.contains([name]), source.c[name]),
+                        else_=model_table.c[name],
+                    )
+                    for name in columns
+                }
+            )
+            .returning(source.c.line)
+            .cte("updated")
+        )
+        inserted = (
+            insert(model_table)
+            .from_select(
+                columns,
+                select(*(source.c[name] for name in columns)).where(
+                    source.c.line.not_in(select(updated.c.line))
+                ),
+            )
+            .returning(model_table.c.id)
+            .cte("inserted")
+        )
+        return db.execute(
+            select(
+                select(func.count()).select_from(inserted).scalar_subquery(),
+                select(func.count()).select_from(updated).scalar_subquery(),
+            )
+        ).one()
+
+
+# Create instance
+bulk_import_service = BulkImportService()
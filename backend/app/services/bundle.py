@@ -0,0 +1,152 @@
+import hashlib
+import io
+import mimetypes
+import threading
+import zipfile
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.document import Document
+from .document import safe_filename
+from .storage import LocalStorageService, StorageService
+
+ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed"}
+# Archive clutter added by macOS and Windows
+JUNK_NAMES = {"__MACOSX", ".DS_Store", "Thumbs.db", "desktop.ini"}
+
+Progress = Callable[[int, int], None]
+
+
+class HashingReader(io.RawIOBase):
+    """Pass a stream through while measuring its size and SHA-256"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.stream.read(len(buffer))
+        buffer[: len(data)] = data
+        self.digest.update(data)
+        self.size += len(data)
+        return len(data)
+
+
+def is_bundle(document: Document) -> bool:
+    """Whether a document is a ZIP archive that can be extracted"""
+    return (
+        document.content_type in ZIP_CONTENT_TYPES
+        or document.filename.lower().endswith(".zip")
+    )
+
+
+def entry_path(name: str) -> str | None:
+    """Safe relative key for an archive entry, None for clutter"""
+    parts = [part for part in PurePosixPath(name.replace("\\", "/")).parts]
+    if not parts or any(part in JUNK_NAMES or part == ".." for part in parts):
+        return None
+    return "/".join(safe_filename(part) for part in parts if part not in ("/", "."))
+
+
+class BundleService:
+    """Extract ZIP bundles of drawings back into document storage.
+
+    The archive is read in place (on S3 with ranged GETs), so it is never
+    downloaded whole. Entries are decompressed and uploaded by a bounded
+    pool of threads, each streaming its entry in checksummed parts, and
+    the extracted files are indexed with one bulk insert at the end.
+    """
+
+    def __init__(
+        self,
+        storage: StorageService | LocalStorageService,
+        *,
+        concurrency: int = settings.BUNDLE_EXTRACT_CONCURRENCY,
+        max_extracted_bytes: int = settings.BUNDLE_MAX_EXTRACTED_BYTES,
+    ):
+        self.storage = storage
+        self.concurrency = concurrency
+        self.max_extracted_bytes = max_extracted_bytes
+
+    def extract(
+        self, db: Session, document: Document, *, progress: Progress | None = None
+    ) -> int:
+        """
+        Extract a bundle under projects/{id}/cad/ and index its files.
+
+        Keys depend only on the bundle and the entry path, so running it
+        again overwrites the same objects and skips rows already indexed.
+        Returns the number of extracted files.
+        """
+        local = threading.local()
+        opened: list = []
+
+        def archive() -> zipfile.ZipFile:
+            # One reader per thread: entries are read from different offsets
+            if not hasattr(local, "archive"):
+                reader = self.storage.open(document.s3_key)
+                local.archive = zipfile.ZipFile(reader)
+                # A ZipFile leaves the file it was given open
+                opened.extend([local.archive, reader])
+            return local.archive
+
+        entries = [
+            (info, path)
+            for info in archive().infolist()
+            if not info.is_dir() and (path := entry_path(info.filename))
+        ]
+        if sum(info.file_size for info, _ in entries) > self.max_extracted_bytes:
+            raise ValueError("Bundle expands beyond the extraction size limit")
+
+        prefix = f"projects/{document.project_id}/cad/{document.id}"
+        folder = f"cad/{PurePosixPath(document.filename).stem}"
+        done = 0
+        lock = threading.Lock()
+
+        def extract_entry(entry: tuple[zipfile.ZipInfo, str]) -> dict:
+            nonlocal done
+            info, path = entry
+            key = f"{prefix}/{path}"
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            with archive().open(info) as member:
+                reader = HashingReader(member)
+                self.storage.put_file(key, reader, content_type=content_type)
+            with lock:
+                done += 1
+                if progress:
+                    progress(done, len(entries))
+            return {
+                "filename": PurePosixPath(path).name[:255],
+                "path": f"{folder}/{path}"[:1024],
+                "content_type": content_type,
+                "size": reader.size,
+                "sha256": reader.digest.hexdigest(),
+                "s3_key": key,
+                "project_id": document.project_id,
+                "campaign_id": document.campaign_id,
+                "item_id": document.item_id,
+                "uploaded_by_id": document.uploaded_by_id,
+                "tags": document.tags,
+            }
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                rows = list(pool.map(extract_entry, entries))
+        finally:
+            for file in opened:
+                file.close()
+
+        if rows:
+            stmt = insert(Document).values(rows)
+            db.execute(stmt.on_conflict_do_nothing(index_elements=["s3_key"]))
+            db.commit()
+        return len(rows)
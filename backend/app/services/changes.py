@@ -0,0 +1,71 @@
+import json
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Literal
+
+import redis
+from redis.exceptions import RedisError
+
+from ..core.config import settings
+from ..core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+ChangeOp = Literal["create", "update", "delete"]
+
+
+def changes_channel(project_id: int | None = None) -> str:
+    """Pub/sub channel for every change, or for one project's changes"""
+    if project_id is None:
+        return settings.CHANGE_FEED_CHANNEL
+    return f"{settings.CHANGE_FEED_CHANNEL}:project:{project_id}"
+
+
+class ChangeFeed:
+    """Broadcast compact change events over Redis pub/sub.
+
+    Every event goes to the global channel and, when the row belongs to a
+    project, to that project's channel, so any API worker can forward it to
+    its connected clients. Publishing is best effort: a Redis outage must
+    never fail the write that has already been committed.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    def publish(
+        self,
+        *,
+        entity: str,
+        id: int,
+        op: ChangeOp,
+        fields: Iterable[str] = (),
+        project_id: int | None = None,
+    ) -> None:
+        """Publish a change event after its transaction committed"""
+        if not settings.CHANGE_FEED_ENABLED:
+            return
+        event = json.dumps(
+            {
+                "entity": entity,
+                "id": id,
+                "op": op,
+                "fields": sorted(fields),
+                "project_id": project_id,
+                "at": datetime.now(UTC).isoformat(),
+            },
+            separators=(",", ":"),
+        )
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                pipe.publish(changes_channel(), event)
+                if project_id is not None:
+                    pipe.publish(changes_channel(project_id), event)
+                pipe.execute()
+        except RedisError:
+            logger.warning("Could not publish %s %s %s", op, entity, id, exc_info=True)
+
+
+# Create instance
+change_feed = ChangeFeed(redis_client)
@@ -16,6 +16,14 @@ class CraftsmanService(BaseCRUDService[Craftsman, CraftsmanCreate, CraftsmanUpda
         """Get craftsman by WhatsApp number"""
         return db.query(Craftsman).filter(Craftsman.whatsapp == whatsapp).first()
 
+    def get_by_ids(self, db: Session, *, ids: list[int]) -> list[Craftsman]:
+        """Get craftsmen by ID, in the order requested"""
+        craftsmen = {
+            craftsman.id: craftsman
+            for craftsman in db.query(Craftsman).filter(Craftsman.id.in_(ids))
+        }
+        return [craftsmen[id] for id in ids if id in craftsmen]
+
     def get_active(
         self, db: Session, *, skip: int = 0, limit: int = 100
     ) -> list[Craftsman]:
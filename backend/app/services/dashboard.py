@@ -0,0 +1,403 @@
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Literal
+
+from sqlalchemy import Date, cast, func, select, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.checkpoint import JobCheckpoint
+from ..models.enums import Currency, ProjectStatus, QuoteStatus
+from ..models.kpi import KpiDaily, KpiMonthly
+from ..models.quote import Quote
+from ..models.status_history import StatusCurrent, StatusHistory
+from .fx import FxJoin, fx_service
+from .status_history import month_start, next_month, status_history_service
+
+CHECKPOINT = "kpi-rollup"
+
+Granularity = Literal["day", "month"]
+Period = Literal["month", "quarter", "year"]
+
+PERIOD_MONTHS: dict[str, int] = {"month": 1, "quarter": 3, "year": 12}
+
+MEASURES = (
+    "quotes_received",
+    "quotes_approved",
+    "cost",
+    "revenue",
+    "projects_started",
+    "projects_completed",
+)
+
+CENT = Decimal("0.01")
+
+
+def utc_day(column):
+    return cast(func.timezone("UTC", column), Date)
+
+
+def midnight(day: date) -> datetime:
+    return datetime.combine(day, time(), UTC)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after (or before) ``day``'s"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def period_start(period: Period, on: date) -> date:
+    months = PERIOD_MONTHS[period]
+    return date(on.year, (on.month - 1) // months * months + 1, 1)
+
+
+def percent_change(current: Decimal | int, previous: Decimal | int) -> float | None:
+    if not previous:
+        return None
+    return round(float((current - previous) / previous * 100), 2)
+
+
+class DashboardService:
+    """KPI rollups behind the dashboard.
+
+    A periodic job folds quote approvals and project transitions into the
+    ``kpi_daily`` table and sums the touched months into ``kpi_monthly``.
+    Dashboard reads only those tables, so comparing periods adds up a
+    handful of monthly rows.
+    """
+
+    def rollup(
+        self, db: Session, *, full: bool = False, today: date | None = None
+    ) -> int:
+        """
+        Recompute the daily rollups that may have changed; returns the days.
+
+        An incremental run (the default) redoes the days with quote or
+        project status changes since the previous run, the days quotes
+        approved before were approved on and the approval days of approved
+        quotes edited since. Deleted quotes are only noticed by a full run.
+        """
+        today = today or datetime.now(UTC).date()
+        checkpoint = None if full else db.get(JobCheckpoint, CHECKPOINT)
+        if checkpoint is None:
+            # Everything with data, and the days that may no longer have any
+            days = set(db.scalars(select(KpiDaily.day)))
+            window = None
+        else:
+            days = self._changed_days(db, midnight(checkpoint.watermark))
+            window = (min(days | {today}), max(days | {today}) + timedelta(days=1))
+        days.add(today)
+
+        totals = self._aggregate(db, window)
+        if window is None:
+            days.update(totals)
+        # Only today's row can take a snapshot of the projects in progress
+        active = db.scalar(
+            select(func.count()).where(
+                StatusCurrent.entity == "projects",
+                StatusCurrent.status == ProjectStatus.ACTIVE.name,
+            )
+        )
+        rows = [
+            {
+                "day": day,
+                **dict.fromkeys(MEASURES, 0),
+                **totals.get(day, {}),
+                "projects_active": active if day == today else None,
+            }
+            for day in sorted(days)
+        ]
+        stmt = insert(KpiDaily)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["day"],
+                set_={
+                    **{name: stmt.excluded[name] for name in MEASURES},
+                    "projects_active": func.coalesce(
+                        stmt.excluded.projects_active, KpiDaily.projects_active
+                    ),
+                    "updated_at": func.now(),
+                },
+            ),
+            rows,
+        )
+        self._rollup_months(db, {month_start(day) for day in days})
+
+        stmt = insert(JobCheckpoint).values(name=CHECKPOINT, watermark=today)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["name"], set_={"watermark": stmt.excluded.watermark}
+            )
+        )
+        db.commit()
+        return len(rows)
+
+    def metrics(
+        self,
+        db: Session,
+        *,
+        today: date | None = None,
+        currency: Currency | None = None,
+    ) -> dict:
+        """This month's KPIs, the projects in progress and the worst bottlenecks"""
+        today = today or datetime.now(UTC).date()
+        start = month_start(today)
+        month = db.get(KpiMonthly, start)
+        return {
+            "month": self._period(
+                start,
+                next_month(start),
+                [month] if month else [],
+                currency=currency,
+                rate=fx_service.rate(db, currency),
+            ),
+            "projects_in_progress": db.scalar(
+                select(KpiDaily.projects_active)
+                .where(KpiDaily.projects_active.is_not(None))
+                .order_by(KpiDaily.day.desc())
+                .limit(1)
+            )
+            or 0,
+            "bottlenecks": status_history_service.bottlenecks(db, limit=5),
+        }
+
+    def history(
+        self,
+        db: Session,
+        *,
+        granularity: Granularity = "month",
+        date_from: date | None = None,
+        date_to: date | None = None,
+        currency: Currency | None = None,
+    ) -> list[dict]:
+        """KPIs of every day or month in [date_from, date_to)"""
+        rate = fx_service.rate(db, currency)
+        model, key = (
+            (KpiDaily, KpiDaily.day)
+            if granularity == "day"
+            else (KpiMonthly, KpiMonthly.month)
+        )
+        stmt = select(model).order_by(key)
+        if date_from:
+            if granularity == "month":
+                date_from = month_start(date_from)
+            stmt = stmt.where(key >= date_from)
+        if date_to:
+            stmt = stmt.where(key < date_to)
+        results = []
+        for row in db.scalars(stmt):
+            start = getattr(row, key.key)
+            end = (
+                start + timedelta(days=1) if granularity == "day" else next_month(start)
+            )
+            results.append(
+                self._period(start, end, [row], currency=currency, rate=rate)
+            )
+        return results
+
+    def compare(
+        self,
+        db: Session,
+        *,
+        period: Period = "quarter",
+        on: date | None = None,
+        currency: Currency | None = None,
+    ) -> dict:
+        """KPIs of the period containing ``on`` against the one before"""
+        rate = fx_service.rate(db, currency)
+        start = period_start(period, on or datetime.now(UTC).date())
+        months = PERIOD_MONTHS[period]
+        previous_start, end = add_months(start, -months), add_months(start, months)
+        rows = list(
+            db.scalars(
+                select(KpiMonthly)
+                .where(KpiMonthly.month >= previous_start, KpiMonthly.month < end)
+                .order_by(KpiMonthly.month)
+            )
+        )
+        current = self._period(
+            start,
+            end,
+            [r for r in rows if r.month >= start],
+            currency=currency,
+            rate=rate,
+        )
+        previous = self._period(
+            previous_start,
+            start,
+            [r for r in rows if r.month < start],
+            currency=currency,
+            rate=rate,
+        )
+        return {
+            "period": period,
+            "current": current,
+            "previous": previous,
+            "changes": {
+                name: percent_change(current[name], previous[name])
+                for name in (*MEASURES, "profit")
+            },
+        }
+
+    def _changed_days(self, db: Session, since: datetime) -> set[date]:
+        approved = (StatusCurrent.entity == "quotes") & (
+            StatusCurrent.status == QuoteStatus.APPROVED.name
+        )
+        changed = select(utc_day(StatusHistory.changed_at)).where(
+            StatusHistory.changed_at >= since,
+            StatusHistory.entity.in_(["quotes", "projects"]),
+        )
+        unapproved = select(utc_day(StatusHistory.entered_at)).where(
+            StatusHistory.changed_at >= since,
+            StatusHistory.entity == "quotes",
+            StatusHistory.from_status == QuoteStatus.APPROVED.name,
+        )
+        edited = (
+            select(utc_day(StatusCurrent.since))
+            .join(Quote, Quote.id == StatusCurrent.entity_id)
+            .where(approved, Quote.updated_at >= since)
+        )
+        return set(db.scalars(union(changed, unapproved, edited)))
+
+    def _aggregate(
+        self, db: Session, window: tuple[date, date] | None
+    ) -> dict[date, dict]:
+        """Measures of every day with data, within the window if given"""
+        fx = FxJoin(Quote.currency, Quote.created_at)
+        cost = fx.price(Quote.price)
+        revenue = func.round(
+            cost * (1 + func.coalesce(Quote.margin_percentage, 0) / 100), 2
+        )
+        approval_day = utc_day(StatusCurrent.since)
+        approved = (
+            fx.join(
+                select(
+                    approval_day.label("day"),
+                    func.count().label("quotes_approved"),
+                    func.sum(cost).label("cost"),
+                    func.sum(revenue).label("revenue"),
+                ).join(Quote, Quote.id == StatusCurrent.entity_id)
+            )
+            .where(
+                StatusCurrent.entity == "quotes",
+                StatusCurrent.status == QuoteStatus.APPROVED.name,
+            )
+            .group_by(approval_day)
+        )
+        created_day = utc_day(Quote.created_at)
+        received = select(
+            created_day.label("day"), func.count().label("quotes_received")
+        ).group_by(created_day)
+
+        change_day = utc_day(StatusHistory.changed_at)
+        # Resuming a project on hold does not start it again
+        started = (StatusHistory.to_status == ProjectStatus.ACTIVE.name) & (
+            func.coalesce(StatusHistory.from_status, "") != ProjectStatus.ON_HOLD.name
+        )
+        projects = (
+            select(
+                change_day.label("day"),
+                func.count().filter(started).label("projects_started"),
+                func.count()
+                .filter(StatusHistory.to_status == ProjectStatus.COMPLETED.name)
+                .label("projects_completed"),
+            )
+            .where(StatusHistory.entity == "projects")
+            .group_by(change_day)
+        )
+        if window:
+            start, end = midnight(window[0]), midnight(window[1])
+            approved = approved.where(
+                StatusCurrent.since >= start, StatusCurrent.since < end
+            )
+            received = received.where(Quote.created_at >= start, Quote.created_at < end)
+            projects = projects.where(
+                StatusHistory.changed_at >= start, StatusHistory.changed_at < end
+            )
+
+        totals: dict[date, dict] = {}
+        for stmt in (approved, received, projects):
+            for row in db.execute(stmt).mappings():
+                totals.setdefault(row["day"], {}).update(
+                    (name, value) for name, value in row.items() if name != "day"
+                )
+        return totals
+
+    def _rollup_months(self, db: Session, months: set[date]) -> None:
+        """Sum the days of each month into its monthly row"""
+        if not months:
+            return
+        days = db.scalars(
+            select(KpiDaily)
+            .where(KpiDaily.day >= min(months), KpiDaily.day < next_month(max(months)))
+            .order_by(KpiDaily.day)
+        )
+        sums: dict[date, dict] = {}
+        for day in days:
+            month = month_start(day.day)
+            if month not in months:
+                continue
+            row = sums.setdefault(
+                month,
+                {"month": month, **dict.fromkeys(MEASURES, 0), "projects_active": None},
+            )
+            for name in MEASURES:
+                row[name] += getattr(day, name)
+            if day.projects_active is not None:
+                row["projects_active"] = day.projects_active
+        if not sums:
+            return
+        stmt = insert(KpiMonthly)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["month"],
+                set_={
+                    **{
+                        name: stmt.excluded[name]
+                        for name in (*MEASURES, "projects_active")
+                    },
+                    "updated_at": func.now(),
+                },
+            ),
+            list(sums.values()),
+        )
+
+    @staticmethod
+    def _period(
+        start: date,
+        end: date,
+        rows: list,
+        *,
+        currency: Currency | None = None,
+        rate: Decimal = Decimal("1"),
+    ) -> dict:
+        """
+        Sum rollup rows into the KPIs of one period.
+
+        Amounts are rolled up in the base currency; ``rate`` is the
+        reporting ``currency``'s rate to base.
+        """
+        period: dict = {
+            "start": start,
+            "end": end,
+            "currency": currency or settings.BASE_CURRENCY,
+        }
+        for name in MEASURES:
+            period[name] = sum((getattr(row, name) for row in rows), 0)
+        period["cost"] = (Decimal(period["cost"]) / rate).quantize(CENT)
+        period["revenue"] = (Decimal(period["revenue"]) / rate).quantize(CENT)
+        period["profit"] = period["revenue"] - period["cost"]
+        period["average_margin_percentage"] = (
+            (period["profit"] / period["cost"] * 100).quantize(CENT)
+            if period["cost"]
+            else None
+        )
+        snapshots = [r.projects_active for r in rows if r.projects_active is not None]
+        period["projects_active"] = snapshots[-1] if snapshots else None
+        return period
+
+
+# Create instance
+dashboard_service = DashboardService()
@@ -0,0 +1,236 @@
+import json
+import logging
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
+
+import redis
+from redis.exceptions import LockError
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.redis import redis_client
+from ..models.checkpoint import JobCheckpoint
+from ..models.enums import TaskStatus
+from ..models.task import Task
+
+logger = logging.getLogger(__name__)
+
+AlertKind = Literal["overdue", "due_soon"]
+
+# Called with the assignee (None for unassigned tasks), the kind and a batch
+Notify = Callable[[int | None, AlertKind, list[dict]], None]
+
+CHECKPOINT = "task-deadlines"
+
+# Matches the predicate of ix_tasks_open_due_date
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+
+# A task is only alerted once per kind and due date; moving its due date
+# makes it eligible again
+ALERT_KEY_TTL = timedelta(days=30)
+
+
+def alert_key(kind: AlertKind, task_id: int, due_date: date | str) -> str:
+    """Redis key marking an alert as sent"""
+    if isinstance(due_date, date):
+        due_date = due_date.isoformat()
+    return f"deadline-alert:{kind}:{task_id}:{due_date}"
+
+
+def notifications_channel(user_id: int | None = None) -> str:
+    """Pub/sub channel for a user's notifications, or for unassigned work"""
+    if user_id is None:
+        return f"{settings.NOTIFICATION_CHANNEL}:unassigned"
+    return f"{settings.NOTIFICATION_CHANNEL}:user:{user_id}"
+
+
+class DeadlineService:
+    """Overdue and due-soon alerts for open tasks.
+
+    A sweep only reads the due dates that crossed a threshold since the
+    previous sweep: tasks due in [watermark, today) have just become overdue
+    and tasks due in [watermark + lead, today + lead) have just come within
+    the due-soon horizon. Both windows are paged through the partial index
+    on open tasks, so the cost follows the number of alerts rather than the
+    size of the table. Alerts are de-duplicated in Redis, batched per
+    assignee and handed to ``notify``; the watermark only moves once every
+    batch has been enqueued, so an interrupted sweep is simply redone.
+
+    Tasks created or moved since the previous sweep started may have due
+    dates in windows already swept, so those windows are read again for
+    just the tasks changed since then, through their own partial index.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        *,
+        page_size: int = 1000,
+        lock_timeout: int = 10 * 60,
+    ):
+        self.client = client
+        self.page_size = page_size
+        self.lock_timeout = lock_timeout
+
+    def sweep(
+        self, db: Session, notify: Notify, *, today: date | None = None
+    ) -> dict[str, int] | None:
+        """
+        Alert the tasks that became overdue or due soon since the last sweep.
+
+        Returns the number of alerts sent per kind, or None when another
+        worker is already sweeping.
+        """
+        lock = self.client.lock(
+            f"lock:{CHECKPOINT}", timeout=self.lock_timeout, blocking=False
+        )
+        if not lock.acquire():
+            logger.info("Deadline sweep already running elsewhere")
+            return None
+        try:
+            return self._sweep(db, notify, today or datetime.now(UTC).date())
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                logger.warning("Deadline sweep outlived its lock")
+
+    def deliver(self, user_id: int | None, kind: AlertKind, alerts: list[dict]) -> None:
+        """Publish one batch of alerts to its recipient's channel"""
+        message = json.dumps(
+            {"type": f"task_{kind}", "user_id": user_id, "tasks": alerts},
+            separators=(",", ":"),
+        )
+        self.client.publish(notifications_channel(user_id), message)
+
+    def _sweep(self, db: Session, notify: Notify, today: date) -> dict[str, int]:
+        started = datetime.now(UTC)
+        checkpoint = db.get(JobCheckpoint, CHECKPOINT)
+        lookback = today - timedelta(days=settings.DEADLINE_FIRST_RUN_LOOKBACK_DAYS)
+        watermark = checkpoint.watermark if checkpoint else lookback
+        lead = timedelta(days=settings.DEADLINE_DUE_SOON_DAYS)
+        windows: dict[AlertKind, tuple[date, date]] = {
+            "overdue": (watermark, today),
+            "due_soon": (max(watermark + lead, today), today + lead),
+        }
+        sent = {
+            kind: self._alert(db, notify, kind, start, end)
+            for kind, (start, end) in windows.items()
+        }
+        if checkpoint:
+            # The swept windows again, for tasks changed since the last run
+            swept: dict[AlertKind, tuple[date, date]] = {
+                "overdue": (lookback, windows["overdue"][0]),
+                "due_soon": (today, windows["due_soon"][0]),
+            }
+            for kind, (start, end) in swept.items():
+                sent[kind] += self._alert(
+                    db, notify, kind, start, end, changed_since=checkpoint.updated_at
+                )
+
+        stmt = insert(JobCheckpoint).values(
+            name=CHECKPOINT, watermark=today, updated_at=started
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={
+                    "watermark": stmt.excluded.watermark,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+        db.commit()
+        return sent
+
+    def _alert(
+        self,
+        db: Session,
+        notify: Notify,
+        kind: AlertKind,
+        start: date,
+        end: date,
+        *,
+        changed_since: datetime | None = None,
+    ) -> int:
+        """Alert every open task due in [start, end) not alerted yet"""
+        stmt = (
+            select(
+                Task.id,
+                Task.title,
+                Task.due_date,
+                Task.project_id,
+                Task.assigned_user_id,
+            )
+            .where(
+                Task.status.in_(OPEN_STATUSES),
+                Task.due_date >= start,
+                Task.due_date < end,
+            )
+            .order_by(Task.due_date, Task.id)
+            .limit(self.page_size)
+        )
+        if changed_since is not None:
+            # Matches the expression of ix_tasks_open_changed_at
+            stmt = stmt.where(
+                func.coalesce(Task.updated_at, Task.created_at) >= changed_since
+            )
+        batches: dict[int | None, list[dict]] = {}
+        sent = 0
+        after = None
+        while start < end:
+            page = db.execute(
+                stmt
+                if after is None
+                else stmt.where(tuple_(Task.due_date, Task.id) > after)
+            ).all()
+            for row in self._claim(kind, page):
+                batch = batches.setdefault(row.assigned_user_id, [])
+                batch.append(
+                    {
+                        "task_id": row.id,
+                        "title": row.title,
+                        "project_id": row.project_id,
+                        "due_date": row.due_date.isoformat(),
+                    }
+                )
+                if len(batch) >= settings.DEADLINE_ALERT_BATCH_SIZE:
+                    sent += self._send(notify, kind, row.assigned_user_id, batch)
+                    del batches[row.assigned_user_id]
+            if len(page) < self.page_size:
+                break
+            after = (page[-1].due_date, page[-1].id)
+
+        for user_id, batch in batches.items():
+            sent += self._send(notify, kind, user_id, batch)
+        return sent
+
+    def _claim(self, kind: AlertKind, rows: list) -> list:
+        """Rows whose alert has not been sent before, marking them as sent"""
+        with self.client.pipeline(transaction=False) as pipe:
+            for row in rows:
+                pipe.set(
+                    alert_key(kind, row.id, row.due_date), 1, nx=True, ex=ALERT_KEY_TTL
+                )
+            claimed = pipe.execute()
+        return [row for row, fresh in zip(rows, claimed, strict=True) if fresh]
+
+    def _send(
+        self, notify: Notify, kind: AlertKind, user_id: int | None, batch: list[dict]
+    ) -> int:
+        try:
+            notify(user_id, kind, batch)
+        except Exception:
+            # Release the claims so the redone sweep alerts these tasks
+            self.client.delete(
+                *(alert_key(kind, a["task_id"], a["due_date"]) for a in batch)
+            )
+            raise
+        return len(batch)
+
+
+# Create instance
+deadline_service = DeadlineService(redis_client)
@@ -0,0 +1,234 @@
+import mimetypes
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import PurePosixPath
+
+from sqlalchemy import delete, select, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.orm import Session
+
+from ..models.document import Document
+from ..models.project import Project
+from ..schemas.document import DocumentCreate, DocumentUpdate
+from .base import BaseCRUDService
+from .search import decode_keyset, encode_cursor
+from .storage import LocalStorageService, StorageService
+
+PROJECT_KEY = re.compile(r"projects/(\d+)/(?:[0-9a-f]{32}/)?(.+)")
+
+
+def safe_filename(filename: str) -> str:
+    """Last path component with anything unusual for an S3 key replaced"""
+    name = re.split(r"[\\/]", filename)[-1]
+    return re.sub(r"[^\w.\-]+", "_", name).strip("._") or "file"
+
+
+def document_key(project_id: int, filename: str) -> str:
+    """Unique S3 key for a new document of a project"""
+    return f"projects/{project_id}/{uuid.uuid4().hex}/{safe_filename(filename)}"
+
+
+def document_path(folder: str | None, filename: str) -> str:
+    """Path of a document within its project, without empty segments"""
+    parts = [part for part in re.split(r"[\\/]", folder or "") if part.strip()]
+    return "/".join([*parts, filename])[:1024]
+
+
+@dataclass
+class ReconcileReport:
+    """What a storage reconciliation found and fixed"""
+
+    listed: int = 0
+    added: int = 0
+    removed: int = 0
+    # Objects outside any known project, left for a human to look at
+    orphaned: list[str] = field(default_factory=list)
+
+
+class DocumentService(BaseCRUDService[Document, DocumentCreate, DocumentUpdate]):
+    """Metadata of files stored in S3"""
+
+    def get_by_project(
+        self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100
+    ) -> list[Document]:
+        """Get documents by project ID"""
+        return (
+            db.query(Document)
+            .filter(Document.project_id == project_id)
+            .order_by(Document.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def search(
+        self,
+        db: Session,
+        *,
+        project_id: int | None = None,
+        content_type: str | None = None,
+        path_prefix: str | None = None,
+        tag: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> dict:
+        """
+        Filter documents, newest first, a keyset page at a time.
+
+        Every filter combination has a composite index ending in
+        (created_at, id), so a page is an index range scan however deep
+        the cursor is. A content type ending in "/*" matches the family,
+        e.g. "image/*".
+        """
+        stmt = select(Document)
+        if project_id is not None:
+            stmt = stmt.where(Document.project_id == project_id)
+        if content_type:
+            if content_type.endswith("/*"):
+                stmt = stmt.where(
+                    Document.content_type.startswith(content_type[:-1], autoescape=True)
+                )
+            else:
+                stmt = stmt.where(Document.content_type == content_type)
+        if path_prefix:
+            stmt = stmt.where(Document.path.startswith(path_prefix, autoescape=True))
+        if tag:
+            # JSONB containment, answered by the GIN index on tags
+            tags = type_coerce(Document.tags, JSONB)
+            stmt = stmt.where(tags.contains([tag.strip().lower()]))
+        if created_from is not None:
+            stmt = stmt.where(Document.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(Document.created_at < created_to)
+        if cursor:
+            created_at, id = decode_keyset(cursor, 2)
+            if not isinstance(created_at, str) or not isinstance(id, int):
+                raise ValueError("Invalid cursor")
+            stmt = stmt.where(
+                tuple_(Document.created_at, Document.id)
+                < tuple_(datetime.fromisoformat(created_at), id)
+            )
+        stmt = stmt.order_by(Document.created_at.desc(), Document.id.desc())
+        documents = db.scalars(stmt.limit(limit + 1)).all()
+
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            last = documents[-1]
+            next_cursor = encode_cursor([last.created_at, last.id])
+        return {"items": documents, "next_cursor": next_cursor}
+
+    def reconcile(
+        self,
+        db: Session,
+        storage: StorageService | LocalStorageService,
+        *,
+        prefix: str = "projects/",
+        page_size: int = 1000,
+        grace: timedelta = timedelta(hours=1),
+    ) -> ReconcileReport:
+        """
+        Bring the index in line with what storage holds.
+
+        The listing is paged and each page is diffed against the index rows
+        in the same key range with one query: s3_key uses a byte-wise
+        collation, so rows and objects sort alike. Objects without a row are
+        indexed and rows without an object are dropped, both in bulk.
+        Anything younger than ``grace`` is left alone so uploads in flight
+        are not mistaken for strays.
+        """
+        report = ReconcileReport()
+        cutoff = datetime.now(UTC) - grace
+        projects = set(db.scalars(select(Project.id)))
+        after = None
+        for page in storage.list_pages(prefix, page_size):
+            objects = {obj["Key"]: obj for obj in page}
+            if not objects:
+                continue
+            last = max(objects)
+            report.listed += len(objects)
+            indexed = self._indexed(db, prefix, after, last)
+            self._add(db, objects, indexed, projects, cutoff, report)
+            self._remove(db, indexed, objects, cutoff, report)
+            db.commit()
+            after = last
+
+        # Rows past the last listed key have no object at all
+        self._remove(db, self._indexed(db, prefix, after, None), {}, cutoff, report)
+        db.commit()
+        return report
+
+    @staticmethod
+    def _indexed(
+        db: Session, prefix: str, after: str | None, last: str | None
+    ) -> dict[str, tuple[int, datetime]]:
+        """Index rows with keys in (after, last]"""
+        stmt = select(Document.s3_key, Document.id, Document.created_at).where(
+            Document.s3_key.startswith(prefix, autoescape=True)
+        )
+        if after is not None:
+            stmt = stmt.where(Document.s3_key > after)
+        if last is not None:
+            stmt = stmt.where(Document.s3_key <= last)
+        return {row.s3_key: (row.id, row.created_at) for row in db.execute(stmt)}
+
+    @staticmethod
+    def _add(
+        db: Session,
+        objects: dict[str, dict],
+        indexed: dict,
+        projects: set[int],
+        cutoff: datetime,
+        report: ReconcileReport,
+    ) -> None:
+        rows = []
+        for key, obj in objects.items():
+            if key in indexed or obj["LastModified"] > cutoff:
+                continue
+            match = PROJECT_KEY.fullmatch(key)
+            if not match or int(match[1]) not in projects:
+                report.orphaned.append(key)
+                continue
+            name = PurePosixPath(key).name
+            rows.append(
+                {
+                    "filename": name[:255],
+                    "path": match[2][:1024],
+                    "content_type": mimetypes.guess_type(name)[0]
+                    or "application/octet-stream",
+                    "size": obj["Size"],
+                    "s3_key": key,
+                    "etag": obj.get("ETag", "").strip('"') or None,
+                    "project_id": int(match[1]),
+                    "created_at": obj["LastModified"],
+                }
+            )
+        if rows:
+            stmt = insert(Document).values(rows)
+            result = db.execute(stmt.on_conflict_do_nothing(index_elements=["s3_key"]))
+            report.added += result.rowcount
+
+    @staticmethod
+    def _remove(
+        db: Session,
+        indexed: dict[str, tuple[int, datetime]],
+        objects: dict[str, dict],
+        cutoff: datetime,
+        report: ReconcileReport,
+    ) -> None:
+        stale = [
+            id
+            for key, (id, created_at) in indexed.items()
+            if key not in objects and created_at < cutoff
+        ]
+        if stale:
+            result = db.execute(delete(Document).where(Document.id.in_(stale)))
+            report.removed += result.rowcount
+
+
+# Create instance
+document_service = DocumentService(Document)
@@ -0,0 +1,264 @@
+"""
+CSV and XLSX export of list endpoints.
+
+Rows are read through a server-side cursor (``yield_per``) as plain
+tuples, never as ORM objects, and written out as they arrive, so the
+memory an export uses does not grow with the number of rows. CSV is
+streamed to the client in chunks as it is produced. XLSX is a ZIP archive
+that can only be finished once every row is in; xlsxwriter's constant
+memory mode spools each row to a temporary file as soon as it is written,
+and the finished workbook is streamed from disk.
+
+Free text is written as text: the workbook never turns strings into
+formulas or links, and CSV cells that a spreadsheet would read as a
+formula are prefixed with an apostrophe.
+"""
+
+import csv
+import io
+import tempfile
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Literal
+
+import xlsxwriter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Engine, Select, select
+from sqlalchemy.orm import Session
+
+from ..models.campaign import Campaign
+from ..models.craftsman import Craftsman
+from ..models.enums import (
+    ProjectStatus,
+    QuoteStatus,
+    TaskPriority,
+    TaskStatus,
+)
+from ..models.item import Item
+from ..models.project import Project
+from ..models.quote import Quote
+from ..models.task import Task
+
+ExportFormat = Literal["csv", "xlsx"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# A spreadsheet opening a CSV evaluates cells starting with these
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+# Projects that are not finished, as in the projects list's active_only
+OPEN_PROJECT_STATUSES = (
+    ProjectStatus.PLANNING,
+    ProjectStatus.ACTIVE,
+    ProjectStatus.ON_HOLD,
+)
+
+
+class ExportService:
+    """Streams filtered lists of quotes, items, tasks and projects"""
+
+    def __init__(self, *, batch_size: int = 1000, chunk_size: int = 64 * 1024):
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+
+    def quotes(
+        self,
+        *,
+        status: QuoteStatus | None = None,
+        item_id: int | None = None,
+        craftsman_id: int | None = None,
+        pending_only: bool = False,
+        approved_only: bool = False,
+    ) -> Select:
+        stmt = (
+            select(
+                Quote.id,
+                Quote.item_id,
+                Item.name.label("item"),
+                Quote.craftsman_id,
+                Craftsman.name.label("craftsman"),
+                Quote.status,
+                Quote.price,
+                Quote.currency,
+                Quote.margin_percentage,
+                Quote.valid_until,
+                Quote.description,
+                Quote.created_at,
+                Quote.updated_at,
+            )
+            .join(Quote.item)
+            .join(Quote.craftsman)
+            .order_by(Quote.id)
+        )
+        if status:
+            stmt = stmt.where(Quote.status == status)
+        if item_id:
+            stmt = stmt.where(Quote.item_id == item_id)
+        if craftsman_id:
+            stmt = stmt.where(Quote.craftsman_id == craftsman_id)
+        if pending_only:
+            stmt = stmt.where(Quote.status == QuoteStatus.PENDING)
+        if approved_only:
+            stmt = stmt.where(Quote.status == QuoteStatus.APPROVED)
+        return stmt
+
+    def items(self, *, campaign_id: int | None = None) -> Select:
+        stmt = (
+            select(
+                Item.id,
+                Item.campaign_id,
+                Campaign.name.label("campaign"),
+                Item.name,
+                Item.description,
+                Item.quantity,
+                Item.unit,
+                Item.estimated_cost,
+                Item.created_at,
+                Item.updated_at,
+            )
+            .join(Item.campaign)
+            .order_by(Item.id)
+        )
+        if campaign_id:
+            stmt = stmt.where(Item.campaign_id == campaign_id)
+        return stmt
+
+    def tasks(
+        self,
+        *,
+        status: TaskStatus | None = None,
+        priority: TaskPriority | None = None,
+        project_id: int | None = None,
+        user_id: int | None = None,
+        todo_only: bool = False,
+        in_progress_only: bool = False,
+        unassigned_only: bool = False,
+    ) -> Select:
+        stmt = select(
+            Task.id,
+            Task.project_id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.priority,
+            Task.due_date,
+            Task.assigned_user_id,
+            Task.created_at,
+            Task.updated_at,
+        ).order_by(Task.id)
+        if status:
+            stmt = stmt.where(Task.status == status)
+        if priority:
+            stmt = stmt.where(Task.priority == priority)
+        if project_id:
+            stmt = stmt.where(Task.project_id == project_id)
+        if user_id:
+            stmt = stmt.where(Task.assigned_user_id == user_id)
+        if todo_only:
+            stmt = stmt.where(Task.status == TaskStatus.TODO)
+        if in_progress_only:
+            stmt = stmt.where(Task.status == TaskStatus.IN_PROGRESS)
+        if unassigned_only:
+            stmt = stmt.where(Task.assigned_user_id.is_(None))
+        return stmt
+
+    def projects(
+        self,
+        *,
+        status: ProjectStatus | None = None,
+        active_only: bool = False,
+        user_id: int | None = None,
+        client_id: int | None = None,
+    ) -> Select:
+        stmt = select(
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.status,
+            Project.budget,
+            Project.start_date,
+            Project.end_date,
+            Project.client_id,
+            Project.user_id,
+            Project.created_at,
+            Project.updated_at,
+        ).order_by(Project.id)
+        if status:
+            stmt = stmt.where(Project.status == status)
+        if active_only:
+            stmt = stmt.where(Project.status.in_(OPEN_PROJECT_STATUSES))
+        if user_id:
+            stmt = stmt.where(Project.user_id == user_id)
+        if client_id:
+            stmt = stmt.where(Project.client_id == client_id)
+        return stmt
+
+    def response(
+        self, bind: Engine, stmt: Select, *, name: str, file_format: ExportFormat
+    ) -> StreamingResponse:
+        """Stream the rows of a query as a CSV or XLSX download"""
+        body = self.csv(bind, stmt) if file_format == "csv" else self.xlsx(bind, stmt)
+        filename = f"{name}-{datetime.now(UTC):%Y%m%d}.{file_format}"
+        return StreamingResponse(
+            body,
+            media_type=MEDIA_TYPES[file_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    def rows(self, bind: Engine, stmt: Select) -> Iterator:
+        """
+        Rows of a query, fetched ``batch_size`` at a time.
+
+        Runs in its own session: the request's session is closed before a
+        streamed body is sent.
+        """
+        with Session(bind) as db:
+            yield from db.execute(stmt.execution_options(yield_per=self.batch_size))
+
+    def csv(self, bind: Engine, stmt: Select) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(stmt.selected_columns.keys())
+        for row in self.rows(bind, stmt):
+            writer.writerow([csv_cell(value) for value in row])
+            if buffer.tell() >= self.chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def xlsx(self, bind: Engine, stmt: Select) -> Iterator[bytes]:
+        with tempfile.TemporaryFile() as output:
+            workbook = xlsxwriter.Workbook(
+                output,
+                {
+                    "constant_memory": True,
+                    "default_date_format": "yyyy-mm-dd",
+                    "remove_timezone": True,
+                    "strings_to_formulas": False,
+                    "strings_to_urls": False,
+                },
+            )
+            sheet = workbook.add_worksheet()
+            sheet.write_row(0, 0, stmt.selected_columns.keys())
+            for n, row in enumerate(self.rows(bind, stmt), start=1):
+                sheet.write_row(n, 0, row)
+            workbook.close()
+
+            output.seek(0)
+            while chunk := output.read(self.chunk_size):
+                yield chunk
+
+
+# Create instance
+export_service = ExportService()
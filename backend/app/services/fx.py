@@ -0,0 +1,239 @@
+"""
+Currency conversion.
+
+Dated exchange rates live in the ``fx_rates`` table. Queries convert
+quote prices to the base currency in SQL by joining every quote to the
+rate of its currency in force on the day it was made (``FxJoin``), so
+aggregates and rankings never mix currencies. Currencies with no rate on
+or before that day fall back to the configured ``FX_RATES_TO_BASE``.
+
+Results are reported in another currency at its latest rate, read from an
+in-process cache of the whole (small) table that is dropped whenever the
+table changes.
+"""
+
+import csv
+import threading
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+from pydantic import ValidationError
+from sqlalchemy import Date, DateTime, Numeric, Select, case, func, literal, select
+from sqlalchemy import cast as sql_cast
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import true
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..core.config import settings
+from ..models.enums import Currency
+from ..models.fx_rate import FxRate
+from ..schemas.fx import FxRateCreate
+
+CENT = Decimal("0.01")
+
+
+def configured_rate(currency: ColumnElement) -> ColumnElement:
+    """SQL expression for the configured fallback rate of a currency column"""
+    rates = {
+        member: literal(Decimal(str(settings.FX_RATES_TO_BASE[member.value])))
+        for member in Currency
+        if member.value in settings.FX_RATES_TO_BASE
+    }
+    return case(rates, value=currency, else_=literal(Decimal("1")))
+
+
+class FxJoin:
+    """Converts prices to the base currency through a join with ``fx_rates``.
+
+    Each row is joined laterally to the latest rate of its currency on or
+    before its day, an index lookup per row. Add the join to the query
+    with ``join`` and use ``price`` for the converted columns::
+
+        fx = FxJoin(Quote.currency, Quote.created_at)
+        stmt = fx.join(select(fx.price(Quote.price)))
+
+    ``report_rate`` (the target currency's rate to base, see
+    ``FxService.rate``) converts the result on to another currency.
+    """
+
+    def __init__(
+        self,
+        currency: ColumnElement,
+        on: ColumnElement,
+        *,
+        report_rate: Decimal = Decimal("1"),
+    ):
+        day = (
+            sql_cast(func.timezone("UTC", on), Date)
+            if isinstance(on.type, DateTime)
+            else on
+        )
+        self.currency = currency
+        self.report_rate = report_rate
+        self.rates = (
+            select(FxRate.rate)
+            .where(FxRate.currency == currency, FxRate.valid_from <= day)
+            .order_by(FxRate.valid_from.desc())
+            .limit(1)
+            .lateral()
+        )
+
+    @property
+    def rate(self) -> ColumnElement:
+        rate = func.coalesce(self.rates.c.rate, configured_rate(self.currency))
+        if self.report_rate != 1:
+            rate = rate / literal(self.report_rate)
+        return rate
+
+    def price(self, price: ColumnElement) -> ColumnElement:
+        """SQL expression converting a price column"""
+        return func.round(price * self.rate, 2).cast(Numeric(12, 2))
+
+    def reported(self, amount: ColumnElement) -> ColumnElement:
+        """SQL expression for a base currency column in the report currency"""
+        if self.report_rate == 1:
+            return amount
+        return func.round(amount / literal(self.report_rate), 2).cast(Numeric(12, 2))
+
+    def join(self, stmt: Select) -> Select:
+        return stmt.outerjoin(self.rates, true())
+
+
+class FxRateCache:
+    """Every dated rate, per currency, held in memory.
+
+    Loaded on first use from the session at hand and dropped on any change
+    to ``fx_rates`` (it is a ``CacheInvalidator``), so reporting a figure in
+    another currency costs no query. Safe to share between request threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._rates: dict[Currency, tuple[list[date], list[Decimal]]] | None = None
+
+    def get(self, db: Session) -> dict[Currency, tuple[list[date], list[Decimal]]]:
+        rates = self._rates
+        if rates is not None:
+            return rates
+        generation = self._generation
+        rates = {}
+        for currency, valid_from, rate in db.execute(
+            select(FxRate.currency, FxRate.valid_from, FxRate.rate).order_by(
+                FxRate.currency, FxRate.valid_from
+            )
+        ):
+            days, values = rates.setdefault(currency, ([], []))
+            days.append(valid_from)
+            values.append(rate)
+        with self._lock:
+            # Not if the table changed while it was being read
+            if generation == self._generation:
+                self._rates = rates
+        return rates
+
+    # CacheInvalidator
+
+    def invalidate(self, table: str, id: int) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._rates = None
+
+
+class FxService:
+    """Dated exchange rates and conversion of reported figures"""
+
+    def __init__(self, rates: FxRateCache):
+        self.rates = rates
+
+    def rate(
+        self, db: Session, currency: Currency | str | None, on: date | None = None
+    ) -> Decimal:
+        """Base currency per unit of ``currency`` on a day, today by default"""
+        if currency is None or currency == settings.BASE_CURRENCY:
+            return Decimal("1")
+        currency = Currency(currency)
+        days, values = self.rates.get(db).get(currency, ((), ()))
+        found = bisect_right(days, on or datetime.now(UTC).date())
+        if found:
+            return values[found - 1]
+        return Decimal(str(settings.FX_RATES_TO_BASE.get(currency.value, 1)))
+
+    def from_base(
+        self,
+        db: Session,
+        amount: Decimal | None,
+        currency: Currency | str | None,
+        on: date | None = None,
+    ) -> Decimal | None:
+        """A base currency amount in ``currency``, to the cent"""
+        if amount is None or currency is None:
+            return amount
+        return (Decimal(amount) / self.rate(db, currency, on)).quantize(CENT)
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        currency: Currency | None = None,
+        on: date | None = None,
+    ) -> list[FxRate]:
+        """Rates by currency and date; with ``on``, those in force that day"""
+        stmt = select(FxRate)
+        if currency:
+            stmt = stmt.where(FxRate.currency == currency)
+        if on:
+            stmt = (
+                stmt.where(FxRate.valid_from <= on)
+                .distinct(FxRate.currency)
+                .order_by(FxRate.currency, FxRate.valid_from.desc())
+            )
+        else:
+            stmt = stmt.order_by(FxRate.currency, FxRate.valid_from)
+        return list(db.scalars(stmt))
+
+    def set_rates(self, db: Session, rates: Iterable[FxRateCreate]) -> int:
+        """
+        Add or replace rates by currency and start date; returns the count.
+
+        Rollups already computed with the old rates are refreshed by the
+        nightly full dashboard rollup.
+        """
+        values = {(rate.currency, rate.valid_from): rate.model_dump() for rate in rates}
+        if not values:
+            return 0
+        stmt = insert(FxRate).values(list(values.values()))
+        db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_fx_rates_currency_valid_from",
+                set_={"rate": stmt.excluded.rate, "updated_at": func.now()},
+            )
+        )
+        db.commit()
+        self.rates.flush()
+        return len(values)
+
+    def load_csv(self, db: Session, lines: Iterable[str]) -> int:
+        """
+        Set the rates of a CSV file with currency, valid_from and rate columns.
+
+        Nothing is loaded if any line is invalid; the ValueError names it.
+        """
+        rates = []
+        reader = csv.DictReader(lines)
+        for row in reader:
+            try:
+                rates.append(FxRateCreate.model_validate(row))
+            except ValidationError as exc:
+                raise ValueError(f"line {reader.line_num}: {exc}") from exc
+        return self.set_rates(db, rates)
+
+
+# Create instance
+fx_service = FxService(FxRateCache())
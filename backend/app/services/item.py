@@ -1,13 +1,42 @@
+from collections.abc import Iterable
+
 from sqlalchemy.orm import Session
 
 from ..models.item import Item
 from ..schemas.item import ItemCreate, ItemUpdate
 from .base import BaseCRUDService
+from .changes import ChangeOp
+from .prediction import price_predictor
+from .similarity import item_similarity_index
 
 
 class ItemService(BaseCRUDService[Item, ItemCreate, ItemUpdate]):
     """Item-specific CRUD service"""
 
+    def project_id_of(self, obj: Item) -> int:
+        """Items belong to a project through their campaign"""
+        return obj.campaign.project_id
+
+    def publish_change(
+        self,
+        obj: Item,
+        op: ChangeOp,
+        *,
+        fields: Iterable[str] = (),
+        project_id: int | None = None,
+    ) -> None:
+        """Also keep this process's similarity index and estimates current"""
+        super().publish_change(obj, op, fields=fields, project_id=project_id)
+        if op == "create" or {"name", "description"} & set(fields):
+            # It may now match items whose estimates left it out
+            price_predictor.estimates.flush()
+        else:
+            price_predictor.estimates.forget_items([obj.id])
+        if op == "delete":
+            item_similarity_index.remove(obj.id)
+        elif op == "create" or {"name", "description"} & set(fields):
+            item_similarity_index.add(obj.id, obj.name, obj.description)
+
     def get_by_campaign(
         self, db: Session, *, campaign_id: int, skip: int = 0, limit: int = 100
     ) -> list[Item]:
@@ -0,0 +1,247 @@
+import re
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from anyio import from_thread
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.craftsman import Craftsman
+from ..models.enums import MessageDirection, MessageStatus
+from ..models.item import Item
+from ..models.whatsapp_message import WhatsAppMessage
+from ..schemas.whatsapp import WhatsAppMessageCreate, WhatsAppMessageUpdate
+from .base import BaseCRUDService
+from .whatsapp import WhatsAppService
+
+STATUS_MAP = {
+    "sent": MessageStatus.SENT,
+    "delivered": MessageStatus.DELIVERED,
+    "read": MessageStatus.READ,
+    "failed": MessageStatus.FAILED,
+}
+
+
+def _digits(phone: str) -> str:
+    """Strip formatting so phone numbers compare as plain digits"""
+    return re.sub(r"\D", "", phone)
+
+
+def _timestamp(value: str | int | None) -> datetime:
+    """Convert a Meta epoch-seconds timestamp to an aware datetime"""
+    if value is None:
+        return datetime.now(UTC)
+    return datetime.fromtimestamp(int(value), tz=UTC)
+
+
+def _message_body(message: dict) -> str | None:
+    """Extract the human-readable text of an inbound message"""
+    message_type = message.get("type")
+    content = message.get(message_type) or {}
+    if message_type == "text":
+        return content.get("body")
+    if message_type == "interactive":
+        reply = content.get("button_reply") or content.get("list_reply") or {}
+        return reply.get("title")
+    if message_type == "button":
+        return content.get("text")
+    return content.get("caption")
+
+
+def parse_webhook_payload(payload: dict) -> tuple[list[dict], list[dict]]:
+    """Split a Meta webhook payload into message rows and status rows"""
+    messages: list[dict] = []
+    statuses: list[dict] = []
+    for entry in payload.get("entry", []):
+        for change in entry.get("changes", []):
+            value = change.get("value") or {}
+            for message in value.get("messages", []):
+                messages.append(
+                    {
+                        "wa_message_id": message["id"],
+                        "direction": MessageDirection.INBOUND,
+                        "phone": message["from"][:20],
+                        "message_type": message.get("type", "unknown")[:32],
+                        "body": _message_body(message),
+                        "status": MessageStatus.RECEIVED,
+                        "sent_at": _timestamp(message.get("timestamp")),
+                        "raw": message,
+                    }
+                )
+            for status in value.get("statuses", []):
+                mapped = STATUS_MAP.get(status.get("status"))
+                if mapped is None:
+                    continue
+                timestamp = _timestamp(status.get("timestamp"))
+                statuses.append(
+                    {
+                        "wa_message_id": status["id"],
+                        "direction": MessageDirection.OUTBOUND,
+                        "phone": status.get("recipient_id", "")[:20],
+                        "message_type": "unknown",
+                        "body": None,
+                        "status": mapped,
+                        "sent_at": timestamp,
+                        "status_updated_at": timestamp,
+                        "raw": None,
+                    }
+                )
+    return messages, statuses
+
+
+class MessageService(
+    BaseCRUDService[WhatsAppMessage, WhatsAppMessageCreate, WhatsAppMessageUpdate]
+):
+    """WhatsApp message storage and webhook ingestion"""
+
+    def get_by_wa_message_id(
+        self, db: Session, *, wa_message_id: str
+    ) -> WhatsAppMessage | None:
+        """Get message by WhatsApp message ID"""
+        return (
+            db.query(WhatsAppMessage)
+            .filter(WhatsAppMessage.wa_message_id == wa_message_id)
+            .first()
+        )
+
+    def ingest(self, db: Session, payloads: Iterable[dict]) -> tuple[int, int]:
+        """
+        Store a batch of webhook payloads with idempotent upserts.
+
+        Messages are inserted once (redeliveries are ignored); status
+        receipts only move a message forward in time. Returns the number of
+        message and status rows written.
+        """
+        return self.ingest_parsed(
+            db, [parse_webhook_payload(payload) for payload in payloads]
+        )
+
+    def ingest_parsed(
+        self, db: Session, parsed: Iterable[tuple[list[dict], list[dict]]]
+    ) -> tuple[int, int]:
+        """Store payloads already split by ``parse_webhook_payload``"""
+        messages: dict[str, dict] = {}
+        statuses: dict[str, dict] = {}
+        for parsed_messages, parsed_statuses in parsed:
+            for row in parsed_messages:
+                messages[row["wa_message_id"]] = row
+            for row in parsed_statuses:
+                current = statuses.get(row["wa_message_id"])
+                if (
+                    not current
+                    or current["status_updated_at"] <= row["status_updated_at"]
+                ):
+                    statuses[row["wa_message_id"]] = row
+
+        craftsmen = self._craftsmen_by_phone(
+            db, {row["phone"] for row in [*messages.values(), *statuses.values()]}
+        )
+        for row in [*messages.values(), *statuses.values()]:
+            row["craftsman_id"] = craftsmen.get(_digits(row["phone"]))
+
+        written = updated = 0
+        if messages:
+            stmt = insert(WhatsAppMessage).values(list(messages.values()))
+            result = db.execute(
+                stmt.on_conflict_do_nothing(index_elements=["wa_message_id"])
+            )
+            written = result.rowcount
+        if statuses:
+            stmt = insert(WhatsAppMessage).values(list(statuses.values()))
+            result = db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["wa_message_id"],
+                    set_={
+                        "status": stmt.excluded.status,
+                        "status_updated_at": stmt.excluded.status_updated_at,
+                        "updated_at": func.now(),
+                    },
+                    where=or_(
+                        WhatsAppMessage.status_updated_at.is_(None),
+                        WhatsAppMessage.status_updated_at
+                        <= stmt.excluded.status_updated_at,
+                    ),
+                )
+            )
+            updated = result.rowcount
+        db.commit()
+        return written, updated
+
+    def request_quotes(
+        self,
+        db: Session,
+        whatsapp: WhatsAppService,
+        *,
+        item: Item,
+        craftsmen: list[Craftsman],
+    ) -> list[dict]:
+        """
+        Send the quote request template to every craftsman concurrently.
+
+        Must be called from a worker thread (a sync endpoint): the sends run
+        on the event loop that owns the pooled WhatsApp client. Delivered
+        messages are recorded as outbound so webhook receipts update them.
+        """
+        description = f"{item.name} ({item.quantity} {item.unit})"
+        results = [{"craftsman_id": craftsman.id} for craftsman in craftsmen]
+        sends = {}
+        for result, craftsman in zip(results, craftsmen, strict=True):
+            phone = craftsman.whatsapp or craftsman.phone
+            if not phone:
+                result["error"] = "Craftsman has no WhatsApp number"
+                continue
+            result["phone"] = phone
+            sends[craftsman.id] = whatsapp.send_template(
+                phone,
+                settings.WHATSAPP_QUOTE_REQUEST_TEMPLATE,
+                {"item_description": description},
+            )
+
+        outcomes = from_thread.run(whatsapp.send_many, list(sends.values()))
+        sent = dict(zip(sends, outcomes, strict=True))
+        rows = []
+        now = datetime.now(UTC)
+        for result in results:
+            outcome = sent.get(result["craftsman_id"])
+            if isinstance(outcome, str):
+                result["wa_message_id"] = outcome
+                rows.append(
+                    {
+                        "wa_message_id": outcome,
+                        "direction": MessageDirection.OUTBOUND,
+                        "phone": _digits(result["phone"])[:20],
+                        "message_type": "template",
+                        "body": f"Solicitud de presupuesto: {description}",
+                        "status": MessageStatus.SENT,
+                        "sent_at": now,
+                        "status_updated_at": now,
+                        "craftsman_id": result["craftsman_id"],
+                        "project_id": item.campaign.project_id,
+                    }
+                )
+            elif outcome is not None:
+                result["error"] = outcome.detail
+            result.pop("phone", None)
+
+        if rows:
+            stmt = insert(WhatsAppMessage).values(rows)
+            db.execute(stmt.on_conflict_do_nothing(index_elements=["wa_message_id"]))
+            db.commit()
+        return results
+
+    def _craftsmen_by_phone(self, db: Session, phones: set[str]) -> dict[str, int]:
+        """Map digit-only phone numbers to craftsman IDs in one query"""
+        phones = {_digits(phone) for phone in phones if phone}
+        if not phones:
+            return {}
+        digits = func.regexp_replace(Craftsman.whatsapp, r"\D", "", "g")
+        rows = db.execute(
+            select(digits.label("phone"), Craftsman.id).where(digits.in_(phones))
+        )
+        return {row.phone: row.id for row in rows}
+
+
+# Create instance
+message_service = MessageService(WhatsAppMessage)
@@ -0,0 +1,307 @@
+import re
+import unicodedata
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.enums import Currency, TaskStatus
+from ..models.quote import Quote
+
+# Words that introduce a price, weighted by how strongly they point at the
+# amount the craftsman is quoting ("total" beats a unit price).
+PRICE_KEYWORDS = {
+    "total": 0.4,
+    "importe": 0.3,
+    "import": 0.3,
+    "precio": 0.3,
+    "preu": 0.3,
+    "presupuesto": 0.3,
+    "pressupost": 0.3,
+    "coste": 0.25,
+    "cost": 0.25,
+    "serian": 0.2,
+    "seria": 0.2,
+}
+
+CURRENCY_MARKERS = {
+    "€": Currency.EUR,
+    "eur": Currency.EUR,
+    "euro": Currency.EUR,
+    "euros": Currency.EUR,
+    "$": Currency.USD,
+    "usd": Currency.USD,
+    "dolar": Currency.USD,
+    "dolares": Currency.USD,
+    "£": Currency.GBP,
+    "gbp": Currency.GBP,
+    "libra": Currency.GBP,
+    "libras": Currency.GBP,
+    "lliura": Currency.GBP,
+    "lliures": Currency.GBP,
+}
+
+# Spanish and Catalan, written without accents (text is folded first)
+STATUS_KEYWORDS = {
+    TaskStatus.COMPLETED: [
+        "terminado",
+        "terminada",
+        "acabado",
+        "acabada",
+        "listo",
+        "lista",
+        "finalizado",
+        "completado",
+        "entregado",
+        "instalado",
+        "acabat",
+        "enllestit",
+        "llest",
+        "llesta",
+        "finalitzat",
+        "lliurat",
+        "instal.lat",
+    ],
+    TaskStatus.IN_PROGRESS: [
+        "empezando",
+        "empezado",
+        "trabajando",
+        "en proceso",
+        "en curso",
+        "en marcha",
+        "comenzado",
+        "comencant",
+        "treballant",
+        "en proces",
+        "en curs",
+    ],
+}
+
+CURRENCY_WEIGHT = 0.55
+MAX_PRICE = Decimal("99999999.99")  # quotes.price is Numeric(10, 2)
+CENT = Decimal("0.01")
+
+# European (1.250,50), English (1,250.50) and plain (1250 / 1250,5) amounts
+NUMBER = (
+    r"\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?"
+    r"|\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?"
+    r"|\d+(?:[.,]\d{1,2})?"
+)
+
+
+def _alternation(words: Iterable[str]) -> str:
+    """Regex alternation trying longer words first"""
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents so 'Está acabàt' matches 'esta acabat'"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).replace(
+        "·", "."
+    )
+
+
+def parse_amount(text: str) -> Decimal | None:
+    """Parse a European or English formatted amount"""
+    if "." in text and "," in text:
+        # The separator that comes last is the decimal one
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        whole, _, fraction = text.rpartition(",")
+        text = text.replace(",", "") if len(fraction) == 3 else f"{whole}.{fraction}"
+    elif "." in text:
+        groups = text.split(".")
+        if len(groups) > 2 or len(groups[-1]) == 3:
+            text = text.replace(".", "")
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        return None
+    return amount.quantize(CENT) if 0 < amount <= MAX_PRICE else None
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedMessage:
+    """Price and work status extracted from a craftsman's message"""
+
+    price: Decimal | None = None
+    currency: Currency | None = None
+    price_confidence: float = 0.0
+    status: TaskStatus | None = None
+    status_confidence: float = 0.0
+
+
+class QuoteMessageParser:
+    """Extract quoted prices and work status from WhatsApp messages.
+
+    All price patterns are compiled into one regex and all status keywords
+    into another, so a message is scanned twice in total instead of once per
+    pattern. Matching runs on accent-folded text, which makes Spanish and
+    Catalan spellings with or without accents equivalent.
+    """
+
+    def __init__(
+        self,
+        price_keywords: dict[str, float] = PRICE_KEYWORDS,
+        currency_markers: dict[str, Currency] = CURRENCY_MARKERS,
+        status_keywords: dict[TaskStatus, list[str]] = STATUS_KEYWORDS,
+    ):
+        self.price_keywords = price_keywords
+        self.currency_markers = currency_markers
+        self.status_keywords = status_keywords
+        self.status_by_keyword = {
+            keyword: status
+            for status, keywords in status_keywords.items()
+            for keyword in keywords
+        }
+        currency = _alternation(currency_markers)
+        self.price_pattern = re.compile(
+            rf"(?:\b(?P<keyword>{_alternation(price_keywords)})\b[^\d\n€$£]{{0,25}})?"
+            rf"(?:(?P<before>[€$£])\s?)?"
+            rf"(?<![\d.,])(?P<amount>{NUMBER})(?![\d.,]*\d)"
+            rf"(?:\s?(?P<after>{currency})(?!\w))?"
+        )
+        self.status_pattern = re.compile(
+            rf"(?P<negation>\b(?:no|aun no|todavia no|encara no)\s+(?:\w+\s+)?)?"
+            rf"\b(?P<keyword>{_alternation(self.status_by_keyword)})\b"
+        )
+
+    def parse(self, text: str | None) -> ParsedMessage:
+        """Parse a single message"""
+        if not text:
+            return ParsedMessage()
+        folded = fold(text)
+        return ParsedMessage(*self._price(folded), *self._status(folded))
+
+    def parse_many(
+        self,
+        texts: Iterable[str | None],
+        workers: int | None = None,
+        chunksize: int = 500,
+    ) -> list[ParsedMessage]:
+        """
+        Parse many messages, across a process pool when workers != 1.
+
+        Parsing is CPU bound, so processes rather than threads are used;
+        each worker builds a parser with this one's keywords and markers
+        once, when it starts.
+        """
+        texts = list(texts)
+        if workers == 1 or len(texts) <= chunksize:
+            return [self.parse(text) for text in texts]
+        with self.pool(workers) as pool:
+            return list(pool.map(_parse_in_worker, texts, chunksize=chunksize))
+
+    def pool(self, workers: int | None = None) -> ProcessPoolExecutor:
+        """A process pool whose workers parse like this parser"""
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_start_worker,
+            initargs=(
+                self.price_keywords,
+                self.currency_markers,
+                self.status_keywords,
+            ),
+        )
+
+    def _price(self, folded: str) -> tuple[Decimal | None, Currency | None, float]:
+        """Pick the most likely quoted amount"""
+        candidates = []
+        for match in self.price_pattern.finditer(folded):
+            marker = match["before"] or match["after"]
+            keyword = match["keyword"]
+            if not marker and not keyword:
+                continue  # bare numbers are dates, quantities, phone numbers
+            amount = parse_amount(match["amount"])
+            if amount is None:
+                continue
+            score = (CURRENCY_WEIGHT if marker else 0.0) + (
+                self.price_keywords[keyword] if keyword else 0.0
+            )
+            currency = self.currency_markers[marker] if marker else None
+            candidates.append((score, amount, currency))
+        if not candidates:
+            return None, None, 0.0
+
+        score, amount, currency = max(candidates, key=lambda c: c[0])
+        # Another amount just as likely makes the pick a coin toss
+        rivals = {c[1] for c in candidates if c[0] == score and c[1] != amount}
+        confidence = min(score, 1.0) * (0.5 if rivals else 1.0)
+        return amount, currency, round(confidence, 2)
+
+    def _status(self, folded: str) -> tuple[TaskStatus | None, float]:
+        """Pick the last stated work status"""
+        found = [
+            self.status_by_keyword[match["keyword"]]
+            for match in self.status_pattern.finditer(folded)
+            if not match["negation"]
+        ]
+        if not found:
+            return None, 0.0
+        confidence = 0.9 if len(set(found)) == 1 else 0.6
+        return found[-1], confidence
+
+
+def parse_message(text: str | None) -> ParsedMessage:
+    """Parse with the module parser"""
+    return message_parser.parse(text)
+
+
+# The parser of a pool worker process, built by QuoteMessageParser.pool
+_worker_parser: QuoteMessageParser | None = None
+
+
+def _start_worker(
+    price_keywords: dict[str, float],
+    currency_markers: dict[str, Currency],
+    status_keywords: dict[TaskStatus, list[str]],
+) -> None:
+    global _worker_parser
+    _worker_parser = QuoteMessageParser(
+        price_keywords, currency_markers, status_keywords
+    )
+
+
+def _parse_in_worker(text: str | None) -> ParsedMessage:
+    return _worker_parser.parse(text)
+
+
+def parse_quote_history(
+    db: Session,
+    *,
+    batch_size: int = 5000,
+    workers: int | None = None,
+    parser: QuoteMessageParser | None = None,
+) -> Iterator[tuple[int, ParsedMessage]]:
+    """
+    Re-parse the WhatsApp message of every quote.
+
+    Quotes are streamed from the database in batches and each batch is
+    parsed on a shared process pool, so memory stays flat however long the
+    history is. ``parser`` defaults to the module parser.
+    """
+    stmt = (
+        select(Quote.id, Quote.whatsapp_message)
+        .where(Quote.whatsapp_message.is_not(None))
+        .order_by(Quote.id)
+        .execution_options(yield_per=batch_size)
+    )
+    with (parser or message_parser).pool(workers) as pool:
+        for rows in db.execute(stmt).partitions():
+            ids = [row.id for row in rows]
+            texts = [row.whatsapp_message for row in rows]
+            parsed = pool.map(
+                _parse_in_worker, texts, chunksize=max(1, len(texts) // 8)
+            )
+            yield from zip(ids, parsed, strict=True)
+
+
+# Create instance
+message_parser = QuoteMessageParser()
@@ -0,0 +1,331 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+from datetime import UTC
+from decimal import Decimal
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.campaign import Campaign
+from ..models.enums import Currency, QuoteStatus
+from ..models.item import Item
+from ..models.quote import Quote
+from ..models.status_history import StatusCurrent
+from .fx import FxJoin, fx_service
+
+# Bump when the layout changes so cached files are re-rendered
+TEMPLATE_VERSION = 1
+
+# How long a queued render keeps others from queueing the same document
+RENDER_LOCK_SECONDS = 5 * 60
+
+CENT = Decimal("0.01")
+
+
+def calculate_line(
+    cost: Decimal, margin_percentage: Decimal | None, quantity: int
+) -> dict:
+    """Apply the studio margin to a craftsman cost for one document line"""
+    margin = margin_percentage or Decimal("0")
+    total = (cost * (1 + margin / 100)).quantize(CENT)
+    return {
+        "cost": str(cost.quantize(CENT)),
+        "margin_percentage": str(margin.quantize(CENT)),
+        "margin": str(total - cost.quantize(CENT)),
+        "unit_price": str((total / quantity).quantize(CENT)),
+        "total": str(total),
+    }
+
+
+def calculate_totals(lines: list[dict]) -> dict:
+    """Sum document lines and add VAT"""
+    subtotal = sum((Decimal(line["total"]) for line in lines), Decimal("0.00"))
+    cost = sum((Decimal(line["cost"]) for line in lines), Decimal("0.00"))
+    vat_percentage = Decimal(str(settings.VAT_PERCENTAGE))
+    vat = (subtotal * vat_percentage / 100).quantize(CENT)
+    return {
+        "cost": str(cost),
+        "margin": str(subtotal - cost),
+        "subtotal": str(subtotal),
+        "vat_percentage": str(vat_percentage),
+        "vat": str(vat),
+        "total": str(subtotal + vat),
+    }
+
+
+class PDFService:
+    """Render quote and invoice PDFs, cached by a hash of their content.
+
+    Documents are plain JSON-safe dicts, so the same payload can be hashed
+    in the API process and rendered in a Celery worker without touching the
+    database again.
+    """
+
+    def __init__(self, storage_dir: str):
+        self.storage_dir = Path(storage_dir)
+
+    def build_quote_document(self, db: Session, *, quote_id: int) -> dict | None:
+        """Collect everything a quote PDF shows"""
+        quote = db.get(Quote, quote_id)
+        if not quote:
+            return None
+        item = quote.item
+        project = item.campaign.project
+        line = {
+            "description": item.name,
+            "details": item.description or "",
+            "quantity": item.quantity,
+            "unit": str(item.unit),
+            **calculate_line(
+                Decimal(quote.price), quote.margin_percentage, item.quantity
+            ),
+        }
+        return {
+            "kind": "quote",
+            "number": f"P-{quote.id:06d}",
+            "issued": quote.created_at.date().isoformat(),
+            "valid_until": quote.valid_until.isoformat() if quote.valid_until else None,
+            "currency": str(quote.currency),
+            "project": project.name,
+            "client": self._client_block(project.client),
+            "lines": [line],
+            "totals": calculate_totals([line]),
+        }
+
+    def build_invoice_document(
+        self, db: Session, *, campaign_id: int, currency: Currency | None = None
+    ) -> dict | None:
+        """
+        Collect approved quotes of a campaign into invoice lines.
+
+        Invoiced in the base currency, or in ``currency`` at its latest rate.
+        """
+        campaign = db.get(Campaign, campaign_id)
+        if not campaign:
+            return None
+        fx = FxJoin(
+            Quote.currency,
+            Quote.created_at,
+            report_rate=fx_service.rate(db, currency),
+        )
+        stmt = (
+            fx.join(
+                select(
+                    Item.name,
+                    Item.description,
+                    Item.quantity,
+                    Item.unit,
+                    fx.price(Quote.price).label("cost"),
+                    Quote.margin_percentage,
+                    func.coalesce(StatusCurrent.since, Quote.updated_at).label(
+                        "approved_at"
+                    ),
+                ).join(
+                    Quote,
+                    and_(
+                        Quote.item_id == Item.id, Quote.status == QuoteStatus.APPROVED
+                    ),
+                )
+            )
+            .outerjoin(
+                StatusCurrent,
+                and_(
+                    StatusCurrent.entity == "quotes",
+                    StatusCurrent.entity_id == Quote.id,
+                ),
+            )
+            .where(Item.campaign_id == campaign_id)
+            .order_by(Item.id, Quote.id)
+        )
+        rows = db.execute(stmt).all()
+        lines = [
+            {
+                "description": row.name,
+                "details": row.description or "",
+                "quantity": row.quantity,
+                "unit": str(row.unit),
+                **calculate_line(row.cost, row.margin_percentage, row.quantity),
+            }
+            for row in rows
+        ]
+        # Dated by the latest approval, so the content (and its hash) only
+        # changes with the quotes
+        issued = max((row.approved_at for row in rows), default=campaign.created_at)
+        project = campaign.project
+        return {
+            "kind": "invoice",
+            "number": f"F-{campaign.id:06d}",
+            "issued": issued.astimezone(UTC).date().isoformat(),
+            "currency": currency or settings.BASE_CURRENCY,
+            "project": project.name,
+            "campaign": campaign.name,
+            "client": self._client_block(project.client),
+            "lines": lines,
+            "totals": calculate_totals(lines),
+        }
+
+    @staticmethod
+    def content_hash(document: dict) -> str:
+        """Stable hash of a document payload and the template version"""
+        payload = json.dumps(
+            {"template": TEMPLATE_VERSION, "document": document},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def render_lock_key(content_hash: str) -> str:
+        """Redis key held while a render of the content is queued or running"""
+        return f"lock:pdf-render:{content_hash}"
+
+    def path_for(self, content_hash: str) -> Path:
+        """Location of the cached PDF for a content hash"""
+        return self.storage_dir / content_hash[:2] / f"{content_hash}.pdf"
+
+    def get_cached(self, content_hash: str) -> Path | None:
+        """Return the cached PDF path if it has already been rendered"""
+        path = self.path_for(content_hash)
+        return path if path.is_file() else None
+
+    def render_to_cache(self, document: dict) -> Path:
+        """Render a document unless cached and return the stored file"""
+        content_hash = self.content_hash(document)
+        cached = self.get_cached(content_hash)
+        if cached:
+            return cached
+
+        path = self.path_for(content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so readers never see a partial PDF
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(self.render(document))
+        os.replace(tmp_name, path)
+        return path
+
+    def generate_quote_pdf(self, db: Session, quote_id: int) -> bytes | None:
+        """Render (or fetch from cache) the PDF for a quote"""
+        document = self.build_quote_document(db, quote_id=quote_id)
+        if document is None:
+            return None
+        return self.render_to_cache(document).read_bytes()
+
+    def generate_invoice_pdf(self, db: Session, campaign_id: int) -> bytes | None:
+        """Render (or fetch from cache) the invoice PDF for a campaign"""
+        document = self.build_invoice_document(db, campaign_id=campaign_id)
+        if document is None:
+            return None
+        return self.render_to_cache(document).read_bytes()
+
+    def render(self, document: dict) -> bytes:
+        """Lay out a document with reportlab"""
+        styles = getSampleStyleSheet()
+        cell = styles["BodyText"]
+        title = "Presupuesto" if document["kind"] == "quote" else "Factura"
+        currency = document["currency"]
+
+        buffer = io.BytesIO()
+        pdf = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            title=f"{title} {document['number']}",
+            author=settings.PROJECT_NAME,
+            leftMargin=18 * mm,
+            rightMargin=18 * mm,
+            topMargin=18 * mm,
+            bottomMargin=18 * mm,
+            invariant=True,  # identical input gives byte-identical output
+        )
+
+        header = [
+            f"<b>{title} {escape(document['number'])}</b>",
+            f"Fecha: {escape(document['issued'])}",
+            f"Proyecto: {escape(document['project'])}",
+        ]
+        if document.get("campaign"):
+            header.append(f"Campaña: {escape(document['campaign'])}")
+        if document.get("valid_until"):
+            header.append(f"Válido hasta: {escape(document['valid_until'])}")
+        client = document["client"]
+        header.append(
+            "Cliente: " + "<br/>".join(escape(v) for v in client.values() if v)
+        )
+
+        rows = [["Concepto", "Cantidad", "Precio unitario", "Total"]]
+        for line in document["lines"]:
+            description = f"<b>{escape(line['description'])}</b>"
+            if line["details"]:
+                description += f"<br/>{escape(line['details'])}"
+            rows.append(
+                [
+                    Paragraph(description, cell),
+                    f"{line['quantity']} {line['unit']}",
+                    f"{line['unit_price']} {currency}",
+                    f"{line['total']} {currency}",
+                ]
+            )
+        lines_table = Table(
+            rows, colWidths=[84 * mm, 28 * mm, 31 * mm, 31 * mm], repeatRows=1
+        )
+        lines_table.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2f3b45")),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                    ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                    ("LINEBELOW", (0, 1), (-1, -1), 0.25, colors.lightgrey),
+                ]
+            )
+        )
+
+        totals = document["totals"]
+        totals_table = Table(
+            [
+                ["Base imponible", f"{totals['subtotal']} {currency}"],
+                [f"IVA ({totals['vat_percentage']}%)", f"{totals['vat']} {currency}"],
+                ["Total", f"{totals['total']} {currency}"],
+            ],
+            colWidths=[40 * mm, 34 * mm],
+            hAlign="RIGHT",
+        )
+        totals_table.setStyle(
+            TableStyle(
+                [
+                    ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+                    ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+                    ("LINEABOVE", (0, -1), (-1, -1), 0.5, colors.black),
+                ]
+            )
+        )
+
+        story = [Paragraph(text, styles["Normal"]) for text in header]
+        story += [Spacer(1, 8 * mm), lines_table, Spacer(1, 6 * mm), totals_table]
+        pdf.build(story)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _client_block(client) -> dict:
+        """Client fields printed on every document"""
+        return {
+            "name": client.name,
+            "company": client.company or "",
+            "address": client.address or "",
+            "email": client.email or "",
+        }
+
+
+# Create instance
+pdf_service = PDFService(settings.PDF_STORAGE_DIR)
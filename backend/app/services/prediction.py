@@ -0,0 +1,327 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.enums import Currency, QuoteStatus
+from ..models.item import Item
+from ..models.quote import Quote
+from .fx import FxJoin, fx_service
+from .similarity import ItemSimilarityIndex, item_similarity_index
+
+CENT = Decimal("0.01")
+
+BOOTSTRAP_SAMPLES = 1000
+
+
+def cents(value: float) -> Decimal:
+    return Decimal(str(value)).quantize(CENT)
+
+
+class EstimateCache:
+    """Price estimates per item, kept until a quote they rely on changes.
+
+    Every entry remembers the items that matched its query, so a quote
+    event only drops the estimates built from that quote's item. A new or
+    renamed item may match any query, so it drops every estimate. Changes
+    made by other processes arrive through the invalidation bus (this is a
+    ``CacheInvalidator`` for the quotes and items tables); as their
+    notifications do not say what changed, any item change flushes.
+    """
+
+    def __init__(
+        self, session_factory: sessionmaker = SessionLocal, max_entries: int = 10_000
+    ):
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[dict, frozenset[int]]] = OrderedDict()
+        self._dependents: dict[int, set[tuple]] = {}
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: tuple, estimate: dict, item_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._drop(key)
+            depends_on = frozenset(item_ids)
+            self._entries[key] = (estimate, depends_on)
+            for item_id in depends_on:
+                self._dependents.setdefault(item_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def forget_items(self, item_ids: Iterable[int]) -> None:
+        """Drop every estimate built from these items' quotes"""
+        with self._lock:
+            for item_id in item_ids:
+                for key in list(self._dependents.get(item_id, ())):
+                    self._drop(key)
+
+    def invalidate(self, table: str, id: int) -> None:
+        if table in ("items", "fx_rates"):
+            # A new or renamed item may match any estimate's query, and a
+            # rate change moves every base currency price
+            self.flush()
+            return
+        with self.session_factory() as db:
+            item_id = db.scalar(select(Quote.item_id).where(Quote.id == id))
+        if item_id is None:
+            # Deleted: the item it belonged to is gone with it
+            self.flush()
+        else:
+            self.forget_items([item_id])
+
+    def flush(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dependents.clear()
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for item_id in entry[1]:
+            keys = self._dependents.get(item_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[item_id]
+
+
+class PricePredictor:
+    """Price guidance for new items from the quote history of similar ones"""
+
+    def __init__(self, index: ItemSimilarityIndex, estimates: EstimateCache):
+        self.index = index
+        self.estimates = estimates
+
+    def find_similar_items(
+        self,
+        db: Session,
+        *,
+        name: str,
+        description: str | None = None,
+        k: int = 10,
+        min_score: float = 0.0,
+        exclude_item_id: int | None = None,
+        currency: Currency | None = None,
+    ) -> list[dict]:
+        """
+        The ``k`` most similar items with their approved quotes.
+
+        Quote prices are also given in the base currency, or in
+        ``currency`` at its latest rate.
+        """
+        self.index.ensure_built(db)
+        matches = self.index.query(
+            name, description, k=k, min_score=min_score, exclude_id=exclude_item_id
+        )
+        if not matches:
+            return []
+        ids = [item_id for item_id, _ in matches]
+        items = {
+            row.id: row
+            for row in db.execute(
+                select(
+                    Item.id, Item.name, Item.description, Item.quantity, Item.unit
+                ).where(Item.id.in_(ids))
+            )
+        }
+        quotes: dict[int, list[dict]] = {item_id: [] for item_id in ids}
+        fx = FxJoin(
+            Quote.currency,
+            Quote.created_at,
+            report_rate=fx_service.rate(db, currency),
+        )
+        for row in db.execute(
+            fx.join(
+                select(
+                    Quote.item_id,
+                    Quote.id.label("quote_id"),
+                    Quote.craftsman_id,
+                    Quote.price,
+                    Quote.currency,
+                    fx.price(Quote.price).label("price_base"),
+                )
+            )
+            .where(Quote.item_id.in_(ids), Quote.status == QuoteStatus.APPROVED)
+            .order_by(Quote.item_id, Quote.id)
+        ).mappings():
+            quote = dict(row)
+            quotes[quote.pop("item_id")].append(quote)
+
+        return [
+            {
+                "item_id": item_id,
+                "name": items[item_id].name,
+                "description": items[item_id].description,
+                "quantity": items[item_id].quantity,
+                "unit": items[item_id].unit,
+                "score": score,
+                "approved_quotes": quotes[item_id],
+            }
+            for item_id, score in matches
+            # Deleted since the index last heard of it
+            if item_id in items
+        ]
+
+    def predict_range(
+        self,
+        db: Session,
+        *,
+        item_id: int,
+        k: int = 50,
+        min_score: float = 0.2,
+        coverage: float = 0.8,
+        confidence: float = 0.95,
+        currency: Currency | None = None,
+    ) -> dict | None:
+        """
+        Likely price of an item from the approved quotes of similar items.
+
+        Quotes are compared per unit of measure: each becomes a base-currency
+        price per unit, weighted by how similar its item is. The range is
+        the central ``coverage`` of that weighted distribution scaled to the
+        item's quantity, and bootstrap resampling gives a ``confidence``
+        interval for each bound. Estimates are kept in the base currency
+        and given in ``currency`` at its latest rate. Returns None for an
+        unknown item.
+        """
+        item = db.execute(
+            select(Item.name, Item.description, Item.quantity, Item.unit).where(
+                Item.id == item_id
+            )
+        ).first()
+        if item is None:
+            return None
+        key = (item_id, k, min_score, coverage, confidence)
+        cached = self.estimates.get(key)
+        if cached is not None:
+            return self._in_currency(db, cached, currency)
+
+        self.index.ensure_built(db)
+        matches = dict(
+            self.index.query(
+                item.name,
+                item.description,
+                k=k,
+                min_score=min_score,
+                exclude_id=item_id,
+            )
+        )
+        fx = FxJoin(Quote.currency, Quote.created_at)
+        history = (
+            db.execute(
+                fx.join(
+                    select(Quote.item_id, fx.price(Quote.price) / Item.quantity).join(
+                        Item, Item.id == Quote.item_id
+                    )
+                ).where(
+                    Quote.item_id.in_(matches),
+                    Quote.status == QuoteStatus.APPROVED,
+                    Item.unit == item.unit,
+                )
+            ).all()
+            if matches
+            else []
+        )
+        estimate = {
+            "item_id": item_id,
+            "currency": settings.BASE_CURRENCY,
+            "unit": item.unit,
+            "quantity": item.quantity,
+            "sample_size": len(history),
+            "similar_items": len({row[0] for row in history}),
+            "coverage": coverage,
+            "confidence": confidence,
+            **self._estimate(
+                history, matches, item.quantity, coverage, confidence, seed=item_id
+            ),
+        }
+        self.estimates.put(key, estimate, [item_id, *matches])
+        return self._in_currency(db, estimate, currency)
+
+    @staticmethod
+    def _in_currency(db: Session, estimate: dict, currency: Currency | None) -> dict:
+        """A base currency estimate with its prices in ``currency``"""
+        if currency is None or currency == estimate["currency"]:
+            return estimate
+
+        def convert(value):
+            if isinstance(value, dict):
+                return {name: convert(inner) for name, inner in value.items()}
+            return fx_service.from_base(db, value, currency)
+
+        return {
+            **estimate,
+            "currency": currency,
+            **{
+                name: convert(estimate[name])
+                for name in ("unit_price", "total", "intervals")
+            },
+        }
+
+    @staticmethod
+    def _estimate(
+        history: list,
+        scores: dict[int, float],
+        quantity: int,
+        coverage: float,
+        confidence: float,
+        *,
+        seed: int,
+    ) -> dict:
+        """Weighted quantiles and their bootstrap intervals, all in NumPy"""
+        if not history:
+            return {"unit_price": None, "total": None, "intervals": None}
+        item_ids, unit_prices = np.array(history, dtype=float).T
+        # Each quote weighs as much as its item resembles the one priced
+        scored = np.array(list(scores.items()))
+        scored = scored[np.argsort(scored[:, 0])]
+        weights = scored[np.searchsorted(scored[:, 0], item_ids), 1]
+        weights /= weights.sum()
+        tail = (1 - coverage) / 2
+        levels = np.array([tail, 0.5, 1 - tail])
+
+        # Weighted quantiles: interpolate on the cumulative weight midpoints
+        order = np.argsort(unit_prices)
+        prices, weights = unit_prices[order], weights[order]
+        cumulative = np.cumsum(weights) - weights / 2
+        point = np.interp(levels, cumulative, prices)
+
+        # Bayesian bootstrap: every replicate reweighs the quotes with
+        # exponential draws, so weighted quantiles of all replicates come
+        # from one cumulative sum instead of resampling row by row
+        rng = np.random.default_rng(seed)
+        replicas = rng.standard_exponential((BOOTSTRAP_SAMPLES, len(prices))) * weights
+        replicas = np.cumsum(replicas, axis=1)
+        replicas /= replicas[:, -1:]
+        resampled = prices[(replicas[:, :, None] >= levels).argmax(axis=1)].T
+        alpha = (1 - confidence) / 2
+        bounds = np.quantile(resampled, [alpha, 1 - alpha], axis=1) * quantity
+
+        names = ("low", "estimate", "high")
+        return {
+            "unit_price": dict(zip(names, map(cents, point), strict=True)),
+            "total": dict(zip(names, map(cents, point * quantity), strict=True)),
+            "intervals": {
+                name: {"lower": cents(lower), "upper": cents(upper)}
+                for name, lower, upper in zip(names, *bounds, strict=True)
+            },
+        }
+
+
+# Create instance
+price_predictor = PricePredictor(item_similarity_index, EstimateCache())
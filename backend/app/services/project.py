@@ -18,8 +18,13 @@ class ProjectService(BaseCRUDService[Project, ProjectCreate, ProjectUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.publish_change(db_obj, "create", fields=obj_data)
         return db_obj
 
+    def project_id_of(self, obj: Project) -> int:
+        """A project's changes go to its own channel"""
+        return obj.id
+
     def get_by_user(
         self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
     ) -> list[Project]:
@@ -1,14 +1,63 @@
-from sqlalchemy.orm import Session
+import logging
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+from decimal import Decimal
 
-from ..models.enums import QuoteStatus
+from sqlalchemy import Numeric, Row, and_, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
+
+from ..core.config import settings
+from ..models.campaign import Campaign
+from ..models.enums import Currency, QuoteStatus
+from ..models.item import Item
 from ..models.quote import Quote
-from ..schemas.quote import QuoteCreate, QuoteUpdate
+from ..schemas.quote import (
+    CampaignQuoteComparison,
+    ItemQuoteComparison,
+    QuoteComparisonEntry,
+    QuoteCreate,
+    QuoteUpdate,
+)
+from .anomaly import quote_anomaly_service
 from .base import BaseCRUDService
+from .changes import ChangeOp, change_feed
+from .fx import FxJoin, fx_service
+from .prediction import price_predictor
+
+logger = logging.getLogger(__name__)
+
+# Changes that move a quote's unit price or its peer group
+PRICED_FIELDS = frozenset({"price", "currency", "item_id", "craftsman_id"})
 
 
 class QuoteService(BaseCRUDService[Quote, QuoteCreate, QuoteUpdate]):
     """Quote-specific CRUD service"""
 
+    def project_id_of(self, obj: Quote) -> int:
+        """Quotes belong to a project through their item's campaign"""
+        return obj.item.campaign.project_id
+
+    def publish_change(
+        self,
+        obj: Quote,
+        op: ChangeOp,
+        *,
+        fields: Iterable[str] = (),
+        project_id: int | None = None,
+    ) -> None:
+        """Also drop the price estimates this quote went into and rescore it"""
+        super().publish_change(obj, op, fields=fields, project_id=project_id)
+        price_predictor.estimates.forget_items([obj.item_id])
+        if op != "delete" and PRICED_FIELDS.intersection(fields):
+            db = object_session(obj)
+            # The quote is already saved; a backfill rescores it later
+            try:
+                quote_anomaly_service.check(db, obj.id)
+            except SQLAlchemyError:
+                db.rollback()
+                logger.warning("Could not score quote %s", obj.id, exc_info=True)
+
     def get_by_item(
         self, db: Session, *, item_id: int, skip: int = 0, limit: int = 100
     ) -> list[Quote]:
@@ -69,6 +118,226 @@ class QuoteService(BaseCRUDService[Quote, QuoteCreate, QuoteUpdate]):
             .all()
         )
 
+    def get_item_comparison(
+        self,
+        db: Session,
+        *,
+        item_id: int,
+        include_closed: bool = False,
+        currency: Currency | None = None,
+    ) -> ItemQuoteComparison | None:
+        """Compare all quotes of a single item"""
+        comparisons = self._compare(
+            db, Item.id == item_id, include_closed=include_closed, currency=currency
+        )
+        return comparisons[0] if comparisons else None
+
+    def get_campaign_comparison(
+        self,
+        db: Session,
+        *,
+        campaign_id: int,
+        include_closed: bool = False,
+        currency: Currency | None = None,
+    ) -> CampaignQuoteComparison:
+        """Compare quotes for every item of a campaign"""
+        items = self._compare(
+            db,
+            Item.campaign_id == campaign_id,
+            include_closed=include_closed,
+            currency=currency,
+        )
+        zero = Decimal("0.00")
+        return CampaignQuoteComparison(
+            campaign_id=campaign_id,
+            base_currency=currency or settings.BASE_CURRENCY,
+            total_best_price=sum((i.min_price or zero for i in items), zero),
+            total_estimated_cost=sum((i.estimated_cost or zero for i in items), zero),
+            total_savings_vs_estimate=sum(
+                (i.savings_vs_estimate or zero for i in items), zero
+            ),
+            items=items,
+        )
+
+    def expire_overdue(
+        self, db: Session, *, today: date | None = None, chunk_size: int = 500
+    ) -> int:
+        """
+        Expire pending quotes whose validity ended before today.
+
+        Quotes are expired in chunks, each its own short transaction: rows
+        are claimed with FOR UPDATE SKIP LOCKED, so a quote being edited is
+        left for the next run instead of waited on. The row triggers log the
+        status change and notify caches; once a chunk is committed, its
+        quotes and their items are announced on the change feed so quote
+        comparisons get refreshed. Returns the number of quotes expired.
+        """
+        today = today or datetime.now(UTC).date()
+        batch = (
+            select(Quote.id)
+            .where(Quote.status == QuoteStatus.PENDING, Quote.valid_until < today)
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+        )
+        stmt = (
+            update(Quote)
+            .where(
+                Quote.id == batch.c.id,
+                Item.id == Quote.item_id,
+                Campaign.id == Item.campaign_id,
+            )
+            .values(status=QuoteStatus.EXPIRED, updated_at=func.now())
+            .returning(Quote.id, Quote.item_id, Campaign.project_id)
+            .execution_options(synchronize_session=False)
+        )
+        expired = 0
+        while True:
+            rows = db.execute(stmt).all()
+            db.commit()
+            for row in rows:
+                change_feed.publish(
+                    entity="quotes",
+                    id=row.id,
+                    op="update",
+                    fields=["status"],
+                    project_id=row.project_id,
+                )
+            for item_id, project_id in {(r.item_id, r.project_id) for r in rows}:
+                change_feed.publish(
+                    entity="items",
+                    id=item_id,
+                    op="update",
+                    fields=["quotes"],
+                    project_id=project_id,
+                )
+            expired += len(rows)
+            if len(rows) < chunk_size:
+                return expired
+
+    def _compare(
+        self,
+        db: Session,
+        item_filter,
+        *,
+        include_closed: bool,
+        currency: Currency | None = None,
+    ) -> list[ItemQuoteComparison]:
+        """Rank quotes per item with a single window-function query.
+
+        Prices are normalized to the base currency in SQL, or to
+        ``currency`` at its latest rate, so ranking, min, median and spread
+        are comparable across currencies. Rejected and expired quotes are
+        left out unless ``include_closed`` is set.
+        """
+        join_on = Quote.item_id == Item.id
+        if not include_closed:
+            join_on = and_(
+                join_on, Quote.status.in_([QuoteStatus.PENDING, QuoteStatus.APPROVED])
+            )
+
+        fx = FxJoin(
+            Quote.currency,
+            Quote.created_at,
+            report_rate=fx_service.rate(db, currency),
+        )
+        normalized = fx.price(Quote.price)
+        ranked = (
+            fx.join(
+                select(
+                    Item.id.label("item_id"),
+                    Item.name.label("item_name"),
+                    fx.reported(Item.estimated_cost).label("estimated_cost"),
+                    Quote.id.label("quote_id"),
+                    Quote.craftsman_id,
+                    Quote.status,
+                    Quote.price,
+                    Quote.currency,
+                    normalized.label("normalized_price"),
+                    func.rank()
+                    .over(partition_by=Item.id, order_by=normalized)
+                    .label("rank"),
+                    func.count(Quote.id)
+                    .over(partition_by=Item.id)
+                    .label("quote_count"),
+                    func.min(normalized).over(partition_by=Item.id).label("min_price"),
+                    func.max(normalized).over(partition_by=Item.id).label("max_price"),
+                )
+                .select_from(Item)
+                .outerjoin(Quote, join_on)
+            )
+            .where(item_filter)
+            .cte("ranked")
+        )
+        medians = (
+            select(
+                ranked.c.item_id,
+                func.percentile_cont(0.5)
+                .within_group(ranked.c.normalized_price)
+                .cast(Numeric(12, 2))
+                .label("median_price"),
+            )
+            .group_by(ranked.c.item_id)
+            .cte("medians")
+        )
+        stmt = (
+            select(ranked, medians.c.median_price)
+            .join(medians, medians.c.item_id == ranked.c.item_id)
+            .order_by(ranked.c.item_id, ranked.c.rank, ranked.c.quote_id)
+        )
+        rows = db.execute(stmt).all()
+
+        comparisons: list[ItemQuoteComparison] = []
+        for row in rows:
+            if not comparisons or comparisons[-1].item_id != row.item_id:
+                comparisons.append(
+                    self._item_comparison(row, currency or settings.BASE_CURRENCY)
+                )
+            if row.quote_id is not None:
+                comparisons[-1].quotes.append(self._comparison_entry(row))
+        return comparisons
+
+    @staticmethod
+    def _item_comparison(row: Row, currency: str) -> ItemQuoteComparison:
+        """Build the per-item summary from the window aggregates of a row"""
+        spread = savings = None
+        if row.min_price is not None:
+            spread = row.max_price - row.min_price
+            if row.estimated_cost is not None:
+                savings = row.estimated_cost - row.min_price
+        return ItemQuoteComparison(
+            item_id=row.item_id,
+            item_name=row.item_name,
+            estimated_cost=row.estimated_cost,
+            base_currency=currency,
+            quote_count=row.quote_count,
+            min_price=row.min_price,
+            median_price=row.median_price,
+            max_price=row.max_price,
+            spread=spread,
+            savings_vs_estimate=savings,
+            quotes=[],
+        )
+
+    @staticmethod
+    def _comparison_entry(row: Row) -> QuoteComparisonEntry:
+        """Build a ranked quote entry with its delta from the best price"""
+        delta = row.normalized_price - row.min_price
+        percentage = None
+        if row.min_price:
+            percentage = round(delta / row.min_price * 100, 2)
+        return QuoteComparisonEntry(
+            quote_id=row.quote_id,
+            craftsman_id=row.craftsman_id,
+            status=row.status,
+            price=row.price,
+            currency=row.currency,
+            normalized_price=row.normalized_price,
+            rank=row.rank,
+            delta_from_best=delta,
+            delta_from_best_percentage=percentage,
+        )
+
 
 # Create instance
 quote_service = QuoteService(Quote)
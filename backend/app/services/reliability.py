@@ -0,0 +1,321 @@
+"""
+Craftsman reliability scores.
+
+Scores are recomputed in batch rather than per page view: one SQL
+aggregate over the quotes produces every craftsman's counts, median
+turnaround and price deviation, and the peer comparison and the final
+score are then computed for all craftsmen at once with NumPy. Results
+live in ``craftsman_scores`` so ranked listings are an index read.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from sqlalchemy import Float, cast, func, literal, or_, select, union, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.craftsman import Craftsman
+from ..models.craftsman_score import SPECIALTY_LENGTH, CraftsmanScore
+from ..models.enums import MessageDirection, QuoteStatus
+from ..models.quote import Quote
+from ..models.whatsapp_message import WhatsAppMessage
+from .fx import FxJoin
+
+# Share of the score given to approvals, expiries, turnaround and pricing
+WEIGHTS = (0.4, 0.2, 0.2, 0.2)
+
+# A quote sent this long after the request scores half the turnaround part
+TURNAROUND_HALF_LIFE_HOURS = 48
+
+# Prices this many standard deviations from the specialty's score zero
+MAX_PRICE_Z = 3
+
+# Quotes written by transactions still open when the last run started
+INCREMENTAL_OVERLAP = timedelta(minutes=5)
+
+
+def primary_specialty(specialties):
+    """SQL expression for the first listed specialty, normalised"""
+    first = func.lower(func.trim(func.split_part(specialties, ",", 1)))
+    # The specialty lists allow longer entries than the score tables store
+    return func.left(first, SPECIALTY_LENGTH)
+
+
+def normalize_specialty(specialty: str) -> str:
+    """A specialty filter as primary_specialty stores it"""
+    return specialty.strip().lower()[:SPECIALTY_LENGTH]
+
+
+class ReliabilityService:
+    """Batch scoring of craftsmen from their quote history"""
+
+    def refresh(
+        self, db: Session, *, full: bool = False, craftsman_ids: list[int] | None = None
+    ) -> int:
+        """
+        Recompute craftsman scores; returns the number of craftsmen rescored.
+
+        An incremental run (the default) only re-aggregates craftsmen who
+        have no score yet, changed since the last run or quoted an item
+        that got a new or changed quote, as those move the item's median
+        price. Deleted quotes are only noticed by a full run.
+        """
+        if craftsman_ids is None and not full:
+            craftsman_ids = self._changed_craftsmen(db)
+        if craftsman_ids is not None and not craftsman_ids:
+            return 0
+
+        quotes = select(Quote).where(Quote.price > 0)
+        if craftsman_ids is not None:
+            items = select(Quote.item_id).where(Quote.craftsman_id.in_(craftsman_ids))
+            quotes = quotes.where(Quote.item_id.in_(items))
+        quotes = quotes.subquery()
+
+        requested_at = (
+            select(func.max(WhatsAppMessage.sent_at))
+            .where(
+                WhatsAppMessage.craftsman_id == quotes.c.craftsman_id,
+                WhatsAppMessage.direction == MessageDirection.OUTBOUND,
+                WhatsAppMessage.message_type == "template",
+                WhatsAppMessage.sent_at <= quotes.c.created_at,
+            )
+            .scalar_subquery()
+        )
+        fx = FxJoin(quotes.c.currency, quotes.c.created_at)
+        offers = fx.join(
+            select(
+                quotes.c.id,
+                quotes.c.item_id,
+                quotes.c.craftsman_id,
+                quotes.c.status,
+                cast(fx.price(quotes.c.price), Float).label("price"),
+                func.date_part("epoch", quotes.c.created_at - requested_at).label(
+                    "turnaround"
+                ),
+            )
+        ).cte("offers")
+        # Prices are only comparable between craftsmen quoting the same item
+        medians = (
+            select(
+                offers.c.item_id,
+                func.percentile_cont(0.5)
+                .within_group(offers.c.price)
+                .label("median_price"),
+            )
+            .group_by(offers.c.item_id)
+            .having(func.count(offers.c.craftsman_id.distinct()) > 1)
+            .cte("medians")
+        )
+
+        def count(status: QuoteStatus):
+            return func.count(offers.c.id).filter(offers.c.status == status)
+
+        stats = (
+            select(
+                Craftsman.id,
+                primary_specialty(Craftsman.specialties),
+                func.count(offers.c.id),
+                count(QuoteStatus.APPROVED),
+                count(QuoteStatus.REJECTED),
+                count(QuoteStatus.EXPIRED),
+                func.percentile_cont(0.5).within_group(offers.c.turnaround),
+                func.avg(func.ln(offers.c.price / medians.c.median_price)),
+                literal(0.0),
+            )
+            .select_from(Craftsman)
+            .outerjoin(offers, offers.c.craftsman_id == Craftsman.id)
+            .outerjoin(medians, medians.c.item_id == offers.c.item_id)
+            .group_by(Craftsman.id)
+        )
+        if craftsman_ids is not None:
+            stats = stats.where(Craftsman.id.in_(craftsman_ids))
+
+        stmt = insert(CraftsmanScore).from_select(
+            [
+                "craftsman_id",
+                "specialty",
+                "quotes",
+                "approved",
+                "rejected",
+                "expired",
+                "turnaround_seconds",
+                "price_deviation",
+                "reliability",
+            ],
+            stats,
+        )
+        result = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["craftsman_id"],
+                set_={
+                    "specialty": stmt.excluded.specialty,
+                    "quotes": stmt.excluded.quotes,
+                    "approved": stmt.excluded.approved,
+                    "rejected": stmt.excluded.rejected,
+                    "expired": stmt.excluded.expired,
+                    "turnaround_seconds": stmt.excluded.turnaround_seconds,
+                    "price_deviation": stmt.excluded.price_deviation,
+                    "computed_at": func.now(),
+                },
+            )
+        )
+        # Peer statistics shift with every rescored craftsman
+        self._score(db)
+        db.commit()
+        return result.rowcount
+
+    def calculate_reliability(
+        self, db: Session, craftsman_id: int
+    ) -> CraftsmanScore | None:
+        """Score of one craftsman, computed now if the batch has not yet"""
+        score = db.get(CraftsmanScore, craftsman_id)
+        if score is None and db.get(Craftsman, craftsman_id):
+            self.refresh(db, craftsman_ids=[craftsman_id])
+            score = db.get(CraftsmanScore, craftsman_id)
+        return score
+
+    def ranked(
+        self,
+        db: Session,
+        *,
+        specialty: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[CraftsmanScore]:
+        """Scored craftsmen, most reliable first"""
+        stmt = select(CraftsmanScore).order_by(
+            CraftsmanScore.reliability.desc(), CraftsmanScore.craftsman_id.desc()
+        )
+        if specialty:
+            stmt = stmt.where(
+                CraftsmanScore.specialty == normalize_specialty(specialty)
+            )
+        return list(db.scalars(stmt.offset(skip).limit(limit)))
+
+    def _changed_craftsmen(self, db: Session) -> list[int]:
+        last_run = db.scalar(select(func.max(CraftsmanScore.computed_at)))
+        unscored = (
+            select(Craftsman.id)
+            .outerjoin(CraftsmanScore)
+            .where(CraftsmanScore.craftsman_id.is_(None))
+        )
+        if last_run is None:
+            return list(db.scalars(unscored))
+        since = last_run - INCREMENTAL_OVERLAP
+        changed_items = select(Quote.item_id).where(
+            or_(Quote.created_at >= since, Quote.updated_at >= since)
+        )
+        targets = union(
+            unscored,
+            select(Craftsman.id).where(Craftsman.updated_at >= since),
+            select(Quote.craftsman_id).where(Quote.item_id.in_(changed_items)),
+        )
+        return list(db.scalars(targets))
+
+    def _score(self, db: Session) -> None:
+        """Recompute price z-scores per specialty and the final scores"""
+        rows = db.execute(
+            select(
+                CraftsmanScore.craftsman_id,
+                CraftsmanScore.specialty,
+                CraftsmanScore.approved,
+                CraftsmanScore.rejected,
+                CraftsmanScore.expired,
+                CraftsmanScore.turnaround_seconds,
+                CraftsmanScore.price_deviation,
+                CraftsmanScore.approval_rate,
+                CraftsmanScore.expiry_rate,
+                CraftsmanScore.price_deviation_z,
+                CraftsmanScore.reliability,
+            )
+        ).all()
+        if not rows:
+            return
+        (
+            ids,
+            specialties,
+            approved,
+            rejected,
+            expired,
+            turnaround,
+            deviation,
+            *current,
+        ) = zip(*rows, strict=True)
+        approved = np.array(approved, dtype=float)
+        expired = np.array(expired, dtype=float)
+        decided = approved + np.array(rejected, dtype=float) + expired
+        turnaround = np.array(turnaround, dtype=float)
+        deviation = np.array(deviation, dtype=float)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            approval_rate = np.where(decided > 0, approved / decided, np.nan)
+            expiry_rate = np.where(decided > 0, expired / decided, np.nan)
+
+            # Deviation from the mean deviation of the specialty's craftsmen
+            _, group = np.unique(specialties, return_inverse=True)
+            known = ~np.isnan(deviation)
+            values = np.where(known, deviation, 0.0)
+            n = np.bincount(group, weights=known)
+            mean = np.bincount(group, weights=values) / n
+            spread = np.bincount(group, weights=values**2) / n - mean**2
+            std = np.sqrt(np.maximum(spread, 0))[group]
+            z = np.where(
+                known & (n[group] > 1) & (std > 1e-9),
+                (deviation - mean[group]) / std,
+                np.nan,
+            )
+
+        # Laplace smoothing keeps a single approval from scoring 100%
+        parts = np.stack(
+            [
+                (approved + 1) / (decided + 2),
+                1 - np.nan_to_num(expiry_rate, nan=0.5),
+                np.nan_to_num(
+                    0.5 ** (turnaround / 3600 / TURNAROUND_HALF_LIFE_HOURS), nan=0.5
+                ),
+                np.nan_to_num(np.clip(1 - np.abs(z) / MAX_PRICE_Z, 0, 1), nan=0.5),
+            ]
+        )
+        reliability = np.round(100 * (np.array(WEIGHTS) @ parts), 2)
+
+        def nullable(values: np.ndarray) -> list[float | None]:
+            return [None if np.isnan(v) else float(v) for v in values]
+
+        computed = zip(
+            nullable(approval_rate),
+            nullable(expiry_rate),
+            nullable(z),
+            reliability.tolist(),
+            strict=True,
+        )
+        changes = [
+            {
+                "craftsman_id": craftsman_id,
+                "approval_rate": new[0],
+                "expiry_rate": new[1],
+                "price_deviation_z": new[2],
+                "reliability": new[3],
+            }
+            for craftsman_id, new, old in zip(
+                ids, computed, zip(*current, strict=True), strict=True
+            )
+            if not self._same(new, old)
+        ]
+        if changes:
+            db.execute(update(CraftsmanScore), changes)
+
+    @staticmethod
+    def _same(new: tuple, old: tuple) -> bool:
+        return all(
+            a is None
+            and b is None
+            or a is not None
+            and b is not None
+            and abs(a - b) < 1e-9
+            for a, b in zip(new, old, strict=True)
+        )
+
+
+# Create instance
+reliability_service = ReliabilityService()
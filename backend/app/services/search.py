@@ -0,0 +1,179 @@
+import base64
+import json
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import Double, and_, func, literal, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from ..models.campaign import Campaign
+from ..models.item import Item
+from ..models.quote import Quote
+from ..models.search import search_query, search_vector
+from ..models.whatsapp_message import WhatsAppMessage
+
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8"
+)
+
+SortOrder = Literal["relevance", "recent"]
+
+
+def encode_cursor(values: list) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    payload = json.dumps(values, default=datetime.isoformat, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_keyset(cursor: str, length: int) -> list:
+    """Decode a cursor holding ``length`` sort key values"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def decode_cursor(cursor: str, sort: SortOrder) -> list:
+    """Decode a cursor; raises ValueError if it was not issued for this sort"""
+    values = decode_keyset(cursor, 4 if sort == "relevance" else 3)
+    values[-3] = datetime.fromisoformat(values[-3])
+    return values
+
+
+class SearchService:
+    """Full-text search over WhatsApp messages and quote texts.
+
+    Matching runs on the generated tsvector columns (GIN indexed) and
+    results are paged with a keyset cursor. ts_headline, the expensive
+    part, only runs for the rows of the returned page.
+    """
+
+    def search_messages(
+        self,
+        db: Session,
+        *,
+        q: str,
+        craftsman_id: int | None = None,
+        project_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        sort: SortOrder = "relevance",
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> dict:
+        """Search messages and quotes, best matches or newest first"""
+        query = search_query(q)
+
+        message_vector = search_vector(WhatsAppMessage.__table__)
+        messages = select(
+            literal("message").label("source"),
+            WhatsAppMessage.id.label("id"),
+            WhatsAppMessage.craftsman_id.label("craftsman_id"),
+            WhatsAppMessage.project_id.label("project_id"),
+            WhatsAppMessage.sent_at.label("sent_at"),
+        ).where(message_vector.op("@@")(query))
+
+        quote_vector = search_vector(Quote.__table__)
+        quotes = (
+            select(
+                literal("quote").label("source"),
+                Quote.id.label("id"),
+                Quote.craftsman_id.label("craftsman_id"),
+                Campaign.project_id.label("project_id"),
+                Quote.created_at.label("sent_at"),
+            )
+            .join(Item, Item.id == Quote.item_id)
+            .join(Campaign, Campaign.id == Item.campaign_id)
+            .where(quote_vector.op("@@")(query))
+        )
+
+        # Filter inside each branch so both can use their indexes
+        if craftsman_id is not None:
+            messages = messages.where(WhatsAppMessage.craftsman_id == craftsman_id)
+            quotes = quotes.where(Quote.craftsman_id == craftsman_id)
+        if project_id is not None:
+            messages = messages.where(WhatsAppMessage.project_id == project_id)
+            quotes = quotes.where(Campaign.project_id == project_id)
+        if date_from is not None:
+            messages = messages.where(WhatsAppMessage.sent_at >= date_from)
+            quotes = quotes.where(Quote.created_at >= date_from)
+        if date_to is not None:
+            messages = messages.where(WhatsAppMessage.sent_at < date_to)
+            quotes = quotes.where(Quote.created_at < date_to)
+
+        if sort == "relevance":
+            # float8 so the rank round-trips through the cursor exactly
+            messages = messages.add_columns(
+                func.ts_rank_cd(message_vector, query).cast(Double).label("rank")
+            )
+            quotes = quotes.add_columns(
+                func.ts_rank_cd(quote_vector, query).cast(Double).label("rank")
+            )
+
+        # Take the top of each branch before merging: a newest-first branch
+        # can then walk its sent_at index and stop after one page
+        after = decode_cursor(cursor, sort) if cursor else None
+        branches = []
+        for branch in (messages, quotes):
+            rows = branch.subquery()
+            top = select(rows)
+            if after:
+                top = top.where(tuple_(*self._keys(rows, sort)) < tuple_(*after))
+            branches.append(
+                top.order_by(*(key.desc() for key in self._keys(rows, sort))).limit(
+                    limit + 1
+                )
+            )
+        hits = union_all(*branches).subquery("hits")
+        keys = self._keys(hits, sort)
+        page = (
+            select(hits)
+            .order_by(*(key.desc() for key in keys))
+            .limit(limit + 1)
+            .subquery("page")
+        )
+
+        text = func.coalesce(
+            WhatsAppMessage.body,
+            func.concat_ws("\n", Quote.whatsapp_message, Quote.description),
+        )
+        columns = [
+            page,
+            func.ts_headline("spanish", text, query, HEADLINE_OPTIONS).label("snippet"),
+        ]
+        if sort == "recent":
+            # Newest-first pages can walk the sent_at index and stop early,
+            # so only the rows that are returned get ranked
+            vector = func.coalesce(message_vector, quote_vector)
+            columns.append(func.ts_rank_cd(vector, query).cast(Double).label("rank"))
+        stmt = (
+            select(*columns)
+            .outerjoin(
+                WhatsAppMessage,
+                and_(page.c.source == "message", WhatsAppMessage.id == page.c.id),
+            )
+            .outerjoin(Quote, and_(page.c.source == "quote", Quote.id == page.c.id))
+            .order_by(*(page.c[key.name].desc() for key in keys))
+        )
+        rows = db.execute(stmt).mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][key.name] for key in keys])
+        return {"items": [dict(row) for row in rows], "next_cursor": next_cursor}
+
+    @staticmethod
+    def _keys(rows, sort: SortOrder) -> list:
+        """Sort key columns, most significant first"""
+        keys = [rows.c.sent_at, rows.c.source, rows.c.id]
+        if sort == "relevance":
+            keys.insert(0, rows.c.rank)
+        return keys
+
+
+# Create instance
+search_service = SearchService()
@@ -0,0 +1,158 @@
+import hashlib
+import hmac
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Protocol
+from urllib.parse import quote, urlencode
+
+import redis
+from botocore.client import BaseClient
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from ..core.config import settings
+from .storage import LocalStorageService, StorageService
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "signed-url"
+
+
+@dataclass(frozen=True, slots=True)
+class SignedURL:
+    """A download link and the moment it stops working"""
+
+    url: str
+    expires_at: datetime
+
+
+class URLSigner(Protocol):
+    """Storage backend able to sign download links for its objects"""
+
+    name: str
+
+    def sign(self, key: str, expires_in: int) -> str: ...
+
+
+class S3URLSigner:
+    """Presigned S3 GET URLs (signed locally, no request to AWS)"""
+
+    name = "s3"
+
+    def __init__(self, client: BaseClient, bucket: str):
+        self.client = client
+        self.bucket = bucket
+
+    def sign(self, key: str, expires_in: int) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+
+class LocalURLSigner:
+    """HMAC-signed links to the API's local file endpoint, for development"""
+
+    name = "local"
+
+    def __init__(self, secret: str, base_url: str = "/api/v1/documents/files"):
+        self.secret = secret.encode()
+        self.base_url = base_url
+
+    def signature(self, key: str, expires: int) -> str:
+        message = f"{key}\n{expires}".encode()
+        return hmac.new(self.secret, message, hashlib.sha256).hexdigest()
+
+    def sign(self, key: str, expires_in: int) -> str:
+        expires = int(time.time()) + expires_in
+        query = urlencode(
+            {"expires": expires, "signature": self.signature(key, expires)}
+        )
+        return f"{self.base_url}/{quote(key)}?{query}"
+
+    def verify(self, key: str, expires: int, signature: str) -> bool:
+        """Check a link was issued by us and has not expired"""
+        return expires > time.time() and hmac.compare_digest(
+            self.signature(key, expires), signature
+        )
+
+
+class SignedURLService:
+    """Issue download links for many documents at once, cached in Redis.
+
+    A listing is served with one MGET; only the keys without a cached link
+    (or whose link is close to expiring) are signed, and those are written
+    back in one pipeline. Links stay cached until they have less than
+    ``min_validity`` seconds left, so a shared link always works for at
+    least that long. Redis being down only costs the extra signing.
+    """
+
+    def __init__(
+        self,
+        signer: URLSigner,
+        cache: redis.Redis,
+        *,
+        ttl: int = settings.DOCUMENT_URL_TTL_SECONDS,
+        min_validity: int = settings.DOCUMENT_URL_MIN_VALIDITY_SECONDS,
+    ):
+        self.signer = signer
+        self.cache = cache
+        self.ttl = ttl
+        self.min_validity = min_validity
+
+    def url_for(self, key: str) -> SignedURL:
+        """Download link for a single object"""
+        return self.urls_for([key])[key]
+
+    def urls_for(self, keys: Iterable[str]) -> dict[str, SignedURL]:
+        """Download links for a batch of objects, keyed by object key"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        cache_keys = [f"{CACHE_PREFIX}:{self.signer.name}:{key}" for key in keys]
+        try:
+            cached = self.cache.mget(cache_keys)
+        except RedisError:
+            logger.warning("Signed URL cache unavailable", exc_info=True)
+            cached = [None] * len(keys)
+
+        urls = {}
+        issued = {}
+        now = int(time.time())
+        for key, cache_key, value in zip(keys, cache_keys, cached, strict=True):
+            if value is not None:
+                expires, _, url = value.decode().partition(" ")
+                urls[key] = SignedURL(url, datetime.fromtimestamp(int(expires), UTC))
+                continue
+            url = self.signer.sign(key, self.ttl)
+            urls[key] = SignedURL(url, datetime.fromtimestamp(now + self.ttl, UTC))
+            issued[cache_key] = f"{now + self.ttl} {url}"
+
+        if issued:
+            try:
+                with self.cache.pipeline(transaction=False) as pipe:
+                    for cache_key, value in issued.items():
+                        pipe.set(cache_key, value, ex=self.ttl - self.min_validity)
+                    pipe.execute()
+            except RedisError:
+                logger.warning("Could not cache signed URLs", exc_info=True)
+        return urls
+
+
+def create_signer(storage: StorageService | LocalStorageService) -> URLSigner:
+    """Signer for the storage backend in use"""
+    if isinstance(storage, LocalStorageService):
+        return LocalURLSigner(settings.SECRET_KEY)
+    return S3URLSigner(storage.client, storage.bucket)
+
+
+def get_signed_url_service(request: Request) -> SignedURLService:
+    """
+    Dependency to get the application's signed URL service.
+    Its S3 client is shared, so it lives on app.state.
+    """
+    return request.app.state.signed_urls
@@ -0,0 +1,285 @@
+"""
+In-process similarity index over item names and descriptions.
+
+Items are represented as character trigram vectors, which match across
+plurals, typos and the Spanish/Catalan spellings found in quote requests
+("armari"/"armario") without a stemmer. The index keeps one posting list
+per trigram; a query scores every item at once by accumulating the
+postings of its trigrams with ``numpy.bincount``, which is a sparse
+matrix-vector product without materialising the matrix.
+
+Item vectors are L2-normalised term frequencies and inverse document
+frequencies are applied on the query side only, so adding an item never
+changes the stored weights of the others and inserts are incremental.
+Changed items are appended and their old row is tombstoned; the index is
+rebuilt once tombstones pile up. Each row keeps a digest of the text it was
+built from, so re-indexing an item whose name and description did not
+change, such as the bus echo of a write this process already indexed, is a
+no-op.
+"""
+
+import logging
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..core.database import SessionLocal
+from ..models.item import Item
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+
+# The name says more about an item than its description
+NAME_WEIGHT = 2
+
+WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def ngrams(text: str | None) -> Counter:
+    """Character trigram counts of accent-folded, lower-cased words"""
+    if not text:
+        return Counter()
+    folded = text.lower()
+    if not folded.isascii():
+        folded = unicodedata.normalize("NFKD", folded)
+        folded = "".join(c for c in folded if not unicodedata.combining(c))
+    padded = f" {WORD_SPLIT.sub(' ', folded).strip()} "
+    return Counter([padded[i : i + NGRAM] for i in range(len(padded) - NGRAM + 1)])
+
+
+def item_terms(name: str | None, description: str | None) -> Counter:
+    # Repeating the name counts its trigrams NAME_WEIGHT times in one pass
+    return ngrams(f"{name or ''} " * NAME_WEIGHT + (description or ""))
+
+
+def item_vector(
+    name: str | None, description: str | None
+) -> tuple[list[str], list[float]]:
+    """Trigrams of an item with their L2-normalised sublinear weights"""
+    terms = item_terms(name, description)
+    weights = [1 + math.log(count) for count in terms.values()]
+    norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+    return list(terms), [w / norm for w in weights]
+
+
+def text_digest(name: str | None, description: str | None) -> int:
+    """Fingerprint of the text an item is indexed by"""
+    return hash((name or "", description or ""))
+
+
+class ItemSimilarityIndex:
+    """Top-k similar items by name and description.
+
+    Built lazily from the ``items`` table on first use and kept current by
+    ``add``/``remove`` from the item service and, across processes, by the
+    invalidation bus (it implements ``CacheInvalidator``). Safe to share
+    between request threads.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        *,
+        compact_ratio: float = 0.25,
+    ):
+        self.session_factory = session_factory
+        self.compact_ratio = compact_ratio
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._built = False
+        self._ids = array("q")  # row -> item id
+        self._alive = array("b")
+        self._digests = array("q")  # row -> text_digest
+        self._rows: dict[int, int] = {}  # item id -> live row
+        self._postings: dict[str, tuple[array, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def build(self, db: Session) -> int:
+        """(Re)load every item; returns the number indexed"""
+        rows = db.execute(
+            select(Item.id, Item.name, Item.description).execution_options(
+                yield_per=5000
+            )
+        )
+        return self.load(rows)
+
+    def load(self, rows: Iterable[tuple[int, str, str | None]]) -> int:
+        """Replace the index with (id, name, description) rows"""
+        ids, digests, rows_of = array("q"), array("q"), {}
+        grams: list[str] = []
+        members, values = array("i"), array("f")
+        for row, (item_id, name, description) in enumerate(rows):
+            ids.append(item_id)
+            digests.append(text_digest(name, description))
+            rows_of[item_id] = row
+            terms, weights = item_vector(name, description)
+            grams.extend(terms)
+            members.extend([row] * len(terms))
+            values.extend(weights)
+
+        # Group the (gram, row, weight) triples by gram in one sort
+        vocabulary: dict[str, int] = {}
+        gram_ids = np.fromiter(
+            (vocabulary.setdefault(gram, len(vocabulary)) for gram in grams),
+            dtype=np.int32,
+            count=len(grams),
+        )
+        order = np.argsort(gram_ids, kind="stable")
+        bounds = np.searchsorted(gram_ids[order], np.arange(len(vocabulary) + 1))
+        members_by_gram = np.frombuffer(members, dtype=np.int32)[order]
+        values_by_gram = np.frombuffer(values, dtype=np.float32)[order]
+        postings = {}
+        for gram, n in vocabulary.items():
+            start, end = bounds[n], bounds[n + 1]
+            postings[gram] = (
+                array("i", members_by_gram[start:end].tobytes()),
+                array("f", values_by_gram[start:end].tobytes()),
+            )
+
+        with self._lock:
+            self._ids, self._rows, self._postings = ids, rows_of, postings
+            self._digests = digests
+            self._alive = array("b", [1]) * len(ids)
+            self._built = True
+            return len(self._rows)
+
+    def ensure_built(self, db: Session) -> None:
+        with self._build_lock:
+            if not self._built:
+                self.build(db)
+
+    def add(self, item_id: int, name: str, description: str | None) -> None:
+        """Index a new item or re-index a changed one"""
+        with self._lock:
+            if not self._built:
+                return
+            row = self._rows.get(item_id)
+            if row is not None and self._digests[row] == text_digest(name, description):
+                return
+            self._remove(item_id)
+            # Removing may have dropped the index for a rebuild
+            if self._built:
+                self._add(item_id, name, description)
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            if self._built:
+                self._remove(item_id)
+
+    def query(
+        self,
+        name: str | None,
+        description: str | None = None,
+        *,
+        k: int = 10,
+        min_score: float = 0.0,
+        exclude_id: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Up to ``k`` (item id, cosine score) pairs, best first"""
+        terms = item_terms(name, description)
+        with self._lock:
+            total = len(self._ids)
+            if not terms or not total:
+                return []
+            grams, weights = [], []
+            for gram, count in terms.items():
+                posting = self._postings.get(gram)
+                if posting:
+                    idf = math.log((1 + len(self._rows)) / (1 + len(posting[0]))) + 1
+                    grams.append(posting)
+                    weights.append((1 + math.log(count)) * idf)
+            if not grams:
+                return []
+            norm = math.sqrt(sum(w * w for w in weights))
+            rows = np.concatenate(
+                [np.frombuffer(posting[0], dtype=np.int32) for posting in grams]
+            )
+            values = np.concatenate(
+                [
+                    np.frombuffer(posting[1], dtype=np.float32) * (weight / norm)
+                    for posting, weight in zip(grams, weights, strict=True)
+                ]
+            )
+            scores = np.bincount(rows, weights=values, minlength=total)
+            scores[np.frombuffer(self._alive, dtype=np.int8) == 0] = 0
+            if exclude_id in self._rows:
+                scores[self._rows[exclude_id]] = 0
+            ids = np.frombuffer(self._ids, dtype=np.int64).copy()
+
+        k = min(k, total)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (int(ids[row]), float(scores[row]))
+            for row in top
+            if scores[row] > 0 and scores[row] >= min_score
+        ]
+
+    # CacheInvalidator
+
+    def invalidate(self, table: str, id: int) -> None:
+        """Re-read one changed item; called from the invalidation bus.
+
+        Changes this process already indexed through ``add`` come back here
+        too; they find the same text indexed and leave the index alone.
+        """
+        if not self._built:
+            return
+        with self.session_factory() as db:
+            row = db.execute(
+                select(Item.name, Item.description).where(Item.id == id)
+            ).first()
+        if row:
+            self.add(id, row.name, row.description)
+        else:
+            self.remove(id)
+
+    def flush(self) -> None:
+        """Forget everything; the next query rebuilds the index"""
+        with self._lock:
+            self._reset()
+
+    def _add(self, item_id: int, name: str, description: str | None) -> None:
+        row = len(self._ids)
+        self._ids.append(item_id)
+        self._alive.append(1)
+        self._digests.append(text_digest(name, description))
+        self._rows[item_id] = row
+        terms, weights = item_vector(name, description)
+        for gram, weight in zip(terms, weights, strict=True):
+            rows, values = self._postings.setdefault(gram, (array("i"), array("f")))
+            rows.append(row)
+            values.append(weight)
+
+    def _remove(self, item_id: int) -> None:
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        self._alive[row] = 0
+        dead = len(self._ids) - len(self._rows)
+        if dead > 1000 and dead > self.compact_ratio * len(self._ids):
+            # Postings of dead rows are only reclaimed by a rebuild
+            logger.info("Item similarity index has %s dead rows; rebuilding", dead)
+            self._reset()
+
+
+# Create instance
+item_similarity_index = ItemSimilarityIndex()
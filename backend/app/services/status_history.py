@@ -0,0 +1,292 @@
+import logging
+import math
+from datetime import UTC, date, datetime, time, timedelta
+from enum import StrEnum
+from typing import Literal
+
+from sqlalchemy import Date, SmallInteger, cast, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..models.enums import CampaignStatus, ProjectStatus, QuoteStatus, TaskStatus
+from ..models.status_history import (
+    StatusCurrent,
+    StatusDurationRollup,
+    StatusHistory,
+)
+
+logger = logging.getLogger(__name__)
+
+Entity = Literal["projects", "campaigns", "quotes", "tasks"]
+
+DEFAULT_PARTITION = "status_history_default"
+
+# The database stores enum member names; the API speaks values
+STATUS_ENUMS: dict[str, type[StrEnum]] = {
+    "projects": ProjectStatus,
+    "campaigns": CampaignStatus,
+    "quotes": QuoteStatus,
+    "tasks": TaskStatus,
+}
+
+# Statuses work can still be stuck in
+OPEN_STATUSES: dict[str, tuple[StrEnum, ...]] = {
+    "projects": (ProjectStatus.PLANNING, ProjectStatus.ACTIVE, ProjectStatus.ON_HOLD),
+    "campaigns": (CampaignStatus.ACTIVE, CampaignStatus.ON_HOLD),
+    "quotes": (QuoteStatus.PENDING,),
+    "tasks": (TaskStatus.TODO, TaskStatus.IN_PROGRESS),
+}
+
+# Durations are counted in log-scale buckets, four per doubling, so a
+# percentile read from the rollups is at most ~19% above the exact one
+BUCKETS_PER_DOUBLING = 4
+
+
+def bucket_upper_bound(bucket: int) -> float:
+    """Longest duration, in seconds, counted in a bucket"""
+    return 2 ** ((bucket + 1) / BUCKETS_PER_DOUBLING)
+
+
+def status_value(entity: str, name: str) -> str:
+    """API value of a stored status name"""
+    return STATUS_ENUMS[entity][name].value
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+class StatusHistoryService:
+    """Status history of projects, campaigns, quotes and tasks.
+
+    Rows are written by database triggers (see app.models.status_history);
+    this service keeps the monthly partitions ahead of time, rolls finished
+    statuses up into per-day duration histograms and answers the analytics
+    from the rollups and the current-status table.
+    """
+
+    def ensure_partitions(
+        self, db: Session, *, months_ahead: int = 2, today: date | None = None
+    ) -> list[str]:
+        """
+        Create the monthly partitions from this month on; returns their names.
+
+        Each month is created in its own transaction, and a month that
+        fails is logged and skipped so the later ones are still created.
+        """
+        start = month_start(today or datetime.now(UTC).date())
+        names = []
+        for _ in range(months_ahead + 1):
+            end = next_month(start)
+            name = f"status_history_p{start:%Y_%m}"
+            try:
+                self._create_partition(db, name, start, end)
+                db.commit()
+            except SQLAlchemyError:
+                db.rollback()
+                logger.exception("Could not create partition %s", name)
+            else:
+                names.append(name)
+            start = end
+        return names
+
+    def _create_partition(self, db: Session, name: str, start: date, end: date) -> None:
+        bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        if db.scalar(text("SELECT to_regclass(:name)"), {"name": name}):
+            return
+        in_range = (
+            f"changed_at >= '{start.isoformat()}'::timestamptz "
+            f"AND changed_at < '{end.isoformat()}'::timestamptz"
+        )
+        stranded = db.scalar(
+            text(f"SELECT EXISTS (SELECT FROM {DEFAULT_PARTITION} WHERE {in_range})")
+        )
+        if not stranded:
+            db.execute(
+                text(
+                    f"CREATE TABLE {name} PARTITION OF status_history FOR VALUES {bounds}"
+                )
+            )
+            return
+        # The month's rows went to the default partition while it was
+        # missing, and PostgreSQL refuses a partition the default holds rows
+        # for: move them into the new partition while the default is detached
+        logger.warning("Moving %s rows out of %s", name, DEFAULT_PARTITION)
+        columns = ", ".join(column.name for column in StatusHistory.__table__.c)
+        for statement in (
+            f"ALTER TABLE status_history DETACH PARTITION {DEFAULT_PARTITION}",
+            f"CREATE TABLE {name} PARTITION OF status_history FOR VALUES {bounds}",
+            f"INSERT INTO status_history ({columns}) "
+            f"SELECT {columns} FROM {DEFAULT_PARTITION} WHERE {in_range}",
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}",
+            f"ALTER TABLE status_history ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+        ):
+            db.execute(text(statement))
+
+    def rollup(self, db: Session, *, since: date | None = None) -> int:
+        """
+        Recompute the duration rollups of every day from ``since`` on.
+
+        Defaults to yesterday and today. Only the partitions covering those
+        days are scanned, and rerunning is harmless: a day's rows are
+        replaced with a fresh count. Returns the number of rollup rows
+        written.
+        """
+        since = since or datetime.now(UTC).date() - timedelta(days=1)
+        seconds = func.date_part(
+            "epoch", StatusHistory.changed_at - StatusHistory.entered_at
+        )
+        bucket = cast(
+            func.floor(
+                func.ln(func.greatest(seconds, 1)) / math.log(2) * BUCKETS_PER_DOUBLING
+            ),
+            SmallInteger,
+        )
+        day = cast(func.timezone("UTC", StatusHistory.changed_at), Date)
+        rows = (
+            select(
+                StatusHistory.entity,
+                StatusHistory.from_status,
+                day.label("day"),
+                bucket.label("bucket"),
+                func.count().label("transitions"),
+                func.sum(seconds).label("total_seconds"),
+            )
+            .where(
+                StatusHistory.changed_at >= datetime.combine(since, time(), UTC),
+                StatusHistory.entered_at.is_not(None),
+            )
+            .group_by(StatusHistory.entity, StatusHistory.from_status, day, bucket)
+        )
+        stmt = insert(StatusDurationRollup).from_select(
+            ["entity", "status", "day", "bucket", "transitions", "total_seconds"],
+            rows,
+        )
+        result = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["entity", "status", "day", "bucket"],
+                set_={
+                    "transitions": stmt.excluded.transitions,
+                    "total_seconds": stmt.excluded.total_seconds,
+                },
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+    def time_in_status(
+        self,
+        db: Session,
+        *,
+        entity: Entity | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[dict]:
+        """Average and p90 time spent in each status, from the daily rollups"""
+        stmt = select(
+            StatusDurationRollup.entity,
+            StatusDurationRollup.status,
+            StatusDurationRollup.bucket,
+            func.sum(StatusDurationRollup.transitions).label("transitions"),
+            func.sum(StatusDurationRollup.total_seconds).label("total_seconds"),
+        ).group_by(
+            StatusDurationRollup.entity,
+            StatusDurationRollup.status,
+            StatusDurationRollup.bucket,
+        )
+        if entity:
+            stmt = stmt.where(StatusDurationRollup.entity == entity)
+        if date_from:
+            stmt = stmt.where(StatusDurationRollup.day >= date_from)
+        if date_to:
+            stmt = stmt.where(StatusDurationRollup.day < date_to)
+
+        histograms: dict[tuple[str, str], list] = {}
+        for row in db.execute(stmt.order_by(StatusDurationRollup.bucket)):
+            histograms.setdefault((row.entity, row.status), []).append(row)
+
+        results = []
+        for (row_entity, status), buckets in sorted(histograms.items()):
+            transitions = sum(row.transitions for row in buckets)
+            total_seconds = sum(row.total_seconds for row in buckets)
+            results.append(
+                {
+                    "entity": row_entity,
+                    "status": status_value(row_entity, status),
+                    "transitions": transitions,
+                    "avg_seconds": total_seconds / transitions,
+                    "p90_seconds": self._percentile(buckets, transitions, 0.9),
+                }
+            )
+        return results
+
+    def bottlenecks(
+        self, db: Session, *, entity: Entity | None = None, limit: int = 20
+    ) -> list[dict]:
+        """Rows stuck longest in a status work can still be waiting in"""
+        open_statuses = [
+            (name, status.name)
+            for name, statuses in OPEN_STATUSES.items()
+            if entity in (None, name)
+            for status in statuses
+        ]
+        stmt = (
+            select(StatusCurrent)
+            .where(
+                tuple_(StatusCurrent.entity, StatusCurrent.status).in_(open_statuses)
+            )
+            .order_by(StatusCurrent.since, StatusCurrent.entity_id)
+            .limit(limit)
+        )
+        now = datetime.now(UTC)
+        return [
+            {
+                "entity": current.entity,
+                "entity_id": current.entity_id,
+                "status": status_value(current.entity, current.status),
+                "since": current.since,
+                "seconds_in_status": (now - current.since).total_seconds(),
+            }
+            for current in db.scalars(stmt)
+        ]
+
+    def history(self, db: Session, *, entity: Entity, entity_id: int) -> list[dict]:
+        """Every status a row has been through, oldest first"""
+        stmt = (
+            select(StatusHistory)
+            .where(StatusHistory.entity == entity, StatusHistory.entity_id == entity_id)
+            .order_by(StatusHistory.changed_at, StatusHistory.id)
+        )
+        return [
+            {
+                "from_status": change.from_status
+                and status_value(entity, change.from_status),
+                "to_status": status_value(entity, change.to_status),
+                "changed_at": change.changed_at,
+                "seconds_in_previous": (
+                    (change.changed_at - change.entered_at).total_seconds()
+                    if change.entered_at
+                    else None
+                ),
+            }
+            for change in db.scalars(stmt)
+        ]
+
+    @staticmethod
+    def _percentile(buckets: list, transitions: int, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of durations"""
+        seen = 0
+        for row in buckets:
+            seen += row.transitions
+            if seen >= fraction * transitions:
+                return bucket_upper_bound(row.bucket)
+        return bucket_upper_bound(buckets[-1].bucket)
+
+
+# Create instance
+status_history_service = StatusHistoryService()
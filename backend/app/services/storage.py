@@ -0,0 +1,405 @@
+import asyncio
+import base64
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from collections.abc import AsyncIterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import batched
+from pathlib import Path
+from typing import BinaryIO
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.client import BaseClient
+from botocore.config import Config
+from fastapi import Request
+
+from ..core.config import settings
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a streamed upload goes past its size limit"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Upload exceeds {max_size} bytes")
+        self.max_size = max_size
+
+
+@dataclass(frozen=True, slots=True)
+class StoredObject:
+    """What S3 holds after an upload"""
+
+    key: str
+    size: int
+    sha256: str
+    etag: str
+
+
+def _checksum(data: bytes) -> str:
+    """Base64 SHA-256 as S3 expects in ChecksumSHA256"""
+    return base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+class S3RangeReader(io.RawIOBase):
+    """Seekable read-only view of an S3 object fetched with ranged GETs.
+
+    zipfile needs to seek to the central directory at the end of the
+    archive and then to each entry, so this lets it read an archive in
+    place. Wrap it in io.BufferedReader to read ahead in large blocks.
+    """
+
+    def __init__(self, client: BaseClient, bucket: str, key: str):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.size = client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}
+        self.position = max(0, base[whence] + offset)
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        if self.position >= self.size or not len(buffer):
+            return 0
+        end = min(self.position + len(buffer), self.size) - 1
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={self.position}-{end}"
+        )
+        data = response["Body"].read()
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+class StorageService:
+    """Stream uploads into the S3 bucket.
+
+    Request bodies are cut into parts as they arrive and each part is sent
+    with S3 multipart upload while the next one is read. At most
+    ``concurrency`` parts are in flight, which caps memory at roughly
+    (concurrency + 1) * part_size whatever the file size; nothing is
+    spooled to disk. Every part carries a SHA-256 checksum that S3 checks
+    on receipt.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        bucket: str,
+        *,
+        part_size: int = settings.S3_PART_SIZE,
+        concurrency: int = settings.S3_UPLOAD_CONCURRENCY,
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.part_size = part_size
+        self.concurrency = concurrency
+        # For put_file: the caller brings its own parallelism, so each file
+        # uploads its parts one after another
+        self.transfer = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            use_threads=False,
+        )
+
+    async def upload_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        content_type: str,
+        max_size: int | None = None,
+    ) -> StoredObject:
+        """Upload a stream of chunks, aborting the upload on any error"""
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        upload_id = None
+        parts: list[asyncio.Task] = []
+        in_flight = asyncio.Semaphore(self.concurrency)
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = await asyncio.to_thread(
+                            self._create_upload, key, content_type
+                        )
+                    part = bytes(buffer[: self.part_size])
+                    del buffer[: self.part_size]
+                    # Blocks reading the body while the parts in flight upload
+                    await in_flight.acquire()
+                    self._raise_failed(parts)
+                    parts.append(
+                        asyncio.create_task(
+                            self._upload_part(
+                                key, upload_id, len(parts) + 1, part, in_flight
+                            )
+                        )
+                    )
+
+            if upload_id is None:
+                # Fits in one part: a plain PUT is one request instead of three
+                etag = await asyncio.to_thread(
+                    self._put_object, key, bytes(buffer), content_type
+                )
+            else:
+                if buffer:
+                    await in_flight.acquire()
+                    parts.append(
+                        asyncio.create_task(
+                            self._upload_part(
+                                key, upload_id, len(parts) + 1, bytes(buffer), in_flight
+                            )
+                        )
+                    )
+                completed = await asyncio.gather(*parts)
+                etag = await asyncio.to_thread(
+                    self._complete_upload, key, upload_id, completed
+                )
+        except BaseException:
+            await asyncio.gather(*parts, return_exceptions=True)
+            if upload_id is not None:
+                await asyncio.to_thread(
+                    self.client.abort_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                )
+            raise
+        return StoredObject(key=key, size=size, sha256=digest.hexdigest(), etag=etag)
+
+    def delete(self, key: str) -> None:
+        """Remove an object from the bucket"""
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_pages(self, prefix: str, page_size: int = 1000) -> Iterator[list[dict]]:
+        """
+        Objects under a prefix, a page at a time in key order.
+
+        Each object is a dict with Key, Size, LastModified and ETag, as in
+        an S3 listing.
+        """
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self.bucket,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": page_size},
+        ):
+            yield page.get("Contents", [])
+
+    def open(self, key: str) -> BinaryIO:
+        """Seekable reader of an object, fetched with ranged GETs a part at a time"""
+        return io.BufferedReader(
+            S3RangeReader(self.client, self.bucket, key), buffer_size=self.part_size
+        )
+
+    def put_file(self, key: str, file: BinaryIO, *, content_type: str) -> None:
+        """Upload a file object, in checksummed parts when it is large"""
+        self.client.upload_fileobj(
+            file,
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type, "ChecksumAlgorithm": "SHA256"},
+            Config=self.transfer,
+        )
+
+    def _create_upload(self, key: str, content_type: str) -> str:
+        response = self.client.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            ContentType=content_type,
+            ChecksumAlgorithm="SHA256",
+        )
+        return response["UploadId"]
+
+    async def _upload_part(
+        self,
+        key: str,
+        upload_id: str,
+        number: int,
+        data: bytes,
+        in_flight: asyncio.Semaphore,
+    ) -> dict:
+        checksum = _checksum(data)
+        try:
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=data,
+                ChecksumAlgorithm="SHA256",
+                ChecksumSHA256=checksum,
+            )
+        finally:
+            in_flight.release()
+        return {
+            "PartNumber": number,
+            "ETag": response["ETag"],
+            "ChecksumSHA256": checksum,
+        }
+
+    def _complete_upload(self, key: str, upload_id: str, parts: list[dict]) -> str:
+        response = self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        return response["ETag"].strip('"')
+
+    def _put_object(self, key: str, data: bytes, content_type: str) -> str:
+        response = self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            ChecksumAlgorithm="SHA256",
+            ChecksumSHA256=_checksum(data),
+        )
+        return response["ETag"].strip('"')
+
+    @staticmethod
+    def _raise_failed(parts: list[asyncio.Task]) -> None:
+        """Stop reading as soon as a part upload has failed"""
+        for part in parts:
+            if part.done() and part.exception():
+                raise part.exception()
+
+
+class LocalStorageService:
+    """Keep uploads on the local filesystem, for development without S3"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path_for(self, key: str) -> Path:
+        """File holding an object, refusing keys that escape the root"""
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError("Invalid storage key")
+        return path
+
+    async def upload_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        content_type: str,
+        max_size: int | None = None,
+    ) -> StoredObject:
+        """Write a stream of chunks to a file"""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise UploadTooLargeError(max_size)
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        sha256 = digest.hexdigest()
+        return StoredObject(key=key, size=size, sha256=sha256, etag=sha256[:32])
+
+    def delete(self, key: str) -> None:
+        """Remove a stored file"""
+        self.path_for(key).unlink(missing_ok=True)
+
+    def list_pages(self, prefix: str, page_size: int = 1000) -> Iterator[list[dict]]:
+        """Files under a prefix, a page at a time in key order, as S3 lists"""
+        keys = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue  # an upload being written
+                key = (Path(directory) / name).relative_to(self.root).as_posix()
+                if key.startswith(prefix):
+                    keys.append(key)
+        # S3 orders keys by their UTF-8 bytes
+        keys.sort(key=str.encode)
+        for page in batched(keys, page_size):
+            objects = []
+            for key in page:
+                stat = self.path_for(key).stat()
+                objects.append(
+                    {
+                        "Key": key,
+                        "Size": stat.st_size,
+                        "LastModified": datetime.fromtimestamp(stat.st_mtime, UTC),
+                    }
+                )
+            yield objects
+
+    def open(self, key: str) -> BinaryIO:
+        """Seekable reader of a stored file"""
+        return self.path_for(key).open("rb")
+
+    def put_file(self, key: str, file: BinaryIO, *, content_type: str) -> None:
+        """Copy a file object into storage"""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                shutil.copyfileobj(file, tmp)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+
+def create_s3_client() -> BaseClient:
+    """S3 client for the configured bucket (thread-safe, connection pooled)"""
+    return boto3.client(
+        "s3",
+        region_name=settings.AWS_REGION,
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+        # SigV4 is required for presigned URLs in newer regions
+        config=Config(signature_version="s3v4"),
+    )
+
+
+def create_storage() -> StorageService | LocalStorageService:
+    """Storage for the configured backend"""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageService(settings.LOCAL_STORAGE_DIR)
+    return StorageService(create_s3_client(), settings.S3_BUCKET_NAME)
+
+
+def get_storage_service(request: Request) -> StorageService | LocalStorageService:
+    """
+    Dependency to get the application's storage service.
+    It owns the pooled S3 client, so it lives on app.state.
+    """
+    return request.app.state.storage
@@ -0,0 +1,69 @@
+from datetime import date
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import DATERANGE
+from sqlalchemy.orm import Session
+
+from ..models.campaign import Campaign
+from ..models.project import Project
+from ..models.task import Task
+from ..models.timeline import date_span, is_dated
+
+
+class TimelineService:
+    """Projects, campaigns and tasks intersecting a date window.
+
+    Projects and campaigns are matched with daterange overlap (&&) on their
+    GiST-indexed spans, tasks with a range scan of their due dates, so the
+    cost follows what is visible rather than the size of the history.
+    """
+
+    def get_timeline(
+        self,
+        db: Session,
+        *,
+        date_from: date,
+        date_to: date,
+        project_id: int | None = None,
+        limit: int = 1000,
+    ) -> dict:
+        """Everything on the timeline between two dates, both inclusive"""
+        window = func.daterange(
+            date_from, date_to, literal_column("'[]'"), type_=DATERANGE
+        )
+
+        projects = select(Project).where(
+            is_dated(Project.start_date, Project.end_date),
+            date_span(Project.start_date, Project.end_date).op("&&")(window),
+        )
+        campaigns = select(Campaign).where(
+            is_dated(Campaign.start_date, Campaign.end_date),
+            date_span(Campaign.start_date, Campaign.end_date).op("&&")(window),
+        )
+        tasks = select(Task).where(Task.due_date.between(date_from, date_to))
+        if project_id is not None:
+            projects = projects.where(Project.id == project_id)
+            campaigns = campaigns.where(Campaign.project_id == project_id)
+            tasks = tasks.where(Task.project_id == project_id)
+
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "projects": db.scalars(
+                projects.order_by(Project.start_date.nulls_first(), Project.id).limit(
+                    limit
+                )
+            ).all(),
+            "campaigns": db.scalars(
+                campaigns.order_by(
+                    Campaign.start_date.nulls_first(), Campaign.id
+                ).limit(limit)
+            ).all(),
+            "tasks": db.scalars(
+                tasks.order_by(Task.due_date, Task.id).limit(limit)
+            ).all(),
+        }
+
+
+# Create instance
+timeline_service = TimelineService()
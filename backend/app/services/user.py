@@ -25,6 +25,9 @@ class UserService(BaseCRUDService[User, UserCreate, UserUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.publish_change(
+            db_obj, "create", fields=obj_data.keys() - {"hashed_password"}
+        )
         return db_obj
 
     def authenticate(self, db: Session, *, email: str, password: str) -> User | None:
@@ -0,0 +1,214 @@
+import asyncio
+import random
+import re
+from collections.abc import Awaitable, Iterable
+
+import httpx
+import redis.asyncio as aioredis
+from fastapi import Request
+
+from ..core.config import settings
+from ..core.rate_limit import TokenBucket
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Graph API rate-limit errors that are not always sent as HTTP 429
+RETRY_ERROR_CODES = {4, 80007, 130429, 131056}
+
+
+class WhatsAppError(Exception):
+    """Raised when the Cloud API rejects a request or retries run out"""
+
+    def __init__(self, detail: str, status_code: int | None = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class WhatsAppService:
+    """Async sender for the WhatsApp Cloud API.
+
+    One pooled HTTP/2 client is shared by every send. Message sends take a
+    token from the business number's throughput bucket and from the
+    recipient's bucket before hitting the API, and rate-limit or server
+    errors are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        *,
+        base_url: str = settings.WHATSAPP_API_URL,
+        api_version: str = settings.WHATSAPP_API_VERSION,
+        access_token: str = settings.WHATSAPP_ACCESS_TOKEN,
+        phone_number_id: str = settings.WHATSAPP_PHONE_NUMBER_ID,
+        max_retries: int = settings.WHATSAPP_MAX_RETRIES,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.redis = redis
+        self.phone_number_id = phone_number_id
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.client = httpx.AsyncClient(
+            base_url=f"{base_url.rstrip('/')}/{api_version}",
+            headers={"Authorization": f"Bearer {access_token}"},
+            http2=transport is None,
+            transport=transport,
+            limits=httpx.Limits(max_connections=settings.WHATSAPP_SEND_CONCURRENCY),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+        self.throughput = TokenBucket(
+            redis,
+            f"whatsapp:rate:{phone_number_id}",
+            rate=settings.WHATSAPP_TIER_MESSAGES_PER_SECOND,
+            capacity=settings.WHATSAPP_TIER_MESSAGES_PER_SECOND,
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def send_text(self, phone: str, body: str) -> str:
+        """Send a plain text message and return its WhatsApp message ID"""
+        return await self._send_message(phone, {"type": "text", "text": {"body": body}})
+
+    async def send_template(
+        self,
+        phone: str,
+        template_id: str,
+        params: dict,
+        language: str = settings.WHATSAPP_TEMPLATE_LANGUAGE,
+    ) -> str:
+        """Send an approved template filled with named body parameters"""
+        parameters = [
+            {"type": "text", "parameter_name": name.lower(), "text": str(value)}
+            for name, value in params.items()
+        ]
+        template = {"name": template_id, "language": {"code": language}}
+        if parameters:
+            template["components"] = [{"type": "body", "parameters": parameters}]
+        return await self._send_message(
+            phone, {"type": "template", "template": template}
+        )
+
+    async def send_document(
+        self, phone: str, pdf: bytes, caption: str, filename: str = "documento.pdf"
+    ) -> str:
+        """Upload a PDF and send it as a document message"""
+        media = await self._request(
+            "POST",
+            f"/{self.phone_number_id}/media",
+            data={"messaging_product": "whatsapp", "type": "application/pdf"},
+            files={"file": (filename, pdf, "application/pdf")},
+        )
+        document = {"id": media["id"], "caption": caption, "filename": filename}
+        return await self._send_message(
+            phone, {"type": "document", "document": document}
+        )
+
+    async def send_many(
+        self,
+        sends: Iterable[Awaitable[str]],
+        concurrency: int = settings.WHATSAPP_SEND_CONCURRENCY,
+    ) -> list[str | WhatsAppError]:
+        """
+        Run many sends concurrently, e.g. a quote request to every craftsman.
+
+        Results keep the input order; a failed send yields its WhatsAppError
+        instead of cancelling the others.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(send: Awaitable[str]) -> str | WhatsAppError:
+            async with semaphore:
+                try:
+                    return await send
+                except WhatsAppError as exc:
+                    return exc
+
+        return await asyncio.gather(*(run(send) for send in sends))
+
+    async def _send_message(self, phone: str, message: dict) -> str:
+        """Rate-limit and post a message to the recipient"""
+        recipient = normalize_phone(phone)
+        await self.throughput.acquire()
+        await self._recipient_bucket(recipient).acquire()
+        response = await self._request(
+            "POST",
+            f"/{self.phone_number_id}/messages",
+            json={
+                "messaging_product": "whatsapp",
+                "recipient_type": "individual",
+                "to": recipient,
+                **message,
+            },
+        )
+        return response["messages"][0]["id"]
+
+    def _recipient_bucket(self, recipient: str) -> TokenBucket:
+        return TokenBucket(
+            self.redis,
+            f"whatsapp:rate:{self.phone_number_id}:{recipient}",
+            rate=settings.WHATSAPP_RECIPIENT_MESSAGES_PER_MINUTE / 60,
+            capacity=settings.WHATSAPP_RECIPIENT_BURST,
+        )
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        """Call the Graph API, retrying rate limits and server errors"""
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                error = WhatsAppError(f"Transport error: {exc!r}")
+            else:
+                if response.is_success:
+                    return response.json()
+                error = self._error(response)
+                if not self._retryable(response):
+                    raise error
+                retry_after = response.headers.get("Retry-After")
+            if attempt >= self.max_retries:
+                raise error
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+    @staticmethod
+    def _retryable(response: httpx.Response) -> bool:
+        if response.status_code in RETRY_STATUSES:
+            return True
+        try:
+            code = response.json()["error"]["code"]
+        except (ValueError, KeyError, TypeError):
+            return False
+        return code in RETRY_ERROR_CODES
+
+    @staticmethod
+    def _error(response: httpx.Response) -> WhatsAppError:
+        try:
+            detail = response.json()["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            detail = response.text or response.reason_phrase
+        return WhatsAppError(detail, status_code=response.status_code)
+
+
+def normalize_phone(phone: str) -> str:
+    """Digits-only international number as the Cloud API expects"""
+    return re.sub(r"\D", "", phone)
+
+
+def get_whatsapp_service(request: Request) -> WhatsAppService:
+    """
+    Dependency to get the application's WhatsApp sender.
+    It owns the pooled HTTP client, so it lives on app.state.
+    """
+    return request.app.state.whatsapp
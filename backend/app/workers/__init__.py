@@ -1 +1,5 @@
 # Celery tasks for async processing
+
+from .celery_app import celery_app
+
+__all__ = ["celery_app"]
@@ -0,0 +1,22 @@
+from app.core.database import SessionLocal
+from app.models.document import Document
+from app.services.bundle import BundleService
+from app.services.storage import create_storage
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="documents.extract_bundle", bind=True)
+def extract_bundle(self, document_id: int) -> dict:
+    """Extract an uploaded ZIP bundle, reporting progress as task state"""
+    service = BundleService(create_storage())
+
+    def progress(done: int, total: int) -> None:
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    with SessionLocal() as db:
+        document = db.get(Document, document_id)
+        if document is None:
+            raise ValueError(f"Document {document_id} not found")
+        extracted = service.extract(db, document, progress=progress)
+    return {"done": extracted, "total": extracted}
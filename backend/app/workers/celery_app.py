@@ -0,0 +1,70 @@
+from celery import Celery
+from celery.schedules import crontab
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "studiohub",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.workers.pdf",
+        "app.workers.bundle",
+        "app.workers.documents",
+        "app.workers.status_history",
+        "app.workers.deadlines",
+        "app.workers.quotes",
+        "app.workers.craftsmen",
+        "app.workers.dashboard",
+    ],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    result_expires=60 * 60 * 24,
+    timezone="Europe/Madrid",
+    beat_schedule={
+        "reconcile-documents": {
+            "task": "documents.reconcile",
+            "schedule": crontab(hour=3, minute=30),
+        },
+        "rollup-status-durations": {
+            "task": "status_history.rollup",
+            "schedule": crontab(minute="*/15"),
+        },
+        "create-status-history-partitions": {
+            "task": "status_history.partitions",
+            "schedule": crontab(hour=2, minute=0),
+        },
+        # Cheap when nothing crossed a deadline: the watermark is a day
+        "sweep-task-deadlines": {
+            "task": "deadlines.sweep",
+            "schedule": crontab(minute=5),
+        },
+        "expire-quotes": {
+            "task": "quotes.expire",
+            "schedule": crontab(minute=10),
+        },
+        "refresh-quote-price-stats": {
+            "task": "quotes.anomaly_stats",
+            "schedule": crontab(minute=15),
+        },
+        "rollup-kpis": {
+            "task": "dashboard.rollup",
+            "schedule": crontab(minute="*/15"),
+        },
+        # Nightly full runs also catch deleted quotes
+        "rebuild-kpis": {
+            "task": "dashboard.rollup",
+            "schedule": crontab(hour=3, minute=45),
+            "kwargs": {"full": True},
+        },
+        "score-craftsmen": {
+            "task": "craftsmen.score",
+            "schedule": crontab(hour=4, minute=0),
+        },
+    },
+)
@@ -0,0 +1,11 @@
+from app.core.database import SessionLocal
+from app.services.reliability import reliability_service
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="craftsmen.score")
+def score_craftsmen(full: bool = True) -> int:
+    """Recompute craftsman reliability scores"""
+    with SessionLocal() as db:
+        return reliability_service.refresh(db, full=full)
@@ -0,0 +1,11 @@
+from app.core.database import SessionLocal
+from app.services.dashboard import dashboard_service
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="dashboard.rollup")
+def rollup_kpis(full: bool = False) -> int:
+    """Refresh the daily and monthly KPI rollups"""
+    with SessionLocal() as db:
+        return dashboard_service.rollup(db, full=full)
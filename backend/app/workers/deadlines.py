@@ -0,0 +1,23 @@
+from app.core.database import SessionLocal
+from app.services.deadlines import AlertKind, deadline_service
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="deadlines.sweep")
+def sweep_task_deadlines() -> dict[str, int] | None:
+    """Alert the tasks that became overdue or due soon since the last sweep"""
+
+    def enqueue(user_id: int | None, kind: AlertKind, alerts: list[dict]) -> None:
+        notify_task_deadlines.delay(user_id, kind, alerts)
+
+    with SessionLocal() as db:
+        return deadline_service.sweep(db, enqueue)
+
+
+@celery_app.task(name="deadlines.notify")
+def notify_task_deadlines(
+    user_id: int | None, kind: AlertKind, alerts: list[dict]
+) -> None:
+    """Deliver one batch of deadline alerts"""
+    deadline_service.deliver(user_id, kind, alerts)
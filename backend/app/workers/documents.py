@@ -0,0 +1,15 @@
+from dataclasses import asdict
+
+from app.core.database import SessionLocal
+from app.services.document import document_service
+from app.services.storage import create_storage
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="documents.reconcile")
+def reconcile_documents() -> dict:
+    """Diff the document index against the storage listing and fix it up"""
+    with SessionLocal() as db:
+        report = document_service.reconcile(db, create_storage())
+    return asdict(report)
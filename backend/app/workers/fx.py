@@ -0,0 +1,39 @@
+"""
+Load dated exchange rates from a CSV file.
+
+    python -m app.workers.fx rates.csv
+
+The file has currency, valid_from (YYYY-MM-DD) and rate columns, the rate
+being base currency units per unit of the currency. Rates already set for
+a currency and day are replaced; nothing is loaded if any line is invalid.
+"""
+
+import argparse
+import sys
+
+from app.core.database import SessionLocal
+from app.services.fx import fx_service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="CSV file, or - for standard input")
+    args = parser.parse_args()
+
+    with (
+        (
+            sys.stdin
+            if args.path == "-"
+            else open(args.path, encoding="utf-8-sig", newline="")
+        ) as lines,
+        SessionLocal() as db,
+    ):
+        try:
+            loaded = fx_service.load_csv(db, lines)
+        except ValueError as exc:
+            sys.exit(str(exc))
+    print(f"Loaded {loaded} rates")
+
+
+if __name__ == "__main__":
+    main()
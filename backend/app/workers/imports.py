@@ -0,0 +1,43 @@
+"""
+Load a CSV file of clients, craftsmen or items into the database.
+
+    python -m app.workers.imports craftsmen craftsmen.csv
+
+Takes the same files as ``POST /api/v1/imports/{entity}`` and prints the
+import report as JSON.
+"""
+
+import argparse
+import json
+import sys
+
+from app.core.database import SessionLocal
+from app.services.bulk_import import TARGETS, BulkImportService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("entity", choices=sorted(TARGETS))
+    parser.add_argument("path", help="CSV file, or - for standard input")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--max-errors", type=int, default=1000)
+    args = parser.parse_args()
+
+    service = BulkImportService(batch_size=args.batch_size, max_errors=args.max_errors)
+    with (
+        (
+            sys.stdin
+            if args.path == "-"
+            else open(args.path, encoding="utf-8-sig", newline="")
+        ) as lines,
+        SessionLocal() as db,
+    ):
+        report = service.import_csv(db, args.entity, lines)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    if report["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+from app.core.redis import redis_client
+from app.services.pdf import pdf_service
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="pdf.render")
+def render_pdf(document: dict) -> dict:
+    """Render a document payload into the content-addressed PDF cache"""
+    try:
+        path = pdf_service.render_to_cache(document)
+    finally:
+        # Let a failed render be queued again straight away
+        redis_client.delete(
+            pdf_service.render_lock_key(pdf_service.content_hash(document))
+        )
+    return {"content_hash": path.stem, "size": path.stat().st_size}
@@ -0,0 +1,26 @@
+from app.core.database import SessionLocal
+from app.services.anomaly import quote_anomaly_service
+from app.services.quote import quote_service
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="quotes.expire")
+def expire_overdue_quotes() -> int:
+    """Expire pending quotes whose validity has ended"""
+    with SessionLocal() as db:
+        return quote_service.expire_overdue(db)
+
+
+@celery_app.task(name="quotes.anomaly_stats")
+def refresh_quote_price_stats() -> int:
+    """Recompute the price statistics new quotes are checked against"""
+    with SessionLocal() as db:
+        return quote_anomaly_service.refresh_stats(db)
+
+
+@celery_app.task(name="quotes.backfill_anomalies")
+def backfill_quote_anomalies(chunk_size: int = 5000) -> int:
+    """Rescore every quote against fresh statistics"""
+    with SessionLocal() as db:
+        return quote_anomaly_service.backfill(db, chunk_size=chunk_size)
@@ -0,0 +1,18 @@
+from app.core.database import SessionLocal
+from app.services.status_history import status_history_service
+
+from .celery_app import celery_app
+
+
+@celery_app.task(name="status_history.rollup")
+def rollup_status_durations() -> int:
+    """Refresh the time-in-status rollups of yesterday and today"""
+    with SessionLocal() as db:
+        return status_history_service.rollup(db)
+
+
+@celery_app.task(name="status_history.partitions")
+def create_status_history_partitions() -> list[str]:
+    """Keep monthly history partitions created ahead of time"""
+    with SessionLocal() as db:
+        return status_history_service.ensure_partitions(db)
@@ -0,0 +1,178 @@
+"""
+Redis Stream consumer that stores WhatsApp webhook events.
+
+Run one or more consumers alongside the API:
+
+    python -m app.workers.whatsapp --consumer ingest-1
+
+Each consumer reads batches from the shared consumer group, writes them with
+idempotent upserts and acknowledges them. Entries left pending by a crashed
+consumer are reclaimed after ``--min-idle`` milliseconds, so every event is
+stored at least once and redeliveries are harmless. Events that cannot be
+stored are acknowledged and moved to the ``<stream>:dead`` stream.
+"""
+
+import argparse
+import json
+import logging
+import socket
+
+import redis
+from redis.exceptions import ResponseError
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis import redis_client
+from app.services.message import message_service, parse_webhook_payload
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookStreamConsumer:
+    """Batch consumer for the WhatsApp webhook stream"""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        *,
+        consumer: str,
+        stream: str = settings.WHATSAPP_WEBHOOK_STREAM,
+        group: str = settings.WHATSAPP_WEBHOOK_GROUP,
+        batch_size: int = 500,
+        block_ms: int = 1000,
+        min_idle_ms: int = 60_000,
+        session_factory: sessionmaker = SessionLocal,
+    ):
+        self.client = client
+        self.consumer = consumer
+        self.stream = stream
+        self.group = group
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.min_idle_ms = min_idle_ms
+        self.session_factory = session_factory
+        self.dead_letter_stream = f"{stream}:dead"
+
+    def ensure_group(self) -> None:
+        """Create the consumer group (and stream) if it does not exist yet"""
+        try:
+            self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    def read_batch(self) -> list[tuple[bytes, dict]]:
+        """Reclaim stale pending entries first, then read new ones"""
+        _, entries, _ = self.client.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_time=self.min_idle_ms,
+            count=self.batch_size,
+        )
+        if entries:
+            return entries
+        response = self.client.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.batch_size,
+            block=self.block_ms,
+        )
+        return response[0][1] if response else []
+
+    def process(self, entries: list[tuple[bytes, dict]]) -> int:
+        """
+        Store a batch of stream entries and acknowledge them.
+
+        Entries that cannot be parsed, or whose rows the database refuses,
+        are moved to the dead-letter stream so they do not come back on
+        every reclaim. Other failures (the database being down) leave the
+        batch pending to be retried.
+        """
+        if not entries:
+            return 0
+        parsed = []
+        for entry_id, fields in entries:
+            try:
+                rows = parse_webhook_payload(json.loads(fields[b"payload"]))
+            except Exception as exc:  # parsing is pure: the payload is malformed
+                self.dead_letter(entry_id, fields, exc)
+                continue
+            parsed.append((entry_id, fields, rows))
+
+        db = self.session_factory()
+        try:
+            written, updated = self._ingest(db, parsed)
+        finally:
+            db.close()
+        self.client.xack(
+            self.stream, self.group, *[entry_id for entry_id, _ in entries]
+        )
+        logger.info(
+            "Ingested %d events: %d messages, %d status updates",
+            len(entries),
+            written,
+            updated,
+        )
+        return len(entries)
+
+    def dead_letter(self, entry_id: bytes, fields: dict, exc: Exception) -> None:
+        logger.warning("Moving malformed webhook event %s aside: %r", entry_id, exc)
+        self.client.xadd(
+            self.dead_letter_stream,
+            {**fields, b"entry_id": entry_id, b"error": repr(exc)},
+        )
+
+    def _ingest(self, db: Session, parsed: list) -> tuple[int, int]:
+        """Write the batch at once, or one entry at a time if it is refused"""
+        try:
+            return message_service.ingest_parsed(db, [rows for *_, rows in parsed])
+        except (DataError, IntegrityError):
+            db.rollback()
+        written = updated = 0
+        for entry_id, fields, rows in parsed:
+            try:
+                counts = message_service.ingest_parsed(db, [rows])
+            except (DataError, IntegrityError) as exc:
+                db.rollback()
+                self.dead_letter(entry_id, fields, exc)
+                continue
+            written += counts[0]
+            updated += counts[1]
+        return written, updated
+
+    def run(self) -> None:
+        """Consume the stream until interrupted"""
+        self.ensure_group()
+        logger.info("Consumer %s reading %s", self.consumer, self.stream)
+        while True:
+            self.process(self.read_batch())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--consumer", default=socket.gethostname())
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--block-ms", type=int, default=1000)
+    parser.add_argument("--min-idle", type=int, default=60_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    consumer = WebhookStreamConsumer(
+        redis_client,
+        consumer=args.consumer,
+        batch_size=args.batch_size,
+        block_ms=args.block_ms,
+        min_idle_ms=args.min_idle,
+    )
+    try:
+        consumer.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Fake Meta webhook sender for load testing the WhatsApp receiver.
+
+Sends signed message and status events to a running API at a target rate:
+
+    WHATSAPP_APP_SECRET=dev-secret uv run python scripts/fake_meta_webhook.py \
+        --url http://localhost:8000/api/v1/whatsapp/webhook --rate 1500 --total 30000
+
+The API must be started with the same WHATSAPP_APP_SECRET. Requires httpx
+(installed with the ``test`` extra).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def message_event(phone: str) -> dict:
+    """Inbound text message in Meta's webhook format"""
+    message_id = f"wamid.{uuid.uuid4().hex}"
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "0",
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messaging_product": "whatsapp",
+                            "contacts": [{"wa_id": phone}],
+                            "messages": [
+                                {
+                                    "from": phone,
+                                    "id": message_id,
+                                    "timestamp": str(int(time.time())),
+                                    "type": "text",
+                                    "text": {"body": f"Presupuesto {message_id[-6:]}"},
+                                }
+                            ],
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def status_event(phone: str, status: str) -> dict:
+    """Delivery receipt for an outbound message"""
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "0",
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messaging_product": "whatsapp",
+                            "statuses": [
+                                {
+                                    "id": f"wamid.{uuid.uuid4().hex}",
+                                    "recipient_id": phone,
+                                    "status": status,
+                                    "timestamp": str(int(time.time())),
+                                }
+                            ],
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def sign(body: bytes, secret: str) -> str:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+async def run(args: argparse.Namespace) -> None:
+    phones = [f"34600{n:06d}" for n in range(args.phones)]
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=args.concurrency * 2)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while (body := await queue.get()) is not None:
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    args.url,
+                    content=body,
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-Hub-Signature-256": sign(body, args.secret),
+                    },
+                )
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+        workers = [asyncio.create_task(worker(client)) for _ in range(args.concurrency)]
+        started = time.perf_counter()
+        for n in range(args.total):
+            phone = random.choice(phones)
+            if random.random() < args.status_ratio:
+                event = status_event(
+                    phone, random.choice(["sent", "delivered", "read"])
+                )
+            else:
+                event = message_event(phone)
+            await queue.put(json.dumps(event).encode())
+            # Pace the producer to the target rate
+            delay = started + (n + 1) / args.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"sent:       {args.total} events in {elapsed:.2f}s")
+    print(f"throughput: {args.total / elapsed:.0f} events/s")
+    print(f"errors:     {errors}")
+    print(f"latency:    p50 {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"            p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Meta webhook sender")
+    parser.add_argument(
+        "--url", default="http://localhost:8000/api/v1/whatsapp/webhook"
+    )
+    parser.add_argument("--secret", default=os.environ.get("WHATSAPP_APP_SECRET", ""))
+    parser.add_argument("--rate", type=float, default=1000, help="events per second")
+    parser.add_argument("--total", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--phones", type=int, default=200)
+    parser.add_argument("--status-ratio", type=float, default=0.5)
+    args = parser.parse_args()
+    if not args.secret:
+        parser.error("set --secret or WHATSAPP_APP_SECRET")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -154,3 +154,55 @@ def sample_task_data():
         "project_id": 1,
         "assigned_user_id": 1,
     }
+
+
+@pytest.fixture
+def project(client, sample_user_data, sample_client_data, sample_project_data):
+    """A project of a new client, as returned by the API"""
+    client.post("/api/v1/users/", json=sample_user_data)
+    client_id = client.post("/api/v1/clients/", json=sample_client_data).json()["id"]
+    sample_project_data["client_id"] = client_id
+    return client.post("/api/v1/projects/", json=sample_project_data).json()
+
+
+@pytest.fixture
+def campaign_id(client, project, sample_campaign_data):
+    """ID of a campaign in the project fixture"""
+    sample_campaign_data["project_id"] = project["id"]
+    return client.post("/api/v1/campaigns/", json=sample_campaign_data).json()["id"]
+
+
+@pytest.fixture
+def item_id(client, campaign_id, sample_item_data):
+    """ID of an item in the campaign fixture"""
+    sample_item_data["campaign_id"] = campaign_id
+    return client.post("/api/v1/items/", json=sample_item_data).json()["id"]
+
+
+@pytest.fixture
+def craftsman_id(client, sample_craftsman_data):
+    """ID of the sample craftsman"""
+    return client.post("/api/v1/craftsmen/", json=sample_craftsman_data).json()["id"]
+
+
+@pytest.fixture
+def create_quote(client):
+    """Factory posting a quote through the API; returns its ID"""
+
+    def create(
+        item_id, craftsman_id, price, *, currency="EUR", quote_status="pending", **data
+    ):
+        response = client.post(
+            "/api/v1/quotes/",
+            json={
+                "price": price,
+                "currency": currency,
+                "status": quote_status,
+                "item_id": item_id,
+                "craftsman_id": craftsman_id,
+                **data,
+            },
+        )
+        return response.json()["id"]
+
+    return create
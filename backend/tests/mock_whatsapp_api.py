@@ -0,0 +1,72 @@
+"""
+Local mock of the WhatsApp Cloud API used by the sender tests.
+
+It can also be run on its own to exercise the sender without Meta:
+
+    uv run uvicorn tests.mock_whatsapp_api:app --port 8900
+
+and WHATSAPP_API_URL=http://localhost:8900 in the backend environment.
+"""
+
+import uuid
+
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse
+
+
+class MockWhatsAppAPI:
+    """Records requests and replays scripted failures"""
+
+    def __init__(self):
+        self.app = FastAPI(title="Mock WhatsApp Cloud API")
+        self.messages: list[dict] = []
+        self.media: list[dict] = []
+        # Responses to return before succeeding: (status_code, error code)
+        self.failures: list[tuple[int, int]] = []
+        self.failing_recipients: set[str] = set()
+
+        @self.app.post("/{version}/{phone_number_id}/messages")
+        async def send_message(phone_number_id: str, request: Request):
+            if failure := self._next_failure():
+                return failure
+            message = await request.json()
+            if message["to"] in self.failing_recipients:
+                return self._error(400, 131026, "Message undeliverable")
+            message_id = f"wamid.{uuid.uuid4().hex}"
+            self.messages.append({"id": message_id, **message})
+            return {
+                "messaging_product": "whatsapp",
+                "contacts": [{"input": message["to"], "wa_id": message["to"]}],
+                "messages": [{"id": message_id}],
+            }
+
+        @self.app.post("/{version}/{phone_number_id}/media")
+        async def upload_media(
+            file: UploadFile = File(...),
+            messaging_product: str = Form(...),
+            type: str = Form(...),
+        ):
+            if failure := self._next_failure():
+                return failure
+            media_id = uuid.uuid4().hex
+            content = await file.read()
+            self.media.append({"id": media_id, "type": type, "size": len(content)})
+            return {"id": media_id}
+
+    def _next_failure(self) -> JSONResponse | None:
+        if not self.failures:
+            return None
+        status_code, code = self.failures.pop(0)
+        return self._error(status_code, code, "Scripted failure")
+
+    @staticmethod
+    def _error(status_code: int, code: int, message: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=status_code,
+            content={
+                "error": {"message": message, "type": "OAuthException", "code": code}
+            },
+        )
+
+
+app = MockWhatsAppAPI().app
@@ -0,0 +1,44 @@
+"""Performance tests for the item similarity index"""
+
+import random
+import time
+
+from app.services.prediction import PricePredictor
+from app.services.similarity import ItemSimilarityIndex
+
+WORDS = (
+    "armario mesa silla sofa lampara estanteria puerta ventana cocina baño "
+    "roble nogal haya pino laton acero vidrio marmol lino terciopelo "
+    "empotrado colgante corredera lacado macizo tapizado encastat roure"
+).split()
+
+
+def test_top_k_over_100k_items_under_50ms():
+    """A query against 100,000 items answers in well under 50 ms"""
+    rng = random.Random(7)
+    index = ItemSimilarityIndex()
+    index.load(
+        (n, " ".join(rng.sample(WORDS, 3)), " ".join(rng.sample(WORDS, 6)))
+        for n in range(100_000)
+    )
+
+    started = time.perf_counter()
+    for _ in range(10):
+        matches = index.query("armario empotrado de roble", "puertas lacadas", k=10)
+    elapsed = (time.perf_counter() - started) / 10
+
+    assert len(matches) == 10
+    assert elapsed < 0.05
+
+
+def test_estimate_statistics_under_50ms():
+    """Weighted quantiles and 1,000 bootstrap resamples of 500 quotes are fast"""
+    rng = random.Random(7)
+    scores = {n: rng.random() for n in range(50)}
+    history = [(rng.randrange(50), rng.uniform(20, 80)) for _ in range(500)]
+
+    started = time.perf_counter()
+    result = PricePredictor._estimate(history, scores, 12, 0.8, 0.95, seed=1)
+
+    assert time.perf_counter() - started < 0.05
+    assert result["total"]["low"] < result["total"]["high"]
@@ -0,0 +1,29 @@
+"""Performance tests for WhatsApp message parsing"""
+
+import time
+
+from app.services.message_parser import message_parser
+
+MESSAGES = [
+    "Hola! El precio sería 1.250,50 € IVA no incluido. Empezamos el lunes 15/03.",
+    "Buenas, ya está terminado el armario. Total: 3.400 euros, te paso factura",
+    "Bon dia, el pressupost és de 980€ + IVA. Encara no està acabat.",
+    "Perfecto, nos vemos mañana a las 10 en la obra",
+] * 2500
+
+
+def test_single_message_under_100ms():
+    """A single message is parsed well inside the 100 ms budget"""
+    started = time.perf_counter()
+    message_parser.parse(MESSAGES[0] * 20)
+    assert time.perf_counter() - started < 0.1
+
+
+def test_batch_throughput():
+    """10,000 messages are parsed serially in under 2 seconds"""
+    started = time.perf_counter()
+    parsed = message_parser.parse_many(MESSAGES, workers=1)
+    elapsed = time.perf_counter() - started
+
+    assert len(parsed) == len(MESSAGES)
+    assert elapsed < 2.0
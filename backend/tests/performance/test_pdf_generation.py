@@ -0,0 +1,50 @@
+"""Benchmark for invoice PDF rendering"""
+
+import time
+from decimal import Decimal
+
+from app.services.pdf import PDFService, calculate_line, calculate_totals
+
+
+def build_invoice(line_count: int) -> dict:
+    """Synthetic invoice payload with ``line_count`` lines"""
+    lines = [
+        {
+            "description": f"Partida {n}: carpintería a medida",
+            "details": "Tablero de roble macizo, acabado al aceite",
+            "quantity": n % 7 + 1,
+            "unit": "unit",
+            **calculate_line(Decimal("125.50") + n, Decimal("18.00"), n % 7 + 1),
+        }
+        for n in range(line_count)
+    ]
+    return {
+        "kind": "invoice",
+        "number": "F-000200",
+        "issued": "2025-01-31",
+        "currency": "EUR",
+        "project": "Benchmark",
+        "campaign": "Obra completa",
+        "client": {"name": "Cliente", "company": "", "address": "", "email": ""},
+        "lines": lines,
+        "totals": calculate_totals(lines),
+    }
+
+
+def test_invoice_200_lines_under_two_seconds(tmp_path):
+    """Rendering a 200-line invoice stays under the 2 second budget"""
+    service = PDFService(str(tmp_path))
+    document = build_invoice(200)
+
+    started = time.perf_counter()
+    path = service.render_to_cache(document)
+    render_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cached = service.render_to_cache(document)
+    cached_seconds = time.perf_counter() - started
+
+    assert path == cached
+    assert path.read_bytes().startswith(b"%PDF")
+    assert render_seconds < 2.0
+    assert cached_seconds < 0.05
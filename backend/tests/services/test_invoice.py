@@ -0,0 +1,208 @@
+"""Tests for quote and invoice PDF generation"""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+import redis
+from fastapi import status
+from sqlalchemy import update
+
+from app.core.redis import redis_client
+from app.models import (
+    Campaign,
+    Client,
+    Craftsman,
+    Currency,
+    Item,
+    Project,
+    Quote,
+    QuoteStatus,
+    StatusCurrent,
+    User,
+)
+from app.services.pdf import PDFService, calculate_line, calculate_totals, pdf_service
+from app.workers.celery_app import celery_app
+
+
+@pytest.fixture
+def campaign(db_session):
+    """Campaign with two approved quotes and one pending quote"""
+    user = User(email="studio@example.com", hashed_password="x", full_name="Studio")
+    client = Client(name="Cliente & Hijos", address="Carrer Major 1, Barcelona")
+    craftsman = Craftsman(name="Taller Puig", specialties="Carpentry")
+    project = Project(name="Casa Puig", user=user, client=client)
+    campaign = Campaign(name="Cocina", project=project)
+    kitchen = Item(name="Kitchen cabinets", quantity=4, campaign=campaign)
+    table = Item(name="Oak table", quantity=1, campaign=campaign)
+    db_session.add_all(
+        [
+            Quote(
+                item=kitchen,
+                craftsman=craftsman,
+                price=Decimal("1000.00"),
+                margin_percentage=Decimal("20.00"),
+                status=QuoteStatus.APPROVED,
+            ),
+            Quote(
+                item=table,
+                craftsman=craftsman,
+                price=Decimal("500.00"),
+                currency=Currency.GBP,
+                status=QuoteStatus.APPROVED,
+            ),
+            Quote(
+                item=table,
+                craftsman=craftsman,
+                price=Decimal("300.00"),
+                status=QuoteStatus.PENDING,
+            ),
+        ]
+    )
+    db_session.commit()
+    return campaign
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Point the shared PDF service at a temporary directory"""
+    monkeypatch.setattr(pdf_service, "storage_dir", tmp_path)
+    return tmp_path
+
+
+def test_margin_calculations():
+    """Test margin, unit price and VAT on document lines"""
+    line = calculate_line(Decimal("1000.00"), Decimal("20.00"), 4)
+
+    assert line["total"] == "1200.00"
+    assert line["margin"] == "200.00"
+    assert line["unit_price"] == "300.00"
+
+    no_margin = calculate_line(Decimal("99.99"), None, 1)
+    assert no_margin["total"] == "99.99"
+    assert no_margin["margin"] == "0.00"
+
+    totals = calculate_totals([line, no_margin])
+    assert totals["subtotal"] == "1299.99"
+    assert totals["margin"] == "200.00"
+    assert totals["vat"] == "273.00"
+    assert totals["total"] == "1572.99"
+
+
+def test_invoice_pdf_generation(db_session, campaign, tmp_path):
+    """Test invoice lines come from approved quotes and the PDF is cached"""
+    service = PDFService(str(tmp_path))
+
+    document = service.build_invoice_document(db_session, campaign_id=campaign.id)
+
+    assert document["number"] == f"F-{campaign.id:06d}"
+    assert [line["description"] for line in document["lines"]] == [
+        "Kitchen cabinets",
+        "Oak table",
+    ]
+    # GBP quote is converted to the base currency before applying margins
+    assert document["lines"][1]["cost"] == "585.00"
+    assert document["totals"]["subtotal"] == "1785.00"
+
+    pdf = service.generate_invoice_pdf(db_session, campaign.id)
+    assert pdf.startswith(b"%PDF")
+    cached = service.get_cached(service.content_hash(document))
+    assert cached is not None
+    assert cached.read_bytes() == pdf
+
+
+def test_content_hash_is_stable(db_session, campaign):
+    """Test identical documents hash identically and changes invalidate"""
+    first = pdf_service.build_invoice_document(db_session, campaign_id=campaign.id)
+    second = pdf_service.build_invoice_document(db_session, campaign_id=campaign.id)
+    assert PDFService.content_hash(first) == PDFService.content_hash(second)
+
+    second["lines"][0]["total"] = "1.00"
+    assert PDFService.content_hash(first) != PDFService.content_hash(second)
+
+
+def test_invoice_is_dated_by_latest_approval(db_session, campaign):
+    """Test the issue date, and so the cache key, does not follow the clock"""
+    for quote, approved in zip(
+        [q for i in campaign.items for q in i.quotes if q.status == "approved"],
+        (datetime(2026, 2, 1, tzinfo=UTC), datetime(2026, 3, 1, 23, tzinfo=UTC)),
+        strict=True,
+    ):
+        db_session.execute(
+            update(StatusCurrent)
+            .where(
+                StatusCurrent.entity == "quotes", StatusCurrent.entity_id == quote.id
+            )
+            .values(since=approved)
+        )
+    db_session.commit()
+
+    document = pdf_service.build_invoice_document(db_session, campaign_id=campaign.id)
+
+    assert document["issued"] == "2026-03-01"
+
+
+def test_render_is_deterministic(db_session, campaign, tmp_path):
+    """Test the same payload renders to identical bytes"""
+    service = PDFService(str(tmp_path))
+    document = service.build_invoice_document(db_session, campaign_id=campaign.id)
+
+    assert service.render(document) == service.render(document)
+
+
+def test_quote_pdf_endpoint_returns_job_then_file(
+    client, db_session, campaign, storage
+):
+    """Test the API queues a render job, then serves the cached file"""
+    quote_id = campaign.items[0].quotes[0].id
+    celery_app.conf.task_always_eager = True
+    try:
+        response = client.get(f"/api/v1/pdfs/quotes/{quote_id}")
+    finally:
+        celery_app.conf.task_always_eager = False
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["job_id"] == f"pdf-{job['content_hash']}"
+
+    job_response = client.get(f"/api/v1/pdfs/jobs/{job['job_id']}")
+    assert job_response.json()["status"] == "SUCCESS"
+
+    response = client.get(f"/api/v1/pdfs/quotes/{quote_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+    response = client.get(job["download_url"])
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_concurrent_requests_queue_one_render(
+    client, db_session, campaign, storage, monkeypatch
+):
+    """Test polling an uncached PDF queues its render only once"""
+    try:
+        redis_client.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis is not available")
+    queued = []
+    monkeypatch.setattr(
+        "app.routers.v1.pdfs.render_pdf.apply_async",
+        lambda **kwargs: queued.append(kwargs["task_id"]),
+    )
+    try:
+        for _ in range(3):
+            response = client.get(f"/api/v1/pdfs/invoices/{campaign.id}")
+            assert response.status_code == status.HTTP_202_ACCEPTED
+    finally:
+        redis_client.delete(PDFService.render_lock_key(response.json()["content_hash"]))
+
+    assert queued == [response.json()["job_id"]]
+
+
+def test_pdf_not_found(client, storage):
+    """Test missing quotes, campaigns and files"""
+    assert client.get("/api/v1/pdfs/quotes/999").status_code == 404
+    assert client.get("/api/v1/pdfs/invoices/999").status_code == 404
+    assert client.get(f"/api/v1/pdfs/files/{'0' * 64}").status_code == 404
+    assert client.get("/api/v1/pdfs/files/not-a-hash").status_code == 422
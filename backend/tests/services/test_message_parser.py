@@ -0,0 +1,170 @@
+"""Tests for the WhatsApp quote message parser"""
+
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from app.models import (
+    Campaign,
+    Client,
+    Craftsman,
+    Currency,
+    Item,
+    Project,
+    Quote,
+    TaskStatus,
+    User,
+)
+from app.services.message_parser import (
+    QuoteMessageParser,
+    message_parser,
+    parse_amount,
+    parse_quote_history,
+)
+
+
+class TestParseAmount:
+    """Test number format handling"""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("1.250,50", "1250.50"),
+            ("1.250", "1250.00"),
+            ("1250,5", "1250.50"),
+            ("1,250.50", "1250.50"),
+            ("1,250", "1250.00"),
+            ("12.50", "12.50"),
+            ("3.400.000", "3400000.00"),
+        ],
+    )
+    def test_formats(self, text, expected):
+        """Test European, English and plain amounts"""
+        assert parse_amount(text) == Decimal(expected)
+
+    def test_out_of_range(self):
+        """Test amounts that cannot be stored as a quote price"""
+        assert parse_amount("0") is None
+        assert parse_amount("1.000.000.000") is None
+
+
+class TestQuoteMessageParser:
+    """Test price and status extraction"""
+
+    def test_european_price_with_currency(self):
+        """Test a Spanish message with a European formatted price"""
+        parsed = message_parser.parse(
+            "Hola! El precio sería 1.250,50 € IVA no incluido"
+        )
+
+        assert parsed.price == Decimal("1250.50")
+        assert parsed.currency == Currency.EUR
+        assert parsed.price_confidence >= 0.8
+
+    def test_total_beats_unit_price(self):
+        """Test the total is preferred over other amounts"""
+        parsed = message_parser.parse("precio unitario 50€, total 250€")
+
+        assert parsed.price == Decimal("250.00")
+
+    def test_keyword_without_currency_has_low_confidence(self):
+        """Test a bare amount after a price keyword is kept but doubted"""
+        parsed = message_parser.parse("Te paso presupuesto: 1250")
+
+        assert parsed.price == Decimal("1250.00")
+        assert parsed.currency is None
+        assert parsed.price_confidence < 0.5
+
+    def test_ambiguous_amounts_lower_confidence(self):
+        """Test two equally likely amounts halve the confidence"""
+        parsed = message_parser.parse("Son 45€ la hora y 1200€ el material")
+
+        assert parsed.price_confidence < 0.5
+
+    def test_ignores_dates_and_times(self):
+        """Test numbers without a price context are not prices"""
+        parsed = message_parser.parse("Nos vemos el 15/03 a las 10")
+
+        assert parsed.price is None
+        assert parsed.price_confidence == 0.0
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("Ya está terminado", TaskStatus.COMPLETED),
+            ("Tot llest!", TaskStatus.COMPLETED),
+            ("Ja està instal·lat", TaskStatus.COMPLETED),
+            ("Estamos trabajando en ello", TaskStatus.IN_PROGRESS),
+            ("Estem treballant-hi, en procés", TaskStatus.IN_PROGRESS),
+            ("Encara no està acabat", None),
+            ("No está terminado todavía", None),
+        ],
+    )
+    def test_status_keywords(self, text, expected):
+        """Test Spanish and Catalan status words, with and without accents"""
+        assert message_parser.parse(text).status == expected
+
+    def test_combined_price_and_status(self):
+        """Test price and status are both read from one message"""
+        parsed = message_parser.parse("Cost 1,250.00 USD, estem treballant-hi")
+
+        assert parsed.price == Decimal("1250.00")
+        assert parsed.currency == Currency.USD
+        assert parsed.status == TaskStatus.IN_PROGRESS
+        assert parsed.status_confidence == 0.9
+
+    def test_parse_many_with_process_pool(self):
+        """Test batch parsing gives the same results as one by one"""
+        texts = ["Total: 3.400 euros. Ya está terminado", None, "Hola"] * 400
+
+        parsed = message_parser.parse_many(texts, workers=2, chunksize=100)
+
+        assert parsed == [message_parser.parse(text) for text in texts]
+
+    def test_parse_many_keeps_parser_config_in_pool(self):
+        """Test pool workers parse with the instance's keywords, not the defaults"""
+        parser = QuoteMessageParser(price_keywords={"total": 0.4})
+        texts = ["precio 500", "total 500"] * 300
+
+        parsed = parser.parse_many(texts, workers=2, chunksize=100)
+
+        assert parsed == [parser.parse(text) for text in texts]
+        assert parsed[0].price is None
+        assert parsed[1].price == Decimal("500.00")
+
+    def test_parse_endpoint(self, client):
+        """Test the parse endpoint returns the extracted fields"""
+        response = client.post(
+            "/api/v1/quotes/parse-message",
+            json={"text": "El preu: 750,50 €. Tot llest!"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["price"] == "750.50"
+        assert data["currency"] == "EUR"
+        assert data["status"] == "completed"
+
+
+def test_parse_quote_history(db_session):
+    """Test every stored quote message is re-parsed in batches"""
+    user = User(email="studio@example.com", hashed_password="x", full_name="Studio")
+    client = Client(name="Cliente")
+    craftsman = Craftsman(name="Taller Puig", specialties="Carpentry")
+    project = Project(name="Casa Puig", user=user, client=client)
+    item = Item(
+        name="Mesa", quantity=1, campaign=Campaign(name="Cocina", project=project)
+    )
+    quotes = [
+        Quote(item=item, craftsman=craftsman, price=Decimal("1"), whatsapp_message=text)
+        for text in ["Total 100 €", None, "Son 250,00 euros"]
+    ]
+    db_session.add_all(quotes)
+    db_session.commit()
+
+    results = dict(parse_quote_history(db_session, batch_size=1, workers=1))
+
+    assert results.keys() == {quotes[0].id, quotes[2].id}
+    assert results[quotes[0].id].price == Decimal("100.00")
+    assert results[quotes[2].id].price == Decimal("250.00")
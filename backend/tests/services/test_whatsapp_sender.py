@@ -0,0 +1,219 @@
+"""Tests for the outbound WhatsApp sender"""
+
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+import redis
+from fastapi import status
+
+from app.core.config import settings
+from app.core.rate_limit import TokenBucket
+from app.core.redis import create_async_redis, redis_client
+from app.models import MessageDirection, MessageStatus, WhatsAppMessage
+from app.services.whatsapp import WhatsAppError, WhatsAppService
+from tests.mock_whatsapp_api import MockWhatsAppAPI
+
+PHONE_NUMBER_ID = "test-number"
+
+
+@pytest.fixture
+def redis_available(monkeypatch):
+    """Skip when Redis is not reachable and start from empty buckets"""
+    try:
+        redis_client.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis is not available")
+    for key in redis_client.scan_iter(f"whatsapp:rate:{PHONE_NUMBER_ID}*"):
+        redis_client.delete(key)
+    monkeypatch.setattr(settings, "WHATSAPP_RECIPIENT_MESSAGES_PER_MINUTE", 600.0)
+
+
+@pytest.fixture
+def mock_api():
+    return MockWhatsAppAPI()
+
+
+@pytest_asyncio.fixture
+async def sender(redis_available, mock_api):
+    redis = create_async_redis()
+    service = WhatsAppService(
+        redis,
+        phone_number_id=PHONE_NUMBER_ID,
+        backoff_base=0.01,
+        max_retries=3,
+        transport=httpx.ASGITransport(app=mock_api.app),
+    )
+    yield service
+    await service.aclose()
+    await redis.aclose()
+
+
+class TestWhatsAppSender:
+    """Test message sends against the mock Cloud API"""
+
+    async def test_send_template(self, sender, mock_api):
+        """Test templates are sent with named parameters to a digits-only number"""
+        message_id = await sender.send_template(
+            "+34 600 111 222", "solicitud_presupuesto", {"ITEM_DESCRIPTION": "Mesa"}
+        )
+
+        assert message_id == mock_api.messages[0]["id"]
+        sent = mock_api.messages[0]
+        assert sent["to"] == "34600111222"
+        assert sent["template"]["language"] == {"code": "es"}
+        assert sent["template"]["components"][0]["parameters"] == [
+            {"type": "text", "parameter_name": "item_description", "text": "Mesa"}
+        ]
+
+    async def test_send_document_uploads_media(self, sender, mock_api):
+        """Test a PDF is uploaded first and then referenced by its media ID"""
+        await sender.send_document("34600111222", b"%PDF-1.4", "Factura F-000001")
+
+        assert mock_api.media[0]["size"] == 8
+        document = mock_api.messages[0]["document"]
+        assert document["id"] == mock_api.media[0]["id"]
+        assert document["caption"] == "Factura F-000001"
+
+    async def test_retries_rate_limits_and_server_errors(self, sender, mock_api):
+        """Test 429, 5xx and throughput errors are retried until success"""
+        mock_api.failures = [(429, 4), (503, 2), (400, 130429)]
+
+        message_id = await sender.send_text("34600111222", "Hola")
+
+        assert message_id == mock_api.messages[0]["id"]
+        assert mock_api.failures == []
+
+    async def test_gives_up_after_max_retries(self, sender, mock_api):
+        """Test the last retryable error is raised once retries run out"""
+        mock_api.failures = [(500, 1)] * 4
+
+        with pytest.raises(WhatsAppError) as exc_info:
+            await sender.send_text("34600111222", "Hola")
+        assert exc_info.value.status_code == 500
+        assert mock_api.messages == []
+
+    async def test_client_errors_are_not_retried(self, sender, mock_api):
+        """Test a permanent error fails immediately"""
+        mock_api.failures = [(400, 100), (500, 1)]
+
+        with pytest.raises(WhatsAppError) as exc_info:
+            await sender.send_text("34600111222", "Hola")
+        assert exc_info.value.status_code == 400
+        assert len(mock_api.failures) == 1
+
+    async def test_send_many_runs_concurrently(self, sender, mock_api):
+        """Test a fan-out keeps order and isolates failures"""
+        phones = [f"34600{n:06d}" for n in range(30)]
+        mock_api.failing_recipients = {phones[3]}
+
+        results = await sender.send_many(
+            [sender.send_text(phone, "Hola") for phone in phones], concurrency=10
+        )
+
+        assert len(results) == 30
+        assert isinstance(results[3], WhatsAppError)
+        assert [r for r in results if isinstance(r, str)] == [
+            m["id"] for m in sorted(mock_api.messages, key=lambda m: m["to"])
+        ]
+
+
+class TestTokenBucket:
+    """Test the Redis token bucket"""
+
+    async def test_waits_when_empty(self, redis_available):
+        """Test acquisitions beyond the burst are spread at the refill rate"""
+        redis = create_async_redis()
+        bucket = TokenBucket(
+            redis, f"whatsapp:rate:{PHONE_NUMBER_ID}:bucket", rate=20, capacity=2
+        )
+        try:
+            started = time.perf_counter()
+            for _ in range(4):
+                await bucket.acquire()
+            elapsed = time.perf_counter() - started
+        finally:
+            await redis.aclose()
+
+        # Two tokens are free, the next two take 50 ms each
+        assert 0.08 <= elapsed < 1.0
+
+
+class TestQuoteRequests:
+    """Test the item quote request fan-out endpoint"""
+
+    def test_request_quotes(
+        self,
+        client,
+        db_session,
+        redis_available,
+        mock_api,
+        sample_user_data,
+        sample_client_data,
+        sample_craftsman_data,
+        sample_project_data,
+        sample_campaign_data,
+        sample_item_data,
+    ):
+        """Test every craftsman is messaged and sends are recorded"""
+        client.app.state.whatsapp = WhatsAppService(
+            client.app.state.redis,
+            phone_number_id=PHONE_NUMBER_ID,
+            transport=httpx.ASGITransport(app=mock_api.app),
+        )
+        client.post("/api/v1/users/", json=sample_user_data)
+        client.post("/api/v1/clients/", json=sample_client_data)
+        craftsman_ids = []
+        for n in range(3):
+            sample_craftsman_data["name"] = f"Craftsman {n}"
+            sample_craftsman_data["whatsapp"] = f"+34 600 000 00{n}"
+            response = client.post("/api/v1/craftsmen/", json=sample_craftsman_data)
+            craftsman_ids.append(response.json()["id"])
+        client.post("/api/v1/projects/", json=sample_project_data)
+        client.post("/api/v1/campaigns/", json=sample_campaign_data)
+        item_id = client.post("/api/v1/items/", json=sample_item_data).json()["id"]
+        mock_api.failing_recipients = {"34600000002"}
+
+        response = client.post(
+            f"/api/v1/items/{item_id}/quote-requests",
+            json={"craftsman_ids": craftsman_ids},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["sent"] == 2
+        assert data["failed"] == 1
+        assert [r["craftsman_id"] for r in data["results"]] == craftsman_ids
+        assert data["results"][2]["error"] == "Message undeliverable"
+
+        rows = db_session.query(WhatsAppMessage).order_by(WhatsAppMessage.id).all()
+        assert [row.wa_message_id for row in rows] == [
+            r["wa_message_id"] for r in data["results"][:2]
+        ]
+        assert rows[0].direction == MessageDirection.OUTBOUND
+        assert rows[0].status == MessageStatus.SENT
+        assert rows[0].body == "Solicitud de presupuesto: Test Item (5 unit)"
+
+    def test_request_quotes_unknown_craftsman(
+        self,
+        client,
+        sample_user_data,
+        sample_client_data,
+        sample_project_data,
+        sample_campaign_data,
+        sample_item_data,
+    ):
+        """Test unknown craftsmen are rejected before anything is sent"""
+        client.post("/api/v1/users/", json=sample_user_data)
+        client.post("/api/v1/clients/", json=sample_client_data)
+        client.post("/api/v1/projects/", json=sample_project_data)
+        client.post("/api/v1/campaigns/", json=sample_campaign_data)
+        item_id = client.post("/api/v1/items/", json=sample_item_data).json()["id"]
+
+        response = client.post(
+            f"/api/v1/items/{item_id}/quote-requests", json={"craftsman_ids": [999]}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Craftsman not found"
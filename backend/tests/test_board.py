@@ -0,0 +1,97 @@
+"""Tests for the project kanban board endpoint"""
+
+from fastapi import status
+
+
+def columns(response) -> dict:
+    return {
+        column["status"]: (column["count"], [card["id"] for card in column["cards"]])
+        for column in response.json()["columns"]
+    }
+
+
+class TestProjectBoard:
+    """Test boards are grouped by status with counts and ETags"""
+
+    def test_task_board(self, client, project, sample_task_data):
+        """Test every column is returned with its count and newest cards"""
+        sample_task_data["project_id"] = project["id"]
+        ids = []
+        for n in range(4):
+            sample_task_data["title"] = f"Task {n}"
+            ids.append(
+                client.post("/api/v1/tasks/", json=sample_task_data).json()["id"]
+            )
+        client.put(f"/api/v1/tasks/{ids[0]}", json={"status": "in progress"})
+
+        response = client.get(
+            f"/api/v1/projects/{project['id']}/board", params={"per_column": 2}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert columns(response) == {
+            "todo": (3, [ids[3], ids[2]]),
+            "in progress": (1, [ids[0]]),
+            "completed": (0, []),
+            "cancelled": (0, []),
+        }
+        card = response.json()["columns"][1]["cards"][0]
+        assert card["title"] == "Task 0"
+        assert card["details"]["priority"] == "medium"
+
+    def test_item_and_quote_boards(
+        self, client, project, campaign_id, craftsman_id, create_quote, sample_item_data
+    ):
+        """Test items are placed by their quotes and quotes by their status"""
+        sample_item_data["campaign_id"] = campaign_id
+        bare, quoted, approved = (
+            client.post("/api/v1/items/", json=sample_item_data).json()["id"]
+            for _ in range(3)
+        )
+        quote_ids = {
+            quote_status: create_quote(
+                item_id, craftsman_id, "150.00", quote_status=quote_status
+            )
+            for item_id, quote_status in ((quoted, "pending"), (approved, "approved"))
+        }
+        url = f"/api/v1/projects/{project['id']}/board"
+
+        items = client.get(url, params={"entity": "items"})
+        quotes = client.get(url, params={"entity": "quotes"})
+
+        assert columns(items) == {
+            "awaiting_quotes": (1, [bare]),
+            "quoted": (1, [quoted]),
+            "approved": (1, [approved]),
+        }
+        assert items.json()["columns"][1]["cards"][0]["details"]["quote_count"] == 1
+        assert columns(quotes) == {
+            "pending": (1, [quote_ids["pending"]]),
+            "approved": (1, [quote_ids["approved"]]),
+            "rejected": (0, []),
+            "expired": (0, []),
+        }
+
+    def test_unchanged_board_returns_304(self, client, project, sample_task_data):
+        """Test the ETag matches until a card changes"""
+        sample_task_data["project_id"] = project["id"]
+        task = client.post("/api/v1/tasks/", json=sample_task_data).json()
+        url = f"/api/v1/projects/{project['id']}/board"
+
+        etag = client.get(url).headers["ETag"]
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert not response.content
+
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "completed"})
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    def test_unknown_project(self, client):
+        """Test a missing project is a 404"""
+        response = client.get("/api/v1/projects/999/board")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
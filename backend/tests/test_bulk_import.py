@@ -0,0 +1,158 @@
+"""Tests for the CSV bulk import"""
+
+from fastapi import status
+from sqlalchemy import select
+
+from app.models import Client, Craftsman, Item, Unit
+from app.services.bulk_import import BulkImportService
+
+
+def upload(client, entity, body):
+    response = client.post(
+        f"/api/v1/imports/{entity}",
+        files={"file": (f"{entity}.csv", body.encode(), "text/csv")},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+class TestBulkImport:
+    """Test CSV rows are validated, staged and merged"""
+
+    def test_craftsmen_upserted_by_phone(self, client, db_session):
+        """Test new rows are inserted, known phones updated and bad rows reported"""
+        client.post(
+            "/api/v1/craftsmen/",
+            json={"name": "Ana", "specialties": "Carpintería", "phone": "600111222"},
+        )
+
+        report = upload(
+            client,
+            "craftsmen",
+            "Name,Specialties,Phone,Hourly_Rate,Is_Active,Unknown\n"
+            "ana lópez,Carpintería,600111222,35.50,false,x\n"
+            "Joan,Fontanería,600333444,,,\n"
+            "Bad,Pintura,12,,,\n"
+            ",Pintura,600555666,,,\n"
+            'Pau,"Electricidad, Domótica",,2000,,\n'
+            "Joan Puig,Fontanería,600333444,40,,\n",
+        )
+
+        assert (report["rows"], report["inserted"], report["updated"]) == (6, 1, 1)
+        assert report["failed"] == 3
+        assert [error["line"] for error in report["errors"]] == [4, 5, 6]
+        assert report["errors"][0]["errors"][0].startswith("phone:")
+        assert report["errors"][1]["errors"] == ["name: Field required"]
+
+        craftsmen = {c.phone: c for c in db_session.scalars(select(Craftsman)).all()}
+        assert len(craftsmen) == 2
+        ana = craftsmen["600111222"]
+        db_session.refresh(ana)
+        assert (ana.name, ana.hourly_rate, ana.is_active) == (
+            "Ana López",
+            35.5,
+            False,
+        )
+        assert ana.updated_at is not None
+        # The last of the repeated rows wins
+        assert craftsmen["600333444"].name == "Joan Puig"
+        assert craftsmen["600333444"].is_active
+
+    def test_updates_keep_fields_not_given(self, client, db_session):
+        """Test columns missing from the file or left empty are not overwritten"""
+        client.post(
+            "/api/v1/clients/",
+            json={
+                "name": "Ana",
+                "email": "ana@example.com",
+                "phone": "600111222",
+                "address": "Carrer Major 1",
+            },
+        )
+        client.post(
+            "/api/v1/craftsmen/",
+            json={
+                "name": "Joan",
+                "specialties": "Fontanería",
+                "phone": "600333444",
+                "email": "joan@example.com",
+                "hourly_rate": "40.00",
+                "is_active": False,
+            },
+        )
+
+        report = upload(
+            client, "clients", "name,email,phone\nAna Vidal,ana@example.com,\n"
+        )
+        assert report["updated"] == 1
+        report = upload(
+            client,
+            "craftsmen",
+            "name,specialties,phone,is_active\nJoan Puig,Fontanería,600333444,\n",
+        )
+        assert report["updated"] == 1
+
+        ana = db_session.scalars(select(Client)).one()
+        assert (ana.name, ana.phone, ana.address) == (
+            "Ana Vidal",
+            "600111222",
+            "Carrer Major 1",
+        )
+        joan = db_session.scalars(select(Craftsman)).one()
+        assert (joan.name, joan.email, joan.hourly_rate, joan.is_active) == (
+            "Joan Puig",
+            "joan@example.com",
+            40,
+            False,
+        )
+
+    def test_items_in_batches(self, client, db_session, campaign_id, monkeypatch):
+        """Test COPY batches, enum units and rows of missing campaigns"""
+        monkeypatch.setattr(
+            "app.routers.v1.imports.bulk_import_service",
+            BulkImportService(batch_size=2, max_errors=1),
+        )
+        rows = [f"Baldosa {n},{n + 1},square meter,{campaign_id}" for n in range(5)]
+        report = upload(
+            client,
+            "items",
+            "name,quantity,unit,campaign_id\n"
+            + "\n".join(rows)
+            + "\nPuerta,1,unit,999\nVentana,0,unit,999\n",
+        )
+
+        assert (report["inserted"], report["updated"], report["failed"]) == (5, 0, 2)
+        # Only the first error is listed; validation runs before staging
+        assert report["errors"] == [
+            {"line": 8, "errors": ["quantity: Input should be greater than 0"]}
+        ]
+        items = db_session.scalars(select(Item).order_by(Item.id)).all()
+        assert [(i.name, i.quantity, i.unit) for i in items][-1] == (
+            "Baldosa 4",
+            5,
+            Unit.SQUARE_METER,
+        )
+
+        report = upload(
+            client, "items", f"name,quantity,campaign_id\nBALDOSA 4,7,{campaign_id}\n"
+        )
+        assert (report["inserted"], report["updated"]) == (0, 1)
+        report = upload(client, "items", "name,campaign_id\nPuerta,999\n")
+        assert report["errors"] == [
+            {"line": 2, "errors": ["campaign_id: campaigns 999 not found"]}
+        ]
+
+    def test_clients_without_email_are_inserted(self, client, db_session):
+        """Test rows with no key never match, and keys ignore case"""
+        body = "name,email\nAna,ana@example.com\nJoan,\nJoan,\n"
+        assert upload(client, "clients", body)["inserted"] == 3
+        report = upload(client, "clients", "name,email\nAna Vidal,ANA@example.com\n")
+        assert (report["inserted"], report["updated"]) == (0, 1)
+        names = db_session.scalars(select(Client.name).order_by(Client.id)).all()
+        assert names == ["Ana Vidal", "Joan", "Joan"]
+
+        response = client.post(
+            "/api/v1/imports/quotes",
+            files={"file": ("quotes.csv", b"price\n1\n", "text/csv")},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,154 @@
+"""Tests for the change feed and its Server-Sent Events stream"""
+
+import json
+
+import pytest
+import redis
+from fastapi import status
+
+from app.core.config import settings
+from app.core.redis import create_async_redis, redis_client
+from app.routers.v1.stream import change_events
+from app.services.changes import change_feed, changes_channel
+
+
+@pytest.fixture
+def subscription():
+    """Pub/sub subscription factory, skipped when Redis is not reachable"""
+    try:
+        redis_client.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis is not available")
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+
+    def subscribe(channel):
+        pubsub.subscribe(channel)
+        pubsub.get_message(timeout=1.0)  # subscribe confirmation
+        return pubsub
+
+    yield subscribe
+    pubsub.close()
+
+
+def received(pubsub):
+    """Drain the change events delivered to a subscription"""
+    events = []
+    while message := pubsub.get_message(timeout=0.5):
+        events.append(json.loads(message["data"]))
+    return events
+
+
+def create_project(client, sample_user_data, sample_client_data, sample_project_data):
+    client.post("/api/v1/users/", json=sample_user_data)
+    client_id = client.post("/api/v1/clients/", json=sample_client_data).json()["id"]
+    sample_project_data["client_id"] = client_id
+    return client.post("/api/v1/projects/", json=sample_project_data).json()["id"]
+
+
+class TestChangeFeed:
+    """Test CRUD commits are broadcast as compact change events"""
+
+    def test_crud_changes_are_published(
+        self,
+        client,
+        subscription,
+        sample_user_data,
+        sample_client_data,
+        sample_project_data,
+        sample_campaign_data,
+    ):
+        """Test create, update and delete reach the project channel"""
+        pubsub = subscription(changes_channel(1))
+
+        project_id = create_project(
+            client, sample_user_data, sample_client_data, sample_project_data
+        )
+        sample_campaign_data["project_id"] = project_id
+        campaign_id = client.post(
+            "/api/v1/campaigns/", json=sample_campaign_data
+        ).json()["id"]
+        client.put(
+            f"/api/v1/campaigns/{campaign_id}",
+            json={"name": "Renamed", "status": sample_campaign_data["status"]},
+        )
+        client.delete(f"/api/v1/campaigns/{campaign_id}")
+
+        events = received(pubsub)
+        assert [(e["entity"], e["op"]) for e in events] == [
+            ("projects", "create"),
+            ("campaigns", "create"),
+            ("campaigns", "update"),
+            ("campaigns", "delete"),
+        ]
+        assert all(e["project_id"] == project_id for e in events)
+        # Only fields whose value actually changed are reported
+        assert events[2]["fields"] == ["name"]
+        assert events[3] == {**events[3], "id": campaign_id, "fields": []}
+
+    def test_other_projects_are_filtered(
+        self, client, subscription, sample_user_data, sample_client_data
+    ):
+        """Test a project channel does not see changes outside the project"""
+        pubsub = subscription(changes_channel(999))
+        everything = redis_client.pubsub(ignore_subscribe_messages=True)
+        everything.subscribe(changes_channel())
+        everything.get_message(timeout=1.0)
+
+        client.post("/api/v1/users/", json=sample_user_data)
+        client.post("/api/v1/clients/", json=sample_client_data)
+
+        assert received(pubsub) == []
+        assert [e["entity"] for e in received(everything)] == ["users", "clients"]
+        everything.close()
+
+    def test_redis_outage_does_not_fail_writes(
+        self, client, monkeypatch, sample_user_data
+    ):
+        """Test a write still succeeds when the change cannot be published"""
+        monkeypatch.setattr(
+            change_feed, "client", redis.from_url("redis://localhost:1")
+        )
+
+        response = client.post("/api/v1/users/", json=sample_user_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+class Connected:
+    """Request stand-in for a client that stays connected"""
+
+    async def is_disconnected(self):
+        return False
+
+
+class TestStreamEndpoint:
+    """Test the Server-Sent Events frames sent to clients"""
+
+    async def test_stream_forwards_events(self, subscription):
+        """Test published changes are framed as SSE change events"""
+        subscription(changes_channel(7))  # skip without Redis
+        redis = create_async_redis()
+        events = change_events(Connected(), redis, changes_channel(7))
+
+        assert await anext(events) == "retry: 3000\n\n"
+        change_feed.publish(entity="items", id=3, op="update", project_id=7)
+        frame = await anext(events)
+
+        assert frame.startswith("event: change\ndata: ")
+        assert frame.endswith("\n\n")
+        event = json.loads(frame.removeprefix("event: change\ndata: "))
+        assert (event["entity"], event["id"], event["op"]) == ("items", 3, "update")
+        await events.aclose()
+        await redis.aclose()
+
+    async def test_stream_sends_heartbeats(self, subscription, monkeypatch):
+        """Test idle connections get keep-alive comments"""
+        subscription(changes_channel(7))
+        monkeypatch.setattr(settings, "CHANGE_FEED_HEARTBEAT_SECONDS", 0.0)
+        redis = create_async_redis()
+        events = change_events(Connected(), redis, changes_channel(7))
+
+        await anext(events)
+        assert await anext(events) == ": keep-alive\n\n"
+        await events.aclose()
+        await redis.aclose()
@@ -0,0 +1,117 @@
+"""Tests for the KPI rollups and dashboard endpoints"""
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from app.models import KpiMonthly
+from app.services.dashboard import dashboard_service
+
+
+@pytest.fixture
+def add_quote(client, project, item_id, craftsman_id, create_quote):
+    client.put(f"/api/v1/projects/{project['id']}", json={"status": "active"})
+
+    def add(price, currency="EUR", quote_status="approved", margin=None):
+        return create_quote(
+            item_id,
+            craftsman_id,
+            price,
+            currency=currency,
+            quote_status=quote_status,
+            margin_percentage=margin,
+        )
+
+    return add
+
+
+def dashboard(client):
+    response = client.get("/api/v1/dashboard/")
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+class TestDashboard:
+    """Test the dashboard reads KPIs rolled up incrementally"""
+
+    def test_rollups_follow_quote_changes(self, client, db_session, add_quote):
+        """Test approvals are counted on rollup and withdrawn approvals dropped"""
+        add_quote("1000.00", margin="20.00")
+        add_quote("100.00", currency="USD")  # 92.00 EUR
+        pending = add_quote("500.00", quote_status="pending")
+        today = datetime.now(UTC).date()
+
+        assert dashboard_service.rollup(db_session) == 1
+
+        metrics = dashboard(client)
+        month = metrics["month"]
+        assert month["start"] == today.replace(day=1).isoformat()
+        assert (month["quotes_received"], month["quotes_approved"]) == (3, 2)
+        assert Decimal(month["cost"]) == Decimal("1092.00")
+        assert Decimal(month["revenue"]) == Decimal("1292.00")
+        assert Decimal(month["profit"]) == Decimal("200.00")
+        assert Decimal(month["average_margin_percentage"]) == Decimal("18.32")
+        assert month["projects_started"] == 1
+        assert metrics["projects_in_progress"] == 1
+        assert metrics["bottlenecks"]
+
+        client.put(f"/api/v1/quotes/{pending}", json={"status": "approved"})
+        dashboard_service.rollup(db_session)
+        assert Decimal(dashboard(client)["month"]["revenue"]) == Decimal("1792.00")
+
+        client.put(f"/api/v1/quotes/{pending}", json={"status": "rejected"})
+        client.delete("/api/v1/quotes/1")
+        dashboard_service.rollup(db_session)
+        month = dashboard(client)["month"]
+        assert (month["quotes_received"], month["quotes_approved"]) == (2, 1)
+        assert Decimal(month["revenue"]) == Decimal("92.00")
+
+    def test_compare_quarters(self, client, db_session):
+        """Test a quarter is compared with the last from monthly rollups"""
+        for month, revenue, cost in (
+            (date(2026, 1, 1), 100, 80),
+            (date(2026, 2, 1), 200, 150),
+            (date(2026, 4, 1), 600, 400),
+            (date(2026, 7, 1), 999, 1),
+        ):
+            db_session.add(
+                KpiMonthly(
+                    month=month,
+                    quotes_received=4,
+                    quotes_approved=2,
+                    revenue=revenue,
+                    cost=cost,
+                    projects_started=0,
+                    projects_completed=0,
+                )
+            )
+        db_session.commit()
+
+        response = client.get(
+            "/api/v1/dashboard/compare",
+            params={"period": "quarter", "on": "2026-05-15"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert (result["current"]["start"], result["current"]["end"]) == (
+            "2026-04-01",
+            "2026-07-01",
+        )
+        assert result["previous"]["start"] == "2026-01-01"
+        assert Decimal(result["previous"]["revenue"]) == Decimal("300.00")
+        assert result["changes"]["revenue"] == 100.0
+        assert result["changes"]["profit"] == 185.71
+        assert result["changes"]["quotes_received"] == -50.0
+
+        response = client.get(
+            "/api/v1/dashboard/history",
+            params={"date_from": "2026-01-10", "date_to": "2026-07-01"},
+        )
+        assert [p["start"] for p in response.json()] == [
+            "2026-01-01",
+            "2026-02-01",
+            "2026-04-01",
+        ]
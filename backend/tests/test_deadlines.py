@@ -0,0 +1,167 @@
+"""Tests for the incremental task deadline sweep"""
+
+from datetime import date
+
+import pytest
+import redis
+from sqlalchemy import select, text
+
+from app.core.redis import redis_client
+from app.models import JobCheckpoint
+from app.services.deadlines import CHECKPOINT, DeadlineService
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def service():
+    try:
+        redis_client.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis is not available")
+    redis_client.delete(f"lock:{CHECKPOINT}")
+    for key in redis_client.scan_iter("deadline-alert:*"):
+        redis_client.delete(key)
+    return DeadlineService(redis_client, page_size=2)
+
+
+@pytest.fixture
+def add_task(client, sample_user_data, sample_client_data, sample_project_data):
+    client.post("/api/v1/users/", json=sample_user_data)
+    client_id = client.post("/api/v1/clients/", json=sample_client_data).json()["id"]
+    sample_project_data["client_id"] = client_id
+    project_id = client.post("/api/v1/projects/", json=sample_project_data).json()["id"]
+
+    def add(due_date, status="todo", assigned_user_id=1):
+        return client.post(
+            "/api/v1/tasks/",
+            json={
+                "title": f"Due {due_date}",
+                "status": status,
+                "due_date": due_date,
+                "project_id": project_id,
+                "assigned_user_id": assigned_user_id,
+            },
+        ).json()["id"]
+
+    return add
+
+
+class Outbox(list):
+    def __call__(self, user_id, kind, alerts):
+        self.append((user_id, kind, [alert["task_id"] for alert in alerts]))
+
+
+class TestDeadlineSweep:
+    """Test sweeps alert each task once, as its deadline is crossed"""
+
+    def test_sweeps_are_incremental(self, service, add_task, db_session):
+        """Test each sweep only alerts the due dates crossed since the last"""
+        add_task("2026-02-01")  # before the first run's lookback
+        overdue = [add_task("2026-03-05"), add_task("2026-03-09")]
+        unassigned = add_task("2026-03-08", assigned_user_id=None)
+        add_task("2026-03-07", status="completed")
+        due_soon = add_task("2026-03-11")
+        later = add_task("2026-03-12")
+        outbox = Outbox()
+
+        assert service.sweep(db_session, outbox, today=TODAY) == {
+            "overdue": 3,
+            "due_soon": 1,
+        }
+        assert sorted(outbox, key=str) == sorted(
+            [
+                (1, "overdue", overdue),
+                (None, "overdue", [unassigned]),
+                (1, "due_soon", [due_soon]),
+            ],
+            key=str,
+        )
+
+        outbox.clear()
+        assert service.sweep(db_session, outbox, today=TODAY) == {
+            "overdue": 0,
+            "due_soon": 0,
+        }
+        assert service.sweep(db_session, outbox, today=date(2026, 3, 12)) == {
+            "overdue": 1,
+            "due_soon": 1,
+        }
+        assert outbox == [(1, "overdue", [due_soon]), (1, "due_soon", [later])]
+        assert db_session.scalar(select(JobCheckpoint.watermark)) == date(2026, 3, 12)
+
+    def test_tasks_changed_into_swept_windows(
+        self, client, service, add_task, db_session
+    ):
+        """Test tasks created or back-dated behind the watermark are alerted"""
+        later = add_task("2026-03-20")
+        outbox = Outbox()
+        service.sweep(db_session, outbox, today=TODAY)
+        assert outbox == []
+
+        late = add_task("2026-03-06")
+        soon = add_task("2026-03-11")
+        client.put(f"/api/v1/tasks/{later}", json={"due_date": "2026-03-04"})
+        add_task("2026-02-01")  # older than the lookback
+
+        assert service.sweep(db_session, outbox, today=TODAY) == {
+            "overdue": 2,
+            "due_soon": 1,
+        }
+        assert outbox == [(1, "overdue", [later, late]), (1, "due_soon", [soon])]
+
+        outbox.clear()
+        service.sweep(db_session, outbox, today=TODAY)
+        assert outbox == []
+
+    def test_failed_delivery_is_redone(self, service, add_task, db_session):
+        """Test alerts that could not be enqueued are sent by the next sweep"""
+        task = add_task("2026-03-09")
+
+        def broken(user_id, kind, alerts):
+            raise ConnectionError("broker is down")
+
+        with pytest.raises(ConnectionError):
+            service.sweep(db_session, broken, today=TODAY)
+        db_session.rollback()
+        outbox = Outbox()
+        service.sweep(db_session, outbox, today=TODAY)
+
+        assert outbox == [(1, "overdue", [task])]
+
+    def test_one_sweep_at_a_time(self, service, add_task, db_session):
+        """Test a sweep gives way while another worker holds the lock"""
+        add_task("2026-03-09")
+        outbox = Outbox()
+        lock = redis_client.lock(f"lock:{CHECKPOINT}", timeout=60)
+        assert lock.acquire(blocking=False)
+        try:
+            assert service.sweep(db_session, outbox, today=TODAY) is None
+        finally:
+            lock.release()
+
+        assert outbox == []
+        assert db_session.get(JobCheckpoint, CHECKPOINT) is None
+
+    def test_sweep_uses_partial_index(self, db_session):
+        """Test the planner reads the due window from the open-task index"""
+        db_session.execute(text("SET enable_seqscan = off"))
+        plan = db_session.execute(
+            text(
+                "EXPLAIN SELECT id FROM tasks "
+                "WHERE status IN ('TODO', 'IN_PROGRESS') "
+                "AND due_date >= '2026-03-01' AND due_date < '2026-03-10' "
+                "ORDER BY due_date, id LIMIT 1000"
+            )
+        ).scalars()
+
+        assert "ix_tasks_open_due_date" in "\n".join(plan)
+
+        plan = db_session.execute(
+            text(
+                "EXPLAIN SELECT id FROM tasks "
+                "WHERE status IN ('TODO', 'IN_PROGRESS') AND due_date IS NOT NULL "
+                "AND coalesce(updated_at, created_at) >= now() - interval '1 hour'"
+            )
+        ).scalars()
+        assert "ix_tasks_open_changed_at" in "\n".join(plan)
@@ -0,0 +1,550 @@
+"""Tests for streaming document uploads to S3"""
+
+import hashlib
+import io
+import zipfile
+from datetime import timedelta
+
+import boto3
+import pytest
+import redis
+from botocore.config import Config
+from fastapi import status
+from moto import mock_aws
+
+from app.core.redis import redis_client
+from app.main import app
+from app.models import Document
+from app.services.bundle import BundleService, entry_path
+from app.services.document import document_service
+from app.services.signed_urls import (
+    LocalURLSigner,
+    S3URLSigner,
+    SignedURLService,
+    get_signed_url_service,
+)
+from app.services.storage import (
+    LocalStorageService,
+    StorageService,
+    get_storage_service,
+)
+
+BUCKET = "test-studiohub-docs"
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def s3():
+    """In-memory S3 stand-in with an empty bucket"""
+    with mock_aws():
+        s3 = boto3.client(
+            "s3", region_name="eu-west-1", config=Config(signature_version="s3v4")
+        )
+        s3.create_bucket(
+            Bucket=BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-1"},
+        )
+        yield s3
+
+
+@pytest.fixture
+def storage(s3):
+    """Storage service using the smallest part size S3 allows"""
+    service = StorageService(s3, BUCKET, part_size=5 * MIB, concurrency=2)
+    signed_urls = SignedURLService(S3URLSigner(s3, BUCKET), redis_client)
+    app.dependency_overrides[get_storage_service] = lambda: service
+    app.dependency_overrides[get_signed_url_service] = lambda: signed_urls
+    yield service
+    app.dependency_overrides.pop(get_storage_service, None)
+    app.dependency_overrides.pop(get_signed_url_service, None)
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    """Development backend keeping files in a temporary directory"""
+    service = LocalStorageService(str(tmp_path))
+    signed_urls = SignedURLService(
+        LocalURLSigner("test-secret"), redis.from_url("redis://localhost:1")
+    )
+    app.dependency_overrides[get_storage_service] = lambda: service
+    app.dependency_overrides[get_signed_url_service] = lambda: signed_urls
+    yield service
+    app.dependency_overrides.pop(get_storage_service, None)
+    app.dependency_overrides.pop(get_signed_url_service, None)
+
+
+def chunks(data: bytes, size: int = 64 * 1024):
+    """Send a body in pieces, as a browser streaming a large file would"""
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class TestDocumentUpload:
+    """Test the streaming upload endpoint"""
+
+    def test_large_file_uses_multipart(self, client, s3, storage, project):
+        """Test a file larger than a part is uploaded in checksummed parts"""
+        data = bytes(range(256)) * (12 * MIB // 256)
+
+        response = client.post(
+            "/api/v1/documents/",
+            params={"filename": "planta baja.dwg", "project_id": project["id"]},
+            content=chunks(data),
+            headers={"Content-Type": "image/vnd.dwg"},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        document = response.json()
+        assert document["size"] == len(data)
+        assert document["sha256"] == hashlib.sha256(data).hexdigest()
+        assert document["s3_key"].endswith("/planta_baja.dwg")
+        stored = s3.get_object(Bucket=BUCKET, Key=document["s3_key"])
+        assert stored["ContentType"] == "image/vnd.dwg"
+        assert stored["ETag"].strip('"').endswith("-3")
+        assert stored["Body"].read() == data
+
+    def test_small_file_uses_single_put(self, client, s3, storage, project):
+        """Test a file smaller than a part is stored with one request"""
+        response = client.post(
+            "/api/v1/documents/",
+            params={"filename": "notas.txt", "project_id": project["id"]},
+            content=b"cotas revisadas",
+            headers={"Content-Type": "text/plain"},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        key = response.json()["s3_key"]
+        stored = s3.get_object(Bucket=BUCKET, Key=key)
+        assert "-" not in stored["ETag"]
+        assert stored["Body"].read() == b"cotas revisadas"
+
+        listed = client.get("/api/v1/documents/", params={"project_id": project["id"]})
+        assert [d["filename"] for d in listed.json()] == ["notas.txt"]
+
+    def test_too_large_upload_is_aborted(
+        self, client, s3, storage, project, monkeypatch
+    ):
+        """Test exceeding the size limit aborts the multipart upload"""
+        monkeypatch.setattr(
+            "app.routers.v1.documents.settings.DOCUMENT_MAX_UPLOAD_BYTES", 7 * MIB
+        )
+
+        response = client.post(
+            "/api/v1/documents/",
+            params={"filename": "huge.dwg", "project_id": project["id"]},
+            content=chunks(b"x" * 8 * MIB),
+        )
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert "Uploads" not in s3.list_multipart_uploads(Bucket=BUCKET)
+        assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+    def test_owner_is_validated(self, client, storage, project):
+        """Test uploads need an existing project and a matching campaign"""
+        response = client.post(
+            "/api/v1/documents/",
+            params={"filename": "a.pdf", "project_id": 999},
+            content=b"%PDF",
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = client.post(
+            "/api/v1/documents/",
+            params={"filename": "a.pdf", "project_id": project["id"], "item_id": 5},
+            content=b"%PDF",
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_invalid_metadata_stores_nothing(self, client, s3, storage, project):
+        """Test metadata is validated before the body is uploaded"""
+        response = client.post(
+            "/api/v1/documents/",
+            params={
+                "filename": "a.pdf",
+                "project_id": project["id"],
+                "tags": [f"tag{n}" for n in range(21)],
+            },
+            content=b"%PDF",
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["loc"] == ["tags"]
+        assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+    def test_delete_removes_object(self, client, s3, storage, project):
+        """Test deleting a document removes its stored file"""
+        document = client.post(
+            "/api/v1/documents/",
+            params={"filename": "a.pdf", "project_id": project["id"]},
+            content=b"%PDF",
+        ).json()
+
+        response = client.delete(f"/api/v1/documents/{document['id']}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+
+class TestStorageService:
+    """Test multipart uploads at the service level"""
+
+    async def test_failed_stream_aborts_upload(self, s3):
+        """Test an interrupted body leaves no pending multipart upload"""
+        service = StorageService(s3, BUCKET, part_size=5 * MIB)
+
+        async def broken_body():
+            yield b"x" * 6 * MIB
+            raise ConnectionError("client went away")
+
+        with pytest.raises(ConnectionError):
+            await service.upload_stream(
+                "broken.dwg", broken_body(), content_type="image/vnd.dwg"
+            )
+
+        assert "Uploads" not in s3.list_multipart_uploads(Bucket=BUCKET)
+
+
+def make_bundle(entries: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+class TestBundleExtraction:
+    """Test ZIP bundles are extracted from S3 back into S3"""
+
+    def test_entry_paths(self):
+        """Test entry names become safe keys and clutter is skipped"""
+        assert entry_path("Planos/Planta 1.dwg") == "Planos/Planta_1.dwg"
+        assert entry_path("../../etc/passwd") is None
+        assert entry_path("/abs/alzado.pdf") == "abs/alzado.pdf"
+        assert entry_path("__MACOSX/Planos/._Planta.dwg") is None
+
+    def test_extracts_and_indexes_entries(self, client, db_session, s3, project):
+        """Test every entry is uploaded under cad/ and indexed in one go"""
+        large = bytes(range(256)) * (6 * MIB // 256)
+        entries = {
+            "Planos/planta.dwg": large,
+            "Planos/alzado.pdf": b"%PDF-1.7 alzado",
+            "memoria.txt": b"Memoria descriptiva",
+            "__MACOSX/Planos/._planta.dwg": b"junk",
+        }
+        s3.put_object(Bucket=BUCKET, Key="bundle.zip", Body=make_bundle(entries))
+        bundle = Document(
+            filename="entrega.zip",
+            path="entrega.zip",
+            content_type="application/zip",
+            size=0,
+            sha256="0" * 64,
+            s3_key="bundle.zip",
+            project_id=project["id"],
+        )
+        db_session.add(bundle)
+        db_session.commit()
+        progress = []
+        service = BundleService(
+            StorageService(s3, BUCKET, part_size=5 * MIB), concurrency=2
+        )
+
+        assert (
+            service.extract(db_session, bundle, progress=lambda *p: progress.append(p))
+            == 3
+        )
+
+        assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+        prefix = f"projects/{project['id']}/cad/{bundle.id}/"
+        stored = s3.get_object(Bucket=BUCKET, Key=prefix + "Planos/planta.dwg")
+        assert stored["Body"].read() == large
+        assert stored["ETag"].strip('"').endswith("-2")
+        documents = {
+            d.s3_key: d
+            for d in db_session.query(Document).filter(Document.id != bundle.id)
+        }
+        assert sorted(documents) == [
+            prefix + "Planos/alzado.pdf",
+            prefix + "Planos/planta.dwg",
+            prefix + "memoria.txt",
+        ]
+        alzado = documents[prefix + "Planos/alzado.pdf"]
+        assert alzado.content_type == "application/pdf"
+        assert alzado.path == "cad/entrega/Planos/alzado.pdf"
+        assert alzado.sha256 == hashlib.sha256(b"%PDF-1.7 alzado").hexdigest()
+
+        # Running again overwrites the same keys and indexes nothing twice
+        assert service.extract(db_session, bundle) == 3
+        assert db_session.query(Document).count() == 4
+
+    def test_extracts_from_local_storage(self, db_session, local_storage, project):
+        """Test bundles also extract with the local development backend"""
+        key = f"projects/{project['id']}/entrega.zip"
+        local_storage.put_file(
+            key,
+            io.BytesIO(make_bundle({"Planos/planta.dwg": b"DWG", "memoria.txt": b""})),
+            content_type="application/zip",
+        )
+        bundle = Document(
+            filename="entrega.zip",
+            path="entrega.zip",
+            content_type="application/zip",
+            size=0,
+            s3_key=key,
+            project_id=project["id"],
+        )
+        db_session.add(bundle)
+        db_session.commit()
+
+        assert BundleService(local_storage).extract(db_session, bundle) == 2
+
+        extracted = f"projects/{project['id']}/cad/{bundle.id}/Planos/planta.dwg"
+        assert local_storage.path_for(extracted).read_bytes() == b"DWG"
+        assert db_session.query(Document).filter_by(s3_key=extracted).one()
+
+    def test_only_zip_documents_can_be_extracted(self, client, storage, project):
+        """Test extraction is refused for files that are not archives"""
+        document = client.post(
+            "/api/v1/documents/",
+            params={"filename": "a.pdf", "project_id": project["id"]},
+            content=b"%PDF",
+            headers={"Content-Type": "application/pdf"},
+        ).json()
+
+        response = client.post(f"/api/v1/documents/{document['id']}/extraction")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestDocumentSearch:
+    """Test filtered, keyset-paginated document search"""
+
+    def upload(self, client, project, filename, content_type, **params):
+        response = client.post(
+            "/api/v1/documents/",
+            params={"filename": filename, "project_id": project["id"], **params},
+            content=b"data",
+            headers={"Content-Type": content_type},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()
+
+    def test_upload_records_folder_and_tags(self, client, local_storage, project):
+        """Test the folder, tags and uploader are stored with the file"""
+        document = self.upload(
+            client,
+            project,
+            "planta.dwg",
+            "image/vnd.dwg",
+            folder="/Planos//Baja/",
+            tags=["Obra", "obra ", "final"],
+        )
+
+        assert document["path"] == "Planos/Baja/planta.dwg"
+        assert document["tags"] == ["obra", "final"]
+        assert document["uploaded_by_id"] == 1
+
+    def test_filters(self, client, local_storage, project):
+        """Test filtering by media type family, folder and tag"""
+        self.upload(
+            client, project, "a.png", "image/png", folder="Fotos", tags=["obra"]
+        )
+        self.upload(client, project, "b.jpg", "image/jpeg", folder="Fotos")
+        self.upload(client, project, "c.pdf", "application/pdf", tags=["obra"])
+
+        def names(**params):
+            response = client.get("/api/v1/documents/search", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            return [d["filename"] for d in response.json()["items"]]
+
+        assert names(project_id=project["id"], content_type="image/*") == [
+            "b.jpg",
+            "a.png",
+        ]
+        assert names(project_id=project["id"], content_type="application/pdf") == [
+            "c.pdf"
+        ]
+        assert names(path_prefix="Fotos/", tag="OBRA") == ["a.png"]
+        assert names(project_id=project["id"] + 1) == []
+
+    def test_keyset_pagination(self, client, local_storage, project):
+        """Test pages follow each other without gaps or repeats"""
+        for n in range(5):
+            self.upload(client, project, f"{n}.pdf", "application/pdf")
+
+        seen, cursor = [], None
+        while True:
+            params = {"project_id": project["id"], "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/api/v1/documents/search", params=params).json()
+            assert all(d["download_url"] for d in page["items"])
+            seen += [d["filename"] for d in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == ["4.pdf", "3.pdf", "2.pdf", "1.pdf", "0.pdf"]
+
+    def test_invalid_cursor(self, client, local_storage):
+        """Test a tampered cursor is rejected"""
+        response = client.get("/api/v1/documents/search", params={"cursor": "bm9wZQ"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestReconciliation:
+    """Test the index is reconciled against the bucket listing"""
+
+    def test_reconcile(self, client, s3, storage, db_session, project):
+        """Test strays are indexed, lost files dropped and others left alone"""
+        kept = client.post(
+            "/api/v1/documents/",
+            params={"filename": "kept.pdf", "project_id": project["id"]},
+            content=b"%PDF",
+        ).json()
+        lost = client.post(
+            "/api/v1/documents/",
+            params={"filename": "lost.pdf", "project_id": project["id"]},
+            content=b"%PDF",
+        ).json()
+        s3.delete_object(Bucket=BUCKET, Key=lost["s3_key"])
+        stray = f"projects/{project['id']}/cad/7/Planos/planta.dwg"
+        for key in (stray, "projects/999/huerfano.pdf", "tmp/ignored.txt"):
+            s3.put_object(Bucket=BUCKET, Key=key, Body=b"DWG")
+
+        report = document_service.reconcile(
+            db_session, storage, page_size=2, grace=timedelta(0)
+        )
+
+        assert report.listed == 3
+        assert report.added == 1
+        assert report.removed == 1
+        assert report.orphaned == ["projects/999/huerfano.pdf"]
+        documents = {d.s3_key: d for d in db_session.query(Document)}
+        assert sorted(documents) == sorted([kept["s3_key"], stray])
+        assert documents[stray].path == "cad/7/Planos/planta.dwg"
+        assert documents[stray].size == 3
+        assert documents[stray].sha256 is None
+
+    def test_reconcile_local_storage(self, client, db_session, local_storage, project):
+        """Test the development backend is reconciled through its file listing"""
+        kept = client.post(
+            "/api/v1/documents/",
+            params={"filename": "kept.pdf", "project_id": project["id"]},
+            content=b"%PDF",
+        ).json()
+        lost = client.post(
+            "/api/v1/documents/",
+            params={"filename": "lost.pdf", "project_id": project["id"]},
+            content=b"%PDF",
+        ).json()
+        local_storage.delete(lost["s3_key"])
+        stray = f"projects/{project['id']}/Fotos/obra.jpg"
+        local_storage.put_file(stray, io.BytesIO(b"JPEG"), content_type="image/jpeg")
+
+        report = document_service.reconcile(
+            db_session, local_storage, page_size=1, grace=timedelta(0)
+        )
+
+        assert (report.listed, report.added, report.removed) == (2, 1, 1)
+        documents = {d.s3_key: d for d in db_session.query(Document)}
+        assert sorted(documents) == sorted([kept["s3_key"], stray])
+        assert (documents[stray].path, documents[stray].size) == ("Fotos/obra.jpg", 4)
+
+    def test_recent_changes_are_left_alone(
+        self, client, s3, storage, db_session, project
+    ):
+        """Test uploads younger than the grace period are not touched"""
+        s3.put_object(Bucket=BUCKET, Key=f"projects/{project['id']}/new.pdf", Body=b"")
+        db_session.add(
+            Document(
+                filename="pending.pdf",
+                path="pending.pdf",
+                content_type="application/pdf",
+                size=0,
+                s3_key=f"projects/{project['id']}/pending.pdf",
+                project_id=project["id"],
+            )
+        )
+        db_session.commit()
+
+        report = document_service.reconcile(db_session, storage)
+
+        assert (report.added, report.removed) == (0, 0)
+
+
+class CountingSigner(LocalURLSigner):
+    """Signer that counts how many links it had to sign"""
+
+    signed = 0
+
+    def sign(self, key, expires_in):
+        self.signed += 1
+        return super().sign(key, expires_in)
+
+
+class TestSignedURLs:
+    """Test download links are signed in batches and cached"""
+
+    def test_links_are_cached(self):
+        """Test a listing only signs the links it has not issued yet"""
+        try:
+            redis_client.ping()
+        except redis.ConnectionError:
+            pytest.skip("Redis is not available")
+        signer = CountingSigner("test-secret")
+        signer.name = "test-counting"
+        keys = [f"projects/1/doc-{n}.pdf" for n in range(3)]
+        redis_client.delete(*(f"signed-url:test-counting:{key}" for key in keys))
+        service = SignedURLService(signer, redis_client, ttl=3600, min_validity=600)
+
+        first = service.urls_for(keys[:2])
+        second = service.urls_for(keys)
+
+        assert signer.signed == 3
+        assert second[keys[0]] == first[keys[0]]
+        ttl = redis_client.ttl(f"signed-url:test-counting:{keys[0]}")
+        assert 0 < ttl <= 3000
+        redis_client.delete(*(f"signed-url:test-counting:{key}" for key in keys))
+
+    def test_links_without_redis(self):
+        """Test links are still issued when the cache is unreachable"""
+        service = SignedURLService(
+            CountingSigner("test-secret"), redis.from_url("redis://localhost:1")
+        )
+
+        url = service.url_for("projects/1/planta.dwg")
+
+        assert url.url.startswith("/api/v1/documents/files/projects/1/planta.dwg?")
+
+    def test_s3_listing_embeds_presigned_urls(self, client, storage, project):
+        """Test the listing carries a presigned GET for every document"""
+        for name in ("a.pdf", "b.pdf"):
+            client.post(
+                "/api/v1/documents/",
+                params={"filename": name, "project_id": project["id"]},
+                content=b"%PDF",
+            )
+
+        listed = client.get("/api/v1/documents/", params={"project_id": project["id"]})
+
+        for document in listed.json():
+            assert document["s3_key"] in document["download_url"]
+            assert "X-Amz-Expires=604800" in document["download_url"]
+            assert document["download_url_expires_at"]
+
+    def test_local_backend_serves_signed_links(self, client, local_storage, project):
+        """Test the development backend stores files and serves signed links"""
+        document = client.post(
+            "/api/v1/documents/",
+            params={"filename": "planta.dwg", "project_id": project["id"]},
+            content=b"DWG-DATA",
+        ).json()
+
+        url = client.get(f"/api/v1/documents/{document['id']}").json()["download_url"]
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b"DWG-DATA"
+
+        response = client.get(url.replace("signature=", "signature=0"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
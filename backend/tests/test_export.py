@@ -0,0 +1,98 @@
+"""Tests for the CSV and XLSX export endpoints"""
+
+import csv
+import io
+import zipfile
+
+import pytest
+from fastapi import status
+
+from app.services.export import ExportService
+
+
+@pytest.fixture
+def add_quotes(item_id, craftsman_id, create_quote):
+    def add(prices, quote_status="pending", description="Test quote"):
+        for price in prices:
+            create_quote(
+                item_id,
+                craftsman_id,
+                price,
+                quote_status=quote_status,
+                description=description,
+            )
+
+    return add
+
+
+def read_csv(response):
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+
+class TestExport:
+    """Test filtered lists are streamed as downloads"""
+
+    def test_quotes_csv_uses_list_filters(self, client, add_quotes, monkeypatch):
+        """Test every matching row is written, across several chunks"""
+        # Tiny batches and chunks so the cursor and stream both go round
+        monkeypatch.setattr(
+            "app.routers.v1.quotes.export_service",
+            ExportService(batch_size=2, chunk_size=100),
+        )
+        add_quotes([f"{100 + n}.00" for n in range(5)])
+        add_quotes(["999.00"], quote_status="approved")
+
+        response = client.get("/api/v1/quotes/export")
+        rows = read_csv(response)
+        assert "attachment" in response.headers["content-disposition"]
+        assert ".csv" in response.headers["content-disposition"]
+        assert [row["price"] for row in rows] == [
+            "100.00",
+            "101.00",
+            "102.00",
+            "103.00",
+            "104.00",
+            "999.00",
+        ]
+        assert rows[0]["item"] == "Test Item"
+        assert rows[0]["craftsman"] == "Test Craftsman"
+
+        rows = read_csv(client.get("/api/v1/quotes/export?approved_only=true"))
+        assert [(row["price"], row["status"]) for row in rows] == [
+            ("999.00", "approved")
+        ]
+        assert read_csv(client.get("/api/v1/quotes/export?item_id=999")) == []
+
+    def test_xlsx_workbooks(self, client, add_quotes):
+        """Test each list downloads as a workbook with a header row"""
+        add_quotes(["100.00"])
+        for path in ("quotes", "items", "tasks", "projects"):
+            response = client.get(f"/api/v1/{path}/export", params={"format": "xlsx"})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["content-type"].endswith("spreadsheetml.sheet")
+            with zipfile.ZipFile(io.BytesIO(response.content)) as workbook:
+                sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+            assert "<row" in sheet
+
+        assert (
+            client.get("/api/v1/items/export", params={"format": "pdf"}).status_code
+            == status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    def test_text_is_never_a_formula(self, client, add_quotes):
+        """Test free text starting like a formula is exported as text"""
+        formula = '=HYPERLINK("http://evil.example","click")'
+        add_quotes(["100.00"], description=formula)
+
+        rows = read_csv(client.get("/api/v1/quotes/export"))
+        assert rows[0]["description"] == "'" + formula
+        assert rows[0]["price"] == "100.00"
+
+        response = client.get("/api/v1/quotes/export", params={"format": "xlsx"})
+        with zipfile.ZipFile(io.BytesIO(response.content)) as workbook:
+            sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        assert "<f>" not in sheet
+        assert "HYPERLINK" in sheet
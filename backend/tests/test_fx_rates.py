@@ -0,0 +1,135 @@
+"""Tests for dated exchange rates and reporting currencies"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from app.services.dashboard import dashboard_service
+from app.services.fx import fx_service
+
+
+@pytest.fixture
+def item_id(client, campaign_id, craftsman_id, sample_item_data):
+    # The shared cache may hold another test database's rates
+    fx_service.rates.flush()
+    sample_item_data.update(campaign_id=campaign_id, estimated_cost="200.00")
+    yield client.post("/api/v1/items/", json=sample_item_data).json()["id"]
+    fx_service.rates.flush()
+
+
+@pytest.fixture
+def add_quote(item_id, craftsman_id, create_quote):
+    def add(price, currency):
+        create_quote(
+            item_id, craftsman_id, price, currency=currency, quote_status="approved"
+        )
+
+    return add
+
+
+def set_rates(client, *rates):
+    response = client.put(
+        "/api/v1/fx-rates/",
+        json=[
+            {"currency": currency, "valid_from": day.isoformat(), "rate": rate}
+            for currency, day, rate in rates
+        ],
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["loaded"]
+
+
+class TestFxRates:
+    """Test prices convert at the rates in force when they were quoted"""
+
+    def test_comparison_uses_dated_rates(self, client, item_id, add_quote):
+        """Test the joined rate, the fallback and a reporting currency"""
+        add_quote("100.00", "USD")
+        add_quote("100.00", "GBP")
+        today = datetime.now(UTC).date()
+
+        def compare(**params):
+            response = client.get(
+                f"/api/v1/items/{item_id}/quote-comparison", params=params
+            )
+            assert response.status_code == status.HTTP_200_OK
+            return response.json()
+
+        # No rates yet: the configured ones
+        assert [q["normalized_price"] for q in compare()["quotes"]] == [
+            "92.00",
+            "117.00",
+        ]
+
+        assert (
+            set_rates(
+                client,
+                ("USD", today - timedelta(days=30), "0.80"),
+                ("USD", today + timedelta(days=1), "0.50"),
+                ("GBP", today, "1.25"),
+            )
+            == 3
+        )
+        comparison = compare()
+        assert comparison["base_currency"] == "EUR"
+        assert [q["normalized_price"] for q in comparison["quotes"]] == [
+            "80.00",
+            "125.00",
+        ]
+
+        # Reported in pounds at today's rate
+        comparison = compare(currency="GBP")
+        assert comparison["base_currency"] == "GBP"
+        assert [q["normalized_price"] for q in comparison["quotes"]] == [
+            "64.00",
+            "100.00",
+        ]
+        assert comparison["estimated_cost"] == "160.00"
+        assert comparison["savings_vs_estimate"] == "96.00"
+
+        response = client.get("/api/v1/fx-rates/", params={"on": today.isoformat()})
+        assert [(r["currency"], r["rate"]) for r in response.json()] == [
+            ("USD", "0.80000000"),
+            ("GBP", "1.25000000"),
+        ]
+
+    def test_dashboard_in_requested_currency(self, client, db_session, add_quote):
+        """Test rolled up amounts are reported in another currency"""
+        add_quote("100.00", "USD")
+        today = datetime.now(UTC).date()
+        set_rates(client, ("USD", today, "0.80"))
+        dashboard_service.rollup(db_session)
+
+        month = client.get("/api/v1/dashboard/").json()["month"]
+        assert (month["currency"], month["cost"]) == ("EUR", "80.00")
+
+        month = client.get("/api/v1/dashboard/", params={"currency": "USD"}).json()[
+            "month"
+        ]
+        assert (month["currency"], month["cost"], month["profit"]) == (
+            "USD",
+            "100.00",
+            "0.00",
+        )
+
+    def test_load_csv_is_all_or_nothing(self, client, db_session, item_id):
+        """Test a file with an invalid line loads nothing"""
+        with pytest.raises(ValueError, match="line 3"):
+            fx_service.load_csv(
+                db_session,
+                ["currency,valid_from,rate\n", "USD,2026-01-01,0.9\n", "CHF,x,1\n"],
+            )
+        assert fx_service.get_multi(db_session) == []
+
+        loaded = fx_service.load_csv(
+            db_session,
+            [
+                "currency,valid_from,rate\n",
+                "USD,2026-01-01,0.9\n",
+                "USD,2026-01-01,0.95\n",
+            ],
+        )
+        assert loaded == 1
+        assert fx_service.rate(db_session, "USD") == Decimal("0.95")
@@ -0,0 +1,113 @@
+"""Tests for the LISTEN/NOTIFY cache invalidation bus"""
+
+import threading
+
+import pytest
+from psycopg2.extensions import make_dsn
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus
+from app.models import Client, Craftsman
+
+
+class RecordingCache:
+    """Invalidator that remembers what it was told"""
+
+    def __init__(self):
+        self.invalidated = []
+        self.flushes = 0
+        self.changed = threading.Event()
+        self.flushed = threading.Event()
+
+    def invalidate(self, table, id):
+        self.invalidated.append((table, id))
+        self.changed.set()
+
+    def flush(self):
+        self.flushes += 1
+        self.flushed.set()
+
+
+@pytest.fixture
+def bus(db_session):
+    """Bus listening on the test database"""
+    bus = InvalidationBus(
+        make_dsn(
+            host=settings.TEST_DB_HOST,
+            port=settings.TEST_DB_PORT,
+            user=settings.TEST_DB_USER,
+            password=settings.TEST_DB_PASSWORD,
+            dbname=db_session.get_bind().url.database,
+        ),
+        reconnect_delay=0.05,
+    )
+    yield bus
+    bus.stop()
+
+
+class TestInvalidationBus:
+    """Test notifications are routed to registered caches"""
+
+    def test_dispatch_routes_by_table(self):
+        """Test only invalidators registered for the table are called"""
+        bus = InvalidationBus("")
+        clients, craftsmen = RecordingCache(), RecordingCache()
+        bus.register(clients, ["clients"])
+        bus.register(craftsmen, ["craftsmen", "clients"])
+
+        bus.dispatch('{"table": "clients", "op": "update", "id": 4}')
+        bus.dispatch('{"table": "craftsmen", "op": "delete", "id": 9}')
+        bus.dispatch("not json")
+
+        assert clients.invalidated == [("clients", 4)]
+        assert craftsmen.invalidated == [("clients", 4), ("craftsmen", 9)]
+
+    def test_bursts_flush_instead_of_invalidating(self):
+        """Test a batch with many rows of one table flushes its caches once"""
+        bus = InvalidationBus("", burst_size=3)
+        items, clients = RecordingCache(), RecordingCache()
+        bus.register(items, ["items", "quotes"])
+        bus.register(clients, ["clients"])
+
+        bus.dispatch_many(
+            [f'{{"table": "items", "op": "insert", "id": {n}}}' for n in range(4)]
+            + ['{"table": "clients", "op": "update", "id": 1}'] * 5
+        )
+
+        assert (items.invalidated, items.flushes) == ([], 1)
+        # Repeats of one row count once
+        assert (clients.invalidated, clients.flushes) == ([("clients", 1)], 0)
+
+    def test_committed_writes_are_notified(self, bus, db_session):
+        """Test a committed insert reaches the cache of the listener"""
+        cache = RecordingCache()
+        bus.register(cache, ["clients"])
+        bus.start()
+        assert bus.connected.wait(5)
+
+        client = Client(name="Estudio Vidal")
+        db_session.add(client)
+        db_session.add(Craftsman(name="Fusteria Roca", specialties="Carpentry"))
+        db_session.commit()
+
+        assert cache.changed.wait(5)
+        assert cache.invalidated == [("clients", client.id)]
+
+    def test_reconnect_flushes_caches(self, bus, db_session):
+        """Test caches are flushed after the listener reconnects"""
+        cache = RecordingCache()
+        bus.register(cache, ["clients"])
+        bus.start()
+        assert bus.connected.wait(5)
+        assert cache.flushes == 1  # initial connect
+        cache.flushed.clear()
+
+        db_session.connection().exec_driver_sql(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            "WHERE application_name = 'invalidation-bus' "
+            "AND datname = current_database()"
+        )
+        db_session.commit()
+
+        assert cache.flushed.wait(5)
+        assert cache.flushes == 2
@@ -0,0 +1,101 @@
+"""Tests for similar item lookup"""
+
+import pytest
+from fastapi import status
+
+from app.services.similarity import ItemSimilarityIndex, item_similarity_index
+
+
+@pytest.fixture
+def add_item(client, campaign_id):
+    # The shared index may still hold another test database's items
+    item_similarity_index.flush()
+
+    def add(name, description=None):
+        return client.post(
+            "/api/v1/items/",
+            json={"name": name, "description": description, "campaign_id": campaign_id},
+        ).json()["id"]
+
+    yield add
+    item_similarity_index.flush()
+
+
+def similar(client, name, **params):
+    response = client.get("/api/v1/items/similar", params={"name": name, **params})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+class TestItemSimilarity:
+    """Test similar items are ranked by their names and descriptions"""
+
+    def test_similar_items_with_prices(
+        self, client, add_item, craftsman_id, create_quote
+    ):
+        """Test the closest items come first with their approved quotes"""
+        wardrobe = add_item("Armario empotrado roble", "Puertas correderas")
+        add_item("Armari encastat", "Portes de roure")
+        add_item("Lámpara de techo", "Latón cepillado")
+        for price, quote_status in (("1200.00", "approved"), ("1500.00", "pending")):
+            create_quote(wardrobe, craftsman_id, price, quote_status=quote_status)
+
+        matches = similar(client, "armarios empotrados", min_score=0.1)
+
+        assert matches[0]["item_id"] == wardrobe
+        assert [q["price"] for q in matches[0]["approved_quotes"]] == ["1200.00"]
+        assert matches[0]["approved_quotes"][0]["price_base"] == "1200.00"
+        assert "Lámpara de techo" not in [m["name"] for m in matches]
+        assert matches == sorted(matches, key=lambda m: -m["score"])
+
+    def test_index_follows_item_changes(self, client, add_item):
+        """Test items are added, re-indexed and removed without a rebuild"""
+        add_item("Mesa de comedor")
+        assert similar(client, "lampara") == []
+        assert item_similarity_index.built
+
+        lamp = add_item("Lámpara colgante")
+        assert [m["item_id"] for m in similar(client, "lampara")] == [lamp]
+
+        client.put(f"/api/v1/items/{lamp}", json={"name": "Aplique de pared"})
+        assert similar(client, "lampara") == []
+        assert [m["item_id"] for m in similar(client, "aplique")] == [lamp]
+
+        client.delete(f"/api/v1/items/{lamp}")
+        assert similar(client, "aplique") == []
+
+    def test_similar_to_an_item(self, client, add_item):
+        """Test an item is compared with the others but not itself"""
+        sofa = add_item("Sofá tres plazas", "Tapizado lino")
+        other = add_item("Sofa 3 plazas", "Tapizado en lino")
+
+        response = client.get(f"/api/v1/items/{sofa}/similar")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [m["item_id"] for m in response.json()] == [other]
+        assert client.get("/api/v1/items/999/similar").status_code == 404
+
+
+def test_tombstones_trigger_a_rebuild():
+    """Test the index drops itself once re-indexed rows pile up"""
+    index = ItemSimilarityIndex(compact_ratio=0.25)
+    index.load((n, f"Item {n}", None) for n in range(4000))
+    # Rebuilt once dead rows exceed a quarter of all rows: 1334 of 5334
+    for n in range(1333):
+        index.add(n, f"Renamed {n}", None)
+    assert index.built and len(index) == 4000
+
+    index.add(0, "Renamed again", None)
+    assert not index.built
+
+
+def test_unchanged_text_is_not_reindexed():
+    """Test bus echoes of changes already indexed leave no dead rows behind"""
+    index = ItemSimilarityIndex(compact_ratio=0.25)
+    index.load((n, f"Item {n}", None) for n in range(4000))
+    for _ in range(2):
+        for n in range(1333):
+            index.add(n, f"Renamed {n}", None)
+
+    assert index.built and len(index) == 4000
+    assert index.query("Renamed 7", k=1)[0][0] == 7
@@ -38,8 +38,8 @@ class TestMigrations:
         # Should have at least one revision (our initial migration)
         assert len(revisions) > 0
 
-        # Check that the initial migration exists
-        initial_revision = revisions[0]
+        # Check that the initial migration exists (walk_revisions runs head -> base)
+        initial_revision = revisions[-1]
         assert initial_revision.revision is not None
         assert "Initial migration" in initial_revision.doc
 
@@ -61,7 +61,7 @@ class TestMigrations:
         revisions = list(script_dir.walk_revisions())
 
         # Get the initial migration
-        initial_revision = revisions[0]
+        initial_revision = revisions[-1]
         migration_path = script_dir.get_revision(initial_revision.revision).path
 
         # Read the migration file
@@ -89,7 +89,7 @@ class TestMigrations:
         revisions = list(script_dir.walk_revisions())
 
         # Get the initial migration
-        initial_revision = revisions[0]
+        initial_revision = revisions[-1]
         migration_path = script_dir.get_revision(initial_revision.revision).path
 
         # Read the migration file
@@ -116,7 +116,7 @@ class TestMigrations:
         revisions = list(script_dir.walk_revisions())
 
         # Get the initial migration
-        initial_revision = revisions[0]
+        initial_revision = revisions[-1]
         migration_path = script_dir.get_revision(initial_revision.revision).path
 
         # Read the migration file
@@ -141,7 +141,7 @@ class TestMigrations:
         revisions = list(script_dir.walk_revisions())
 
         # Get the initial migration
-        initial_revision = revisions[0]
+        initial_revision = revisions[-1]
         migration_path = script_dir.get_revision(initial_revision.revision).path
 
         # Read the migration file
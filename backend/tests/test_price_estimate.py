@@ -0,0 +1,122 @@
+"""Tests for price range estimates"""
+
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from app.services.prediction import EstimateCache, price_predictor
+from app.services.similarity import item_similarity_index
+
+
+@pytest.fixture
+def add_item(client, campaign_id, craftsman_id, create_quote):
+    # The shared index and cache may hold another test database's items
+    item_similarity_index.flush()
+    price_predictor.estimates.flush()
+
+    def add(name, quantity=1, unit="square meter", quotes=()):
+        item_id = client.post(
+            "/api/v1/items/",
+            json={
+                "name": name,
+                "quantity": quantity,
+                "unit": unit,
+                "campaign_id": campaign_id,
+            },
+        ).json()["id"]
+        for price, currency in quotes:
+            create_quote(
+                item_id, craftsman_id, price, currency=currency, quote_status="approved"
+            )
+        return item_id
+
+    yield add
+    item_similarity_index.flush()
+    price_predictor.estimates.flush()
+
+
+def estimate(client, item_id, **options):
+    response = client.post(f"/api/v1/items/{item_id}/price-estimate", json=options)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+class TestPriceEstimate:
+    """Test estimates are learned from similar items' approved quotes"""
+
+    def test_range_per_unit_and_currency(self, client, add_item):
+        """Test quotes are compared per unit, in the base currency"""
+        add_item("Parquet roble", 10, quotes=[("400.00", "EUR"), ("500.00", "EUR")])
+        add_item("Parquet de roble", 20, quotes=[("900.00", "EUR")])
+        # 0.92 EUR per USD: 50.00 per square meter
+        add_item("Parquet roble natural", 2, quotes=[("108.70", "USD")])
+        # Same words, different unit: not comparable
+        add_item("Parquet roble", 1, unit="hour", quotes=[("9000.00", "EUR")])
+        floor = add_item("Parquet roble claro", 30)
+
+        result = estimate(client, floor, min_score=0.1)
+
+        assert result["currency"] == "EUR"
+        assert result["sample_size"] == 4
+        assert result["similar_items"] == 3
+        unit_price = {k: Decimal(v) for k, v in result["unit_price"].items()}
+        assert Decimal("40") <= unit_price["low"] <= unit_price["estimate"]
+        assert unit_price["estimate"] <= unit_price["high"] <= Decimal("50")
+        assert Decimal(result["total"]["estimate"]) == pytest.approx(
+            unit_price["estimate"] * 30, abs=Decimal("0.5")
+        )
+        for name, interval in result["intervals"].items():
+            assert Decimal(interval["lower"]) <= Decimal(interval["upper"])
+            assert Decimal(interval["lower"]) <= Decimal(result["total"][name])
+
+    def test_no_history(self, client, add_item):
+        """Test an item with nothing comparable gets an empty estimate"""
+        lamp = add_item("Lámpara de pie")
+
+        result = estimate(client, lamp)
+
+        assert result["sample_size"] == 0
+        assert result["total"] is None
+        response = client.post("/api/v1/items/999/price-estimate")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cached_until_quotes_change(self, client, add_item):
+        """Test a new quote on a similar item refreshes the estimate"""
+        tiles = add_item("Alicatado baño", quotes=[("30.00", "EUR")])
+        target = add_item("Alicatado baño cocina")
+        first = estimate(client, target)
+        assert first["sample_size"] == 1
+        assert estimate(client, target) == first
+
+        client.post(
+            "/api/v1/quotes/",
+            json={
+                "price": "40.00",
+                "currency": "EUR",
+                "status": "approved",
+                "item_id": tiles,
+                "craftsman_id": 1,
+            },
+        )
+
+        assert estimate(client, target)["sample_size"] == 2
+
+    def test_new_similar_item_refreshes_estimate(self, client, add_item):
+        """Test a cached estimate takes in items created after it"""
+        add_item("Pintura salón", quotes=[("12.00", "EUR")])
+        target = add_item("Pintura salón comedor")
+        assert estimate(client, target)["sample_size"] == 1
+
+        add_item("Pintura salón grande", quotes=[("14.00", "EUR")])
+
+        assert estimate(client, target)["sample_size"] == 2
+
+    def test_item_notifications_flush(self):
+        """Test another process's item change drops every estimate"""
+        cache = EstimateCache()
+        cache.put((1,), {"sample_size": 1}, [1, 2])
+
+        cache.invalidate("items", 3)
+
+        assert cache.get((1,)) is None
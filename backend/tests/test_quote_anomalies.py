@@ -0,0 +1,154 @@
+"""Tests for quote price anomaly detection"""
+
+import pytest
+from fastapi import status
+from sqlalchemy import select, text
+
+from app.models import Quote, QuoteAnomaly, QuotePriceStats, Unit
+from app.services.anomaly import quote_anomaly_service
+
+# Typical unit prices of 40 to 51 per square meter
+USUAL_PRICES = [f"{400 + 10 * n}.00" for n in range(12)]
+
+
+@pytest.fixture
+def workshop(client, db_session, campaign_id, create_quote):
+    class Workshop:
+        carpenter = client.post(
+            "/api/v1/craftsmen/",
+            json={"name": "Ana", "specialties": "Carpintería, Ebanistería"},
+        ).json()["id"]
+        floor = client.post(
+            "/api/v1/items/",
+            json={
+                "name": "Tarima",
+                "quantity": 10,
+                "unit": "square meter",
+                "campaign_id": campaign_id,
+            },
+        ).json()["id"]
+
+        def history(self, prices):
+            # Written directly, as quotes from before detection existed
+            quotes = [
+                Quote(price=price, item_id=self.floor, craftsman_id=self.carpenter)
+                for price in prices
+            ]
+            db_session.add_all(quotes)
+            db_session.commit()
+            return [quote.id for quote in quotes]
+
+        def quote(self, price):
+            return create_quote(self.floor, self.carpenter, price)
+
+    return Workshop()
+
+
+def anomalies(client, **params):
+    response = client.get("/api/v1/quotes/anomalies", params=params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+class TestQuoteAnomalies:
+    """Test quotes are scored against their specialty and unit's statistics"""
+
+    def test_new_quotes_are_checked(self, client, db_session, workshop):
+        """Test creating and updating a quote flags and clears it"""
+        workshop.history(USUAL_PRICES)
+        assert quote_anomaly_service.refresh_stats(db_session) == 1
+        stats = db_session.scalar(select(QuotePriceStats))
+        assert (stats.specialty, stats.unit, stats.samples) == (
+            "carpintería",
+            Unit.SQUARE_METER,
+            12,
+        )
+
+        outlier = workshop.quote("5000.00")
+        workshop.quote("450.00")
+
+        [anomaly] = anomalies(client)
+        assert anomaly["quote_id"] == outlier
+        assert anomaly["unit"] == "square meter"
+        assert anomaly["unit_price"] == 500.0
+        assert 40 < anomaly["typical_unit_price"] < 51
+        assert anomaly["score"] > 3.5
+        assert anomalies(client, specialty="Carpintería", unit="square meter")
+        assert anomalies(client, specialty="fontanería") == []
+        assert anomalies(client, min_score=1000) == []
+
+        client.put(f"/api/v1/quotes/{outlier}", json={"price": "460.00"})
+        assert anomalies(client) == []
+
+    def test_backfill_in_chunks(self, client, db_session, workshop):
+        """Test the history is rescored chunk by chunk, both ways"""
+        usual = workshop.history(USUAL_PRICES)
+        high, low = workshop.history(["9000.00", "20.00"])
+        # Flagged before the prices were corrected
+        db_session.add(
+            QuoteAnomaly(
+                quote_id=usual[0],
+                specialty="carpintería",
+                unit=Unit.SQUARE_METER,
+                unit_price=1.0,
+                typical_unit_price=45.0,
+                score=-9.0,
+            )
+        )
+        db_session.commit()
+
+        assert quote_anomaly_service.backfill(db_session, chunk_size=5) == 2
+
+        scores = {a["quote_id"]: a["score"] for a in anomalies(client)}
+        assert scores.keys() == {high, low}
+        assert scores[high] > 3.5 and scores[low] < -3.5
+
+    def test_small_groups_are_not_judged(self, client, db_session, workshop):
+        """Test a group needs enough quotes before anything is flagged"""
+        workshop.history(USUAL_PRICES[:3])
+        quote_anomaly_service.refresh_stats(db_session)
+
+        workshop.quote("5000.00")
+
+        assert anomalies(client) == []
+
+    def test_long_specialty_is_cut_to_fit(self, client, db_session, workshop):
+        """Test a first specialty longer than the stats key does not fail"""
+        long_specialty = "Restauración de " + "carpintería histórica " * 10
+        client.put(
+            f"/api/v1/craftsmen/{workshop.carpenter}",
+            json={"specialties": long_specialty.strip()},
+        )
+        workshop.history(USUAL_PRICES)
+
+        assert quote_anomaly_service.refresh_stats(db_session) == 1
+        assert len(db_session.scalar(select(QuotePriceStats.specialty))) == 100
+        outlier = workshop.quote("5000.00")
+        assert quote_anomaly_service.backfill(db_session) == 1
+
+        [anomaly] = anomalies(client, specialty=long_specialty)
+        assert anomaly["quote_id"] == outlier
+
+    def test_scoring_errors_do_not_fail_the_write(
+        self, client, db_session, workshop, monkeypatch
+    ):
+        """Test a quote is still saved when scoring it hits a database error"""
+
+        def fail(db, rows, existing):
+            db.execute(text("SELECT 1 / 0"))
+
+        monkeypatch.setattr(quote_anomaly_service, "_store", fail)
+
+        response = client.post(
+            "/api/v1/quotes/",
+            json={
+                "price": "5000.00",
+                "currency": "EUR",
+                "item_id": workshop.floor,
+                "craftsman_id": workshop.carpenter,
+            },
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["price"] == "5000.00"
+        assert db_session.get(Quote, response.json()["id"])
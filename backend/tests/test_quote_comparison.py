@@ -0,0 +1,191 @@
+"""Tests for quote comparison endpoints"""
+
+from fastapi import status
+
+
+class TestQuoteComparison:
+    """Test item and campaign quote comparison"""
+
+    def setup_dependencies(
+        self,
+        client,
+        sample_user_data,
+        sample_client_data,
+        sample_craftsman_data,
+        sample_project_data,
+        sample_campaign_data,
+        sample_item_data,
+    ):
+        """Create a campaign with one item and three craftsmen"""
+        client.post("/api/v1/users/", json=sample_user_data)
+        client_id = client.post("/api/v1/clients/", json=sample_client_data).json()[
+            "id"
+        ]
+
+        craftsman_ids = []
+        for name in ["Alba Fuster", "Jordi Puig", "Marta Soler"]:
+            sample_craftsman_data["name"] = name
+            response = client.post("/api/v1/craftsmen/", json=sample_craftsman_data)
+            craftsman_ids.append(response.json()["id"])
+
+        sample_project_data["client_id"] = client_id
+        project_id = client.post("/api/v1/projects/", json=sample_project_data).json()[
+            "id"
+        ]
+        sample_campaign_data["project_id"] = project_id
+        campaign_id = client.post(
+            "/api/v1/campaigns/", json=sample_campaign_data
+        ).json()["id"]
+        sample_item_data["campaign_id"] = campaign_id
+        item_id = client.post("/api/v1/items/", json=sample_item_data).json()["id"]
+
+        return campaign_id, item_id, craftsman_ids
+
+    def create_quote(self, client, item_id, craftsman_id, price, currency, **extra):
+        """Create a quote and return its ID"""
+        payload = {
+            "price": price,
+            "currency": currency,
+            "item_id": item_id,
+            "craftsman_id": craftsman_id,
+            **extra,
+        }
+        response = client.post("/api/v1/quotes/", json=payload)
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["id"]
+
+    def test_item_comparison_ranks_by_normalized_price(
+        self,
+        client,
+        sample_user_data,
+        sample_client_data,
+        sample_craftsman_data,
+        sample_project_data,
+        sample_campaign_data,
+        sample_item_data,
+    ):
+        """Test quotes are ranked across currencies with deltas from the best"""
+        campaign_id, item_id, craftsman_ids = self.setup_dependencies(
+            client,
+            sample_user_data,
+            sample_client_data,
+            sample_craftsman_data,
+            sample_project_data,
+            sample_campaign_data,
+            sample_item_data,
+        )
+        eur_quote = self.create_quote(
+            client, item_id, craftsman_ids[0], "150.00", "EUR"
+        )
+        usd_quote = self.create_quote(
+            client, item_id, craftsman_ids[1], "100.00", "USD"
+        )
+        gbp_quote = self.create_quote(
+            client, item_id, craftsman_ids[2], "200.00", "GBP"
+        )
+
+        response = client.get(f"/api/v1/items/{item_id}/quote-comparison")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["item_id"] == item_id
+        assert data["base_currency"] == "EUR"
+        assert data["quote_count"] == 3
+        assert [q["quote_id"] for q in data["quotes"]] == [
+            usd_quote,
+            eur_quote,
+            gbp_quote,
+        ]
+        assert [q["rank"] for q in data["quotes"]] == [1, 2, 3]
+        assert data["min_price"] == "92.00"
+        assert data["median_price"] == "150.00"
+        assert data["max_price"] == "234.00"
+        assert data["spread"] == "142.00"
+        assert data["savings_vs_estimate"] == "8.00"
+        assert data["quotes"][0]["delta_from_best"] == "0.00"
+        assert data["quotes"][1]["delta_from_best"] == "58.00"
+
+    def test_item_comparison_excludes_closed_quotes(
+        self,
+        client,
+        sample_user_data,
+        sample_client_data,
+        sample_craftsman_data,
+        sample_project_data,
+        sample_campaign_data,
+        sample_item_data,
+    ):
+        """Test rejected quotes are only compared on request"""
+        campaign_id, item_id, craftsman_ids = self.setup_dependencies(
+            client,
+            sample_user_data,
+            sample_client_data,
+            sample_craftsman_data,
+            sample_project_data,
+            sample_campaign_data,
+            sample_item_data,
+        )
+        self.create_quote(client, item_id, craftsman_ids[0], "150.00", "EUR")
+        self.create_quote(
+            client, item_id, craftsman_ids[1], "50.00", "EUR", status="rejected"
+        )
+
+        data = client.get(f"/api/v1/items/{item_id}/quote-comparison").json()
+        assert data["quote_count"] == 1
+        assert data["min_price"] == "150.00"
+
+        data = client.get(
+            f"/api/v1/items/{item_id}/quote-comparison?include_closed=true"
+        ).json()
+        assert data["quote_count"] == 2
+        assert data["min_price"] == "50.00"
+
+    def test_item_comparison_not_found(self, client):
+        """Test comparison for a missing item"""
+        response = client.get("/api/v1/items/999/quote-comparison")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Item not found"
+
+    def test_campaign_comparison_totals(
+        self,
+        client,
+        sample_user_data,
+        sample_client_data,
+        sample_craftsman_data,
+        sample_project_data,
+        sample_campaign_data,
+        sample_item_data,
+    ):
+        """Test campaign comparison includes unquoted items and totals"""
+        campaign_id, item_id, craftsman_ids = self.setup_dependencies(
+            client,
+            sample_user_data,
+            sample_client_data,
+            sample_craftsman_data,
+            sample_project_data,
+            sample_campaign_data,
+            sample_item_data,
+        )
+        sample_item_data["name"] = "Unquoted Item"
+        sample_item_data["estimated_cost"] = "40.00"
+        unquoted_id = client.post("/api/v1/items/", json=sample_item_data).json()["id"]
+        self.create_quote(client, item_id, craftsman_ids[0], "90.00", "EUR")
+        self.create_quote(client, item_id, craftsman_ids[1], "120.00", "EUR")
+
+        response = client.get(f"/api/v1/campaigns/{campaign_id}/quote-comparison")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["item_id"] for i in data["items"]] == [item_id, unquoted_id]
+        assert data["items"][1]["quote_count"] == 0
+        assert data["items"][1]["quotes"] == []
+        assert data["total_best_price"] == "90.00"
+        assert data["total_estimated_cost"] == "140.00"
+        assert data["total_savings_vs_estimate"] == "10.00"
+
+    def test_campaign_comparison_not_found(self, client):
+        """Test comparison for a missing campaign"""
+        response = client.get("/api/v1/campaigns/999/quote-comparison")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,78 @@
+"""Tests for the quote expiry sweep"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models import Quote, QuoteStatus, StatusHistory
+from app.services.quote import quote_service
+
+TODAY = date(2026, 5, 1)
+
+
+@pytest.fixture
+def add_quote(db_session, item_id, craftsman_id):
+    def add(valid_until, status=QuoteStatus.PENDING):
+        # Written directly: the API only accepts validity dates in the future
+        quote = Quote(
+            price=100,
+            status=status,
+            valid_until=valid_until and date.fromisoformat(valid_until),
+            item_id=item_id,
+            craftsman_id=craftsman_id,
+        )
+        db_session.add(quote)
+        db_session.commit()
+        return quote.id
+
+    return add
+
+
+class TestQuoteExpiry:
+    """Test pending quotes past their validity are expired in chunks"""
+
+    def test_overdue_pending_quotes_expire(self, add_quote, db_session):
+        """Test only pending quotes valid before today are expired"""
+        overdue = [add_quote("2026-03-01"), add_quote("2026-04-30")]
+        overdue.append(add_quote("2026-04-15"))
+        still_valid = add_quote("2026-05-01")
+        approved = add_quote("2026-01-01", status=QuoteStatus.APPROVED)
+        open_ended = add_quote(None)
+
+        assert quote_service.expire_overdue(db_session, today=TODAY, chunk_size=2) == 3
+        assert quote_service.expire_overdue(db_session, today=TODAY) == 0
+
+        statuses = dict(db_session.execute(select(Quote.id, Quote.status)).all())
+        assert {id for id, s in statuses.items() if s == QuoteStatus.EXPIRED} == set(
+            overdue
+        )
+        assert statuses[still_valid] == QuoteStatus.PENDING
+        assert statuses[approved] == QuoteStatus.APPROVED
+        assert statuses[open_ended] == QuoteStatus.PENDING
+        assert {q.id for q in quote_service.get_pending(db_session)} == {
+            still_valid,
+            open_ended,
+        }
+        # The status history trigger saw every expiry
+        assert sorted(
+            db_session.scalars(
+                select(StatusHistory.entity_id).where(
+                    StatusHistory.entity == "quotes",
+                    StatusHistory.to_status == "EXPIRED",
+                )
+            )
+        ) == sorted(overdue)
+
+    def test_locked_quotes_are_skipped(self, add_quote, db_session):
+        """Test a quote locked by another transaction is left for the next run"""
+        locked, free = add_quote("2026-03-01"), add_quote("2026-03-02")
+        with db_session.get_bind().connect() as other:
+            other.execute(
+                text("SELECT id FROM quotes WHERE id = :id FOR UPDATE"), {"id": locked}
+            )
+            assert quote_service.expire_overdue(db_session, today=TODAY) == 1
+            other.rollback()
+
+        assert db_session.get(Quote, free).status == QuoteStatus.EXPIRED
+        assert quote_service.expire_overdue(db_session, today=TODAY) == 1
@@ -0,0 +1,144 @@
+"""Tests for craftsman reliability scoring"""
+
+import math
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from app.models import CraftsmanScore, MessageDirection, MessageStatus
+from app.models.whatsapp_message import WhatsAppMessage
+from app.services import reliability
+from app.services.reliability import reliability_service
+
+
+@pytest.fixture
+def workshop(client, db_session, campaign_id, create_quote):
+    class Workshop:
+        def craftsman(self, name, specialties="Carpintería, Ebanistería"):
+            return client.post(
+                "/api/v1/craftsmen/", json={"name": name, "specialties": specialties}
+            ).json()["id"]
+
+        def item(self, name):
+            return client.post(
+                "/api/v1/items/", json={"name": name, "campaign_id": campaign_id}
+            ).json()["id"]
+
+        def quote(self, craftsman_id, item_id, price, quote_status="pending"):
+            return create_quote(item_id, craftsman_id, price, quote_status=quote_status)
+
+        def request_sent(self, craftsman_id, hours_ago):
+            sent_at = datetime.now(UTC) - timedelta(hours=hours_ago)
+            db_session.add(
+                WhatsAppMessage(
+                    wa_message_id=f"wamid.{craftsman_id}.{hours_ago}",
+                    direction=MessageDirection.OUTBOUND,
+                    phone="34600000000",
+                    message_type="template",
+                    status=MessageStatus.SENT,
+                    sent_at=sent_at,
+                    craftsman_id=craftsman_id,
+                )
+            )
+            db_session.commit()
+
+    return Workshop()
+
+
+class TestReliability:
+    """Test scores are aggregated per craftsman and compared within specialties"""
+
+    def test_full_refresh(self, client, db_session, workshop):
+        """Test every craftsman is scored from their quotes and requests"""
+        prompt, slow = workshop.craftsman("Ana"), workshop.craftsman("Bruno")
+        idle = workshop.craftsman("Carla", "Fontanería")
+        workshop.request_sent(prompt, hours_ago=2)
+        workshop.request_sent(slow, hours_ago=96)
+        door, table = workshop.item("Puerta"), workshop.item("Mesa")
+        workshop.quote(prompt, door, "100.00", "approved")
+        workshop.quote(prompt, table, "200.00", "approved")
+        workshop.quote(slow, door, "300.00", "rejected")
+        workshop.quote(slow, table, "600.00", "expired")
+
+        assert reliability_service.refresh(db_session, full=True) == 3
+
+        scores = {s.craftsman_id: s for s in db_session.query(CraftsmanScore)}
+        assert scores[prompt].specialty == "carpintería"
+        assert (scores[prompt].approved, scores[prompt].approval_rate) == (2, 1.0)
+        assert (scores[slow].expired, scores[slow].expiry_rate) == (1, 0.5)
+        assert scores[prompt].turnaround_seconds == pytest.approx(7200, abs=60)
+        assert scores[slow].turnaround_seconds == pytest.approx(96 * 3600, abs=60)
+        # Half and one and a half times the item medians
+        assert scores[prompt].price_deviation == pytest.approx(math.log(0.5))
+        assert scores[slow].price_deviation == pytest.approx(math.log(1.5))
+        assert scores[prompt].price_deviation_z == pytest.approx(-1)
+        assert scores[idle].quotes == 0
+        assert scores[idle].price_deviation_z is None
+
+        response = client.get("/api/v1/craftsmen/reliability")
+        assert response.status_code == status.HTTP_200_OK
+        assert [s["craftsman_id"] for s in response.json()] == [prompt, idle, slow]
+        response = client.get(
+            "/api/v1/craftsmen/reliability", params={"specialty": "Fontanería"}
+        )
+        assert [s["craftsman_id"] for s in response.json()] == [idle]
+
+    def test_incremental_refresh(self, client, db_session, workshop, monkeypatch):
+        """Test only craftsmen affected by changed quotes are rescored"""
+        monkeypatch.setattr(reliability, "INCREMENTAL_OVERLAP", timedelta(0))
+        first, second = workshop.craftsman("Ana"), workshop.craftsman("Bruno")
+        other = workshop.craftsman("Carla")
+        door, lamp = workshop.item("Puerta"), workshop.item("Lámpara")
+        workshop.quote(first, door, "100.00")
+        workshop.quote(second, door, "100.00")
+        workshop.quote(other, lamp, "50.00")
+        assert reliability_service.refresh(db_session) == 3
+        assert reliability_service.refresh(db_session) == 0
+
+        # A new price for the door rescores everyone who quoted it
+        workshop.quote(first, door, "400.00")
+
+        assert reliability_service.refresh(db_session) == 2
+        deviations = dict(
+            db_session.execute(
+                select(CraftsmanScore.craftsman_id, CraftsmanScore.price_deviation)
+            ).all()
+        )
+        assert deviations[first] > 0 and deviations[second] == 0
+        response = client.post("/api/v1/craftsmen/reliability/refresh")
+        assert response.json() == {"rescored": 0}
+
+    def test_long_specialty_is_cut_to_fit(self, client, db_session, workshop):
+        """Test a first specialty longer than the score column does not fail"""
+        long_specialty = "Restauración de " + "carpintería histórica " * 10
+        ana = workshop.craftsman("Ana", long_specialty.strip() + ", Ebanistería")
+        other = workshop.craftsman("Bruno")
+        workshop.quote(ana, workshop.item("Puerta"), "100.00", "approved")
+
+        assert reliability_service.refresh(db_session, full=True) == 2
+
+        score = db_session.get(CraftsmanScore, ana)
+        assert len(score.specialty) == 100
+        assert long_specialty.lower().startswith(score.specialty)
+        assert db_session.get(CraftsmanScore, other).specialty == "carpintería"
+        response = client.get(
+            "/api/v1/craftsmen/reliability", params={"specialty": long_specialty}
+        )
+        assert [s["craftsman_id"] for s in response.json()] == [ana]
+        response = client.get(f"/api/v1/craftsmen/{ana}/reliability")
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_score_of_one_craftsman(self, client, workshop):
+        """Test a craftsman missing from the batch is scored on demand"""
+        craftsman = workshop.craftsman("Ana")
+        workshop.quote(craftsman, workshop.item("Puerta"), "100.00", "approved")
+
+        response = client.get(f"/api/v1/craftsmen/{craftsman}/reliability")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["quotes"] == 1
+        assert 0 <= response.json()["reliability"] <= 100
+        response = client.get("/api/v1/craftsmen/999/reliability")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
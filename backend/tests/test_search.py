@@ -0,0 +1,155 @@
+"""Tests for full-text message search"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from app.models import (
+    Campaign,
+    Client,
+    Craftsman,
+    Item,
+    MessageDirection,
+    Project,
+    Quote,
+    User,
+    WhatsAppMessage,
+)
+
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def corpus(db_session):
+    """Messages and quotes from two craftsmen on two projects"""
+    user = User(email="studio@example.com", hashed_password="x", full_name="Studio")
+    client = Client(name="Cliente")
+    puig = Craftsman(name="Taller Puig", specialties="Carpentry")
+    soler = Craftsman(name="Marta Soler", specialties="Ironwork")
+    casa = Project(name="Casa Puig", user=user, client=client)
+    loft = Project(name="Loft Gràcia", user=user, client=client)
+    item = Item(
+        name="Armario", quantity=1, campaign=Campaign(name="Cocina", project=casa)
+    )
+
+    texts = [
+        (puig, casa, "Los armarios de roble estarán terminados el viernes"),
+        (puig, casa, "Te envío el presupuesto del armario empotrado"),
+        (soler, loft, "La barandilla de hierro ya está instalada"),
+        (soler, loft, "Encara estem treballant en la barana"),
+        (puig, loft, "Armario de roble macizo para el dormitorio, roble roble"),
+    ]
+    messages = [
+        WhatsAppMessage(
+            wa_message_id=f"wamid.{n}",
+            direction=MessageDirection.INBOUND,
+            phone="34600111222",
+            message_type="text",
+            body=body,
+            sent_at=NOW - timedelta(days=n),
+            craftsman=craftsman,
+            project=project,
+        )
+        for n, (craftsman, project, body) in enumerate(texts)
+    ]
+    quote = Quote(
+        item=item,
+        craftsman=puig,
+        price=Decimal("1200.00"),
+        description="Armario a medida en roble",
+        whatsapp_message="Precio final del armario: 1.200 €",
+    )
+    db_session.add_all([*messages, quote])
+    db_session.commit()
+    return {"messages": messages, "quote": quote, "puig": puig, "loft": loft}
+
+
+class TestMessageSearch:
+    """Test GET /api/v1/search/messages"""
+
+    def test_stemmed_match_across_messages_and_quotes(self, client, corpus):
+        """Test singular and plural forms match and quotes are included"""
+        response = client.get("/api/v1/search/messages", params={"q": "armarios"})
+
+        assert response.status_code == status.HTTP_200_OK
+        items = response.json()["items"]
+        assert {(hit["source"], hit["id"]) for hit in items} == {
+            ("message", corpus["messages"][0].id),
+            ("message", corpus["messages"][1].id),
+            ("message", corpus["messages"][4].id),
+            ("quote", corpus["quote"].id),
+        }
+        ranks = [hit["rank"] for hit in items]
+        assert ranks == sorted(ranks, reverse=True)
+
+    def test_snippet_highlights_match(self, client, corpus):
+        """Test ts_headline marks the matched words"""
+        items = client.get(
+            "/api/v1/search/messages", params={"q": "barandilla"}
+        ).json()["items"]
+
+        assert len(items) == 1
+        assert "<mark>barandilla</mark>" in items[0]["snippet"]
+
+    def test_catalan_words_match_exactly(self, client, corpus):
+        """Test words unknown to the Spanish stemmer are found as written"""
+        items = client.get(
+            "/api/v1/search/messages", params={"q": "treballant barana"}
+        ).json()["items"]
+
+        assert [hit["id"] for hit in items] == [corpus["messages"][3].id]
+
+    def test_filters(self, client, corpus):
+        """Test craftsman, project and date filters"""
+        params = {
+            "q": "roble",
+            "craftsman_id": corpus["puig"].id,
+            "project_id": corpus["loft"].id,
+        }
+        items = client.get("/api/v1/search/messages", params=params).json()["items"]
+        assert [hit["id"] for hit in items] == [corpus["messages"][4].id]
+
+        params = {"q": "roble", "date_from": (NOW - timedelta(days=1)).isoformat()}
+        items = client.get("/api/v1/search/messages", params=params).json()["items"]
+        assert ("message", corpus["messages"][0].id) in {
+            (hit["source"], hit["id"]) for hit in items
+        }
+        assert corpus["messages"][4].id not in [
+            hit["id"] for hit in items if hit["source"] == "message"
+        ]
+
+    @pytest.mark.parametrize("sort", ["relevance", "recent"])
+    def test_keyset_pagination(self, client, corpus, sort):
+        """Test pages do not overlap and cover every hit"""
+        params = {"q": "armario", "sort": sort, "limit": 1}
+        everything = client.get(
+            "/api/v1/search/messages", params={**params, "limit": 100}
+        ).json()["items"]
+
+        seen = []
+        cursor = None
+        while True:
+            page = client.get(
+                "/api/v1/search/messages",
+                params={**params, "cursor": cursor} if cursor else params,
+            ).json()
+            seen += page["items"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == everything
+        if sort == "recent":
+            dates = [hit["sent_at"] for hit in seen]
+            assert dates == sorted(dates, reverse=True)
+
+    def test_invalid_cursor(self, client, corpus):
+        """Test a malformed cursor is rejected"""
+        response = client.get(
+            "/api/v1/search/messages", params={"q": "roble", "cursor": "bm9wZQ=="}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Invalid cursor"
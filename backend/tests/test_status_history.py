@@ -0,0 +1,203 @@
+"""Tests for the status history log and time-in-status analytics"""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import DBAPIError
+
+from app.models import StatusCurrent, StatusHistory
+from app.services.status_history import bucket_upper_bound, status_history_service
+
+
+class TestStatusHistory:
+    """Test status transitions are logged by the database"""
+
+    def test_transitions_are_recorded(self, client, project):
+        """Test creation and every status change appear in the history"""
+        url = f"/api/v1/projects/{project['id']}"
+        client.put(url, json={"status": "active"})
+        client.put(url, json={"name": "Renamed"})  # not a status change
+        client.put(url, json={"status": "completed"})
+
+        response = client.get(
+            f"/api/v1/analytics/status-history/projects/{project['id']}"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        history = response.json()
+        assert [(h["from_status"], h["to_status"]) for h in history] == [
+            (None, "planning"),
+            ("planning", "active"),
+            ("active", "completed"),
+        ]
+        assert history[0]["seconds_in_previous"] is None
+        assert history[1]["seconds_in_previous"] >= 0
+
+    def test_history_is_append_only(self, client, db_session, project):
+        """Test history rows cannot be rewritten or deleted"""
+        with pytest.raises(DBAPIError, match="append-only"):
+            db_session.execute(update(StatusHistory).values(to_status="ACTIVE"))
+        db_session.rollback()
+
+    def test_monthly_partitions(self, db_session):
+        """Test partitions are created ahead and receive their month's rows"""
+        names = status_history_service.ensure_partitions(
+            db_session, today=date(2026, 11, 15)
+        )
+
+        assert names == [
+            "status_history_p2026_11",
+            "status_history_p2026_12",
+            "status_history_p2027_01",
+        ]
+        assert (
+            status_history_service.ensure_partitions(
+                db_session, today=date(2026, 11, 1)
+            )
+            == names
+        )
+        db_session.add(
+            StatusHistory(
+                entity="tasks",
+                entity_id=1,
+                to_status="TODO",
+                changed_at=datetime(2026, 12, 24, tzinfo=UTC),
+            )
+        )
+        db_session.commit()
+        partition = db_session.execute(
+            text("SELECT tableoid::regclass::text FROM status_history")
+        ).scalar_one()
+        assert partition == "status_history_p2026_12"
+
+    def test_rows_in_the_default_partition_are_moved(self, db_session):
+        """Test a month missed by the job still gets its partition later"""
+
+        def add(changed_at):
+            db_session.add(
+                StatusHistory(
+                    entity="tasks", entity_id=1, to_status="TODO", changed_at=changed_at
+                )
+            )
+            db_session.commit()
+
+        def partitions():
+            return db_session.execute(
+                text(
+                    "SELECT tableoid::regclass::text, count(*) FROM status_history "
+                    "GROUP BY 1 ORDER BY 1"
+                )
+            ).all()
+
+        add(datetime(2026, 11, 20, tzinfo=UTC))
+        add(datetime(2026, 12, 24, tzinfo=UTC))
+        add(datetime(2030, 1, 1, tzinfo=UTC))
+        assert partitions() == [("status_history_default", 3)]
+
+        names = status_history_service.ensure_partitions(
+            db_session, today=date(2026, 11, 15)
+        )
+
+        assert names == [
+            "status_history_p2026_11",
+            "status_history_p2026_12",
+            "status_history_p2027_01",
+        ]
+        assert partitions() == [
+            ("status_history_default", 1),
+            ("status_history_p2026_11", 1),
+            ("status_history_p2026_12", 1),
+        ]
+        # The default partition is attached again
+        add(datetime(2031, 1, 1, tzinfo=UTC))
+        assert partitions()[0] == ("status_history_default", 2)
+
+    def test_a_failed_month_does_not_stop_the_others(self, db_session, monkeypatch):
+        """Test the months after one that cannot be created are still created"""
+        create = status_history_service._create_partition
+
+        def create_or_fail(db, name, start, end):
+            if name == "status_history_p2026_12":
+                db.execute(text("SELECT 1 / 0"))
+            create(db, name, start, end)
+
+        monkeypatch.setattr(status_history_service, "_create_partition", create_or_fail)
+
+        assert status_history_service.ensure_partitions(
+            db_session, today=date(2026, 11, 15)
+        ) == ["status_history_p2026_11", "status_history_p2027_01"]
+
+
+class TestStatusAnalytics:
+    """Test analytics are answered from rollups and current statuses"""
+
+    def test_time_in_status(self, client, db_session):
+        """Test averages and p90 come from the rolled-up histograms"""
+        day = datetime(2026, 10, 1, 12, tzinfo=UTC)
+        hours = [1, 1, 2, 2, 3, 3, 4, 4, 5, 48]
+        db_session.add_all(
+            StatusHistory(
+                entity="quotes",
+                entity_id=n,
+                from_status="PENDING",
+                to_status="APPROVED",
+                entered_at=day - timedelta(hours=duration),
+                changed_at=day,
+            )
+            for n, duration in enumerate(hours)
+        )
+        db_session.commit()
+
+        assert status_history_service.rollup(db_session, since=day.date()) > 0
+        # Rerunning replaces the day's counts instead of adding to them
+        status_history_service.rollup(db_session, since=day.date())
+
+        response = client.get(
+            "/api/v1/analytics/status-times", params={"entity": "quotes"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        [pending] = response.json()
+        assert pending["status"] == "pending"
+        assert pending["transitions"] == 10
+        assert pending["avg_seconds"] == pytest.approx(7.3 * 3600)
+        # The 9th fastest took 5 hours; p90 is that bucket's upper bound
+        assert 5 * 3600 <= pending["p90_seconds"] <= 5 * 3600 * 2**0.25
+        assert pending["p90_seconds"] in [bucket_upper_bound(b) for b in range(80)]
+
+        response = client.get(
+            "/api/v1/analytics/status-times",
+            params={"entity": "quotes", "date_from": "2026-10-02"},
+        )
+        assert response.json() == []
+
+    def test_bottlenecks(self, client, db_session, project, sample_task_data):
+        """Test the rows waiting longest in an open status come first"""
+        sample_task_data["project_id"] = project["id"]
+        task = client.post("/api/v1/tasks/", json=sample_task_data).json()
+        done = client.post("/api/v1/tasks/", json=sample_task_data).json()
+        client.put(f"/api/v1/tasks/{done['id']}", json={"status": "completed"})
+        db_session.execute(
+            update(StatusCurrent)
+            .where(StatusCurrent.entity == "tasks")
+            .values(since=datetime.now(UTC) - timedelta(days=3))
+        )
+        db_session.commit()
+
+        response = client.get("/api/v1/analytics/bottlenecks")
+
+        assert response.status_code == status.HTTP_200_OK
+        bottlenecks = response.json()
+        assert [(b["entity"], b["entity_id"]) for b in bottlenecks] == [
+            ("tasks", task["id"]),
+            ("projects", project["id"]),
+        ]
+        assert bottlenecks[0]["status"] == "todo"
+        assert bottlenecks[0]["seconds_in_status"] >= 3 * 86400
+
+        client.delete(f"/api/v1/tasks/{task['id']}")
+        assert db_session.scalars(
+            select(StatusCurrent.entity_id).where(StatusCurrent.entity == "tasks")
+        ).all() == [done["id"]]
@@ -0,0 +1,114 @@
+"""Tests for the timeline endpoint"""
+
+from datetime import date
+
+import pytest
+from fastapi import status
+from sqlalchemy import text, update
+
+from app.models import Project
+from app.models.timeline import date_span
+
+
+@pytest.fixture
+def client_id(client, sample_user_data, sample_client_data):
+    client.post("/api/v1/users/", json=sample_user_data)
+    return client.post("/api/v1/clients/", json=sample_client_data).json()["id"]
+
+
+def create_project(client, client_id, name, start_date, end_date):
+    response = client.post(
+        "/api/v1/projects/",
+        json={
+            "name": name,
+            "client_id": client_id,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["id"]
+
+
+def timeline(client, date_from, date_to, **params):
+    response = client.get(
+        "/api/v1/timeline", params={"from": date_from, "to": date_to, **params}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+class TestTimeline:
+    """Test the window overlap query over projects, campaigns and tasks"""
+
+    def test_projects_overlapping_the_window(self, client, db_session, client_id):
+        """Test bars are matched by overlap, with open ends running on"""
+        spring = create_project(client, client_id, "Spring", "2026-03-01", "2026-05-31")
+        summer = create_project(client, client_id, "Summer", "2026-06-01", "2026-08-31")
+        ongoing = create_project(client, client_id, "Ongoing", "2026-01-15", None)
+        create_project(client, client_id, "Undated", None, None)
+
+        def names(date_from, date_to):
+            return {p["id"] for p in timeline(client, date_from, date_to)["projects"]}
+
+        assert names("2026-05-31", "2026-06-01") == {spring, summer, ongoing}
+        assert names("2026-09-01", "2027-12-31") == {ongoing}
+        assert names("2025-01-01", "2026-01-14") == set()
+
+        # An end before the start is clamped rather than failing the write
+        db_session.execute(
+            update(Project)
+            .where(Project.id == summer)
+            .values(end_date=date(2026, 1, 1))
+        )
+        db_session.commit()
+        assert names("2026-06-01", "2026-06-01") == {summer, ongoing}
+
+    def test_campaigns_and_tasks(
+        self, client, client_id, sample_campaign_data, sample_task_data
+    ):
+        """Test campaign bars and task due dates are filtered too"""
+        project_id = create_project(client, client_id, "P", "2026-01-01", None)
+        sample_campaign_data.update(
+            project_id=project_id, start_date="2026-02-01", end_date="2026-02-28"
+        )
+        campaign = client.post("/api/v1/campaigns/", json=sample_campaign_data).json()
+        sample_task_data.update(project_id=project_id, due_date="2026-02-14")
+        task = client.post("/api/v1/tasks/", json=sample_task_data).json()
+        sample_task_data["due_date"] = "2026-04-01"
+        client.post("/api/v1/tasks/", json=sample_task_data)
+
+        data = timeline(client, "2026-02-10", "2026-02-20", project_id=project_id)
+
+        assert [c["id"] for c in data["campaigns"]] == [campaign["id"]]
+        assert [t["id"] for t in data["tasks"]] == [task["id"]]
+        assert timeline(client, "2026-02-10", "2026-02-20", project_id=999) == {
+            "date_from": "2026-02-10",
+            "date_to": "2026-02-20",
+            "projects": [],
+            "campaigns": [],
+            "tasks": [],
+        }
+
+    def test_invalid_window(self, client):
+        """Test a window ending before it starts is rejected"""
+        response = client.get(
+            "/api/v1/timeline", params={"from": "2026-02-01", "to": "2026-01-01"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_overlap_uses_range_index(self, db_session):
+        """Test the planner answers the overlap from the GiST index"""
+        span = date_span(Project.start_date, Project.end_date)
+        db_session.execute(text("SET enable_seqscan = off"))
+        plan = db_session.execute(
+            text(
+                f"EXPLAIN SELECT id FROM projects "
+                f"WHERE (start_date IS NOT NULL OR end_date IS NOT NULL) "
+                f"AND {span.compile(compile_kwargs={'literal_binds': True})} "
+                f"&& daterange('2026-01-01', '2026-12-31', '[]')"
+            )
+        ).scalars()
+
+        assert "ix_projects_timeline" in "\n".join(plan)